@@ -0,0 +1 @@
+"""Parser and pipeline benchmarks (run as modules, e.g. `python -m benchmarks.section_markers`)."""
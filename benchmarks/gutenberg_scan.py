@@ -0,0 +1,166 @@
+"""
+Gutenberg Preprocessing Benchmark
+
+Times what `IntegratedParser.parse` does before format detection, on seeded
+synthetic books wrapped in Project Gutenberg boilerplate, both the previous
+way (`clean(raw)`, which splits the text, then `get_toc(raw)`, which splits
+it again, then splitting the cleaned text for the parsers) and through one
+`scan` shared by `clean_layout` and the TOC. Reports wall time and tracemalloc
+peak memory, and checks that both give the same cleaned lines, metadata and
+TOC.
+
+Usage:
+    python -m benchmarks.gutenberg_scan [--size-mb 10] [--kinds novel,play] [--seed 0]
+                                        [--repeat 3]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from typing import Callable, Optional
+
+from benchmarks.synthetic import GENERATORS
+from src.parsers.gutenberg import _CHAPTER_IN_CAPTION, GutenbergMetadata, GutenbergParser
+
+
+class LegacyGutenbergParser(GutenbergParser):
+    """GutenbergParser.clean and get_toc as they were."""
+
+    def clean(self, text: str) -> tuple[str, GutenbergMetadata]:
+        lines = text.split("\n")
+        content_start, content_end, metadata = self._locate_content(lines, self._find_start(lines))
+        content_lines = list(self._legacy_clean_lines(lines[content_start:content_end]))
+        content_lines = self._skip_toc(content_lines)
+        content = "\n".join(content_lines)
+        if not metadata.title:
+            metadata.title = self._extract_title_from_content(content_lines[:100])
+        return content, metadata
+
+    def get_toc(self, text: str) -> Optional[str]:
+        lines = text.split("\n")
+        toc_start = -1
+        for i, line in enumerate(lines[:500]):
+            if line.lower().strip() in [
+                "contents",
+                "table of contents",
+                "contents.",
+                "table of contents.",
+            ]:
+                toc_start = i
+                break
+        if toc_start == -1:
+            return None
+        return "\n".join(lines[toc_start : self._find_toc_end(lines, toc_start)])
+
+    def _find_start(self, lines: list[str]) -> Optional[int]:
+        for i, line in enumerate(lines[:1000]):
+            line_upper = line.upper()
+            if ("START OF" in line_upper and "PROJECT GUTENBERG" in line_upper) or (
+                "END*THE SMALL PRINT" in line or "END THE SMALL PRINT" in line_upper
+            ):
+                j = i + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                return j
+            if line.strip() == "***" and i > 10:
+                j = i + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                if j < len(lines):
+                    next_line = lines[j].strip()
+                    if next_line and (
+                        next_line[0].isupper()
+                        or any(word in next_line.upper() for word in ["CHAPTER", "PART", "BOOK"])
+                    ):
+                        return j
+        return None
+
+    def _legacy_clean_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        blank_count = 0
+        in_illustration = False
+        for line in lines:
+            line_stripped = line.strip()
+            if line_stripped.startswith("[Illustration"):
+                in_illustration = True
+                if line_stripped.endswith("]"):
+                    in_illustration = False
+                continue
+            if in_illustration:
+                if line_stripped.endswith("]"):
+                    in_illustration = False
+                    inner = line_stripped.rstrip("]").rstrip(".").strip()
+                    if _CHAPTER_IN_CAPTION.match(inner):
+                        yield inner
+                continue
+            if line_stripped and all(c.isdigit() or c.isspace() for c in line_stripped):
+                continue
+            if not line_stripped:
+                blank_count += 1
+                if blank_count <= 2:
+                    yield line
+            else:
+                blank_count = 0
+                yield line
+
+
+def legacy_preprocess(raw: str) -> tuple[list[str], str, GutenbergMetadata, Optional[str]]:
+    """Cleaned lines, cleaned text, metadata and TOC, as IntegratedParser.parse got them."""
+    cleaner = LegacyGutenbergParser()
+    cleaned, metadata = cleaner.clean(raw)
+    toc = cleaner.get_toc(raw)
+    return cleaned.split("\n"), cleaned, metadata, toc
+
+
+def preprocess(raw: str) -> tuple[list[str], str, GutenbergMetadata, Optional[str]]:
+    """The same, from one scan of the raw text."""
+    cleaner = GutenbergParser()
+    layout = cleaner.scan(raw)
+    lines, metadata = cleaner.clean_layout(layout)
+    toc = layout.toc
+    del layout
+    return lines or [""], "\n".join(lines), metadata, toc
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` calls, then peak traced memory of one more."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=10.0, help="Text size in MB")
+    parser.add_argument("--kinds", default=",".join(GENERATORS), help="Comma-separated kinds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'kind':14} {'legacy':>8} {'peak':>8} {'scan':>8} {'peak':>8}")
+    for kind in (k.strip() for k in args.kinds.split(",")):
+        raw = GENERATORS[kind](int(args.size_mb * 1_000_000), seed=args.seed)
+        old, new = legacy_preprocess(raw), preprocess(raw)
+        if old[:2] != new[:2] or vars(old[2]) != vars(new[2]) or old[3] != new[3]:
+            raise SystemExit(f"{kind}: preprocessing results differ")
+
+        legacy_time, legacy_peak = measure(lambda raw=raw: legacy_preprocess(raw), args.repeat)
+        scan_time, scan_peak = measure(lambda raw=raw: preprocess(raw), args.repeat)
+        print(
+            f"{kind:14} {legacy_time:7.3f}s {legacy_peak / 1e6:6.1f}MB "
+            f"{scan_time:7.3f}s {scan_peak / 1e6:6.1f}MB  ({legacy_time / scan_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
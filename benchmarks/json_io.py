@@ -0,0 +1,123 @@
+"""
+JSON Serialization Benchmark
+
+Writes and reads a synthetic book of about 5MB of text the way the
+application used to (`json.dump(book.to_dict(), indent=2)` to a text file,
+`json.load`, then `Book.from_dict`) and through `src.utils.json_io` with
+each available backend, streaming chapters, pretty and compact. Reports wall
+time and tracemalloc peak memory of writing, decoding (what
+`load_transformed_json` does) and decoding into a Book (what `parse_json`
+does), and checks that the pretty output is byte-identical to the old output.
+
+Usage:
+    python -m benchmarks.json_io [--size-mb 5] [--seed 0] [--repeat 5]
+"""
+
+import argparse
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import multi_volume_text
+from src.models.book import Book
+from src.parsers.book_converter import BookConverter
+from src.parsers.parser import IntegratedParser
+from src.utils import json_io
+
+
+def legacy_write(book: Book, path: Path) -> None:
+    """Application._save_output as it was."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(book.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def legacy_read(path: Path) -> dict:
+    """JSON loading as it was."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` calls, then peak traced memory of one more."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def report(title: str, cases: list[tuple[str, Callable[[], object]]], repeat: int) -> None:
+    print(f"\n{title:40} {'time':>8} {'peak':>9}")
+    baseline = None
+    for name, func in cases:
+        elapsed, peak = measure(func, repeat)
+        baseline = baseline or elapsed
+        print(f"{name:40} {elapsed:7.3f}s {peak / 1e6:7.1f}MB  ({baseline / elapsed:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=5.0, help="Book text size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = multi_volume_text(int(args.size_mb * 1_000_000), seed=args.seed)
+    book = BookConverter().convert(IntegratedParser().parse(raw))
+    del raw
+    print(f"Synthetic book: {len(book.chapters)} chapters, {book.word_count():,} words")
+    print(f"Backends: {', '.join(json_io.BACKENDS)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.json"
+        legacy_write(book, legacy_path)
+        print(f"Pretty JSON: {legacy_path.stat().st_size / 1e6:.1f} MB")
+
+        write_cases = [("json.dump(to_dict(), indent=2)", lambda: legacy_write(book, legacy_path))]
+        read_cases = [("json.load", lambda: legacy_read(legacy_path))]
+        book_cases = [
+            ("json.load + Book.from_dict", lambda: Book.from_dict(legacy_read(legacy_path)))
+        ]
+        for backend in json_io.BACKENDS:
+            for compact in (False, True):
+                path = Path(tmp) / f"{backend}-{'compact' if compact else 'pretty'}.json"
+
+                def write(path=path, backend=backend, compact=compact):
+                    json_io.write_json(
+                        path, book.to_dict(lazy=True), compact=compact, backend=backend
+                    )
+
+                def read(path=path, backend=backend):
+                    return json_io.read_json(path, backend=backend)
+
+                def read_book(path=path, backend=backend):
+                    return Book.from_dict(json_io.read_json(path, backend=backend))
+
+                write()
+                if not compact and path.read_bytes() != legacy_path.read_bytes():
+                    raise SystemExit(f"{backend} output differs from json.dump")
+                if read_book() != book:
+                    raise SystemExit(f"{backend} round trip differs")
+                label = f"{backend} {'compact' if compact else 'pretty'}"
+                write_cases.append((f"write_json {label}, streamed", write))
+                read_cases.append((f"read_json {label}", read))
+                book_cases.append((f"read_json {label} + Book.from_dict", read_book))
+
+        report("write", write_cases, args.repeat)
+        report("decode", read_cases, args.repeat)
+        report("decode + Book.from_dict", book_cases, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
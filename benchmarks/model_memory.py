@@ -0,0 +1,201 @@
+"""
+Book Model Memory Benchmark
+
+Loads the same chapters of synthetic sentences into the slotted, text-backed
+`Chapter`/`Paragraph` models and into the previous dataclass models (a list
+of sentence strings per paragraph), and reports the memory they hold per
+million words, the time to build them from dicts, and the time of repeated
+`Paragraph.get_text` calls. Checks that both produce the same hashes and
+dicts.
+
+Usage:
+    python -m benchmarks.model_memory [--words 1000000] [--seed 0] [--repeat 5]
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from benchmarks.synthetic import sentence
+from src.models.book import Chapter
+from src.models.tracking import TrackedList, versions
+
+
+@dataclass
+class LegacyParagraph:
+    """Paragraph as it was: a tracked list of sentences, joined on every read."""
+
+    sentences: list[str]
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "sentences":
+            value = TrackedList(value, self._touch)
+            object.__setattr__(self, name, value)
+            self._touch()
+        else:
+            object.__setattr__(self, name, value)
+
+    def _touch(self):
+        object.__setattr__(self, "_digest", None)
+        object.__setattr__(self, "_version", next(versions))
+
+    def digest(self) -> bytes:
+        if self._digest is None:
+            payload = f"{len(self.sentences)}\x1e" + "\x1e".join(self.sentences)
+            object.__setattr__(self, "_digest", hashlib.sha256(payload.encode()).digest())
+        return self._digest
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"sentences": self.sentences}
+
+    def get_text(self) -> str:
+        return " ".join(self.sentences)
+
+
+@dataclass
+class LegacyChapter:
+    """Chapter as it was: a dataclass over a tracked list of paragraphs."""
+
+    number: Optional[int]
+    title: Optional[str]
+    paragraphs: list[LegacyParagraph]
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "paragraphs":
+            value = TrackedList(value, self._touch)
+            object.__setattr__(self, name, value)
+            self._touch()
+        else:
+            object.__setattr__(self, name, value)
+
+    def _touch(self):
+        object.__setattr__(self, "_content_digest", None)
+        object.__setattr__(self, "_version", next(versions))
+
+    def digest(self) -> bytes:
+        header = json.dumps(
+            {"number": self.number, "title": self.title, "metadata": self.metadata},
+            sort_keys=True,
+            default=str,
+        )
+        h = hashlib.sha256(header.encode())
+        content = hashlib.sha256()
+        for paragraph in self.paragraphs:
+            content.update(paragraph.digest())
+        h.update(content.digest())
+        return h.digest()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "number": self.number,
+            "title": self.title,
+            "paragraphs": [p.to_dict() for p in self.paragraphs],
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LegacyChapter":
+        return cls(
+            number=data.get("number"),
+            title=data.get("title"),
+            paragraphs=[LegacyParagraph(p.get("sentences", [])) for p in data["paragraphs"]],
+            metadata=data.get("metadata", {}),
+        )
+
+
+def chapter_dicts(words: int, seed: int = 0, paragraphs_per_chapter: int = 40) -> list[dict]:
+    """Chapter dicts holding about `words` words of synthetic sentences."""
+    rng = random.Random(seed)
+    chapters, paragraphs, total = [], [], 0
+    while total < words:
+        sentences = [sentence(rng) for _ in range(rng.randint(1, 8))]
+        total += sum(len(s.split()) for s in sentences)
+        paragraphs.append({"sentences": sentences})
+        if len(paragraphs) == paragraphs_per_chapter:
+            number = len(chapters) + 1
+            chapters.append(
+                {"number": number, "title": f"Chapter {number}", "paragraphs": paragraphs}
+            )
+            paragraphs = []
+    if paragraphs:
+        number = len(chapters) + 1
+        chapters.append({"number": number, "title": f"Chapter {number}", "paragraphs": paragraphs})
+    return chapters
+
+
+def load(cls: type, payload: str) -> tuple[float, int, list]:
+    """
+    Build chapters from serialized dicts.
+
+    Returns:
+        Build time, bytes still held once the parsed dicts are freed, and the chapters
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    chapters = [cls.from_dict(data) for data in json.loads(payload)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, held, chapters
+
+
+def time_get_text(chapters: list, repeat: int) -> float:
+    """Wall time of `repeat` passes calling get_text on every paragraph."""
+    paragraphs = [p for chapter in chapters for p in chapter.paragraphs]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for paragraph in paragraphs:
+            paragraph.get_text()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--words", type=int, default=1_000_000, help="Words of text")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="get_text passes per model")
+    args = parser.parse_args()
+
+    dicts = chapter_dicts(args.words, seed=args.seed)
+    words = sum(len(s.split()) for c in dicts for p in c["paragraphs"] for s in p["sentences"])
+    paragraphs = sum(len(c["paragraphs"]) for c in dicts)
+    payload = json.dumps(dicts)
+    del dicts
+    print(f"{len(payload) / 1e6:.1f} MB JSON: {words:,} words, {paragraphs:,} paragraphs")
+
+    cases: list[tuple[str, Callable[..., Any]]] = [
+        ("legacy dataclass (sentence lists)", LegacyChapter),
+        ("slotted text + sentence offsets", Chapter),
+    ]
+    results = []
+    for name, cls in cases:
+        elapsed, held, chapters = load(cls, payload)
+        results.append((name, elapsed, held, time_get_text(chapters, args.repeat), chapters))
+
+    legacy, compact = results[0][4], results[1][4]
+    if [c.digest() for c in legacy] != [c.digest() for c in compact]:
+        raise SystemExit("Chapter digests differ")
+    if [c.to_dict() for c in legacy] != [c.to_dict() for c in compact]:
+        raise SystemExit("Chapter dicts differ")
+
+    print(f"{'model':36} {'MB / 1M words':>14} {'from_dict':>10} {'get_text':>10}")
+    base_memory, base_text = results[0][2], results[0][3]
+    for name, elapsed, held, text_time, _ in results:
+        per_million = held / 1e6 * 1_000_000 / words
+        print(
+            f"{name:36} {per_million:14.1f} {elapsed:9.2f}s {text_time:9.2f}s"
+            f"  ({base_memory / held:.1f}x memory, {base_text / text_time:.1f}x get_text)"
+        )
+
+
+if __name__ == "__main__":
+    main()
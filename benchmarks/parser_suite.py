@@ -0,0 +1,279 @@
+"""
+Parser Benchmark Suite
+
+Runs every parser stage on seeded synthetic books of each kind (novel,
+play, multi-volume, epistolary, poetry) at several sizes, and reports
+per-stage wall time and tracemalloc peak memory:
+
+    clean      GutenbergParser.scan + clean_layout
+    detect     FormatDetector.detect
+    hierarchy  HierarchyBuilder.build_hierarchy   (non-plays)
+    play       PlayParser.parse                   (plays)
+    flatten    hierarchy or play to chapter dicts
+    validate   validate_and_clean_chapters
+    convert    BookConverter.convert
+
+Stages are routed the way `IntegratedParser.parse` routes them. Time and
+memory are measured in separate runs, so tracemalloc does not skew the
+timings. Finally, a log-log fit of each stage's time and peak memory against
+text length gives its scaling exponent. The suite exits non-zero if any
+stage scales worse than linearly (exponent above 1 + tolerance).
+
+Usage:
+    python -m benchmarks.parser_suite [--sizes 100KB,1MB,10MB,50MB] [--kinds novel,play]
+                                      [--seed 0] [--repeat 3] [--tolerance 0.3]
+                                      [--json results.json]
+"""
+
+import argparse
+import gc
+import json
+import math
+import time
+import tracemalloc
+from typing import Any, Callable, TypeVar
+
+from benchmarks.synthetic import GENERATORS
+from src.parsers.book_converter import BookConverter
+from src.parsers.chapter_validator import validate_and_clean_chapters
+from src.parsers.detector import BookFormat, FormatDetector
+from src.parsers.gutenberg import GutenbergParser
+from src.parsers.hierarchy import HierarchyBuilder
+from src.parsers.parser import IntegratedParser, ParsedBook
+from src.parsers.play import PlayParser, play_to_chapters
+
+T = TypeVar("T")
+
+STAGES = ["clean", "detect", "hierarchy", "play", "flatten", "validate", "convert"]
+UNITS = {"KB": 1_000, "MB": 1_000_000}
+
+# Measurements below these are dominated by timer noise and fixed costs,
+# so they are left out of the scaling fit
+MIN_TIME = 0.005
+MIN_MEMORY = 256_000
+
+
+def parse_size(value: str) -> int:
+    """'100KB' / '10MB' / '2500' to a number of characters."""
+    value = value.strip().upper()
+    for unit, factor in UNITS.items():
+        if value.endswith(unit):
+            return int(float(value[: -len(unit)]) * factor)
+    return int(value)
+
+
+def format_size(size: int) -> str:
+    """Inverse of `parse_size`, for table headings."""
+    if size >= UNITS["MB"]:
+        return f"{size / UNITS['MB']:g}MB"
+    return f"{size / UNITS['KB']:g}KB"
+
+
+def run_pipeline(raw: str, stage: Callable[[str, Callable[[], T]], T]) -> None:
+    """
+    Parse and convert a book, handing each stage to `stage(name, func)`.
+
+    Args:
+        raw: Raw book text
+        stage: Runs one stage and returns its result (and measures it)
+    """
+    cleaner = GutenbergParser()
+    detector = FormatDetector()
+    builder = HierarchyBuilder()
+    parser = IntegratedParser()
+
+    def clean():
+        layout = cleaner.scan(raw)
+        lines, metadata = cleaner.clean_layout(layout)
+        return lines or [""], "\n".join(lines), metadata, layout.toc
+
+    lines, cleaned, metadata, toc = stage("clean", clean)
+    detection = stage("detect", lambda: detector.detect(cleaned, toc))
+
+    if detection.format == BookFormat.PLAY and detection.confidence > 70:
+        play = stage("play", lambda: PlayParser().parse(lines))
+        chapters = stage("flatten", lambda: play_to_chapters(play))
+    else:
+        hierarchy = stage(
+            "hierarchy",
+            lambda: builder.build_hierarchy(lines, detection.format.value, skip_toc=True),
+        )
+        chapters = stage("flatten", lambda: parser._hierarchy_to_chapters(hierarchy))
+    chapters = stage("validate", lambda: validate_and_clean_chapters(chapters))
+
+    parsed = ParsedBook(
+        title=metadata.title if metadata else None,
+        author=metadata.author if metadata else None,
+        metadata={},
+        format=detection.format,
+        format_confidence=detection.confidence,
+        chapters=chapters,
+        hierarchy=None,
+        raw_text_length=len(raw),
+        cleaned_text_length=len(cleaned),
+    )
+    stage("convert", lambda: BookConverter().convert(parsed))
+
+
+def time_stages(raw: str, repeat: int) -> dict[str, float]:
+    """Best wall time of each stage over `repeat` runs of the pipeline."""
+    times: dict[str, float] = {}
+
+    def timed(name: str, func: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        times[name] = min(elapsed, times.get(name, elapsed))
+        return result
+
+    for _ in range(repeat):
+        gc.collect()
+        run_pipeline(raw, timed)
+    return times
+
+
+def peak_memory_by_stage(raw: str) -> dict[str, int]:
+    """Bytes allocated at each stage's peak, above what was live when it started."""
+    peaks: dict[str, int] = {}
+
+    def traced(name: str, func: Callable[[], T]) -> T:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func()
+        peaks[name] = tracemalloc.get_traced_memory()[1] - current
+        return result
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_pipeline(raw, traced)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def scaling_exponent(points: list[tuple[int, float]], floor: float) -> float:
+    """
+    Slope of log(value) against log(size), i.e. k in value ~ size**k.
+
+    Points with values under `floor` are skipped.
+
+    Returns:
+        The exponent, or NaN if fewer than two points remain
+    """
+    logs = [(math.log(size), math.log(value)) for size, value in points if value >= floor]
+    if len(logs) < 2:
+        return math.nan
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    var_x = sum((x - mean_x) ** 2 for x, _ in logs)
+    if not var_x:
+        return math.nan
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / var_x
+
+
+def benchmark_kind(kind: str, sizes: list[int], seed: int, repeat: int) -> list[dict[str, Any]]:
+    """Time and memory of every stage for one kind of book at each size."""
+    runs = []
+    for size in sizes:
+        raw = GENERATORS[kind](size, seed=seed)
+        runs.append(
+            {
+                "size": size,
+                "chars": len(raw),
+                "time": time_stages(raw, repeat if size < 10 * UNITS["MB"] else 1),
+                "memory": peak_memory_by_stage(raw),
+            }
+        )
+        del raw
+    return runs
+
+
+def print_kind(kind: str, runs: list[dict[str, Any]]) -> None:
+    """One table per kind: a row per stage, time and peak memory per size."""
+    stages = [s for s in STAGES if any(s in run["time"] for run in runs)]
+    heading = "".join(f"{format_size(run['size']):>22}" for run in runs)
+    print(f"\n{kind}\n{'stage':10}{heading}")
+    for stage in stages:
+        cells = "".join(
+            f"{run['time'][stage] * 1000:11.1f}ms {run['memory'][stage] / 1e6:7.1f}MB"
+            for run in runs
+        )
+        print(f"{stage:10}{cells}")
+    totals = "".join(f"{sum(run['time'].values()):12.2f}s {'':8}" for run in runs)
+    print(f"{'total':10}{totals}")
+
+
+def check_scaling(
+    results: dict[str, list[dict[str, Any]]], tolerance: float
+) -> list[tuple[str, str, str, float]]:
+    """
+    Print each stage's scaling exponents and return those above 1 + tolerance.
+
+    Returns:
+        (kind, stage, "time" or "memory", exponent) for each failure
+    """
+    failures = []
+    print(f"\nScaling exponents (value ~ size**k; fail above {1 + tolerance:.2f})")
+    print(f"{'kind':14}{'stage':10}{'time':>8}{'memory':>8}")
+    for kind, runs in results.items():
+        for stage in STAGES:
+            if not all(stage in run["time"] for run in runs):
+                continue
+            exponents = {
+                "time": scaling_exponent([(r["chars"], r["time"][stage]) for r in runs], MIN_TIME),
+                "memory": scaling_exponent(
+                    [(r["chars"], r["memory"][stage]) for r in runs], MIN_MEMORY
+                ),
+            }
+            flags = []
+            for metric, k in exponents.items():
+                if k > 1 + tolerance:
+                    failures.append((kind, stage, metric, k))
+                    flags.append(metric)
+            cells = "".join(
+                f"{'-' if math.isnan(k) else f'{k:.2f}':>8}" for k in exponents.values()
+            )
+            note = f"  SUPERLINEAR {', '.join(flags)}" if flags else ""
+            print(f"{kind:14}{stage:10}{cells}{note}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100KB,1MB,10MB,50MB", help="Comma-separated sizes")
+    parser.add_argument("--kinds", default=",".join(GENERATORS), help="Comma-separated kinds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timing runs per size under 10MB (best is kept)"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.3, help="Allowed scaling exponent above 1"
+    )
+    parser.add_argument("--json", help="Also write the measurements to this file")
+    args = parser.parse_args()
+
+    sizes = sorted(parse_size(s) for s in args.sizes.split(","))
+    kinds = [k.strip() for k in args.kinds.split(",")]
+    unknown = [k for k in kinds if k not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown kinds {unknown}; choose from {list(GENERATORS)}")
+
+    results = {}
+    for kind in kinds:
+        results[kind] = benchmark_kind(kind, sizes, args.seed, args.repeat)
+        print_kind(kind, results[kind])
+
+    failures = check_scaling(results, args.tolerance)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if failures:
+        raise SystemExit(
+            "Superlinear scaling: "
+            + ", ".join(f"{kind}/{stage} {metric} k={k:.2f}" for kind, stage, metric, k in failures)
+        )
+
+
+if __name__ == "__main__":
+    main()
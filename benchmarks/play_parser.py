@@ -0,0 +1,334 @@
+"""
+Play Parser Benchmark
+
+Compares the state-machine `PlayParser` with the previous predicate-chain
+parser on a synthetic complete-plays volume, reports throughput in lines
+per second, and checks that both build the same acts, scenes and
+elements.
+
+The previous parser is kept below as it was, except for one fix it shares
+with the new one: it used to drop the last scene of every act but the last.
+
+Usage:
+    python -m benchmarks.play_parser [--size-mb 10] [--seed 0] [--repeat 3]
+"""
+
+import argparse
+import time
+from typing import Any, Optional
+
+from benchmarks.synthetic import complete_plays_text
+from src.parsers.gutenberg import GutenbergParser
+from src.parsers.play import Act, Play, PlayElement, PlayElementType, PlayParser, Scene
+
+
+class LegacyPlayParser(PlayParser):
+    """PlayParser as it was: every line through a chain of predicates."""
+
+    def _parse_content(self, lines: list[str], play: Play):
+        """Parse play content into acts and scenes."""
+        current_act = None
+        current_scene = None
+        i = 0
+
+        while i < len(lines):
+            line = lines[i].strip()
+
+            if not line:
+                i += 1
+                continue
+
+            # Check for act marker
+            if self._is_act_marker(line):
+                act_info = self._parse_act_marker(line)
+                if act_info:
+                    # Save previous act if exists (with its last scene: the fix)
+                    if current_scene and current_scene.elements and current_act:
+                        current_act.scenes.append(current_scene)
+                    if current_act and current_act.scenes:
+                        play.acts.append(current_act)
+
+                    current_act = Act(
+                        number=act_info["number"], title=act_info.get("title"), scenes=[]
+                    )
+                    current_scene = None
+
+            # Check for scene marker
+            elif self._is_scene_marker(line):
+                scene_info = self._parse_scene_marker(line)
+                if scene_info:
+                    # Save previous scene if exists
+                    if current_scene and current_scene.elements and current_act:
+                        current_act.scenes.append(current_scene)
+
+                    current_scene = Scene(
+                        number=scene_info["number"],
+                        title=scene_info.get("title"),
+                        location=scene_info.get("location"),
+                        elements=[],
+                    )
+
+            # Check for prologue
+            elif self._is_prologue_marker(line):
+                i = self._parse_prologue(lines, i + 1, play)
+                continue
+
+            # Check for epilogue
+            elif self._is_epilogue_marker(line):
+                i = self._parse_epilogue(lines, i + 1, play)
+                continue
+
+            # Check for dramatis personae
+            elif self._is_dramatis_personae(line):
+                i = self._parse_dramatis_personae(lines, i + 1, play)
+                continue
+
+            # Parse scene content
+            elif current_scene:
+                # Check for stage direction
+                if line.startswith("[") and line.endswith("]"):
+                    current_scene.elements.append(
+                        PlayElement(type=PlayElementType.STAGE_DIRECTION, content=line[1:-1])
+                    )
+
+                # Check for character name (all caps, often followed by period or colon)
+                elif self._is_character_name(line):
+                    character = self._extract_character_name(line)
+                    # Look for dialogue on same or next lines
+                    dialogue_lines = []
+
+                    # Check if dialogue is on same line
+                    if ":" in line or "." in line:
+                        parts = line.split(":", 1) if ":" in line else line.split(".", 1)
+                        if len(parts) > 1 and parts[1].strip():
+                            dialogue_lines.append(parts[1].strip())
+
+                    # Collect following lines until next element
+                    j = i + 1
+                    while j < len(lines):
+                        next_line = lines[j].strip()
+                        if not next_line:
+                            break
+                        if (
+                            self._is_character_name(next_line)
+                            or self._is_stage_direction(next_line)
+                            or self._is_act_marker(next_line)
+                            or self._is_scene_marker(next_line)
+                        ):
+                            break
+                        dialogue_lines.append(next_line)
+                        j += 1
+
+                    if dialogue_lines:
+                        current_scene.elements.append(
+                            PlayElement(
+                                type=PlayElementType.DIALOGUE,
+                                content=" ".join(dialogue_lines),
+                                metadata={"character": character},
+                            )
+                        )
+                        i = j - 1  # Will be incremented at loop end
+
+                # Regular text (description, etc.)
+                else:
+                    current_scene.elements.append(
+                        PlayElement(type=PlayElementType.DIALOGUE, content=line)
+                    )
+
+            i += 1
+
+        # Save final act and scene
+        if current_scene and current_scene.elements and current_act:
+            current_act.scenes.append(current_scene)
+
+        if current_act and current_act.scenes:
+            play.acts.append(current_act)
+
+    def _is_act_marker(self, line: str) -> bool:
+        """Check if line marks an act."""
+        line_upper = line.upper().strip()
+        # Remove trailing periods
+        line_upper = line_upper.rstrip(".")
+        return (
+            line_upper.startswith("ACT ")
+            or line_upper == "ACT"  # Sometimes just "ACT" alone
+            or line_upper.startswith("ACTUS ")  # Latin
+            or (line_upper.startswith("THE ") and "ACT" in line_upper)
+        )
+
+    def _is_scene_marker(self, line: str) -> bool:
+        """Check if line marks a scene."""
+        line_upper = line.upper().strip()
+        return (
+            line_upper.startswith("SCENE ")
+            or line_upper.startswith("SC. ")
+            or (line_upper.startswith("THE ") and "SCENE" in line_upper)
+        )
+
+    def _is_character_name(self, line: str) -> bool:
+        """Check if line is a character name (for dialogue)."""
+        if not line or len(line) > 50:  # Character names are usually short
+            return False
+
+        # Common patterns for character names
+        # 1. All caps
+        # 2. Ends with period or colon
+        # 3. Short line (< 30 chars)
+        line_stripped = line.strip()
+
+        # Must have at least one letter
+        if not any(c.isalpha() for c in line_stripped):
+            return False
+
+        # Check if mostly uppercase letters (allowing for punctuation)
+        letters = [c for c in line_stripped if c.isalpha()]
+        # (and not a stage direction)
+        return bool(
+            letters
+            and sum(1 for c in letters if c.isupper()) / len(letters) > 0.7
+            and not line_stripped.startswith("[")
+        )
+
+    def _is_stage_direction(self, line: str) -> bool:
+        """Check if line is a stage direction."""
+        line_stripped = line.strip()
+        return (
+            (line_stripped.startswith("[") and line_stripped.endswith("]"))
+            or line_stripped.startswith("Enter ")
+            or line_stripped.startswith("Exit ")
+            or line_stripped.startswith("Exeunt")
+        )
+
+    def _is_prologue_marker(self, line: str) -> bool:
+        """Check if line marks a prologue."""
+        line_upper = line.upper().strip()
+        return "PROLOGUE" in line_upper and len(line_upper) < 30
+
+    def _parse_prologue(self, lines: list[str], start_idx: int, play: Play) -> int:
+        """Parse prologue content."""
+        prologue_lines = []
+        i = start_idx
+
+        while i < len(lines):
+            line = lines[i].strip()
+
+            # Stop at next major element
+            if (
+                self._is_act_marker(line)
+                or self._is_scene_marker(line)
+                or self._is_epilogue_marker(line)
+            ):
+                break
+
+            if line:
+                prologue_lines.append(line)
+
+            i += 1
+
+        play.prologue = prologue_lines
+        return i
+
+    def _is_epilogue_marker(self, line: str) -> bool:
+        """Check if line marks an epilogue."""
+        line_upper = line.upper().strip()
+        return "EPILOGUE" in line_upper and len(line_upper) < 30
+
+    def _parse_epilogue(self, lines: list[str], start_idx: int, play: Play) -> int:
+        """Parse epilogue content."""
+        epilogue_lines = []
+        i = start_idx
+
+        while i < len(lines):
+            line = lines[i].strip()
+            if line:
+                epilogue_lines.append(line)
+            i += 1
+
+        play.epilogue = epilogue_lines
+        return i
+
+    def _is_dramatis_personae(self, line: str) -> bool:
+        """Check if line marks dramatis personae."""
+        line_lower = line.lower().strip()
+        return (
+            ("dramatis" in line_lower and "person" in line_lower)
+            or line_lower == "characters"
+            or line_lower == "persons represented"
+        )
+
+    def _parse_dramatis_personae(self, lines: list[str], start_idx: int, play: Play) -> int:
+        """Parse character list."""
+        characters = []
+        i = start_idx
+
+        while i < len(lines):
+            line = lines[i].strip()
+
+            # Stop at next major element
+            if (
+                self._is_act_marker(line)
+                or self._is_scene_marker(line)
+                or self._is_prologue_marker(line)
+            ):
+                break
+
+            # Stop at multiple blank lines
+            if not line:
+                blank_count = 0
+                j = i
+                while j < len(lines) and not lines[j].strip():
+                    blank_count += 1
+                    j += 1
+                if blank_count > 2:
+                    break
+            elif line:
+                characters.append(line)
+
+            i += 1
+
+        play.dramatis_personae = characters
+        return i
+
+
+def measure(parser: PlayParser, lines: list[str], repeat: int) -> tuple[float, Play]:
+    """Best wall time over `repeat` parses, and the parsed play."""
+    best, play = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        play = parser.parse(lines)
+        best = min(best, time.perf_counter() - start)
+    return best, play
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=10.0, help="Text size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = complete_plays_text(int(args.size_mb * 1_000_000), seed=args.seed)
+    cleaned, _ = GutenbergParser().clean(raw)
+    lines = cleaned.split("\n")
+    print(f"Synthetic complete plays: {len(raw) / 1e6:.1f} MB, {len(lines):,} lines")
+
+    results = []
+    print(f"{'parser':34} {'time':>8} {'lines/s':>12}")
+    for name, play_parser in [
+        ("predicate chain (previous)", LegacyPlayParser()),
+        ("single classification + states", PlayParser()),
+    ]:
+        elapsed, play = measure(play_parser, lines, args.repeat)
+        results.append((elapsed, play))
+        speedup = results[0][0] / elapsed
+        print(f"{name:34} {elapsed:7.2f}s {len(lines) / elapsed:12,.0f}  ({speedup:.1f}x)")
+
+    if results[0][1] != results[1][1]:
+        raise SystemExit("The parsers built different plays")
+    play = results[1][1]
+    scenes = sum(len(act.scenes) for act in play.acts)
+    print(f"{len(play.acts)} acts, {scenes} scenes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Section Marker Benchmark
+
+Compares the single-scan section/format matcher with the previous
+pattern-by-pattern `re.match` loops on a synthetic multi-volume novel,
+and checks that both classify every line the same way.
+
+Usage:
+    python -m benchmarks.section_markers [--size-mb 10] [--seed 0] [--repeat 3]
+"""
+
+import argparse
+import re
+import time
+from typing import Callable
+
+from benchmarks.synthetic import multi_volume_text
+from src.parsers.detector import FormatDetector
+from src.parsers.hierarchy import HierarchyBuilder, _roman_to_int
+
+
+def legacy_match_section(builder: HierarchyBuilder, line: str):
+    """HierarchyBuilder._match_section as it was: every pattern through re.match."""
+    for section_type, patterns in builder.patterns.items():
+        for pattern, extractor in patterns:
+            match = re.match(pattern, line)
+            if match:
+                result = extractor(match)
+                if isinstance(result, tuple):
+                    number, title = result
+                    if title:
+                        title = title.strip("[]().,;: ") or None
+                else:
+                    number, title = result, None
+                if number and re.fullmatch(r"[IVXLCDMivxlcdm]+", number):
+                    number = str(_roman_to_int(number))
+                return (section_type, number, title)
+    return None
+
+
+def legacy_detect_types(builder: HierarchyBuilder, lines: list[str]) -> set:
+    """The section-type scan of HierarchyBuilder._detect_hierarchy as it was."""
+    found = set()
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        for section_type, patterns in builder.patterns.items():
+            for pattern, _ in patterns:
+                if re.match(pattern, line):
+                    found.add(section_type)
+                    break
+    return found
+
+
+def legacy_score_families(detector: FormatDetector, lines: list[str]) -> dict:
+    """FormatDetector's five _score_patterns passes as they were (scores before penalties)."""
+    results = {}
+    for family, patterns in detector.pattern_families.items():
+        score, evidence = 0.0, []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            for pattern, weight, description in patterns:
+                if re.match(pattern, line, re.IGNORECASE):
+                    score += weight
+                    if len(evidence) < 10:
+                        evidence.append(f"{description}: '{line[:50]}...'")
+        results[family] = (score, evidence)
+    return results
+
+
+def best_of(func: Callable[[], object], repeat: int) -> tuple[float, object]:
+    """Fastest wall time of `repeat` runs, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=10.0, help="Text size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = multi_volume_text(int(args.size_mb * 1_000_000), seed=args.seed)
+    lines = [line.strip() for line in text.split("\n")]
+    content = [line for line in lines if line]
+    print(f"Synthetic multi-volume text: {len(text) / 1e6:.1f} MB, {len(content)} non-blank lines")
+
+    builder = HierarchyBuilder()
+    detector = FormatDetector()
+    no_penalty = dict.fromkeys(detector.pattern_families, 0)
+
+    cases = [
+        (
+            "HierarchyBuilder._match_section",
+            lambda: [legacy_match_section(builder, line) for line in content],
+            lambda: [builder._match_section(line) for line in content],
+        ),
+        (
+            "HierarchyBuilder._detect_hierarchy scan",
+            lambda: legacy_detect_types(builder, content),
+            lambda: {
+                hit.payload[0] for line in content for hit in builder._matcher.match_all(line)
+            },
+        ),
+        (
+            "FormatDetector pattern scoring",
+            lambda: legacy_score_families(detector, content),
+            lambda: detector._score_families(content, no_penalty),
+        ),
+    ]
+
+    print(f"{'stage':42} {'before':>9} {'after':>9} {'speedup':>8}")
+    for name, before, after in cases:
+        old_time, old_result = best_of(before, args.repeat)
+        new_time, new_result = best_of(after, args.repeat)
+        if old_result != new_result:
+            raise SystemExit(f"{name}: results differ from the previous implementation")
+        print(f"{name:42} {old_time:8.3f}s {new_time:8.3f}s {old_time / new_time:7.1f}x")
+
+    full_time, _ = best_of(lambda: builder.build_hierarchy(text.split("\n")), args.repeat)
+    print(f"{'HierarchyBuilder.build_hierarchy (total)':42} {'':9} {full_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
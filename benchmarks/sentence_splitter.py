@@ -0,0 +1,106 @@
+"""
+Sentence Splitter Benchmark
+
+Compares `BookConverter.split_sentences` with the previous implementation
+(one `str.replace` pass per abbreviation, a three-branch lookbehind split
+and placeholder restoration) on the paragraphs of a synthetic novel with
+abbreviations mixed in, reports throughput in sentences per second, and
+checks that both split every paragraph the same way.
+
+Usage:
+    python -m benchmarks.sentence_splitter [--size-mb 10] [--seed 0] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable
+
+from benchmarks.synthetic import paragraph
+from src.parsers.book_converter import BookConverter
+
+LEGACY_ENDINGS = re.compile(
+    r"(?<=[.!?])\s+(?=[A-Z])|"
+    r"(?<=[.!?])\s*$|"
+    r'(?<=[.!?]["\'"])\s+(?=[A-Z])'
+)
+
+TITLES = ["Mr.", "Mrs.", "Dr.", "Prof.", "Jr.", "Co.", "U.S.", "a.m.", "e.g.", "etc.", "Sept."]
+
+
+def legacy_split_sentences(converter: BookConverter, text: str) -> list[str]:
+    """BookConverter.split_sentences as it was."""
+    if not text or not text.strip():
+        return []
+    text = " ".join(text.split())
+    protected_text = text
+    for abbrev in converter.abbreviations:
+        protected_text = protected_text.replace(abbrev, abbrev.replace(".", "<!DOT!>"))
+    result = []
+    for sentence in LEGACY_ENDINGS.split(protected_text):
+        if sentence and sentence.strip():
+            sentence = sentence.replace("<!DOT!>", ".").strip()
+            if sentence:
+                result.append(sentence)
+    if not result:
+        return [text.strip()] if text.strip() else []
+    return result
+
+
+def paragraphs(size: int, seed: int = 0) -> list[str]:
+    """Synthetic paragraphs of about `size` characters, with abbreviations and straight quotes."""
+    rng = random.Random(seed)
+    out, length = [], 0
+    while length < size:
+        words = paragraph(rng).replace("“", '"').replace("”", '"').split(" ")
+        for i in range(len(words)):
+            if rng.random() < 0.04:
+                words[i] = f"{rng.choice(TITLES)} {words[i]}"
+        text = " ".join(words)
+        out.append(text)
+        length += len(text)
+    return out
+
+
+def measure(func: Callable[[str], list[str]], texts: list[str], repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` runs, and the number of sentences produced."""
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(len(func(text)) for text in texts)
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=10.0, help="Text size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    converter = BookConverter()
+    texts = paragraphs(int(args.size_mb * 1_000_000), seed=args.seed)
+    print(f"{len(texts)} paragraphs, {sum(map(len, texts)) / 1e6:.1f} MB")
+
+    mismatches = sum(
+        converter.split_sentences(text) != legacy_split_sentences(converter, text) for text in texts
+    )
+    if mismatches:
+        raise SystemExit(f"{mismatches} paragraphs split differently")
+
+    cases = [
+        ("legacy replace + lookbehind split", lambda t: legacy_split_sentences(converter, t)),
+        ("single-scan split_sentences", converter.split_sentences),
+    ]
+    print(f"{'splitter':36} {'time':>8} {'sentences/s':>13}")
+    baseline = None
+    for name, func in cases:
+        elapsed, count = measure(func, texts, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:36} {elapsed:7.2f}s {count / elapsed:13,.0f}  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
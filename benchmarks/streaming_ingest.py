@@ -0,0 +1,87 @@
+"""
+Streaming Ingestion Benchmark
+
+Parses a synthetic multi-volume novel from disk twice: by reading the whole
+file and calling `IntegratedParser.parse`, and through `StreamingParser`,
+consuming one chapter at a time. Reports wall time and tracemalloc peak
+memory for each, and checks that both produce the same chapters.
+
+Usage:
+    python -m benchmarks.streaming_ingest [--size-mb 20] [--seed 0]
+"""
+
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import multi_volume_text
+from src.parsers.parser import parse_book
+from src.parsers.streaming import stream_book
+
+
+def measure(func: Callable[[], object]) -> tuple[float, int, object]:
+    """Wall time, peak traced memory in bytes, and the result of one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def chapter_digest(chapters) -> tuple[int, int, str]:
+    """(chapters, largest chapter in characters, digest) without keeping the chapters."""
+    digest = hashlib.sha256()
+    total = largest = 0
+    for chapter in chapters:
+        data = json.dumps(chapter, sort_keys=True).encode()
+        digest.update(data)
+        total += 1
+        largest = max(largest, sum(len(p) for p in chapter["paragraphs"]))
+    return total, largest, digest.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=20.0, help="Text size in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.txt"
+        path.write_text(multi_volume_text(int(args.size_mb * 1_000_000), seed=args.seed))
+        print(f"Synthetic multi-volume text: {path.stat().st_size / 1e6:.1f} MB")
+
+        def streamed():
+            with stream_book(path) as book:
+                return chapter_digest(book.chapters)
+
+        cases = [
+            (
+                "read + IntegratedParser.parse",
+                lambda: chapter_digest(parse_book(str(path)).chapters),
+            ),
+            ("StreamingParser (one chapter at a time)", streamed),
+        ]
+
+        results = []
+        print(f"{'path':42} {'time':>9} {'peak memory':>12}")
+        for name, func in cases:
+            elapsed, peak, result = measure(func)
+            results.append(result)
+            print(f"{name:42} {elapsed:8.2f}s {peak / 1e6:9.1f} MB")
+
+        if results[0] != results[1]:
+            raise SystemExit("Streamed chapters differ from IntegratedParser.parse")
+        chapters, largest, _ = results[1]
+        print(f"{chapters} chapters, largest {largest / 1e6:.2f} MB of text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Synthetic Books
+
+Seeded generators of Gutenberg-like texts for parser benchmarks.
+
+The prose is assembled from a fixed vocabulary, so a given seed and size
+always produce the same text, and no real books have to be checked in.
+"""
+
+import random
+
+WORDS = [
+    "the",
+    "of",
+    "and",
+    "to",
+    "a",
+    "in",
+    "that",
+    "was",
+    "he",
+    "she",
+    "her",
+    "his",
+    "it",
+    "with",
+    "as",
+    "for",
+    "had",
+    "you",
+    "not",
+    "be",
+    "at",
+    "on",
+    "but",
+    "by",
+    "which",
+    "have",
+    "from",
+    "this",
+    "all",
+    "were",
+    "they",
+    "been",
+    "would",
+    "my",
+    "one",
+    "so",
+    "there",
+    "when",
+    "who",
+    "said",
+    "could",
+    "what",
+    "very",
+    "an",
+    "no",
+    "any",
+    "more",
+    "some",
+    "into",
+    "than",
+    "little",
+    "now",
+    "must",
+    "such",
+    "much",
+    "then",
+    "upon",
+    "should",
+    "only",
+    "great",
+    "before",
+    "well",
+    "mother",
+    "father",
+    "sister",
+    "brother",
+    "lady",
+    "gentleman",
+    "house",
+    "letter",
+    "evening",
+    "morning",
+    "moment",
+    "felt",
+    "thought",
+    "knew",
+    "long",
+]
+
+NAMES = ["Elizabeth", "Darcy", "Jane", "Bingley", "Lydia", "Wickham", "Charlotte", "Collins"]
+
+ROMAN = [
+    "I",
+    "II",
+    "III",
+    "IV",
+    "V",
+    "VI",
+    "VII",
+    "VIII",
+    "IX",
+    "X",
+    "XI",
+    "XII",
+    "XIII",
+    "XIV",
+    "XV",
+    "XVI",
+    "XVII",
+    "XVIII",
+    "XIX",
+    "XX",
+]
+
+
+def roman(n: int) -> str:
+    """Roman numeral for 1..3999."""
+    if n <= len(ROMAN):
+        return ROMAN[n - 1]
+    numerals = [
+        (1000, "M"),
+        (900, "CM"),
+        (500, "D"),
+        (400, "CD"),
+        (100, "C"),
+        (90, "XC"),
+        (50, "L"),
+        (40, "XL"),
+        (10, "X"),
+        (9, "IX"),
+        (5, "V"),
+        (4, "IV"),
+        (1, "I"),
+    ]
+    out = []
+    for value, symbol in numerals:
+        while n >= value:
+            out.append(symbol)
+            n -= value
+    return "".join(out)
+
+
+def sentence(rng: random.Random) -> str:
+    """One sentence of filler prose, sometimes with dialogue."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 22))]
+    words[rng.randrange(len(words))] = rng.choice(NAMES)
+    text = " ".join(words)
+    text = text[0].upper() + text[1:]
+    if rng.random() < 0.15:
+        return f"“{text},” said {rng.choice(NAMES)}."
+    return text + rng.choice([".", ".", ".", "!", "?", ";"])
+
+
+def verse_line(rng: random.Random) -> str:
+    """One short line of verse."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 9))]
+    return " ".join(words).capitalize() + rng.choice([",", ",", ";", ".", "!", "?"])
+
+
+def paragraph(rng: random.Random, width: int = 72) -> str:
+    """A paragraph of 1-8 sentences, hard-wrapped like Gutenberg texts."""
+    text = " ".join(sentence(rng) for _ in range(rng.randint(1, 8)))
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    lines.append(line)
+    return "\n".join(lines)
+
+
+def gutenberg_wrap(title: str, body: str) -> str:
+    """Surround a body with Project Gutenberg header and footer lines."""
+    return (
+        f"The Project Gutenberg eBook of {title}\n\n"
+        f"Title: {title}\nAuthor: A. Writer\nRelease date: January 1, 2000 [eBook #0]\n"
+        "Language: English\n\n"
+        f"*** START OF THE PROJECT GUTENBERG EBOOK {title.upper()} ***\n\n"
+        f"{body}\n\n"
+        f"*** END OF THE PROJECT GUTENBERG EBOOK {title.upper()} ***\n\n"
+        "End of the Project Gutenberg License.\n"
+    )
+
+
+def multi_volume_text(size: int, seed: int = 0, chapters_per_volume: int = 20) -> str:
+    """
+    A multi-volume novel (VOLUME I / CHAPTER I. ...) of about `size` characters.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+        chapters_per_volume: Chapters before the next VOLUME heading
+
+    Returns:
+        Gutenberg-style text with a table of contents
+    """
+    rng = random.Random(seed)
+    toc = ["CONTENTS", ""]
+    parts = []
+    length = 0
+    volume = chapter = 0
+    while length < size:
+        if chapter % chapters_per_volume == 0:
+            volume += 1
+            heading = f"VOLUME {roman(volume)}"
+            toc.append(heading)
+            parts.append(f"\n\n{heading}\n\n")
+        chapter += 1
+        heading = f"CHAPTER {roman(chapter)}."
+        toc.append(f"    {heading}")
+        paragraphs = [paragraph(rng) for _ in range(rng.randint(15, 40))]
+        block = f"\n\n{heading}\n\n" + "\n\n".join(paragraphs)
+        parts.append(block)
+        length += len(block)
+    body = "\n".join(toc) + "\n" + "".join(parts)
+    return gutenberg_wrap("A Synthetic Novel in Volumes", body)
+
+
+def novel_text(size: int, seed: int = 0) -> str:
+    """
+    A novel of CHAPTER I. ... headings, with a table of contents.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+
+    Returns:
+        Gutenberg-style text
+    """
+    rng = random.Random(seed)
+    toc = ["CONTENTS", ""]
+    parts = []
+    length = chapter = 0
+    while length < size:
+        chapter += 1
+        heading = f"CHAPTER {roman(chapter)}."
+        toc.append(f"    {heading}")
+        paragraphs = [paragraph(rng) for _ in range(rng.randint(15, 40))]
+        block = f"\n\n{heading}\n\n" + "\n\n".join(paragraphs)
+        parts.append(block)
+        length += len(block)
+    body = "\n".join(toc) + "\n" + "".join(parts)
+    return gutenberg_wrap("A Synthetic Novel", body)
+
+
+def _play(rng: random.Random, size: int, scenes_per_act: int, prologue: bool = False) -> str:
+    """Body of one play of about `size` characters."""
+    people = [name.upper() for name in NAMES]
+    parts = ["DRAMATIS PERSONAE\n\n" + "\n".join(f"{name}, a gentleman" for name in people)]
+    if prologue:
+        verse = "\n".join(sentence(rng) for _ in range(rng.randint(4, 14)))
+        parts.append(f"\n\n\n\nPROLOGUE\n\n{verse}")
+    length = act = scene = 0
+    while length < size:
+        if scene % scenes_per_act == 0:
+            act += 1
+            parts.append(f"\n\n\n\nACT {roman(act)}.")
+        lines = [f"SCENE {roman(scene % scenes_per_act + 1)}. A room in the house."]
+        scene += 1
+        lines.append(f"[Enter {rng.choice(NAMES)} and {rng.choice(NAMES)}]")
+        for _ in range(rng.randint(20, 50)):
+            if rng.random() < 0.7:
+                speech = "\n".join(verse_line(rng) for _ in range(rng.randint(1, 8)))
+            else:
+                speech = "\n".join(sentence(rng) for _ in range(rng.randint(1, 4)))
+            if rng.random() < 0.2:
+                # Speech starting on the speaker's line
+                lines.append(f"{rng.choice(people)}. {speech}")
+            else:
+                lines.append(f"{rng.choice(people)}.\n{speech}")
+            if rng.random() < 0.1:
+                lines.append(f"[Exit {rng.choice(NAMES)}]")
+            elif rng.random() < 0.05:
+                lines.append(f"Enter {rng.choice(NAMES)}.")
+        lines.append("[Exeunt]")
+        block = "\n\n" + "\n\n".join(lines)
+        parts.append(block)
+        length += len(block)
+    return "".join(parts)
+
+
+def play_text(size: int, seed: int = 0, scenes_per_act: int = 5) -> str:
+    """
+    A play: dramatis personae, then ACT / SCENE headings, stage directions
+    and speeches under upper-case character names.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+        scenes_per_act: Scenes before the next ACT heading
+
+    Returns:
+        Gutenberg-style text
+    """
+    rng = random.Random(seed)
+    return gutenberg_wrap("A Synthetic Play", _play(rng, size, scenes_per_act))
+
+
+def complete_plays_text(size: int, seed: int = 0, play_size: int = 150_000) -> str:
+    """
+    A complete-works volume: one play after another, some with a prologue.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+        play_size: Approximate length of each play
+
+    Returns:
+        Gutenberg-style text
+    """
+    rng = random.Random(seed)
+    plays = []
+    length = 0
+    while length < size:
+        title = f"THE TRAGEDY OF {rng.choice(NAMES).upper()} {roman(len(plays) + 1)}"
+        body = _play(rng, play_size, rng.randint(3, 6), prologue=rng.random() < 0.3)
+        plays.append(f"{title}\n\n\n\n{body}")
+        length += len(plays[-1])
+    return gutenberg_wrap("The Complete Plays", "\n\n\n\n\n".join(plays))
+
+
+def epistolary_text(size: int, seed: int = 0) -> str:
+    """
+    A novel in letters: LETTER I. ... headings, dated, with a salutation.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+
+    Returns:
+        Gutenberg-style text
+    """
+    rng = random.Random(seed)
+    months = ["January", "March", "May", "July", "September", "November"]
+    parts = []
+    length = letter = 0
+    while length < size:
+        letter += 1
+        date = f"{rng.randint(1, 28)} {rng.choice(months)} {rng.randint(1790, 1799)}"
+        paragraphs = [paragraph(rng) for _ in range(rng.randint(3, 12))]
+        block = (
+            f"\n\nLETTER {roman(letter)}.\n\n{date}\n\nMy dear {rng.choice(NAMES)},\n\n"
+            + "\n\n".join(paragraphs)
+            + f"\n\nYours ever,\n{rng.choice(NAMES)}"
+        )
+        parts.append(block)
+        length += len(block)
+    return gutenberg_wrap("Synthetic Letters", "".join(parts))
+
+
+def poetry_text(size: int, seed: int = 0) -> str:
+    """
+    A collection of poems headed by Roman numerals, in indented stanzas.
+
+    Args:
+        size: Target length in characters
+        seed: Random seed
+
+    Returns:
+        Gutenberg-style text
+    """
+    rng = random.Random(seed)
+    parts = []
+    length = poem = 0
+    while length < size:
+        poem += 1
+        stanzas = []
+        for _ in range(rng.randint(2, 6)):
+            stanzas.append("\n".join("    " + verse_line(rng) for _ in range(4)))
+        block = f"\n\n{roman(poem)}\n\n" + "\n\n".join(stanzas)
+        parts.append(block)
+        length += len(block)
+    return gutenberg_wrap("Synthetic Poems", "".join(parts))
+
+
+# Book kinds for the parser benchmark suite, by name
+GENERATORS = {
+    "novel": novel_text,
+    "play": play_text,
+    "multi_volume": multi_volume_text,
+    "epistolary": epistolary_text,
+    "poetry": poetry_text,
+}
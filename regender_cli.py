@@ -37,6 +37,10 @@ async def process_book(args):
     # Initialize application
     config_path = args.config or "src/config.json"
     app = Application(config_path)
+    if args.compact:
+        app.compact_json = True
+    if args.batch:
+        os.environ["REGENDER_BATCH_MODE"] = "1"
 
     # Determine input and output paths
     input_path = args.input
@@ -198,6 +202,19 @@ async def async_main():
 
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
 
+    parser.add_argument(
+        "--compact", action="store_true", help="Write output JSON without indentation"
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "Send transformation and character extraction requests as provider batch jobs "
+            "(about half price, results within 24h); character merging still runs live"
+        ),
+    )
+
     # Selective transformation options
     parser.add_argument(
         "--characters",
@@ -236,6 +253,71 @@ async def async_main():
     await process_book(args)
 
 
+def ingest_corpus_cli(argv: list[str]):
+    """Parse a corpus of text books in parallel (`regender_cli.py ingest PATH...`)."""
+    from src.services.book_cache import BookCache
+    from src.services.corpus import CorpusIngestor
+
+    parser = argparse.ArgumentParser(
+        prog="regender_cli.py ingest",
+        description="Parse a corpus of .txt books in parallel into canonical JSON "
+        "and/or the parsed-book cache. Re-running skips files already ingested.",
+    )
+    parser.add_argument("paths", nargs="+", help="Text files or directories (searched recursively)")
+    parser.add_argument(
+        "-o", "--output-dir", help="Directory for canonical JSON (default: books/json/corpus)"
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Also store books in the parsed-book cache"
+    )
+    parser.add_argument(
+        "--no-json", action="store_true", help="Only store books in the parsed-book cache"
+    )
+    parser.add_argument("--manifest", help="Manifest path (default: manifest.jsonl in the output)")
+    parser.add_argument(
+        "-j", "--workers", type=int, help="Worker processes (default: number of CPUs)"
+    )
+    parser.add_argument("--pattern", default="*.txt", help="File glob inside directories")
+    parser.add_argument(
+        "--no-retry-failed", action="store_true", help="Skip files that failed in an earlier run"
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="Write canonical JSON without indentation"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.verbose)
+
+    def report(record):
+        if record["status"] == "ok":
+            print(
+                f"  ✓ {record['path']} ({record['format']}, {record['chapters']} chapters, "
+                f"{record['timings']['total']:.1f}s)"
+            )
+        else:
+            print(f"  ✗ {record['path']}: {record.get('error')}")
+
+    ingestor = CorpusIngestor(
+        json_dir=None if args.no_json else (args.output_dir or "books/json/corpus"),
+        cache=BookCache() if args.cache or args.no_json else None,
+        manifest_path=args.manifest,
+        workers=args.workers,
+        retry_failed=not args.no_retry_failed,
+        compact_json=args.compact,
+    )
+    print(f"Ingesting {', '.join(args.paths)} with {ingestor.workers} workers...")
+    summary = ingestor.run(args.paths, pattern=args.pattern, on_record=report)
+
+    print(
+        f"\n{summary.ingested} ingested, {summary.skipped} skipped, {summary.failed} failed "
+        f"in {summary.elapsed:.1f}s"
+    )
+    print(f"  Manifest: {summary.manifest_path}")
+    if summary.failed:
+        sys.exit(1)
+
+
 def _launch_tui():
     """Launch the interactive TUI (must run outside asyncio event loop)."""
     logging.disable(logging.CRITICAL)
@@ -254,6 +336,11 @@ def main():
         _launch_tui()
         return
 
+    # Corpus ingestion has its own arguments and runs a process pool
+    if sys.argv[1] == "ingest":
+        ingest_corpus_cli(sys.argv[2:])
+        return
+
     try:
         asyncio.run(async_main())
     except KeyboardInterrupt:
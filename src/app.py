@@ -8,6 +8,7 @@ all services, plugins, and configuration.
 import asyncio
 import json
 import logging
+import weakref
 from pathlib import Path
 from typing import Any, Optional
 
@@ -17,6 +18,25 @@ from src.models.character import CharacterAnalysis
 from src.models.transformation import TransformType
 from src.parsers.book_converter import BookConverter
 from src.plugins.base import PluginManager
+from src.providers.concurrency import get_all_concurrency_limiters
+from src.providers.http_pool import configure_http_pool, get_http_client
+from src.services.analysis_store import provider_identity
+from src.services.book_cache import content_hash
+from src.utils.circuit_breaker_monitor import CircuitBreakerMonitor
+from src.utils.json_io import read_json, write_json
+from src.utils.usage_accounting import get_usage_accountant
+
+# Provider identities (plus base URL) already warmed up, per shared HTTP client. The
+# pool keeps one client per event loop, so a new loop (or a reopened client) starts cold
+_warmed_up: "weakref.WeakKeyDictionary[Any, set[tuple[str, str, Optional[str]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _forget_failed_warm_up(task: asyncio.Task, warmed: set, key: tuple) -> None:
+    """Let a later Application retry a warm-up that failed or was cancelled."""
+    if task.cancelled() or task.exception() is not None or not task.result():
+        warmed.discard(key)
 
 
 class Application:
@@ -58,6 +78,9 @@ class Application:
         else:
             self.config = self._get_default_config()
 
+        # Output JSON is indented unless "compact_json" is set (or --compact on the CLI)
+        self.compact_json = bool(self.config.get("compact_json", False))
+
         # Initialize components
         self._initialize()
 
@@ -123,14 +146,57 @@ class Application:
         if self._owns_context:
             self.context.initialize()
 
+        # Size the shared HTTP pool to the configured concurrency
+        self._provider = None
+        self._configure_http_pool()
+
         # Load provider plugins
         self._load_providers()
 
         # Register services
         self._register_services()
 
+        # Open provider connections while the book is being parsed
+        self._start_warm_up()
+
         self.logger.info("Application initialized successfully")
 
+    def _configure_http_pool(self):
+        """Match the shared connection pool to the services' concurrency limits."""
+        max_connections = sum(
+            service.get("config", {}).get("max_concurrent", 5)
+            for service in self.config.get("services", {}).values()
+            if "provider" in service.get("dependencies", {})
+        )
+        if max_connections:
+            configure_http_pool(max_connections=max_connections)
+
+    def _start_warm_up(self):
+        """
+        Warm up the provider connection in the background, if a loop is running.
+
+        Runs once per provider identity for each shared HTTP client, i.e. per
+        event loop; a failed warm-up is retried by the next Application.
+        """
+        self._warm_up_task = None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Sync callers get a new loop per call; nothing to keep warm
+
+        provider = self._provider
+        if provider is None or not hasattr(provider, "warm_up"):
+            return
+        key = (*provider_identity(provider), getattr(provider, "base_url", None))
+        warmed = _warmed_up.setdefault(get_http_client(), set())
+        if key in warmed:
+            return
+        warmed.add(key)
+        self._warm_up_task = loop.create_task(provider.warm_up())
+        self._warm_up_task.add_done_callback(
+            lambda task: _forget_failed_warm_up(task, warmed, key)
+        )
+
     def _load_providers(self):
         """Load and initialize provider plugins."""
         import os
@@ -144,6 +210,8 @@ class Application:
             "openai": "src.providers.openai",
             "anthropic": "src.providers.anthropic",
             "ollama": "src.providers.ollama",
+            "replay": "src.providers.replay",
+            "composite": "src.providers.composite",
         }
 
         # Load all available provider plugins
@@ -171,12 +239,32 @@ class Application:
 
                 # Register as service for dependency injection
                 self.context.register_instance("llm_provider", provider)
+                self._provider = provider
                 self.logger.info(f"Registered provider: {provider.name}")
+                self._attach_hedge_provider(provider)
             except Exception as e:
                 self.logger.error(f"Failed to initialize provider: {e}")
         else:
             self.logger.error("No LLM provider could be loaded")
 
+    def _attach_hedge_provider(self, provider):
+        """Send hedged requests to REGENDER_HEDGE_PROVIDER, if hedging is on and it is set."""
+        import os
+
+        hedge_name = os.getenv("REGENDER_HEDGE_PROVIDER")
+        if not getattr(provider, "hedger", None) or not hedge_name or hedge_name == provider.name:
+            return
+        hedge_provider = self.plugin_manager.get(hedge_name)
+        if not hedge_provider:
+            self.logger.warning(f"Hedge provider '{hedge_name}' not found, hedging to {provider.name}")
+            return
+        try:
+            hedge_provider.initialize({"hedge": False})
+            provider.hedger.policy.provider = hedge_provider
+            self.logger.info(f"Hedging slow {provider.name} requests to {hedge_name}")
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize hedge provider {hedge_name}: {e}")
+
     def _register_services(self):
         """Register services with the container."""
         for service_name, service_config in self.config.get("services", {}).items():
@@ -222,6 +310,10 @@ class Application:
         """
         Get existing character analysis or analyze characters.
 
+        The character service looks prior analyses up in the content-addressed
+        analysis store by book hash, provider and model (so renamed input files
+        still hit), and checkpoints and stores new ones.
+
         Args:
             file_path: Path to the book file
             book: Parsed book object
@@ -229,39 +321,7 @@ class Application:
         Returns:
             Character analysis
         """
-        # Check for existing character analysis file
-        input_path = Path(file_path)
-
-        # Determine book name for output folder
-        book_name = input_path.stem
-        # Remove common prefixes like pg12- or pg43-
-        if book_name.startswith("pg") and "-" in book_name:
-            book_name = book_name.split("-", 1)[1]
-        # Convert to lowercase and replace spaces/underscores with hyphens
-        book_folder = book_name.lower().replace("_", "-").replace(" ", "-")
-
-        # Check for most recent character analysis in timestamped folders
-        output_base = Path("books/output")
-        matching_folders = sorted(output_base.glob(f"{book_folder}-*"))
-
-        for folder in reversed(matching_folders):  # Check newest first
-            char_file = folder / "characters.json"
-            if char_file.exists():
-                self.logger.info(f"Loading existing character analysis from {char_file}")
-                try:
-                    with open(char_file) as f:
-                        char_data = json.load(f)
-                    return CharacterAnalysis.from_dict(char_data)
-                except Exception as e:
-                    self.logger.warning(f"Failed to load character file: {e}")
-
-        # No existing analysis, analyze the book
-        self.logger.info("No existing character analysis found, analyzing book...")
-        character_service = self.get_service("character")
-        characters = await character_service.process(book)
-
-        # Note: Character analysis will be saved by the CLI with a timestamp
-        return characters
+        return await self.get_service("character").process(book)
 
     async def process_book(
         self,
@@ -311,8 +371,7 @@ class Application:
             if output_dir:
                 char_file = output_dir / "characters.json"
                 if not char_file.exists():
-                    with open(char_file, 'w') as f:
-                        json.dump(characters.to_dict(), f, indent=2, default=str)
+                    write_json(char_file, characters.to_dict(), compact=self.compact_json)
                     self.logger.info(f"Saved character analysis to {char_file}")
 
             # Transform the book
@@ -352,6 +411,7 @@ class Application:
                 "characters": len(characters.characters),
                 "changes": len(transformation.changes),
                 "output_path": output_path,
+                "usage": transformation.metadata.get("usage", {}),
             }
 
         except Exception as e:
@@ -368,9 +428,8 @@ class Application:
 
         # Save based on extension
         if output_path.suffix == ".json":
-            # Save as JSON
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(transformed_book.to_dict(), f, indent=2, ensure_ascii=False)
+            # Save as JSON, one chapter at a time
+            write_json(output_path, transformed_book.to_dict(lazy=True), compact=self.compact_json)
         else:
             # Save as text using TextExportService for proper Unicode handling
             from src.services.base import ServiceConfig
@@ -406,38 +465,47 @@ class Application:
         self.logger.info(f"Parsing book: {file_path}")
 
         try:
-            # Parse the book using the integrated parser
-            from src.parsers.parser import IntegratedParser
+            input_path = Path(file_path)
 
-            parser = IntegratedParser()
+            # Reuse an earlier parse of the same file content
+            book_cache = getattr(self.get_service("parser"), "book_cache", None)
+            digest = content_hash(input_path) if book_cache else None
+            book = book_cache.get(digest) if digest else None
 
-            # Read the file
-            input_path = Path(file_path)
-            with open(input_path, encoding="utf-8", errors="ignore") as f:
-                text = f.read()
+            if book is None:
+                # Parse the book using the integrated parser
+                from src.parsers.parser import IntegratedParser
+
+                parser = IntegratedParser()
+
+                # Read the file
+                with open(input_path, encoding="utf-8", errors="ignore") as f:
+                    text = f.read()
 
-            # Parse to ParsedBook format
-            parsed_book = parser.parse(text)
+                # Parse to ParsedBook format
+                parsed_book = parser.parse(text)
 
-            # Convert to canonical Book format with sentences
-            converter = BookConverter()
-            book = converter.convert(parsed_book)
+                # Convert to canonical Book format with sentences
+                converter = BookConverter()
+                book = converter.convert(parsed_book)
+                if digest:
+                    book_cache.put(digest, book)
+            else:
+                self.logger.info(f"Loaded parsed book from cache: {input_path}")
             book.source_file = str(input_path)
 
             self.logger.info(f"Parsed book: {book.title}")
 
             # Calculate statistics
             total_paragraphs = sum(len(ch.paragraphs) for ch in book.chapters)
-            total_sentences = sum(len(p.sentences) for ch in book.chapters for p in ch.paragraphs)
+            total_sentences = sum(p.sentence_count() for ch in book.chapters for p in ch.paragraphs)
 
             # Save output if requested
             if output_path:
                 output_path = Path(output_path)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
 
-                # Save as JSON
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(book.to_dict(), f, indent=2, ensure_ascii=False)
+                # Save as JSON, one chapter at a time
+                write_json(output_path, book.to_dict(lazy=True), compact=self.compact_json)
 
                 self.logger.info(f"Saved canonical JSON to {output_path}")
 
@@ -494,11 +562,7 @@ class Application:
             # Load the book (from JSON if available, otherwise parse)
             if input_path.suffix == ".json":
                 # Load from JSON
-                with open(input_path, encoding="utf-8") as f:
-                    book_data = json.load(f)
-                from src.models.book import Book
-
-                book = Book.from_dict(book_data)
+                book = Book.from_dict(read_json(input_path))
                 self.logger.info(f"Loaded book from JSON: {book.title}")
             else:
                 # Parse from text
@@ -524,8 +588,7 @@ class Application:
                     "source_file": str(input_path),
                 }
 
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(character_data, f, indent=2, ensure_ascii=False)
+                write_json(output_path, character_data, compact=self.compact_json)
 
                 self.logger.info(f"Saved character analysis to {output_path}")
 
@@ -599,6 +662,18 @@ class Application:
         return {
             "container": self.context.container.get_metrics(),
             "plugins": self.plugin_manager.list_plugins(),
+            "usage": get_usage_accountant().summary(),
+            "retries": self._provider.retry_stats.to_dict()
+            if getattr(self._provider, "retry_stats", None)
+            else {},
+            "hedging": self._provider.hedger.get_metrics()
+            if getattr(self._provider, "hedger", None)
+            else {},
+            "circuit_breakers": CircuitBreakerMonitor().get_health_summary(),
+            "concurrency": {
+                name: limiter.get_metrics()
+                for name, limiter in get_all_concurrency_limiters().items()
+            },
         }
 
     def shutdown(self):
@@ -882,6 +882,9 @@ class RegenderTUI(App):
         self._name_map: dict[str, str] | None = None
         self._pending_characters = None
         self._name_suggestions: list[dict] = []
+        self._suggestion_task: asyncio.Task | None = None
+        self._suggestion_task_key: tuple | None = None
+        self._session_app = None  # Application of the character analysis, reused for suggestions
         self._name_review_idx: int = 0
         self._name_edit_mode: bool = False
         self._name_custom_mode: bool = False
@@ -915,9 +918,26 @@ class RegenderTUI(App):
         if self._check_llm_setup():
             self._show_setup_wizard()
         else:
+            self._warm_up_connections()
             self._show_book_menu()
         self.query_one("#input", Input).focus()
 
+    def _warm_up_connections(self) -> None:
+        """Open pooled provider connections while the user is still choosing options."""
+        from src.providers.http_pool import warm_up
+
+        urls = []
+        provider = os.environ.get("DEFAULT_PROVIDER", "")
+        if provider == "ollama":
+            urls.append(os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1"))
+        else:
+            if os.environ.get("OPENAI_API_KEY", "") and provider in ("", "openai"):
+                urls.append("https://api.openai.com/v1/models")
+            if os.environ.get("ANTHROPIC_API_KEY", "") and provider in ("", "anthropic"):
+                urls.append("https://api.anthropic.com/v1/models")
+        if urls:
+            asyncio.ensure_future(warm_up(urls))
+
     def _check_llm_setup(self) -> bool:
         """Check if LLM provider is configured. Returns True if setup wizard is needed."""
         from dotenv import load_dotenv
@@ -1060,8 +1080,12 @@ class RegenderTUI(App):
         try:
             from openai import AsyncOpenAI
 
+            from src.providers.http_pool import get_http_client
+
             base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1")
-            client = AsyncOpenAI(api_key="ollama", base_url=base_url)
+            client = AsyncOpenAI(
+                api_key="ollama", base_url=base_url, http_client=get_http_client()
+            )
             # Minimal test call
             await asyncio.wait_for(
                 client.chat.completions.create(
@@ -1526,6 +1550,9 @@ class RegenderTUI(App):
             debug_log.info("Step 4: Analyzing characters (LLM call)...")
             characters = await character_service.process(book)
             debug_log.info(f"  found {len(characters.characters)} characters")
+            store = getattr(character_service, "analysis_store", None)
+            if store:
+                debug_log.info(f"  analysis stored under {store.root} (book {characters.book_id})")
             self._pending_characters = characters
 
             stats = characters.get_statistics()
@@ -1539,8 +1566,9 @@ class RegenderTUI(App):
             }
             debug_log.info(f"Analysis complete: {result}")
 
-            app.shutdown()
-            debug_log.info("App shutdown OK")
+            # Kept open: name suggestions for these characters go through the same services
+            self._close_session_app()
+            self._session_app = app
 
             if result.get("success"):
                 by_gender = result.get("by_gender", {})
@@ -1590,6 +1618,7 @@ class RegenderTUI(App):
                             self.print(f"    [#aaaaaa]... and {len(main_chars) - 5} more[/]")
 
                     self.print("")
+                    self._prefetch_name_suggestions()
                     self._show_transform_menu()
 
                 show_results()
@@ -1660,6 +1689,7 @@ class RegenderTUI(App):
                 self._selected_transform = self.TRANSFORM_TYPES[idx][0]
                 self.transform_type = self._selected_transform
                 self.print(f"[#ffffff]✓[/] {self._selected_transform}")
+                self._prefetch_name_suggestions()
                 self._show_options_menu()
                 return
         except ValueError:
@@ -1668,6 +1698,7 @@ class RegenderTUI(App):
                     self._selected_transform = name
                     self.transform_type = name
                     self.print(f"[#ffffff]✓[/] {name}")
+                    self._prefetch_name_suggestions()
                     self._show_options_menu()
                     return
 
@@ -1701,12 +1732,11 @@ class RegenderTUI(App):
 
         if has_ollama:
             try:
-                import httpx
+                from src.providers.http_pool import get_http_client
 
                 base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    resp = await client.get(f"{base_url}/api/tags")
-                    models = resp.json().get("models", [])
+                resp = await get_http_client().get(f"{base_url}/api/tags", timeout=5.0)
+                models = resp.json().get("models", [])
                 for m in models:
                     name = m.get("name", "")
                     if name:
@@ -1723,7 +1753,9 @@ class RegenderTUI(App):
             try:
                 from anthropic import AsyncAnthropic
 
-                client = AsyncAnthropic()
+                from src.providers.http_pool import get_http_client
+
+                client = AsyncAnthropic(http_client=get_http_client())
                 page = await client.models.list(limit=50)
                 for m in page.data:
                     if m.id.startswith("claude-"):
@@ -1744,7 +1776,9 @@ class RegenderTUI(App):
             try:
                 from openai import AsyncOpenAI
 
-                client = AsyncOpenAI()
+                from src.providers.http_pool import get_http_client
+
+                client = AsyncOpenAI(http_client=get_http_client())
                 models_page = await client.models.list()
                 openai_models: list[tuple[str, str, str]] = []
                 seen: set[str] = set()
@@ -1867,6 +1901,49 @@ class RegenderTUI(App):
         with contextlib.suppress(Exception):
             self.query_one(HeaderBar).update_meta(self._book_stats)
 
+    def _prefetch_name_suggestions(self) -> None:
+        """Start fetching name suggestions in the background.
+
+        Runs as soon as both the character analysis and a gender transform are
+        known, so the name review screen usually opens instantly. Results are
+        also memoized on disk by the character service.
+        """
+        transform = self._selected_transform
+        if not self._pending_characters or transform in (None, "parse_only", "character_analysis"):
+            return
+        key = (id(self._pending_characters), transform)
+        if self._suggestion_task_key == key:
+            return
+        if self._suggestion_task and not self._suggestion_task.done():
+            self._suggestion_task.cancel()
+        self._suggestion_task_key = key
+        self._suggestion_task = asyncio.ensure_future(
+            self._fetch_name_suggestions(self._pending_characters, transform)
+        )
+
+    async def _fetch_name_suggestions(self, characters, transform: str) -> list[dict]:
+        """Ask the session's character service for name suggestions (cached on disk)."""
+        character_service = self._get_session_app().get_service("character")
+        return await character_service.suggest_name_alternatives(characters, transform)
+
+    def _get_session_app(self):
+        """The Application kept from the character analysis, created if there is none."""
+        if self._session_app is None:
+            from dotenv import load_dotenv
+
+            from src.app import Application
+
+            load_dotenv()
+            self._session_app = Application("src/config.json")
+        return self._session_app
+
+    def _close_session_app(self) -> None:
+        """Shut down the Application kept from the character analysis, if any."""
+        if self._session_app is not None:
+            with contextlib.suppress(Exception):
+                self._session_app.shutdown()
+            self._session_app = None
+
     @work(exclusive=True)
     async def _run_name_review(self) -> None:
         """Fetch AI name suggestions and show review menu."""
@@ -1875,32 +1952,30 @@ class RegenderTUI(App):
             self._start_processing()
             return
 
-        # Show loader while fetching suggestions
-        loader_start = time.time()
-        loader = BrailleLoader("Suggesting names", loader_start)
-        with contextlib.suppress(Exception):
-            self.query_one("#content", ContentArea).add_widget(loader)
+        # Reuse the speculative request if it matches the current selection
+        self._prefetch_name_suggestions()
+        task = self._suggestion_task
+
+        loader = None
+        if task is None or not task.done():
+            # Show loader while fetching suggestions
+            loader = BrailleLoader("Suggesting names", time.time())
+            with contextlib.suppress(Exception):
+                self.query_one("#content", ContentArea).add_widget(loader)
 
         suggestions: list[dict] = []
         try:
-            from dotenv import load_dotenv
-
-            from src.app import Application
-
-            load_dotenv()
-            app = Application("src/config.json")
-            character_service = app.get_service("character")
-            suggestions = await character_service.suggest_name_alternatives(
-                self._pending_characters,
-                self._selected_transform or "",
-            )
-            app.shutdown()
+            if task is not None:
+                suggestions = [dict(s) for s in await asyncio.shield(task)]
         except Exception:
             suggestions = []
+            # Let a later attempt retry instead of reusing the failed task
+            self._suggestion_task_key = None
         finally:
-            with contextlib.suppress(Exception):
-                loader.stop()
-                loader.remove()
+            if loader is not None:
+                with contextlib.suppress(Exception):
+                    loader.stop()
+                    loader.remove()
 
         self._name_suggestions = suggestions
         self._show_name_review_menu()
@@ -2433,6 +2508,11 @@ class RegenderTUI(App):
         self._stage_loader = None
         self._analysis_loader = None
         self._model_choices = []
+        if self._suggestion_task and not self._suggestion_task.done():
+            self._suggestion_task.cancel()
+        self._suggestion_task = None
+        self._suggestion_task_key = None
+        self._close_session_app()
         os.environ.pop("DEFAULT_MODEL", None)
 
         self.book_title = "—"
@@ -8,16 +8,16 @@ Converts transformed JSON output to various formats:
 - RTF with UTF-8 encoding (for InDesign)
 """
 
-import json
 import re
 from pathlib import Path
 from typing import Optional
 
+from src.utils.json_io import read_json
+
 
 def load_transformed_json(json_path: str) -> dict:
     """Load a transformed book JSON file."""
-    with open(json_path, encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(json_path)
 
 
 def _book_title(data: dict) -> Optional[str]:
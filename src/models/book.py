@@ -6,20 +6,101 @@ the application.
 """
 
 import hashlib
+import itertools
 import json
+import operator
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from src.models.tracking import TrackedList, versions
+
 
-@dataclass
 class Paragraph:
-    """Represents a paragraph in a book."""
+    """
+    Represents a paragraph in a book.
+
+    Stored compactly: the paragraph text (its sentences joined by single
+    spaces, which is what `get_text` returns) plus an array of sentence end
+    offsets, instead of one string object per sentence. `sentences` is
+    unpacked into a list the first time it is read, and kept as a list from
+    then on so it can be mutated in place.
+    """
+
+    __slots__ = ("_text", "_ends", "_sentences", "_digest", "_version")
+
+    def __init__(self, sentences: list[str]):
+        self.sentences = sentences
+
+    @property
+    def sentences(self) -> list[str]:
+        """The sentences, as a list that tracks in-place mutation."""
+        if self._sentences is None:
+            self._sentences = TrackedList(self.iter_sentences(), self._touch)
+            self._ends = None  # the text stays, as get_text's cache
+        return self._sentences
+
+    @sentences.setter
+    def sentences(self, value: Iterable[str]):
+        if not isinstance(value, (list, tuple)):
+            value = list(value)
+        if len(value) == 1:
+            self._text, self._ends = value[0], None
+        else:
+            self._text = " ".join(value)
+            # Sentence i ends at its cumulative length plus the i separators before it
+            lengths = itertools.accumulate(map(len, value))
+            self._ends = array("I", map(operator.add, lengths, itertools.count()))
+        self._sentences = None
+        self._touch()
+
+    def _touch(self):
+        """Invalidate the cached digest (and unpacked text) after a mutation."""
+        if self._sentences is not None:
+            self._text = None
+        self._digest = None
+        self._version = next(versions)
+
+    def iter_sentences(self) -> Iterator[str]:
+        """Iterate over the sentences without unpacking them into a list."""
+        if self._sentences is not None:
+            return iter(self._sentences)
+        if self._ends is None:
+            return iter((self._text,))
+        return self._slice_sentences()
+
+    def _slice_sentences(self) -> Iterator[str]:
+        text, start = self._text, 0
+        for end in self._ends:
+            yield text[start:end]
+            start = end + 1
+
+    def sentence_count(self) -> int:
+        """Get the number of sentences."""
+        if self._sentences is not None:
+            return len(self._sentences)
+        return 1 if self._ends is None else len(self._ends)
+
+    def digest(self) -> bytes:
+        """
+        Get the SHA-256 digest of the paragraph's sentences.
 
-    sentences: list[str]
+        Cached until the paragraph is mutated.
+        """
+        if self._digest is None:
+            # Length prefix + record separator keeps sentence boundaries unambiguous
+            payload = f"{self.sentence_count()}\x1e" + "\x1e".join(self.iter_sentences())
+            self._digest = hashlib.sha256(payload.encode()).digest()
+        return self._digest
+
+    def hash(self) -> str:
+        """Get a short hex hash of the paragraph content."""
+        return self.digest().hex()[:16]
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
-        return {"sentences": self.sentences}
+        return {"sentences": list(self.iter_sentences())}
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Paragraph":
@@ -28,21 +109,109 @@ class Paragraph:
 
     def get_text(self) -> str:
         """Get full text of the paragraph."""
-        return " ".join(self.sentences)
+        if self._text is None:
+            self._text = " ".join(self._sentences)
+        return self._text
 
     def word_count(self) -> int:
         """Get word count of the paragraph."""
-        return sum(len(sentence.split()) for sentence in self.sentences)
+        # Sentences are joined by whitespace, so no word spans two of them
+        return len(self.get_text().split())
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return list(self.iter_sentences()) == list(other.iter_sentences())
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return f"Paragraph(sentences={list(self.iter_sentences())!r})"
+
+    def __reduce__(self):
+        # Copies and unpickled objects are rebuilt (and re-packed) from the sentences
+        return (self.__class__, (list(self.iter_sentences()),))
 
 
-@dataclass
 class Chapter:
     """Represents a chapter in a book."""
 
-    number: Optional[int]
-    title: Optional[str]
-    paragraphs: list[Paragraph]
-    metadata: dict[str, Any] = field(default_factory=dict)
+    __slots__ = (
+        "number",
+        "title",
+        "_paragraphs",
+        "metadata",
+        "_content_digest",
+        "_content_stamp",
+        "_version",
+    )
+
+    def __init__(
+        self,
+        number: Optional[int],
+        title: Optional[str],
+        paragraphs: list[Paragraph],
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        self.number = number
+        self.title = title
+        self.paragraphs = paragraphs
+        self.metadata = {} if metadata is None else metadata
+
+    @property
+    def paragraphs(self) -> list[Paragraph]:
+        """The paragraphs, as a list that tracks in-place mutation."""
+        return self._paragraphs
+
+    @paragraphs.setter
+    def paragraphs(self, value: Iterable[Paragraph]):
+        self._paragraphs = TrackedList(value, self._touch)
+        self._touch()
+
+    def _touch(self):
+        """Invalidate the cached content digest after the paragraph list changes."""
+        self._content_digest = None
+        self._version = next(versions)
+
+    def _get_content_digest(self) -> bytes:
+        """Get the Merkle digest over paragraph digests, recomputing only when stale."""
+        cached = self._content_digest
+        if cached is not None:
+            stamp = self._content_stamp
+            if self._version < stamp and all(p._version < stamp for p in self.paragraphs):
+                return cached
+
+        h = hashlib.sha256()
+        for paragraph in self.paragraphs:
+            h.update(paragraph.digest())
+        self._content_digest = h.digest()
+        self._content_stamp = next(versions)
+        return self._content_digest
+
+    def digest(self) -> bytes:
+        """
+        Get the SHA-256 digest of the chapter.
+
+        Combines the (cheap) header fields with the cached paragraph digests,
+        so unchanged paragraphs are never re-serialized.
+        """
+        header = json.dumps(
+            {"number": self.number, "title": self.title, "metadata": self.metadata},
+            sort_keys=True,
+            default=str,
+        )
+        h = hashlib.sha256(header.encode())
+        h.update(self._get_content_digest())
+        return h.digest()
+
+    def hash(self) -> str:
+        """
+        Get a short hex hash of the chapter.
+
+        Stable across runs, so it can be used as a cache key for
+        chapter-level work such as incremental re-transformation.
+        """
+        return self.digest().hex()[:16]
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
@@ -71,13 +240,37 @@ class Chapter:
         """Get all sentences in the chapter."""
         sentences = []
         for paragraph in self.paragraphs:
-            sentences.extend(paragraph.sentences)
+            sentences.extend(paragraph.iter_sentences())
         return sentences
 
     def word_count(self) -> int:
         """Get word count of the chapter."""
         return sum(p.word_count() for p in self.paragraphs)
 
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.number, self.title, self.paragraphs, self.metadata) == (
+            other.number,
+            other.title,
+            other.paragraphs,
+            other.metadata,
+        )
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return (
+            f"Chapter(number={self.number!r}, title={self.title!r}, "
+            f"paragraphs={list(self.paragraphs)!r}, metadata={self.metadata!r})"
+        )
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.number, self.title, list(self.paragraphs), self.metadata),
+        )
+
 
 @dataclass
 class Book:
@@ -89,11 +282,18 @@ class Book:
     metadata: dict[str, Any] = field(default_factory=dict)
     source_file: Optional[str] = None
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary representation."""
+    def to_dict(self, lazy: bool = False) -> dict[str, Any]:
+        """
+        Convert to dictionary representation.
+
+        Args:
+            lazy: Give chapters as a generator of chapter dicts, for streaming
+                with `src.utils.json_io.dump`
+        """
+        chapters = (c.to_dict() for c in self.chapters)
         return {
             "metadata": {"title": self.title, "author": self.author, **self.metadata},
-            "chapters": [c.to_dict() for c in self.chapters],
+            "chapters": chapters if lazy else list(chapters),
             "source_file": self.source_file,
         }
 
@@ -137,11 +337,24 @@ class Book:
         """
         Generate a unique hash for the book.
 
-        This is used for caching and deduplication.
+        This is used for caching and deduplication. The hash is a Merkle root
+        over the chapter digests plus the book-level metadata; the source file
+        path is deliberately excluded so the same content hashes the same
+        wherever it was loaded from.
         """
-        # Create a stable representation
-        book_repr = json.dumps(self.to_dict(), sort_keys=True)
-        return hashlib.sha256(book_repr.encode()).hexdigest()[:16]
+        header = json.dumps(
+            {"title": self.title, "author": self.author, "metadata": self.metadata},
+            sort_keys=True,
+            default=str,
+        )
+        h = hashlib.sha256(header.encode())
+        for chapter in self.chapters:
+            h.update(chapter.digest())
+        return h.hexdigest()[:16]
+
+    def chapter_hashes(self) -> list[str]:
+        """Get the hash of every chapter, in order."""
+        return [chapter.hash() for chapter in self.chapters]
 
     def validate(self) -> list[str]:
         """
@@ -160,7 +373,7 @@ class Book:
                 errors.append(f"Chapter {i + 1} has no paragraphs")
 
             for j, paragraph in enumerate(chapter.paragraphs):
-                if not paragraph.sentences:
+                if not paragraph.sentence_count():
                     errors.append(f"Chapter {i + 1}, Paragraph {j + 1} has no sentences")
 
         return errors
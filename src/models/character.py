@@ -5,11 +5,25 @@ This module defines character-related models for gender analysis
 and transformation.
 """
 
+import re
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
+from src.models.tracking import TrackedList
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a character name for lookup.
+
+    Case, periods and repeated whitespace are ignored, so "Mr. Darcy",
+    "mr darcy" and "MR.  DARCY" all normalize to the same key.
+    """
+    return " ".join(name.replace(".", " ").split()).casefold()
+
 
 class Gender(Enum):
     """Gender enumeration."""
@@ -34,6 +48,36 @@ class Character:
     importance: str = "supporting"  # main, supporting, minor
     confidence: float = 1.0  # Confidence in gender identification
 
+    def __setattr__(self, name: str, value: Any):
+        if name == "aliases":
+            value = TrackedList(value, self._touch)
+        object.__setattr__(self, name, value)
+        if name in ("name", "aliases"):
+            self._touch()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Owner references are per object; copies join analyses on their own
+        return {k: v for k, v in self.__dict__.items() if k != "_owners"}
+
+    def __setstate__(self, state: dict[str, Any]):
+        # Copies and unpickled objects must re-wrap their tracked lists
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def _add_owner(self, analysis: "CharacterAnalysis"):
+        """Register an analysis whose name index covers this character."""
+        owners = self.__dict__.setdefault("_owners", {})
+        key = id(analysis)
+        if key not in owners:
+            owners[key] = weakref.ref(analysis, lambda _: owners.pop(key, None))
+
+    def _touch(self):
+        """Invalidate the name indexes of the analyses that list this character."""
+        for ref in list(self.__dict__.get("_owners", {}).values()):
+            owner = ref()
+            if owner is not None:
+                owner._touch_roster()
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
         return {
@@ -135,6 +179,60 @@ class CharacterAnalysis:
     provider: Optional[str] = None
     model: Optional[str] = None
 
+    def __setattr__(self, name: str, value: Any):
+        if name == "characters":
+            value = TrackedList(value, self._touch_roster)
+            object.__setattr__(self, "_index", None)
+            object.__setattr__(self, "_matcher", None)
+            object.__setattr__(self, "_index_version", -1)
+        object.__setattr__(self, name, value)
+        if name == "characters":
+            self._touch_roster()
+
+    def __setstate__(self, state: dict[str, Any]):
+        # Copies and unpickled objects must re-wrap their tracked lists
+        for key, value in state.items():
+            setattr(self, key, value)
+        object.__setattr__(self, "_index_version", -1)
+
+    def _touch_roster(self):
+        """Record that the cast, or a listed character's name or aliases, changed."""
+        object.__setattr__(self, "_roster_version", self.__dict__.get("_roster_version", 0) + 1)
+
+    def _ensure_index(self) -> dict[str, Character]:
+        """
+        Build the normalized name/alias index if it is missing or stale.
+
+        Canonical names take precedence over aliases; otherwise the first
+        character in cast order wins.
+        """
+        if self._index is None or self._index_version != self._roster_version:
+            index: dict[str, Character] = {}
+            for character in self.characters:
+                character._add_owner(self)
+                index.setdefault(normalize_name(character.name), character)
+            for character in self.characters:
+                for alias in character.aliases:
+                    if alias:
+                        index.setdefault(normalize_name(alias), character)
+            object.__setattr__(self, "_index", index)
+            object.__setattr__(self, "_matcher", None)
+            object.__setattr__(self, "_index_version", self._roster_version)
+        return self._index
+
+    def _get_matcher(self) -> Optional[re.Pattern]:
+        """Get the compiled mention matcher (built lazily with the index)."""
+        index = self._ensure_index()
+        if self._matcher is None:
+            # Match what normalize_name ignores: case, periods and runs of whitespace
+            alternatives = {r"[\s.]+".join(map(re.escape, key.split())) for key in index if key}
+            pattern = None
+            if alternatives:
+                alternation = "|".join(sorted(alternatives, key=len, reverse=True))
+                pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+            object.__setattr__(self, "_matcher", pattern)
+        return self._matcher
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
         return {
@@ -161,11 +259,43 @@ class CharacterAnalysis:
         )
 
     def get_character(self, name: str) -> Optional[Character]:
-        """Get a character by name."""
-        for character in self.characters:
-            if character.name == name or name in character.aliases:
-                return character
-        return None
+        """Get a character by name or alias (case- and punctuation-insensitive)."""
+        if not name:
+            return None
+        return self._ensure_index().get(normalize_name(name))
+
+    def find_mentions(self, text: str) -> list[tuple[int, int, Character]]:
+        """
+        Find character mentions in a span of text.
+
+        Uses one compiled alternation over every name and alias (longest
+        first), so the text is scanned once regardless of cast size. Matching
+        is as lenient as `get_character`: a mention resolves to the character
+        `get_character` returns for the same text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            List of (start, end, character) tuples in text order
+        """
+        pattern = self._get_matcher()
+        if pattern is None or not text:
+            return []
+        index = self._index
+        mentions = []
+        for m in pattern.finditer(text):
+            character = index.get(normalize_name(m.group(0)))
+            if character is not None:
+                mentions.append((m.start(), m.end(), character))
+        return mentions
+
+    def mentioned_characters(self, text: str) -> list[Character]:
+        """Get the distinct characters mentioned in a span of text, in order."""
+        seen = {}
+        for _, _, character in self.find_mentions(text):
+            seen.setdefault(id(character), character)
+        return list(seen.values())
 
     def get_main_characters(self) -> list[Character]:
         """Get all main characters."""
@@ -0,0 +1,82 @@
+"""
+Mutation Tracking
+
+Helpers the domain models use to notice in-place changes, so they can
+keep cached digests and indexes until something below them changes.
+"""
+
+import itertools
+from typing import Callable, Optional
+
+# Monotonic mutation stamps shared by all models. A cached digest is valid as
+# long as nothing below it has been stamped after the digest was computed.
+versions = itertools.count(1)
+
+
+class TrackedList(list):
+    """List that reports in-place mutations to its owner."""
+
+    __slots__ = ("_on_change",)
+
+    def __init__(self, items=(), on_change: Optional[Callable[[], None]] = None):
+        super().__init__(items)
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def __reduce_ex__(self, protocol):
+        # Pickle/copy as a plain list; the owner re-wraps it on assignment
+        return (list, (list(self),))
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._changed()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._changed()
+        return result
+
+    def append(self, value):
+        super().append(value)
+        self._changed()
+
+    def extend(self, values):
+        super().extend(values)
+        self._changed()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._changed()
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        super().remove(value)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
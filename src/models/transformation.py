@@ -75,14 +75,22 @@ class Transformation:
     quality_score: Optional[float] = None
     qc_iterations: int = 0
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary representation."""
+    def to_dict(self, lazy: bool = False) -> dict[str, Any]:
+        """
+        Convert to dictionary representation.
+
+        Args:
+            lazy: Give chapters and changes as generators of dicts, for
+                streaming with `src.utils.json_io.dump`
+        """
+        chapters = (c.to_dict() for c in self.transformed_chapters)
+        changes = (c.to_dict() for c in self.changes)
         return {
             "original_book_id": self.original_book.hash(),
             "transform_type": self.transform_type.value,
-            "chapters": [c.to_dict() for c in self.transformed_chapters],
+            "chapters": chapters if lazy else list(chapters),
             "characters": self.characters_used.to_dict(),
-            "changes": [c.to_dict() for c in self.changes],
+            "changes": changes if lazy else list(changes),
             "metadata": self.metadata,
             "timestamp": self.timestamp.isoformat(),
             "quality_score": self.quality_score,
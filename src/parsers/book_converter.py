@@ -13,12 +13,9 @@ class BookConverter:
 
     def __init__(self):
         """Initialize the converter."""
-        # Common sentence ending patterns
-        self.sentence_endings = re.compile(
-            r"(?<=[.!?])\s+(?=[A-Z])|"  # Period/exclamation/question + space + capital
-            r"(?<=[.!?])\s*$|"  # Period/exclamation/question at end
-            r'(?<=[.!?]["\'"])\s+(?=[A-Z])'  # Quoted sentence ending
-        )
+        # Candidate sentence boundary: the single space (text is whitespace-normalized)
+        # after ./!/?, optionally followed by a straight quote, before a capital letter
+        self.sentence_boundary = re.compile(r"[.!?][\"']? (?=[A-Z])")
 
         # Common abbreviations that don't end sentences
         self.abbreviations = {
@@ -57,11 +54,26 @@ class BookConverter:
             "Nov.",
             "Dec.",
         }
+        self._lookup: list[tuple[int, frozenset]] = []
+        self._lookup_source: set = set()
+
+    def _abbreviation_lookup(self) -> list[tuple[int, frozenset]]:
+        """Abbreviations grouped by length, rebuilt if `abbreviations` was changed."""
+        if self._lookup_source != self.abbreviations:
+            by_length: dict[int, set] = {}
+            for abbrev in self.abbreviations:
+                by_length.setdefault(len(abbrev), set()).add(abbrev)
+            self._lookup = [(length, frozenset(group)) for length, group in by_length.items()]
+            self._lookup_source = set(self.abbreviations)
+        return self._lookup
 
     def split_sentences(self, text: str) -> list[str]:
         """
         Split text into sentences.
 
+        One scan over the text finds candidate boundaries; a candidate whose
+        period closes one of `abbreviations` (e.g. "Mr.", "U.S.") is skipped.
+
         Args:
             text: Text to split
 
@@ -74,27 +86,18 @@ class BookConverter:
         # Normalize whitespace
         text = " ".join(text.split())
 
-        # Protect abbreviations by replacing periods with placeholder
-        protected_text = text
-        for abbrev in self.abbreviations:
-            protected_text = protected_text.replace(abbrev, abbrev.replace(".", "<!DOT!>"))
-
-        # Split on sentence boundaries
-        sentences = self.sentence_endings.split(protected_text)
-
-        # Restore periods in abbreviations and clean up
+        lookup = self._abbreviation_lookup()
         result = []
-        for sentence in sentences:
-            if sentence and sentence.strip():
-                # Restore dots
-                sentence = sentence.replace("<!DOT!>", ".")
-                sentence = sentence.strip()
-                if sentence:
-                    result.append(sentence)
-
-        # If no sentences found, return the whole text as one sentence
-        if not result:
-            return [text.strip()] if text.strip() else []
+        start = 0
+        for match in self.sentence_boundary.finditer(text):
+            end = match.start() + 1
+            if text[match.start()] == "." and any(
+                text[end - length : end] in group for length, group in lookup
+            ):
+                continue
+            result.append(text[start : match.end() - 1])
+            start = match.end()
+        result.append(text[start:])
 
         return result
 
@@ -127,12 +130,12 @@ class BookConverter:
             if isinstance(para, str):
                 # Convert string paragraph to Paragraph object
                 paragraph = self.convert_paragraph(para)
-                if paragraph.sentences:  # Only add non-empty paragraphs
+                if paragraph.sentence_count():  # Only add non-empty paragraphs
                     paragraphs.append(paragraph)
             elif isinstance(para, dict):
                 # Already structured - convert
                 paragraph = Paragraph.from_dict(para)
-                if paragraph.sentences:
+                if paragraph.sentence_count():
                     paragraphs.append(paragraph)
 
         return Chapter(
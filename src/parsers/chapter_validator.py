@@ -4,6 +4,7 @@ Chapter Validation and Cleanup
 Merges empty chapters and validates chapter structure.
 """
 
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 
@@ -27,7 +28,39 @@ def validate_and_clean_chapters(
     if not chapters:
         return []
 
-    cleaned = []
+    cleaned = list(iter_validated_chapters(chapters, min_paragraphs))
+
+    # If we have no valid chapters but have content, create single chapter
+    if not cleaned and chapters:
+        all_paragraphs = []
+        for ch in chapters:
+            all_paragraphs.extend(ch.get("paragraphs", []))
+
+        if all_paragraphs:
+            cleaned = [
+                {"number": 1, "title": "Chapter 1", "paragraphs": all_paragraphs, "type": "chapter"}
+            ]
+
+    return cleaned
+
+
+def iter_validated_chapters(
+    chapters: Iterable[dict[str, Any]], min_paragraphs: int = 3
+) -> Iterator[dict[str, Any]]:
+    """
+    Lazy version of `validate_and_clean_chapters` for streamed chapters.
+
+    A chapter is yielded as soon as the next real chapter (or the end of
+    the input) shows that nothing more will be merged into it.
+
+    Args:
+        chapters: Chapter dictionaries in reading order
+        min_paragraphs: Minimum paragraphs for a valid chapter
+
+    Yields:
+        Cleaned, renumbered chapters
+    """
+    number = 0
     current_content = []
     current_title = None
 
@@ -38,27 +71,25 @@ def validate_and_clean_chapters(
             # This is a real chapter with content
             if current_content:
                 # Save any accumulated content first
-                cleaned.append(
-                    {
-                        "number": len(cleaned) + 1,
-                        "title": current_title or f"Chapter {len(cleaned) + 1}",
-                        "paragraphs": current_content,
-                        "type": "chapter",
-                    }
-                )
+                number += 1
+                yield {
+                    "number": number,
+                    "title": current_title or f"Chapter {number}",
+                    "paragraphs": current_content,
+                    "type": "chapter",
+                }
                 current_content = []
                 current_title = None
 
             # Add this chapter
-            cleaned.append(
-                {
-                    "number": len(cleaned) + 1,
-                    "title": ch.get("title", f"Chapter {len(cleaned) + 1}"),
-                    "paragraphs": ch.get("paragraphs", []),
-                    "type": ch.get("type", "chapter"),
-                    "metadata": ch.get("metadata", {}),
-                }
-            )
+            number += 1
+            yield {
+                "number": number,
+                "title": ch.get("title", f"Chapter {number}"),
+                "paragraphs": ch.get("paragraphs", []),
+                "type": ch.get("type", "chapter"),
+                "metadata": ch.get("metadata", {}),
+            }
         else:
             # Empty or very small chapter - accumulate its content
             if para_count > 0:
@@ -68,27 +99,13 @@ def validate_and_clean_chapters(
 
     # Don't forget remaining content
     if current_content:
-        cleaned.append(
-            {
-                "number": len(cleaned) + 1,
-                "title": current_title or f"Chapter {len(cleaned) + 1}",
-                "paragraphs": current_content,
-                "type": "chapter",
-            }
-        )
-
-    # If we have no valid chapters but have content, create single chapter
-    if not cleaned and chapters:
-        all_paragraphs = []
-        for ch in chapters:
-            all_paragraphs.extend(ch.get("paragraphs", []))
-
-        if all_paragraphs:
-            cleaned = [
-                {"number": 1, "title": "Chapter 1", "paragraphs": all_paragraphs, "type": "chapter"}
-            ]
-
-    return cleaned
+        number += 1
+        yield {
+            "number": number,
+            "title": current_title or f"Chapter {number}",
+            "paragraphs": current_content,
+            "type": "chapter",
+        }
 
 
 def is_collection(chapters: list[dict[str, Any]]) -> bool:
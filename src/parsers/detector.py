@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from .patterns import LinePatternMatcher
+
 
 class BookFormat(Enum):
     """Detected book formats."""
@@ -115,6 +117,23 @@ class FormatDetector:
             (r"^\d+\s+\w+\s+\d{4}", 2.0, "Date format"),
         ]
 
+        # Every family in one matcher, so sampled lines are classified in a single scan
+        self.pattern_families = {
+            "standard": self.chapter_patterns,
+            "play": self.play_patterns,
+            "multi_part": self.multipart_patterns,
+            "poetry": self.poetry_patterns,
+            "epistolary": self.epistolary_patterns,
+        }
+        self._matcher = LinePatternMatcher(
+            (
+                (pattern, (family, weight, description))
+                for family, patterns in self.pattern_families.items()
+                for pattern, weight, description in patterns
+            ),
+            re.IGNORECASE,
+        )
+
     def detect(self, text: str, toc: Optional[str] = None) -> FormatDetection:
         """
         Detect the format of the book.
@@ -128,13 +147,30 @@ class FormatDetector:
         """
         lines = text.split("\n")
 
+        # Sample different parts of the book
+        return self.detect_sampled(lines[:500], self._get_sample_lines(lines), toc)
+
+    def detect_sampled(
+        self, first_lines: list[str], sample_lines: list[str], toc: Optional[str] = None
+    ) -> FormatDetection:
+        """
+        Detect the format from lines already taken from the book.
+
+        Used when the text is streamed rather than held in memory; `detect`
+        gives the same result for the whole text.
+
+        Args:
+            first_lines: The first 500 lines of the cleaned text
+            sample_lines: Lines at the positions given by `sample_ranges`
+            toc: Optional table of contents
+
+        Returns:
+            FormatDetection with format, confidence, and evidence
+        """
         # Check for collection/anthology first
-        first_500_lines = "\n".join(lines[:500]).lower()
+        first_500_lines = "\n".join(first_lines[:500]).lower()
         is_collection = any(pattern in first_500_lines for pattern in self.collection_patterns)
 
-        # Sample different parts of the book
-        sample_lines = self._get_sample_lines(lines)
-
         # Score each format
         scores = {}
         evidence = {}
@@ -145,15 +181,16 @@ class FormatDetector:
             # Collections often have many plays/poems as chapters
             scores["standard"] = 50  # Treat as standard book with many chapters
 
-        # Check standard chapter format
-        scores["standard"], evidence["standard"] = self._score_patterns(
-            sample_lines, self.chapter_patterns, min_matches=3
+        family_scores = self._score_families(
+            sample_lines,
+            {"standard": 3, "play": 5, "multi_part": 1, "poetry": 3, "epistolary": 2},
         )
 
+        # Check standard chapter format
+        scores["standard"], evidence["standard"] = family_scores["standard"]
+
         # Check play format (require strong evidence - both acts AND scenes)
-        play_score, play_evidence = self._score_patterns(
-            sample_lines, self.play_patterns, min_matches=5
-        )
+        play_score, play_evidence = family_scores["play"]
         # Only consider it a play if we find both acts and scenes
         has_acts = any("ACT" in str(e).upper() for e in play_evidence)
         has_scenes = any("SCENE" in str(e).upper() for e in play_evidence)
@@ -164,20 +201,9 @@ class FormatDetector:
             scores["play"] = play_score * 0.3  # Heavily penalize without both
             evidence["play"] = play_evidence
 
-        # Check multi-part format
-        scores["multi_part"], evidence["multi_part"] = self._score_patterns(
-            sample_lines, self.multipart_patterns, min_matches=1
-        )
-
-        # Check poetry format
-        scores["poetry"], evidence["poetry"] = self._score_patterns(
-            sample_lines, self.poetry_patterns, min_matches=3
-        )
-
-        # Check epistolary format
-        scores["epistolary"], evidence["epistolary"] = self._score_patterns(
-            sample_lines, self.epistolary_patterns, min_matches=2
-        )
+        # Check multi-part, poetry and epistolary formats
+        for family in ("multi_part", "poetry", "epistolary"):
+            scores[family], evidence[family] = family_scores[family]
 
         # Analyze TOC if available
         if toc:
@@ -257,56 +283,68 @@ class FormatDetector:
 
         Samples from beginning, middle, and end to catch different patterns.
         """
-        total_lines = len(lines)
+        samples = []
+        for span in self.sample_ranges(len(lines), sample_size):
+            samples.extend(lines[span.start : span.stop])
+        return samples
 
+    @staticmethod
+    def sample_ranges(total_lines: int, sample_size: int = 2000) -> list[range]:
+        """Line index ranges sampled by `_get_sample_lines` for a text of `total_lines`."""
         if total_lines <= sample_size:
-            return lines
-
-        samples = []
+            return [range(total_lines)]
 
+        third = sample_size // 3
         # Sample from beginning (might have TOC)
-        samples.extend(lines[: sample_size // 3])
+        ranges = [range(0, third)]
 
         # Sample from middle
         middle_start = total_lines // 2 - sample_size // 6
-        samples.extend(lines[middle_start : middle_start + sample_size // 3])
+        ranges.append(range(middle_start, middle_start + third))
 
         # Sample from near end (but not the very end)
         end_start = total_lines - sample_size // 2
-        samples.extend(lines[end_start : end_start + sample_size // 3])
+        ranges.append(range(end_start, min(end_start + third, total_lines)))
 
-        return samples
+        return ranges
 
-    def _score_patterns(
-        self, lines: list[str], patterns: list[tuple], min_matches: int = 1
-    ) -> tuple[float, list[str]]:
+    def _score_families(
+        self, lines: list[str], min_matches: dict[str, int]
+    ) -> dict[str, tuple[float, list[str]]]:
         """
-        Score lines against patterns.
+        Score lines against every pattern family in one pass.
+
+        Args:
+            lines: Sampled lines
+            min_matches: Matches a family needs before its score counts in full
 
         Returns:
-            Tuple of (score, list of matched evidence)
+            Map of family to (score, list of matched evidence)
         """
-        score = 0
-        evidence = []
-        match_count = 0
+        scores = dict.fromkeys(self.pattern_families, 0.0)
+        counts = dict.fromkeys(self.pattern_families, 0)
+        evidence: dict[str, list[str]] = {family: [] for family in self.pattern_families}
 
         for line in lines:
             line = line.strip()
             if not line:
                 continue
 
-            for pattern, weight, description in patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    score += weight
-                    match_count += 1
-                    if len(evidence) < 10:  # Limit evidence
-                        evidence.append(f"{description}: '{line[:50]}...'")
-
-        # Require minimum matches
-        if match_count < min_matches:
-            score = score / 2  # Penalize sparse matches
-
-        return score, evidence
+            for hit in self._matcher.match_all(line):
+                family, weight, description = hit.payload
+                scores[family] += weight
+                counts[family] += 1
+                if len(evidence[family]) < 10:  # Limit evidence
+                    evidence[family].append(f"{description}: '{line[:50]}...'")
+
+        results = {}
+        for family in self.pattern_families:
+            score = scores[family]
+            # Require minimum matches
+            if counts[family] < min_matches.get(family, 1):
+                score = score / 2  # Penalize sparse matches
+            results[family] = (score, evidence[family])
+        return results
 
     def _analyze_toc(self, toc: str) -> Optional[str]:
         """
@@ -6,8 +6,37 @@ Avoids regex where possible for better reliability and maintainability.
 """
 
 import re
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from typing import Optional
+from itertools import islice
+from typing import Optional, Union
+
+# _skip_toc only inspects this many leading content lines
+TOC_WINDOW = 2000
+
+_CHAPTER_IN_CAPTION = re.compile(r"^(Chapter|CHAPTER)\s+[IVXLCDM\d]+")
+
+_TOC_HEADINGS = {"contents", "table of contents", "contents.", "table of contents."}
+
+# A TOC ends at the first line starting with one of these followed by " " or "."
+_TOC_CHAPTER_MARKERS = tuple(
+    marker + suffix
+    for marker in [
+        "CHAPTER",
+        "Chapter",
+        "PART",
+        "Part",
+        "ACT",
+        "Act",
+        "BOOK",
+        "Book",
+        "PROLOGUE",
+        "Prologue",
+        "INTRODUCTION",
+        "Introduction",
+    ]
+    for suffix in (" ", ".")
+)
 
 
 @dataclass
@@ -24,6 +53,30 @@ class GutenbergMetadata:
     produced_by: Optional[str] = None
 
 
+@dataclass
+class GutenbergLayout:
+    """
+    Where the parts of a raw Gutenberg text are, as line offsets into `lines`.
+
+    Built by `GutenbergParser.scan`, which reads only the head and the tail
+    of the text; the content lines in between are read once, when cleaned.
+    """
+
+    lines: Sequence[str]
+    content_start: int
+    content_end: int
+    metadata: GutenbergMetadata
+    toc_start: Optional[int] = None
+    toc_end: Optional[int] = None
+
+    @property
+    def toc(self) -> Optional[str]:
+        """The table of contents (what `GutenbergParser.get_toc` returns)."""
+        if self.toc_start is None:
+            return None
+        return "\n".join(self.lines[self.toc_start : self.toc_end])
+
+
 class GutenbergParser:
     """
     Line-based Project Gutenberg text parser.
@@ -41,11 +94,114 @@ class GutenbergParser:
         Returns:
             Tuple of (cleaned_text, metadata)
         """
-        lines = text.split("\n")
-        metadata = GutenbergMetadata()
+        content_lines, metadata = self.clean_layout(self.scan(text))
+        return "\n".join(content_lines), metadata
+
+    def scan(self, text: Union[str, Sequence[str]]) -> GutenbergLayout:
+        """
+        Locate the content, metadata and table of contents of a raw text.
+
+        The text is split into lines once. A single forward sweep over the
+        head finds both the START marker and the TOC heading, and a backward
+        sweep over the tail finds the END marker.
+
+        Args:
+            text: Raw Gutenberg text, or its lines
+
+        Returns:
+            GutenbergLayout to pass to `clean_layout` / `clean_stream`
+        """
+        lines = text.split("\n") if isinstance(text, str) else text
+        start_idx, toc_start = self._scan_head(lines)
+        content_start, content_end, metadata = self._locate_content(lines, start_idx)
+        toc_end = self._find_toc_end(lines, toc_start) if toc_start is not None else None
+        return GutenbergLayout(lines, content_start, content_end, metadata, toc_start, toc_end)
+
+    def clean_layout(self, layout: GutenbergLayout) -> tuple[list[str], GutenbergMetadata]:
+        """
+        Clean a scanned text (`clean`, without joining the lines).
+
+        Args:
+            layout: Result of `scan`
+
+        Returns:
+            Tuple of (cleaned lines, metadata)
+        """
+        content = islice(layout.lines, layout.content_start, layout.content_end)
+        content_lines = self._skip_toc(list(self._iter_clean_lines(content)))
+
+        # If no title found, try to extract from content
+        metadata = layout.metadata
+        if not metadata.title:
+            metadata.title = self._extract_title_from_content(content_lines[:100])
+
+        return content_lines, metadata
+
+    def clean_stream(
+        self, lines: Union[Sequence[str], GutenbergLayout]
+    ) -> tuple[list[str], Iterator[str], GutenbergMetadata]:
+        """
+        Clean Gutenberg text lazily (same result as `clean`, without the full copies).
+
+        Only the header, the end of the text and the first TOC_WINDOW content
+        lines are looked at up front; the remaining lines are cleaned as they
+        are consumed.
+
+        Args:
+            lines: Raw lines with random access (e.g. a memory-mapped line
+                index), or their `scan` result
+
+        Returns:
+            Tuple of (first cleaned lines, iterator over the rest, metadata);
+            the cleaned text is the head followed by the rest
+        """
+        layout = lines if isinstance(lines, GutenbergLayout) else self.scan(lines)
+        content = islice(layout.lines, layout.content_start, layout.content_end)
+        cleaned = self._iter_clean_lines(content)
+
+        # The TOC skip only decides on the first TOC_WINDOW lines
+        head = self._skip_toc(list(islice(cleaned, TOC_WINDOW)))
+
+        metadata = layout.metadata
+        if not metadata.title:
+            metadata.title = self._extract_title_from_content(head[:100])
+
+        return head, cleaned, metadata
+
+    def _scan_head(self, lines: Sequence[str]) -> tuple[Optional[int], Optional[int]]:
+        """
+        Find the content start marker and the TOC heading in one pass.
+
+        The START marker is looked for in the first 1000 lines and the TOC
+        heading in the first 500, as `get_toc` does.
+
+        Returns:
+            Tuple of (content start index, TOC heading index), each None if not found
+        """
+        start_idx = toc_start = None
+        for i in range(min(len(lines), 1000)):
+            line = lines[i]
+            if toc_start is None and i < 500 and self._is_toc_heading(line):
+                toc_start = i
+            if start_idx is None:
+                start_idx = self._start_after(lines, i)
+            if start_idx is not None and (toc_start is not None or i >= 499):
+                break
+        return start_idx, toc_start
+
+    def _locate_content(
+        self, lines: Sequence[str], start_idx: Optional[int]
+    ) -> tuple[int, int, GutenbergMetadata]:
+        """
+        Find the content range and extract metadata from the header.
 
-        # Find content boundaries
-        start_idx = self._find_start(lines)
+        Args:
+            lines: Raw lines
+            start_idx: Content start found by `_scan_head`
+
+        Returns:
+            Tuple of (content start index, content end index, metadata)
+        """
         end_idx = self._find_end(lines)
 
         # Extract metadata from header
@@ -53,78 +209,57 @@ class GutenbergParser:
         if start_idx and start_idx > 10:
             # Metadata likely before START marker
             header_lines = lines[: min(start_idx, 500)]
-            metadata = self._extract_metadata(header_lines)
+        elif start_idx is not None:
+            # START marker at beginning: look after it
+            header_lines = lines[start_idx : min(start_idx + 200, len(lines))]
         else:
-            # START marker at beginning or not found
-            # Look for metadata after START marker
-            if start_idx is not None:
-                # Look after the START marker
-                header_lines = lines[start_idx : min(start_idx + 200, len(lines))]
-            else:
-                # No clear start, try first 200 lines
-                header_lines = lines[: min(200, len(lines))]
-            metadata = self._extract_metadata(header_lines)
+            # No clear start, try first 200 lines
+            header_lines = lines[: min(200, len(lines))]
+        metadata = self._extract_metadata(header_lines)
 
-        # Extract content
+        # Content range
         if start_idx is not None and end_idx is not None:
-            content_lines = lines[start_idx:end_idx]
-        elif start_idx is not None:
-            content_lines = lines[start_idx:]
-        elif end_idx is not None:
+            return start_idx, end_idx, metadata
+        if start_idx is not None:
+            return start_idx, len(lines), metadata
+        if end_idx is not None:
             # No clear start, use heuristic
-            actual_start = self._find_actual_start(lines[:end_idx])
-            content_lines = lines[actual_start:end_idx]
-        else:
-            # No markers found, use heuristics
-            actual_start = self._find_actual_start(lines)
-            actual_end = self._find_actual_end(lines)
-            content_lines = lines[actual_start:actual_end]
-
-        # Clean content and skip TOC
-        content_lines = self._clean_lines(content_lines)
-        content_lines = self._skip_toc(content_lines)
-        content = "\n".join(content_lines)
+            return self._find_actual_start(lines[:end_idx]), end_idx, metadata
+        # No markers found, use heuristics
+        return self._find_actual_start(lines), self._find_actual_end(lines), metadata
 
-        # If no title found, try to extract from content
-        if not metadata.title:
-            metadata.title = self._extract_title_from_content(content_lines[:100])
+    def _start_after(self, lines: Sequence[str], i: int) -> Optional[int]:
+        """
+        Where content starts if line `i` is a start marker, else None.
 
-        return content, metadata
-
-    def _find_start(self, lines: list[str]) -> Optional[int]:
-        """Find start of actual content using line-based checks."""
-        for i, line in enumerate(lines[:1000]):
-            line_upper = line.upper()
-
-            # Most common Gutenberg start marker
-            if "START OF" in line_upper and "PROJECT GUTENBERG" in line_upper:
-                # Skip blank lines after marker
-                j = i + 1
-                while j < len(lines) and not lines[j].strip():
-                    j += 1
-                return j
-
-            # Older format
-            if "END*THE SMALL PRINT" in line or "END THE SMALL PRINT" in line_upper:
-                j = i + 1
-                while j < len(lines) and not lines[j].strip():
-                    j += 1
-                return j
-
-            # Sometimes marked with asterisks
-            if line.strip() == "***" and i > 10:  # Not at very beginning
-                # Check if next non-blank line looks like start
-                j = i + 1
-                while j < len(lines) and not lines[j].strip():
-                    j += 1
-                if j < len(lines):
-                    next_line = lines[j].strip()
-                    # If it looks like a title or chapter, this might be the start
-                    if next_line and (
-                        next_line[0].isupper()
-                        or any(word in next_line.upper() for word in ["CHAPTER", "PART", "BOOK"])
-                    ):
-                        return j
+        Content starts at the first non-blank line after the marker.
+        """
+        line = lines[i]
+        line_upper = line.upper()
+
+        # Most common Gutenberg start marker, or the older small print format
+        if ("START OF" in line_upper and "PROJECT GUTENBERG" in line_upper) or (
+            "END*THE SMALL PRINT" in line or "END THE SMALL PRINT" in line_upper
+        ):
+            j = i + 1
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            return j
+
+        # Sometimes marked with asterisks
+        if line.strip() == "***" and i > 10:  # Not at very beginning
+            # Check if next non-blank line looks like start
+            j = i + 1
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            if j < len(lines):
+                next_line = lines[j].strip()
+                # If it looks like a title or chapter, this might be the start
+                if next_line and (
+                    next_line[0].isupper()
+                    or any(word in next_line.upper() for word in ["CHAPTER", "PART", "BOOK"])
+                ):
+                    return j
 
         return None
 
@@ -539,20 +674,29 @@ class GutenbergParser:
         - Page numbers (lines with just numbers)
         - Illustration blocks (including multi-line blocks with captions/copyrights)
         """
-        cleaned = []
+        return list(self._iter_clean_lines(lines))
+
+    def _iter_clean_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Lazy version of `_clean_lines`."""
         blank_count = 0
         in_illustration = False  # Track multi-line illustration blocks
 
         for line in lines:
             line_stripped = line.strip()
 
+            # Handle blank lines (keep max 2 consecutive)
+            if not line_stripped:
+                if not in_illustration:
+                    blank_count += 1
+                    if blank_count <= 2:
+                        yield line
+                continue
+
             # Track illustration blocks — they can span multiple lines
             # Block opens with [Illustration and closes when line ends with ]
             if line_stripped.startswith("[Illustration"):
-                in_illustration = True
-                if line_stripped.endswith("]"):
-                    # Single-line illustration — opens and closes on same line
-                    in_illustration = False
+                # A single-line illustration opens and closes on the same line
+                in_illustration = not line_stripped.endswith("]")
                 continue
 
             if in_illustration:
@@ -561,24 +705,18 @@ class GutenbergParser:
                     # If the closing line contains a chapter heading, preserve it
                     # e.g. "Chapter I.]" inside an illustration caption
                     inner = line_stripped.rstrip("]").rstrip(".").strip()
-                    if re.match(r"^(Chapter|CHAPTER)\s+[IVXLCDM\d]+", inner):
-                        cleaned.append(inner)
+                    if _CHAPTER_IN_CAPTION.match(inner):
+                        yield inner
                 continue
 
             # Skip page numbers (lines that are purely digits/spaces)
-            if line_stripped and all(c.isdigit() or c.isspace() for c in line_stripped):
+            if line_stripped[0].isdigit() and all(
+                c.isdigit() or c.isspace() for c in line_stripped
+            ):
                 continue
 
-            # Handle blank lines (keep max 2 consecutive)
-            if not line_stripped:
-                blank_count += 1
-                if blank_count <= 2:
-                    cleaned.append(line)
-            else:
-                blank_count = 0
-                cleaned.append(line)
-
-        return cleaned
+            blank_count = 0
+            yield line
 
     def get_toc(self, text: str) -> Optional[str]:
         """
@@ -586,68 +724,37 @@ class GutenbergParser:
 
         Returns the TOC section as a string, or None if not found.
         """
-        lines = text.split("\n")
-        toc_start = -1
-        toc_end = -1
-
-        # Look for TOC markers
-        for i, line in enumerate(lines[:500]):  # TOC usually in first 500 lines
-            line_lower = line.lower().strip()
-
-            # TOC markers
-            if line_lower in ["contents", "table of contents", "contents.", "table of contents."]:
-                toc_start = i
-                break
-
-            # Sometimes just "CONTENTS" in caps
-            if line.strip() == "CONTENTS":
-                toc_start = i
-                break
+        return self.get_toc_lines(text.split("\n"))
+
+    def get_toc_lines(self, lines: Sequence[str]) -> Optional[str]:
+        """`get_toc` for text that is already split into lines (reads at most 700)."""
+        # TOC usually in first 500 lines
+        for i in range(min(len(lines), 500)):
+            if self._is_toc_heading(lines[i]):
+                return "\n".join(lines[i : self._find_toc_end(lines, i)])
+        return None
 
-        if toc_start == -1:
-            return None
+    def _is_toc_heading(self, line: str) -> bool:
+        """Whether a line is a "CONTENTS" / "Table of Contents" heading."""
+        return line.lower().strip() in _TOC_HEADINGS
 
-        # Find TOC end (many blank lines or chapter start)
+    def _find_toc_end(self, lines: Sequence[str], toc_start: int) -> int:
+        """Find TOC end (many blank lines or chapter start)."""
         consecutive_blanks = 0
-        chapter_markers = [
-            "CHAPTER",
-            "Chapter",
-            "PART",
-            "Part",
-            "ACT",
-            "Act",
-            "BOOK",
-            "Book",
-            "PROLOGUE",
-            "Prologue",
-            "INTRODUCTION",
-            "Introduction",
-        ]
-
         for i in range(toc_start + 1, min(toc_start + 200, len(lines))):
             line_stripped = lines[i].strip()
 
             if not line_stripped:
                 consecutive_blanks += 1
                 if consecutive_blanks > 3:
-                    toc_end = i
-                    break
+                    return i
             else:
                 consecutive_blanks = 0
                 # Check for chapter start
-                for marker in chapter_markers:
-                    if line_stripped.startswith(marker + " ") or line_stripped.startswith(
-                        marker + "."
-                    ):
-                        toc_end = i
-                        break
-                if toc_end != -1:
-                    break
-
-        if toc_end == -1:
-            toc_end = min(toc_start + 100, len(lines))
+                if line_stripped.startswith(_TOC_CHAPTER_MARKERS):
+                    return i
 
-        return "\n".join(lines[toc_start:toc_end])
+        return min(toc_start + 100, len(lines))
 
 
 # Convenience function for backward compatibility
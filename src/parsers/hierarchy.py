@@ -9,6 +9,10 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from .patterns import LinePatternMatcher
+
+_ROMAN_NUMBER = re.compile(r"[IVXLCDMivxlcdm]+")
+
 
 def _roman_to_int(s: str) -> int:
     """Convert a Roman numeral string to an integer (e.g. 'XIII' → 13)."""
@@ -184,6 +188,13 @@ class HierarchyBuilder:
             ],
         }
 
+        # All patterns in priority order, classified with one scan per line
+        self._matcher = LinePatternMatcher(
+            (pattern, (section_type, extractor))
+            for section_type, patterns in self.patterns.items()
+            for pattern, extractor in patterns
+        )
+
     def build_hierarchy(
         self, lines: list[str], format_hint: str = None, skip_toc: bool = True
     ) -> Section:
@@ -200,7 +211,27 @@ class HierarchyBuilder:
         """
         # Create root section
         root = Section(type=SectionType.BOOK, title="Book")
+        hierarchy, start_index = self.plan_hierarchy(lines, format_hint, skip_toc)
+
+        # Build the structure
+        current_sections = self.start_sections(root, hierarchy)
+        for i in range(start_index, len(lines)):
+            self.add_line(lines[i], root, current_sections, hierarchy)
+
+        return root
+
+    def plan_hierarchy(
+        self, lines: list[str], format_hint: str = None, skip_toc: bool = True
+    ) -> tuple[list[SectionType], int]:
+        """
+        Choose the hierarchy levels and the line where content starts.
+
+        Only the first 2000 lines are read, so a prefix of a longer text
+        gives the same answer as the whole text.
 
+        Returns:
+            Tuple of (hierarchy levels, index of the first content line)
+        """
         # Determine hierarchy levels based on format
         if format_hint == "multi_part":
             hierarchy = [SectionType.VOLUME, SectionType.CHAPTER]
@@ -215,46 +246,63 @@ class HierarchyBuilder:
         if skip_toc:
             start_index = self._find_content_start(lines, hierarchy)
 
-        # Build the structure
+        return hierarchy, start_index
+
+    def start_sections(
+        self, root: Section, hierarchy: list[SectionType]
+    ) -> dict[SectionType, Optional[Section]]:
+        """Open sections per level at the start of the content."""
         current_sections = dict.fromkeys(hierarchy)
         current_sections[SectionType.BOOK] = root
+        return current_sections
 
-        for i in range(start_index, len(lines)):
-            line = lines[i]
-            line_stripped = line.strip()
-            if not line_stripped:
-                # Add blank lines to current content
-                lowest_section = self._get_lowest_section(current_sections)
-                if lowest_section:
-                    lowest_section.add_line(line)
-                continue
+    def add_line(
+        self,
+        line: str,
+        root: Section,
+        current_sections: dict[SectionType, Optional[Section]],
+        hierarchy: list[SectionType],
+    ) -> Optional[tuple[Section, Section]]:
+        """
+        Add one line to the hierarchy being built.
 
-            # Check if this line starts a new section
-            section_match = self._match_section(line_stripped)
+        Returns:
+            (new section, parent) if the line started a section, else None
+        """
+        line_stripped = line.strip()
+        if not line_stripped:
+            # Add blank lines to current content
+            lowest_section = self._get_lowest_section(current_sections)
+            if lowest_section:
+                lowest_section.add_line(line)
+            return None
 
-            if section_match:
-                section_type, number, title = section_match
+        # Check if this line starts a new section
+        section_match = self._match_section(line_stripped)
 
-                # Create new section
-                new_section = Section(type=section_type, number=number, title=title)
+        if section_match:
+            section_type, number, title = section_match
 
-                # Find parent section
-                parent = self._find_parent_section(section_type, current_sections, hierarchy)
-                if parent:
-                    parent.add_subsection(new_section)
-                    current_sections[section_type] = new_section
+            # Create new section
+            new_section = Section(type=section_type, number=number, title=title)
 
-                    # Clear lower-level sections
-                    self._clear_lower_sections(section_type, current_sections, hierarchy)
-            else:
-                # Add line to current lowest section
-                lowest_section = self._get_lowest_section(current_sections)
-                if lowest_section:
-                    lowest_section.add_line(line)
-                else:
-                    root.add_line(line)
+            # Find parent section
+            parent = self._find_parent_section(section_type, current_sections, hierarchy)
+            if parent:
+                parent.add_subsection(new_section)
+                current_sections[section_type] = new_section
 
-        return root
+                # Clear lower-level sections
+                self._clear_lower_sections(section_type, current_sections, hierarchy)
+                return new_section, parent
+        else:
+            # Add line to current lowest section
+            lowest_section = self._get_lowest_section(current_sections)
+            if lowest_section:
+                lowest_section.add_line(line)
+            else:
+                root.add_line(line)
+        return None
 
     def _detect_hierarchy(self, lines: list[str]) -> list[SectionType]:
         """
@@ -268,11 +316,8 @@ class HierarchyBuilder:
             if not line_stripped:
                 continue
 
-            for section_type, patterns in self.patterns.items():
-                for pattern, _ in patterns:
-                    if re.match(pattern, line_stripped):
-                        found_types.add(section_type)
-                        break
+            for hit in self._matcher.match_all(line_stripped):
+                found_types.add(hit.payload[0])
 
         # Determine hierarchy based on what was found
         if SectionType.VOLUME in found_types:
@@ -305,26 +350,26 @@ class HierarchyBuilder:
         Returns:
             Tuple of (section_type, number, title) or None
         """
-        for section_type, patterns in self.patterns.items():
-            for pattern, extractor in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    result = extractor(match)
-                    if isinstance(result, tuple):
-                        number, title = result
-                        # Strip stray brackets/punctuation that leak in from chapter header formatting
-                        if title:
-                            title = title.strip("[]().,;: ")
-                            if not title:
-                                title = None
-                    else:
-                        number = result
-                        title = None
-                    # Convert Roman numerals to integers for clean display
-                    if number and re.fullmatch(r"[IVXLCDMivxlcdm]+", number):
-                        number = str(_roman_to_int(number))
-                    return (section_type, number, title)
-        return None
+        hit = self._matcher.match(line)
+        if hit is None:
+            return None
+
+        section_type, extractor = hit.payload
+        result = extractor(hit.match)
+        if isinstance(result, tuple):
+            number, title = result
+            # Strip stray brackets/punctuation that leak in from chapter header formatting
+            if title:
+                title = title.strip("[]().,;: ")
+                if not title:
+                    title = None
+        else:
+            number = result
+            title = None
+        # Convert Roman numerals to integers for clean display
+        if number and _ROMAN_NUMBER.fullmatch(number):
+            number = str(_roman_to_int(number))
+        return (section_type, number, title)
 
     def _find_parent_section(
         self,
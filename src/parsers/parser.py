@@ -4,7 +4,9 @@ Integrated Parser
 Combines all parser components into a complete parsing solution.
 """
 
+from collections.abc import Iterator
 from dataclasses import dataclass
+from itertools import count
 from typing import Any, Optional
 
 from .chapter_validator import validate_and_clean_chapters
@@ -13,6 +15,11 @@ from .gutenberg import GutenbergParser
 from .hierarchy import HierarchyBuilder, Section, SectionType
 from .play import PlayParser, play_to_chapters
 
+# Version of the parsed output. Bump it whenever a change to the parsers
+# (or to sentence splitting in book_converter.py) alters the book produced
+# for the same text, so cached parses are not reused.
+PARSER_VERSION = "2"
+
 
 @dataclass
 class ParsedBook:
@@ -55,11 +62,16 @@ class IntegratedParser:
         Returns:
             ParsedBook with all extracted information
         """
-        # Step 1: Clean the text
-        cleaned_text, metadata = self.cleaner.clean(raw_text)
+        # Step 1: Clean the text (split and scanned once, shared with the TOC lookup)
+        layout = self.cleaner.scan(raw_text)
+        lines, metadata = self.cleaner.clean_layout(layout)
+        toc = layout.toc
+        del layout  # the raw lines are no longer needed
+        cleaned_text = "\n".join(lines)
+        # "".split("\n") is one empty line
+        lines = lines or [""]
 
         # Step 2: Detect format
-        toc = self.cleaner.get_toc(raw_text)
         detection = self.detector.detect(cleaned_text, toc)
 
         # Use hint if provided and confidence is low
@@ -69,8 +81,6 @@ class IntegratedParser:
             format_value = detection.format.value
 
         # Step 3: Build hierarchy or parse as play
-        lines = cleaned_text.split("\n")
-
         # Use specialized play parser for plays (only if very high confidence)
         # Low confidence play detection often means dialogue-heavy fiction
         if detection.format == BookFormat.PLAY and detection.confidence > 70:
@@ -120,70 +130,68 @@ class IntegratedParser:
 
         Preserves hierarchy information in metadata.
         """
-        chapters = []
-        chapter_number = 1
-
-        def process_section(section: Section, parent_path: list[str] = None):
-            nonlocal chapter_number
-
-            if parent_path is None:
-                parent_path = []
-
-            # Skip the root book node
-            if section.type == SectionType.BOOK and not parent_path:
-                if section.subsections:
-                    # Process all subsections
-                    for sub in section.subsections:
-                        process_section(sub, parent_path)
-                elif section.content:
-                    # No subsections but has content - treat as single chapter
-                    paragraphs = self._lines_to_paragraphs(section.content)
-                    if paragraphs:
-                        chapter = {
-                            "number": 1,
-                            "title": "Chapter 1",
-                            "type": "chapter",
-                            "paragraphs": paragraphs,
-                            "hierarchy": [],
-                            "metadata": {},
-                        }
-                        chapters.append(chapter)
-                return
-
-            # Check if this is a leaf node (has content but no subsections)
-            is_leaf = not section.subsections or (
-                len(section.content) > 0
-                and all(len(sub.content) == 0 for sub in section.subsections)
-            )
-
-            if is_leaf:
-                # This is a chapter
-                # Convert content lines to paragraphs
-                paragraphs = self._lines_to_paragraphs(section.content)
+        return list(self._section_chapters(hierarchy, [], count(1)))
 
-                chapter = {
-                    "number": chapter_number,
-                    "title": section.get_full_title(),
-                    "type": section.type.value,
-                    "paragraphs": paragraphs,
-                    "hierarchy": parent_path.copy() if parent_path else [],
-                    "metadata": section.metadata,
-                }
-
-                # Add section number if available
-                if section.number:
-                    chapter["section_number"] = section.number
-
-                chapters.append(chapter)
-                chapter_number += 1
-            else:
-                # This is a container - process subsections
-                current_path = parent_path + [section.get_full_title()]
+    def _section_chapters(
+        self, section: Section, parent_path: list[str], numbers: Iterator[int]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Chapters of one section and its subsections, in reading order.
+
+        Args:
+            section: Section to flatten
+            parent_path: Titles of the enclosing containers
+            numbers: Chapter number sequence shared across the whole book
+        """
+        # Skip the root book node
+        if section.type == SectionType.BOOK and not parent_path:
+            if section.subsections:
+                # Process all subsections
                 for sub in section.subsections:
-                    process_section(sub, current_path)
+                    yield from self._section_chapters(sub, parent_path, numbers)
+            elif section.content:
+                # No subsections but has content - treat as single chapter
+                paragraphs = self._lines_to_paragraphs(section.content)
+                if paragraphs:
+                    yield {
+                        "number": 1,
+                        "title": "Chapter 1",
+                        "type": "chapter",
+                        "paragraphs": paragraphs,
+                        "hierarchy": [],
+                        "metadata": {},
+                    }
+            return
+
+        # Check if this is a leaf node (has content but no subsections)
+        is_leaf = not section.subsections or (
+            len(section.content) > 0 and all(len(sub.content) == 0 for sub in section.subsections)
+        )
 
-        process_section(hierarchy)
-        return chapters
+        if is_leaf:
+            # This is a chapter
+            # Convert content lines to paragraphs
+            paragraphs = self._lines_to_paragraphs(section.content)
+
+            chapter = {
+                "number": next(numbers),
+                "title": section.get_full_title(),
+                "type": section.type.value,
+                "paragraphs": paragraphs,
+                "hierarchy": parent_path.copy() if parent_path else [],
+                "metadata": section.metadata,
+            }
+
+            # Add section number if available
+            if section.number:
+                chapter["section_number"] = section.number
+
+            yield chapter
+        else:
+            # This is a container - process subsections
+            current_path = parent_path + [section.get_full_title()]
+            for sub in section.subsections:
+                yield from self._section_chapters(sub, current_path, numbers)
 
     def _lines_to_paragraphs(self, lines: list[str]) -> list[str]:
         """
@@ -0,0 +1,104 @@
+"""
+Line Pattern Matcher
+
+Classifies a line against an ordered list of patterns with one regex scan.
+
+All patterns are compiled into a single alternation, each wrapped in a
+named group. `re` tries the alternatives left to right, so the first
+alternative that matches is the first pattern, in list order, that
+`re.match` would have accepted. Because the individual patterns are not
+rewritten, their numbered groups keep their meaning: a hit is matched
+again with its own compiled pattern, and that match object is returned.
+Most lines of a book match no section marker at all. Those lines cost one
+failed scan instead of one cache lookup and one match call per pattern.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class PatternMatch:
+    """A pattern that matched a line."""
+
+    index: int  # Position of the pattern in the matcher's list
+    payload: Any  # Whatever was registered with the pattern
+    match: re.Match  # Match of the pattern itself (its own group numbers)
+
+
+class LinePatternMatcher:
+    """
+    Ordered set of patterns matched at the start of a line in a single scan.
+
+    Usage:
+        matcher = LinePatternMatcher([(r"^CHAPTER\\s+(\\d+)", "chapter"), ...])
+        hit = matcher.match(line)
+        if hit:
+            kind, number = hit.payload, hit.match.group(1)
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, Any]], flags: int = 0):
+        """
+        Compile the patterns.
+
+        Args:
+            entries: (pattern, payload) pairs in priority order
+            flags: re flags applied to every pattern
+        """
+        self.entries = list(entries)
+        self.flags = flags
+        self._compiled = [re.compile(pattern, flags) for pattern, _ in self.entries]
+        try:
+            self._combined: Optional[re.Pattern] = re.compile(
+                "|".join(f"(?P<_p{i}>{pattern})" for i, (pattern, _) in enumerate(self.entries)),
+                flags,
+            )
+        except re.error:
+            # Patterns that cannot share one regex (e.g. numbered backreferences)
+            self._combined = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _first_index(self, line: str) -> Optional[int]:
+        """Index of the first pattern that matches."""
+        if self._combined is not None:
+            m = self._combined.match(line)
+            # The wrapper group closes after any group inside it, so it is lastgroup
+            return int(m.lastgroup[2:]) if m else None
+        for i, pattern in enumerate(self._compiled):
+            if pattern.match(line):
+                return i
+        return None
+
+    def match(self, line: str) -> Optional[PatternMatch]:
+        """
+        First pattern (in list order) that matches at the start of the line.
+
+        Args:
+            line: Line to classify
+
+        Returns:
+            PatternMatch, or None if no pattern matches
+        """
+        index = self._first_index(line)
+        if index is None:
+            return None
+        return PatternMatch(index, self.entries[index][1], self._compiled[index].match(line))
+
+    def match_all(self, line: str) -> Iterator[PatternMatch]:
+        """
+        Every pattern that matches at the start of the line, in list order.
+
+        Lines matching nothing cost one scan; patterns before the first hit
+        are known not to match and are skipped.
+        """
+        index = self._first_index(line)
+        if index is None:
+            return
+        for i in range(index, len(self._compiled)):
+            m = self._compiled[i].match(line)
+            if m:
+                yield PatternMatch(i, self.entries[i][1], m)
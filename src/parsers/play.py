@@ -4,6 +4,7 @@ Play Format Parser
 Specialized parser for theatrical plays with acts, scenes, and dialogue.
 """
 
+import re
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
@@ -94,6 +95,44 @@ class Play:
     epilogue: Optional[list[str]]
 
 
+# Line flags set by PlayParser._classify; one line can carry several
+_ACT = 1
+_SCENE = 2
+_PROLOGUE = 4
+_EPILOGUE = 8
+_DRAMATIS = 16
+_BRACKETED = 32  # [Stage direction]
+_DIRECTION = 64  # Bracketed, or starting Enter/Exit/Exeunt
+_CHARACTER = 128  # Speaker name
+
+# Lines that end a speech, a prologue and a character list
+_SPEECH_END = _CHARACTER | _DIRECTION | _ACT | _SCENE
+_PROLOGUE_END = _ACT | _SCENE | _EPILOGUE
+_DRAMATIS_END = _ACT | _SCENE | _PROLOGUE
+
+# Longest line taken for a speaker name
+_MAX_NAME_LENGTH = 50
+
+# Upper-cased starts of act and scene markers
+_MARKER_START = re.compile(r"ACT |ACTUS |SCENE |SC\. |THE ")
+
+# ASCII bytes that are not letters / not capitals, deleted to count the rest
+_NOT_LETTER = bytes(c for c in range(128) if not chr(c).isalpha())
+_NOT_CAPITAL = bytes(c for c in range(128) if not chr(c).isupper())
+
+
+def _mostly_upper(line: str) -> bool:
+    """True if more than 70% of the line's letters are capitals."""
+    if line.isascii():
+        data = line.encode("ascii")
+        letters = len(data.translate(None, _NOT_LETTER))
+        capitals = len(data.translate(None, _NOT_CAPITAL))
+    else:
+        letters = sum(map(str.isalpha, line))
+        capitals = sum(1 for c in line if c.isalpha() and c.isupper())
+    return letters > 0 and capitals / letters > 0.7
+
+
 class PlayParser:
     """
     Parser for theatrical plays.
@@ -175,121 +214,81 @@ class PlayParser:
         return 0
 
     def _parse_content(self, lines: list[str], play: Play):
-        """Parse play content into acts and scenes."""
-        current_act = None
-        current_scene = None
-        i = 0
-
-        while i < len(lines):
-            line = lines[i].strip()
+        """
+        Parse play content into acts and scenes.
 
+        Each line is classified once (see `_classify`), then handed to the
+        handler of the builder's current state, which returns the next state.
+        """
+        builder = _PlayBuilder(self, play)
+        handlers = builder.handlers
+        state = builder.BODY
+        cache: dict[str, int] = {}
+        for line in lines:
+            line = line.strip()
             if not line:
-                i += 1
-                continue
-
-            # Check for act marker
-            if self._is_act_marker(line):
-                act_info = self._parse_act_marker(line)
-                if act_info:
-                    # Save previous act if exists
-                    if current_act and current_act.scenes:
-                        play.acts.append(current_act)
-
-                    current_act = Act(
-                        number=act_info["number"], title=act_info.get("title"), scenes=[]
-                    )
-                    current_scene = None
-
-            # Check for scene marker
-            elif self._is_scene_marker(line):
-                scene_info = self._parse_scene_marker(line)
-                if scene_info:
-                    # Save previous scene if exists
-                    if current_scene and current_scene.elements and current_act:
-                        current_act.scenes.append(current_scene)
-
-                    current_scene = Scene(
-                        number=scene_info["number"],
-                        title=scene_info.get("title"),
-                        location=scene_info.get("location"),
-                        elements=[],
-                    )
-
-            # Check for prologue
-            elif self._is_prologue_marker(line):
-                i = self._parse_prologue(lines, i + 1, play)
-                continue
-
-            # Check for epilogue
-            elif self._is_epilogue_marker(line):
-                i = self._parse_epilogue(lines, i + 1, play)
-                continue
-
-            # Check for dramatis personae
-            elif self._is_dramatis_personae(line):
-                i = self._parse_dramatis_personae(lines, i + 1, play)
+                state = handlers[state](line, 0)
                 continue
+            flags = cache.get(line)
+            if flags is None:
+                flags = self._classify(line)
+                # Speaker names, stage directions and markers repeat; prose rarely does
+                if len(line) <= _MAX_NAME_LENGTH:
+                    cache[line] = flags
+            state = handlers[state](line, flags)
+        builder.finish(state)
+
+    def _classify(self, line: str) -> int:
+        """
+        Line flags (_ACT, _SCENE, ...) of a stripped, non-empty line.
 
-            # Parse scene content
-            elif current_scene:
-                # Check for stage direction
-                if line.startswith("[") and line.endswith("]"):
-                    current_scene.elements.append(
-                        PlayElement(type=PlayElementType.STAGE_DIRECTION, content=line[1:-1])
-                    )
-
-                # Check for character name (all caps, often followed by period or colon)
-                elif self._is_character_name(line):
-                    character = self._extract_character_name(line)
-                    # Look for dialogue on same or next lines
-                    dialogue_lines = []
-
-                    # Check if dialogue is on same line
-                    if ":" in line or "." in line:
-                        parts = line.split(":", 1) if ":" in line else line.split(".", 1)
-                        if len(parts) > 1 and parts[1].strip():
-                            dialogue_lines.append(parts[1].strip())
-
-                    # Collect following lines until next element
-                    j = i + 1
-                    while j < len(lines):
-                        next_line = lines[j].strip()
-                        if not next_line:
-                            break
-                        if (
-                            self._is_character_name(next_line)
-                            or self._is_stage_direction(next_line)
-                            or self._is_act_marker(next_line)
-                            or self._is_scene_marker(next_line)
-                        ):
-                            break
-                        dialogue_lines.append(next_line)
-                        j += 1
-
-                    if dialogue_lines:
-                        current_scene.elements.append(
-                            PlayElement(
-                                type=PlayElementType.DIALOGUE,
-                                content=" ".join(dialogue_lines),
-                                metadata={"character": character},
-                            )
-                        )
-                        i = j - 1  # Will be incremented at loop end
-
-                # Regular text (description, etc.)
-                else:
-                    current_scene.elements.append(
-                        PlayElement(type=PlayElementType.DIALOGUE, content=line)
-                    )
+        A line can carry several flags; which one wins depends on the
+        builder's state.
+        """
+        upper = line.upper()
+        flags = 0
+
+        if _MARKER_START.match(upper):
+            # Act: "ACT I.", "ACT" alone, Latin "ACTUS", "THE FIRST ACT"
+            act = upper.rstrip(".")
+            if act.startswith(("ACT ", "ACTUS ")) or (act.startswith("THE ") and "ACT" in act):
+                flags |= _ACT
+            if upper.startswith(("SCENE ", "SC. ")) or (
+                upper.startswith("THE ") and "SCENE" in upper
+            ):
+                flags |= _SCENE
+        elif upper.rstrip(".") == "ACT":
+            flags |= _ACT
+
+        if len(upper) < 30:
+            if "PROLOGUE" in upper:
+                flags |= _PROLOGUE
+            if "EPILOGUE" in upper:
+                flags |= _EPILOGUE
+
+        # Only ASCII letters lower-case to these words, so the upper-case
+        # text must contain them too
+        if "DRAMATIS" in upper or upper in ("CHARACTERS", "PERSONS REPRESENTED"):
+            lower = line.lower()
+            if (
+                ("dramatis" in lower and "person" in lower)
+                or lower == "characters"
+                or lower == "persons represented"
+            ):
+                flags |= _DRAMATIS
 
-            i += 1
+        if line[0] == "[":
+            if line[-1] == "]":
+                flags |= _BRACKETED | _DIRECTION
+            return flags
+        if line.startswith(("Enter ", "Exit ", "Exeunt")):
+            flags |= _DIRECTION
 
-        # Save final act and scene
-        if current_scene and current_scene.elements and current_act:
-            current_act.scenes.append(current_scene)
+        # Speaker name: short and mostly upper case (allowing for punctuation)
+        if len(line) <= _MAX_NAME_LENGTH and _mostly_upper(line):
+            flags |= _CHARACTER
 
-        if current_act and current_act.scenes:
-            play.acts.append(current_act)
+        return flags
 
     def _is_play_element(self, line: str) -> bool:
         """Check if line is a play element."""
@@ -299,18 +298,6 @@ class PlayParser:
             for marker in ["ACT ", "SCENE ", "PROLOGUE", "EPILOGUE", "ENTER ", "EXIT", "EXEUNT"]
         )
 
-    def _is_act_marker(self, line: str) -> bool:
-        """Check if line marks an act."""
-        line_upper = line.upper().strip()
-        # Remove trailing periods
-        line_upper = line_upper.rstrip(".")
-        return (
-            line_upper.startswith("ACT ")
-            or line_upper == "ACT"  # Sometimes just "ACT" alone
-            or line_upper.startswith("ACTUS ")  # Latin
-            or (line_upper.startswith("THE ") and "ACT" in line_upper)
-        )
-
     def _parse_act_marker(self, line: str) -> Optional[dict[str, str]]:
         """Parse act marker for number and title."""
         line_stripped = line.strip().rstrip(".")
@@ -329,15 +316,6 @@ class PlayParser:
         # Default to Act I if no number found
         return {"number": "I"}
 
-    def _is_scene_marker(self, line: str) -> bool:
-        """Check if line marks a scene."""
-        line_upper = line.upper().strip()
-        return (
-            line_upper.startswith("SCENE ")
-            or line_upper.startswith("SC. ")
-            or (line_upper.startswith("THE ") and "SCENE" in line_upper)
-        )
-
     def _parse_scene_marker(self, line: str) -> Optional[dict[str, Any]]:
         """Parse scene marker for number, title, and location."""
         result = {}
@@ -369,30 +347,6 @@ class PlayParser:
 
         return result if result else None
 
-    def _is_character_name(self, line: str) -> bool:
-        """Check if line is a character name (for dialogue)."""
-        if not line or len(line) > 50:  # Character names are usually short
-            return False
-
-        # Common patterns for character names
-        # 1. All caps
-        # 2. Ends with period or colon
-        # 3. Short line (< 30 chars)
-        line_stripped = line.strip()
-
-        # Must have at least one letter
-        if not any(c.isalpha() for c in line_stripped):
-            return False
-
-        # Check if mostly uppercase letters (allowing for punctuation)
-        letters = [c for c in line_stripped if c.isalpha()]
-        if letters and sum(1 for c in letters if c.isupper()) / len(letters) > 0.7:
-            # Check if it's not a stage direction
-            if not line_stripped.startswith("["):
-                return True
-
-        return False
-
     def _extract_character_name(self, line: str) -> str:
         """Extract character name from line."""
         # Remove trailing punctuation
@@ -406,105 +360,155 @@ class PlayParser:
 
         return name.strip()
 
-    def _is_stage_direction(self, line: str) -> bool:
-        """Check if line is a stage direction."""
-        line_stripped = line.strip()
-        return (
-            (line_stripped.startswith("[") and line_stripped.endswith("]"))
-            or line_stripped.startswith("Enter ")
-            or line_stripped.startswith("Exit ")
-            or line_stripped.startswith("Exeunt")
-        )
 
-    def _is_prologue_marker(self, line: str) -> bool:
-        """Check if line marks a prologue."""
-        line_upper = line.upper().strip()
-        return "PROLOGUE" in line_upper and len(line_upper) < 30
-
-    def _parse_prologue(self, lines: list[str], start_idx: int, play: Play) -> int:
-        """Parse prologue content."""
-        prologue_lines = []
-        i = start_idx
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Stop at next major element
-            if (
-                self._is_act_marker(line)
-                or self._is_scene_marker(line)
-                or self._is_epilogue_marker(line)
-            ):
-                break
-
-            if line:
-                prologue_lines.append(line)
-
-            i += 1
-
-        play.prologue = prologue_lines
-        return i
-
-    def _is_epilogue_marker(self, line: str) -> bool:
-        """Check if line marks an epilogue."""
-        line_upper = line.upper().strip()
-        return "EPILOGUE" in line_upper and len(line_upper) < 30
-
-    def _parse_epilogue(self, lines: list[str], start_idx: int, play: Play) -> int:
-        """Parse epilogue content."""
-        epilogue_lines = []
-        i = start_idx
-
-        while i < len(lines):
-            line = lines[i].strip()
-            if line:
-                epilogue_lines.append(line)
-            i += 1
-
-        play.epilogue = epilogue_lines
-        return i
-
-    def _is_dramatis_personae(self, line: str) -> bool:
-        """Check if line marks dramatis personae."""
-        line_lower = line.lower().strip()
-        return (
-            ("dramatis" in line_lower and "person" in line_lower)
-            or line_lower == "characters"
-            or line_lower == "persons represented"
-        )
-
-    def _parse_dramatis_personae(self, lines: list[str], start_idx: int, play: Play) -> int:
-        """Parse character list."""
-        characters = []
-        i = start_idx
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Stop at next major element
-            if (
-                self._is_act_marker(line)
-                or self._is_scene_marker(line)
-                or self._is_prologue_marker(line)
-            ):
-                break
+class _PlayBuilder:
+    """
+    State machine that assembles a `Play` from classified lines.
 
-            # Stop at multiple blank lines
-            if not line:
-                blank_count = 0
-                j = i
-                while j < len(lines) and not lines[j].strip():
-                    blank_count += 1
-                    j += 1
-                if blank_count > 2:
-                    break
-            elif line:
-                characters.append(line)
+    `handlers` maps each state to the method that takes the next line and
+    its flags and returns the new state. A line that ends a prologue,
+    character list or speech is handed on to the body handler, so it is
+    never classified twice.
+    """
 
-            i += 1
+    BODY = "body"
+    SPEECH = "speech"
+    PROLOGUE = "prologue"
+    EPILOGUE = "epilogue"
+    DRAMATIS = "dramatis"
+
+    def __init__(self, parser: PlayParser, play: Play):
+        self.parser = parser
+        self.play = play
+        self.act: Optional[Act] = None
+        self.scene: Optional[Scene] = None
+        self.handlers = {
+            self.BODY: self._body,
+            self.SPEECH: self._speech,
+            self.PROLOGUE: self._prologue,
+            self.EPILOGUE: self._epilogue,
+            self.DRAMATIS: self._dramatis,
+        }
+        # Lines of the prologue, epilogue, character list or speech being read
+        self.collected: list[str] = []
+        self.character: Optional[str] = None
+        self.blank_lines = 0
+
+    def finish(self, state: str):
+        """Close whatever is still open at the end of the text."""
+        if state == self.SPEECH:
+            self._end_speech()
+        elif state == self.PROLOGUE:
+            self.play.prologue = self.collected
+        elif state == self.EPILOGUE:
+            self.play.epilogue = self.collected
+        elif state == self.DRAMATIS:
+            self.play.dramatis_personae = self.collected
+        self._end_act()
+
+    def _end_scene(self):
+        if self.scene and self.scene.elements and self.act:
+            self.act.scenes.append(self.scene)
+        self.scene = None
+
+    def _end_act(self):
+        self._end_scene()
+        if self.act and self.act.scenes:
+            self.play.acts.append(self.act)
+
+    def _body(self, line: str, flags: int) -> str:
+        if not line:
+            return self.BODY
+
+        if flags & _ACT:
+            self._end_act()
+            act_info = self.parser._parse_act_marker(line)
+            self.act = Act(number=act_info["number"], title=act_info.get("title"), scenes=[])
+        elif flags & _SCENE:
+            self._end_scene()
+            scene_info = self.parser._parse_scene_marker(line)
+            self.scene = Scene(
+                number=scene_info["number"],
+                title=scene_info.get("title"),
+                location=scene_info.get("location"),
+                elements=[],
+            )
+        elif flags & _PROLOGUE:
+            self.collected = []
+            return self.PROLOGUE
+        elif flags & _EPILOGUE:
+            self.collected = []
+            return self.EPILOGUE
+        elif flags & _DRAMATIS:
+            self.collected = []
+            self.blank_lines = 0
+            return self.DRAMATIS
+        elif self.scene:
+            if flags & _BRACKETED:
+                self.scene.elements.append(
+                    PlayElement(type=PlayElementType.STAGE_DIRECTION, content=line[1:-1])
+                )
+            elif flags & _CHARACTER:
+                # Dialogue may start on the name line ("HAMLET. To be...")
+                self.character = self.parser._extract_character_name(line)
+                self.collected = []
+                if ":" in line or "." in line:
+                    parts = line.split(":", 1) if ":" in line else line.split(".", 1)
+                    if len(parts) > 1 and parts[1].strip():
+                        self.collected.append(parts[1].strip())
+                return self.SPEECH
+            else:
+                # Regular text (description, etc.)
+                self.scene.elements.append(PlayElement(type=PlayElementType.DIALOGUE, content=line))
+
+        return self.BODY
+
+    def _end_speech(self):
+        if self.collected:
+            self.scene.elements.append(
+                PlayElement(
+                    type=PlayElementType.DIALOGUE,
+                    content=" ".join(self.collected),
+                    metadata={"character": self.character},
+                )
+            )
 
-        play.dramatis_personae = characters
-        return i
+    def _speech(self, line: str, flags: int) -> str:
+        # A speech runs until a blank line or the next speaker, direction or marker
+        if line and not flags & _SPEECH_END:
+            self.collected.append(line)
+            return self.SPEECH
+        self._end_speech()
+        return self._body(line, flags)
+
+    def _prologue(self, line: str, flags: int) -> str:
+        if flags & _PROLOGUE_END:
+            self.play.prologue = self.collected
+            return self._body(line, flags)
+        if line:
+            self.collected.append(line)
+        return self.PROLOGUE
+
+    def _epilogue(self, line: str, flags: int) -> str:
+        # The epilogue runs to the end of the text
+        if line:
+            self.collected.append(line)
+        return self.EPILOGUE
+
+    def _dramatis(self, line: str, flags: int) -> str:
+        # The character list runs until a marker or more than two blank lines
+        if flags & _DRAMATIS_END:
+            self.play.dramatis_personae = self.collected
+            return self._body(line, flags)
+        if not line:
+            self.blank_lines += 1
+            if self.blank_lines > 2:
+                self.play.dramatis_personae = self.collected
+                return self.BODY
+        else:
+            self.blank_lines = 0
+            self.collected.append(line)
+        return self.DRAMATIS
 
 
 def play_to_chapters(play: Play) -> list[dict[str, Any]]:
@@ -0,0 +1,420 @@
+"""
+Streaming Book Ingestion
+
+Parses a book file without loading its text into memory.
+
+The file is memory-mapped and split into lines through an index of line
+offsets; lines are decoded only when they are read. Gutenberg cleaning,
+format detection, hierarchy building and paragraph assembly all consume
+the lines lazily, and a chapter is emitted as soon as no later line can
+change it. Apart from the line index (8 bytes per line), peak memory is
+proportional to the largest chapter rather than to the whole book.
+
+The chapters are the same as `IntegratedParser.parse` produces for the
+same file. Plays parsed by `PlayParser` are the exception to the memory
+bound: their lines are collected first, since the play parser needs the
+whole text.
+"""
+
+import mmap
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from itertools import chain, count, islice
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .chapter_validator import iter_validated_chapters
+from .detector import BookFormat
+from .gutenberg import GutenbergLayout
+from .hierarchy import Section, SectionType
+from .parser import IntegratedParser, ParsedBook
+from .play import PlayParser, play_to_chapters
+
+# Universal newlines, as text-mode open() translates them
+_NEWLINE = re.compile(rb"\r\n?|\n")
+
+# HierarchyBuilder.plan_hierarchy reads at most this many lines
+_PLAN_WINDOW = 2000
+
+# Bytes decoded at a time when counting characters
+_COUNT_CHUNK = 1 << 20
+
+# Lines decoded at a time when iterating
+_BLOCK_LINES = 4096
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split decoded text on universal newlines."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.split("\n")
+
+
+class MappedLines(Sequence):
+    """
+    Lines of a memory-mapped text file, decoded on access.
+
+    Behaves like the list `open(path).read().split("\\n")` would give
+    (with universal newlines), without holding the decoded text.
+    """
+
+    def __init__(
+        self, file_path: Union[str, Path], encoding: str = "utf-8", errors: str = "strict"
+    ):
+        """
+        Map the file and index its lines.
+
+        Args:
+            file_path: Text file to map
+            encoding: Text encoding
+            errors: Decoding error handling (as for bytes.decode)
+        """
+        self.encoding = encoding
+        self.errors = errors
+        self._file = open(file_path, "rb")  # noqa: SIM115 - closed in close()
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._data = b""
+
+        self._starts = array("q", [0])
+        self._starts.extend(m.end() for m in _NEWLINE.finditer(self._data))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._line(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self._line(index)
+
+    def __iter__(self) -> Iterator[str]:
+        # Decode blocks of whole lines rather than one line at a time
+        for start in range(0, len(self._starts), _BLOCK_LINES):
+            stop = start + _BLOCK_LINES
+            if stop >= len(self._starts):
+                block = self._decode(self._starts[start], len(self._data))
+                yield from _split_lines(block)
+            else:
+                block = self._decode(self._starts[start], self._starts[stop])
+                # The block ends with a newline; drop the empty string after it
+                yield from islice(_split_lines(block), _BLOCK_LINES)
+
+    def _decode(self, start: int, end: int) -> str:
+        return self._data[start:end].decode(self.encoding, self.errors)
+
+    def _line(self, index: int) -> str:
+        start = self._starts[index]
+        end = self._starts[index + 1] if index + 1 < len(self._starts) else len(self._data)
+        if self._data[end - 2 : end] == b"\r\n":
+            end -= 2
+        elif self._data[end - 1 : end] in (b"\n", b"\r"):
+            end -= 1
+        return self._decode(start, end)
+
+    def text_length(self) -> int:
+        """Length of the decoded text (newlines counted as one character)."""
+        length = 0
+        step = max(1, len(self._starts) * _COUNT_CHUNK // max(len(self._data), 1))
+        for i in range(0, len(self._starts), step):
+            start = self._starts[i]
+            end = self._starts[i + step] if i + step < len(self._starts) else len(self._data)
+            chunk = self._decode(start, end)
+            length += len(chunk) - chunk.count("\r\n")
+        return length
+
+    def close(self):
+        """Unmap and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedLines":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class StreamedBook:
+    """
+    A book being parsed from disk.
+
+    Everything but the chapters is known up front; `chapters` yields the
+    same chapter dictionaries as `ParsedBook.chapters`, one at a time.
+    """
+
+    title: str
+    author: Optional[str]
+    metadata: dict[str, Any]
+    format: BookFormat
+    format_confidence: float
+    chapters: Iterator[dict[str, Any]]
+    raw_text_length: int
+    cleaned_text_length: int
+    _lines: Optional[MappedLines] = field(default=None, repr=False)
+
+    def to_parsed_book(self) -> ParsedBook:
+        """Collect the remaining chapters into a ParsedBook (without a hierarchy)."""
+        return ParsedBook(
+            title=self.title,
+            author=self.author,
+            metadata=self.metadata,
+            format=self.format,
+            format_confidence=self.format_confidence,
+            chapters=list(self.chapters),
+            hierarchy=None,
+            raw_text_length=self.raw_text_length,
+            cleaned_text_length=self.cleaned_text_length,
+        )
+
+    def close(self):
+        """Release the mapped file (also done when `chapters` is exhausted)."""
+        self.chapters.close()
+        if self._lines is not None:
+            self._lines.close()
+
+    def __enter__(self) -> "StreamedBook":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ChapterEmitter:
+    """
+    Flattens a hierarchy that is still being built.
+
+    A section can only gain lines or subsections while it, or one of its
+    descendants, is among the builder's current sections. Everything
+    before the first such "open" section is final and is flattened with
+    `IntegratedParser._section_chapters`, then dropped from the tree.
+    """
+
+    def __init__(self, parser: IntegratedParser, root: Section):
+        self.parser = parser
+        self.root = root
+        self.parents: dict[int, Section] = {}
+        self.positions: dict[int, int] = {}  # id(section) -> first subsection not yet emitted
+        self.numbers = count(1)
+
+    def add_section(self, section: Section, parent: Section):
+        """Record a newly started section."""
+        self.parents[id(section)] = parent
+
+    def drain(
+        self, current_sections: Optional[dict[SectionType, Optional[Section]]]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Emit the chapters that can no longer change.
+
+        Args:
+            current_sections: The builder's open sections, or None at the end of the text
+        """
+        open_ids = set()
+        for section in (current_sections or {}).values():
+            while section is not None and id(section) not in open_ids:
+                open_ids.add(id(section))
+                section = self.parents.get(id(section))
+
+        if self.root.subsections:
+            # Root content is ignored once there are sections
+            self.root.content.clear()
+            yield from self._drain(self.root, [], open_ids)
+        elif current_sections is None:
+            yield from self.parser._section_chapters(self.root, [], self.numbers)
+
+    def _drain(
+        self, section: Section, path: list[str], open_ids: set[int]
+    ) -> Iterator[dict[str, Any]]:
+        """Emit finished subsections of a section known to be a container."""
+        # Containers contribute only their title to the chapters below them
+        section.content.clear()
+        if not (section.type == SectionType.BOOK and not path):
+            path = path + [section.get_full_title()]
+
+        subsections = section.subsections
+        pos = self.positions.get(id(section), 0)
+        while pos < len(subsections):
+            child = subsections[pos]
+            is_open = id(child) in open_ids
+            if id(child) in self.positions or (is_open and self._is_container(child, path)):
+                yield from self._drain(child, path, open_ids)
+            elif not is_open:
+                yield from self.parser._section_chapters(child, path, self.numbers)
+            if is_open:
+                break
+            # Finished: free it
+            subsections[pos] = None
+            self.positions.pop(id(child), None)
+            self.parents.pop(id(child), None)
+            pos += 1
+        self.positions[id(section)] = pos
+
+    @staticmethod
+    def _is_container(section: Section, path: list[str]) -> bool:
+        """Whether an open section is already certain not to become a chapter itself."""
+        if section.type == SectionType.BOOK and not path:
+            return bool(section.subsections)
+        return any(sub.content for sub in section.subsections)
+
+
+class StreamingParser:
+    """
+    Parses book files lazily, chapter by chapter.
+
+    Usage:
+        with StreamingParser().parse_file("books/texts/big.txt") as book:
+            for chapter in book.chapters:
+                ...
+    """
+
+    def __init__(self, parser: Optional[IntegratedParser] = None):
+        """
+        Initialize the streaming parser.
+
+        Args:
+            parser: Integrated parser whose components (and rules) are used
+        """
+        self.parser = parser or IntegratedParser()
+
+    def parse_file(
+        self,
+        file_path: Union[str, Path],
+        format_hint: Optional[str] = None,
+        encoding: str = "utf-8",
+        errors: str = "strict",
+    ) -> StreamedBook:
+        """
+        Start parsing a book file.
+
+        The cleaned text is streamed twice before this returns (to measure
+        it and to sample it for format detection) and once more as the
+        chapters are consumed.
+
+        Args:
+            file_path: Path to the book file
+            format_hint: Optional hint about format
+            encoding: Text encoding
+            errors: Decoding error handling
+
+        Returns:
+            StreamedBook whose chapters are parsed on iteration
+        """
+        lines = MappedLines(file_path, encoding, errors)
+        try:
+            return self._parse_lines(lines, format_hint)
+        except Exception:
+            lines.close()
+            raise
+
+    def _parse_lines(self, lines: MappedLines, format_hint: Optional[str]) -> StreamedBook:
+        cleaner, detector = self.parser.cleaner, self.parser.detector
+
+        # Step 1: Clean the text (measure it); the raw lines are scanned only once
+        layout = cleaner.scan(lines)
+        _, _, metadata = cleaner.clean_stream(layout)
+        line_count = char_count = 0
+        for line in self._cleaned(layout):
+            line_count += 1
+            char_count += len(line)
+
+        # Step 2: Detect format from the same lines `detect` would sample
+        toc = layout.toc
+        ranges = detector.sample_ranges(line_count)
+        samples = [[] for _ in ranges]
+        first_lines = []
+        last_needed = max(max(r.stop for r in ranges), 500)
+        for i, line in enumerate(islice(self._cleaned(layout), last_needed)):
+            if i < 500:
+                first_lines.append(line)
+            for span, sample in zip(ranges, samples):
+                if i in span:
+                    sample.append(line)
+        detection = detector.detect_sampled(first_lines, list(chain.from_iterable(samples)), toc)
+
+        # Use hint if provided and confidence is low
+        if format_hint and detection.confidence < 50:
+            format_value = format_hint
+        else:
+            format_value = detection.format.value
+
+        # Steps 3-4.5: Build hierarchy (or parse as play) and emit validated chapters
+        if detection.format == BookFormat.PLAY and detection.confidence > 70:
+            chapters = iter(play_to_chapters(PlayParser().parse(list(self._cleaned(layout)))))
+        else:
+            chapters = self._hierarchy_chapters(self._cleaned(layout), format_value)
+
+        # Step 5: Extract title and author from metadata
+        return StreamedBook(
+            title=metadata.title or "Unknown Title",
+            author=metadata.author or "Unknown Author",
+            metadata={
+                "title": metadata.title,
+                "author": metadata.author,
+                "language": metadata.language,
+                "release_date": metadata.release_date,
+                "ebook_number": metadata.ebook_number,
+            },
+            format=detection.format,
+            format_confidence=detection.confidence,
+            chapters=self._emit(iter_validated_chapters(chapters), lines),
+            raw_text_length=lines.text_length(),
+            cleaned_text_length=char_count + line_count - 1,
+            _lines=lines,
+        )
+
+    def _cleaned(self, layout: GutenbergLayout) -> Iterator[str]:
+        """The cleaned text, line by line (what `clean(...)[0].split("\\n")` gives)."""
+        head, rest, _ = self.parser.cleaner.clean_stream(layout)
+        if not head:
+            # "".split("\n") is one empty line
+            return iter([""])
+        return chain(head, rest)
+
+    def _hierarchy_chapters(self, stream: Iterator[str], format_value: str) -> Iterator[dict]:
+        """Build the hierarchy line by line, yielding chapters as they complete."""
+        builder = self.parser.builder
+        prefix = list(islice(stream, _PLAN_WINDOW))
+        hierarchy, start_index = builder.plan_hierarchy(prefix, format_value, skip_toc=True)
+
+        root = Section(type=SectionType.BOOK, title="Book")
+        current_sections = builder.start_sections(root, hierarchy)
+        emitter = _ChapterEmitter(self.parser, root)
+
+        for line in chain(islice(prefix, start_index, None), stream):
+            started = builder.add_line(line, root, current_sections, hierarchy)
+            if started:
+                emitter.add_section(*started)
+                yield from emitter.drain(current_sections)
+        yield from emitter.drain(None)
+
+    @staticmethod
+    def _emit(chapters: Iterator[dict], lines: MappedLines) -> Iterator[dict]:
+        """Yield the chapters, unmapping the file once they are exhausted."""
+        try:
+            yield from chapters
+        finally:
+            lines.close()
+
+
+def stream_book(file_path: Union[str, Path], format_hint: Optional[str] = None) -> StreamedBook:
+    """
+    Convenience function to parse a book file lazily.
+
+    Args:
+        file_path: Path to the book file
+        format_hint: Optional format hint
+
+    Returns:
+        StreamedBook whose chapters are parsed on iteration
+    """
+    return StreamingParser().parse_file(file_path, format_hint)
@@ -8,7 +8,9 @@ import asyncio
 import json
 from typing import Any
 
+from src.providers.base import CompletionResult, CompletionUsage
 from src.providers.base_provider import BaseProviderPlugin
+from src.providers.http_pool import PooledSDKClient
 
 
 class AnthropicProvider(BaseProviderPlugin):
@@ -49,21 +51,84 @@ class AnthropicProvider(BaseProviderPlugin):
         """Anthropic rate limit (requests per minute)."""
         return 4000  # Opus 4 tier: 4,000 requests/min
 
+    @property
+    def warm_up_url(self) -> str:
+        """API endpoint to pre-connect to."""
+        return "https://api.anthropic.com/v1/models"
+
     def _initialize_client(self):
         """Initialize Anthropic client."""
         try:
             from anthropic import AsyncAnthropic
 
-            self.client = AsyncAnthropic(api_key=self.api_key)
+            api_key = self.api_key
+            # max_retries=0: retry_async is the only retry layer (see src.utils.retry)
+            self.client = PooledSDKClient(
+                lambda http_client: AsyncAnthropic(
+                    api_key=api_key, http_client=http_client, max_retries=0
+                )
+            )
             self.logger.debug("Anthropic async client initialized")
         except ImportError as e:
             raise ImportError(
                 "anthropic package not installed. Run: pip install anthropic"
             ) from e
 
+    def build_request(self, messages: list[dict[str, str]], **kwargs) -> dict[str, Any]:
+        """
+        Build Messages API parameters (shared with the batch backend).
+
+        Args:
+            messages: List of message dicts
+            **kwargs: Additional parameters
+
+        Returns:
+            Request parameters for messages.create
+        """
+        # Convert messages to Anthropic format
+        # Anthropic expects a system message separately
+        system_message = None
+        claude_messages = []
+
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            else:
+                claude_messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+
+        # Prepare request parameters
+        request_params = {
+            "model": kwargs.get("model", self.model),
+            "messages": claude_messages,
+            "max_tokens": kwargs.get("max_tokens", 4096),
+            "temperature": kwargs.get("temperature", 0.7),
+        }
+
+        # Add JSON instruction if JSON format is requested
+        if kwargs.get("response_format") == "json_object":
+            json_instruction = "\n\nIMPORTANT: You must respond with valid JSON only. Do not include any explanatory text, markdown formatting, or code blocks. Return only the raw JSON object or array."
+            if system_message:
+                system_message += json_instruction
+            else:
+                system_message = json_instruction
+
+        # Add system message if present
+        if system_message:
+            request_params["system"] = system_message
+        return request_params
+
+    def batch_backend(self):
+        """Anthropic Message Batches backend (about half price, 24h completion window)."""
+        from src.providers.batch import AnthropicBatchBackend
+
+        return AnthropicBatchBackend(self)
+
     async def _complete_impl(
         self, messages: list[dict[str, str]], **kwargs
-    ) -> str:
+    ) -> CompletionResult:
         """
         Anthropic-specific completion implementation.
 
@@ -72,42 +137,10 @@ class AnthropicProvider(BaseProviderPlugin):
             **kwargs: Additional parameters
 
         Returns:
-            Completion text
+            Completion text with reported usage
         """
         try:
-            # Convert messages to Anthropic format
-            # Anthropic expects a system message separately
-            system_message = None
-            claude_messages = []
-
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    claude_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-
-            # Prepare request parameters
-            request_params = {
-                "model": kwargs.get("model", self.model),
-                "messages": claude_messages,
-                "max_tokens": kwargs.get("max_tokens", 4096),
-                "temperature": kwargs.get("temperature", 0.7),
-            }
-
-            # Add JSON instruction if JSON format is requested
-            if kwargs.get("response_format") == "json_object":
-                json_instruction = "\n\nIMPORTANT: You must respond with valid JSON only. Do not include any explanatory text, markdown formatting, or code blocks. Return only the raw JSON object or array."
-                if system_message:
-                    system_message += json_instruction
-                else:
-                    system_message = json_instruction
-
-            # Add system message if present
-            if system_message:
-                request_params["system"] = system_message
+            request_params = self.build_request(messages, **kwargs)
 
             # Make the API call with await and timeout (60 seconds)
             response = await asyncio.wait_for(
@@ -125,7 +158,17 @@ class AnthropicProvider(BaseProviderPlugin):
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"Invalid JSON response: {e}")
 
-            return content
+            usage = getattr(response, "usage", None)
+            return CompletionResult(
+                text=content,
+                usage=CompletionUsage(
+                    input_tokens=getattr(usage, "input_tokens", 0) or 0,
+                    output_tokens=getattr(usage, "output_tokens", 0) or 0,
+                    cached_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+                    model=getattr(response, "model", None) or request_params["model"],
+                    estimated=usage is None,
+                ),
+            )
 
         except asyncio.TimeoutError:
             self.logger.error("Anthropic API call timed out after 60 seconds")
@@ -133,22 +176,16 @@ class AnthropicProvider(BaseProviderPlugin):
         except Exception as e:
             error_message = str(e)
 
-            # Check for overloaded error (529) and retry
+            # Overload (529) and rate limits (429) are retried by the provider retry layer
             if "529" in error_message or "overloaded" in error_message.lower():
-                self.logger.warning("Anthropic API overloaded (529), waiting 30 seconds...")
-                await asyncio.sleep(30)
-                # Retry once
-                return await self._complete_impl(messages, **kwargs)
-
-            # Check for rate limit (429)
-            elif "429" in error_message or "rate" in error_message.lower():
+                self.logger.warning(f"Anthropic API overloaded: {e}")
+                raise
+            if "429" in error_message or "rate_limit" in error_message.lower():
                 self.logger.warning(f"Anthropic rate limit hit: {e}")
-                await asyncio.sleep(60)  # Wait 60 seconds for rate limit
-                # Retry once
-                return await self._complete_impl(messages, **kwargs)
+                raise
 
             # Check for insufficient credits
-            elif "credit" in error_message.lower() or "billing" in error_message.lower():
+            if "credit" in error_message.lower() or "billing" in error_message.lower():
                 self.logger.error("Anthropic API credits/billing issue")
                 raise ValueError("Anthropic API billing issue. Please check your account.")
 
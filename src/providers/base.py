@@ -5,7 +5,64 @@ This module defines the base interface for LLM providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class CompletionUsage:
+    """Token usage and timing reported for a single completion."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency: float = 0.0
+    model: Optional[str] = None
+    estimated: bool = False  # True when the API reported no usage and it was approximated
+
+    @property
+    def total_tokens(self) -> int:
+        """Input plus output tokens."""
+        return self.input_tokens + self.output_tokens
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return asdict(self)
+
+
+@dataclass
+class CompletionResult:
+    """Completion text together with the usage that produced it."""
+
+    text: str
+    usage: CompletionUsage
+
+
+async def complete_with_usage(
+    provider: Any, messages: list[dict[str, str]], **kwargs
+) -> CompletionResult:
+    """
+    Complete a prompt on any provider and return the usage of that request.
+
+    Unlike reading `provider.last_usage` after the call, this cannot pick up
+    the usage of another request running concurrently on the same provider.
+    Providers with only `complete` (e.g. test doubles) get an estimated,
+    empty usage record.
+
+    Args:
+        provider: LLM provider (plugin or duck-typed)
+        messages: List of message dictionaries
+        **kwargs: Additional provider-specific parameters
+
+    Returns:
+        CompletionResult
+    """
+    method = getattr(type(provider), "complete_with_usage", None)
+    if method is not None and method is not LLMProvider.complete_with_usage:
+        return await provider.complete_with_usage(messages, **kwargs)
+    text = await provider.complete(messages, **kwargs)
+    usage = CompletionUsage(model=getattr(provider, "model", None), estimated=True)
+    return CompletionResult(text=text, usage=usage)
 
 
 class LLMProvider(ABC):
@@ -52,6 +109,24 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def complete_with_usage(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> CompletionResult:
+        """
+        Complete a prompt and return the text with the usage of this very request.
+
+        Providers that know their usage override this; the default only has
+        the text, so its usage is marked estimated.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            CompletionResult
+        """
+        return await complete_with_usage(self, messages, **kwargs)
+
     def complete_sync(self, messages: list[dict[str, str]], **kwargs) -> str:
         """
         Synchronous wrapper for completion (use only when async is not possible).
@@ -6,12 +6,29 @@ Each provider (OpenAI, Anthropic, etc.) should inherit from this.
 """
 
 import logging
+import math
+import os
+import time
 from abc import abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from src.plugins.base import Plugin
-from src.providers.base import LLMProvider
+from src.providers.base import (
+    CompletionResult,
+    CompletionUsage,
+    LLMProvider,
+    complete_with_usage,
+)
+from src.providers.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyConfig,
+    get_concurrency_limiter,
+)
+from src.providers.hedging import HedgePolicy, RequestHedger
 from src.providers.rate_limiter import TokenBucketRateLimiter as RateLimiter
+from src.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, get_circuit_breaker
+from src.utils.retry import RetryPolicy, RetryStats, retry_async
+from src.utils.usage_accounting import get_usage_accountant, usage_scope
 
 
 class BaseProviderPlugin(LLMProvider, Plugin):
@@ -19,14 +36,33 @@ class BaseProviderPlugin(LLMProvider, Plugin):
     Base class for all LLM provider plugins.
 
     This combines the LLMProvider interface with the Plugin system,
-    providing common functionality like rate limiting and logging.
+    providing common functionality like rate limiting, retries and logging.
+
+    Every completion goes through one retry layer (see src/utils/retry.py):
+    transient failures are retried with jittered backoff and Retry-After,
+    within a total deadline, and a per-provider circuit breaker
+    ("provider:<name>") stops calls to a provider that keeps failing.
+    Requests in flight are bounded by a per-provider AIMD limiter that is
+    shared by every service using the provider.
+    Subclasses should raise errors from `_complete_impl` rather than sleep
+    and retry themselves.
     """
 
+    # Per-provider circuit breaker settings (shared by all instances of a provider)
+    CIRCUIT_BREAKER_CONFIG = CircuitBreakerConfig(
+        failure_threshold=5, success_threshold=2, timeout_duration=30.0, half_open_max_calls=2
+    )
+
     def __init__(self):
         """Initialize base provider."""
         self.api_key: Optional[str] = None
         self.model: Optional[str] = None
         self.rate_limiter: Optional[RateLimiter] = None
+        self.last_usage: Optional[CompletionUsage] = None
+        self.retry_policy = RetryPolicy.from_env()
+        self.retry_stats = RetryStats()
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        self.hedger: Optional[RequestHedger] = None
         self.logger = logging.getLogger(self.__class__.__name__)
         self._initialized = False
 
@@ -83,8 +119,6 @@ class BaseProviderPlugin(LLMProvider, Plugin):
         Args:
             config: Configuration dictionary with api_key, model, etc.
         """
-        import os
-
         # Get API key from config or environment
         self.api_key = config.get("api_key") or os.getenv(
             f"{self.provider_name.upper()}_API_KEY"
@@ -109,6 +143,8 @@ class BaseProviderPlugin(LLMProvider, Plugin):
                 tokens_per_request=4000    # Estimated tokens per request
             )
 
+        self._configure_requests(config)
+
         # Provider-specific initialization
         self._initialize_client()
 
@@ -117,11 +153,76 @@ class BaseProviderPlugin(LLMProvider, Plugin):
             f"Initialized {self.provider_name} provider with model {self.model}"
         )
 
+    def _configure_requests(self, config: dict[str, Any]) -> None:
+        """
+        Apply the request-level settings shared by all providers.
+
+        Args:
+            config: Provider configuration; reads "retry" (RetryPolicy overrides)
+                and "hedge" (True or HedgePolicy overrides; REGENDER_HEDGE=1 also enables)
+        """
+        if config.get("retry"):
+            self.retry_policy = RetryPolicy.from_env(**config["retry"])
+
+        hedge = config.get("hedge")
+        if hedge is None:
+            hedge = os.getenv("REGENDER_HEDGE", "").lower() in ("1", "true", "yes")
+        if hedge:
+            overrides = hedge if isinstance(hedge, dict) else {}
+            self.hedger = RequestHedger(HedgePolicy.from_env(**overrides))
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """The provider's circuit breaker (registered for CircuitBreakerMonitor)."""
+        return get_circuit_breaker(f"provider:{self.provider_name}", self.CIRCUIT_BREAKER_CONFIG)
+
+    @property
+    def concurrency_config(self) -> ConcurrencyConfig:
+        """Bounds for the adaptive concurrency limiter (override per provider)."""
+        return ConcurrencyConfig.from_env()
+
+    @property
+    def concurrency_limiter(self) -> AdaptiveConcurrencyLimiter:
+        """The provider's shared adaptive concurrency limiter."""
+        if self._concurrency_limiter is None:
+            self._concurrency_limiter = get_concurrency_limiter(
+                self.provider_name, self.concurrency_config
+            )
+        return self._concurrency_limiter
+
+    @property
+    def warm_up_url(self) -> Optional[str]:
+        """URL whose connection is opened ahead of time (None to skip warm-up)."""
+        return None
+
+    def batch_backend(self):
+        """
+        Backend for the provider's asynchronous batch API.
+
+        Returns:
+            A batch backend (see src.providers.batch), or None if the provider
+            has no batch API (the local file-backed backend is used instead)
+        """
+        return None
+
     @abstractmethod
     def _initialize_client(self):
         """Initialize the provider-specific client."""
         pass
 
+    async def warm_up(self) -> bool:
+        """
+        Open a pooled connection to the provider before the first request.
+
+        Returns:
+            True if the endpoint answered
+        """
+        if not self.warm_up_url:
+            return False
+        from src.providers.http_pool import warm_up
+
+        return await warm_up([self.warm_up_url]) > 0
+
     def execute(self, context: dict[str, Any]) -> Any:
         """
         Execute plugin (complete a prompt).
@@ -150,21 +251,87 @@ class BaseProviderPlugin(LLMProvider, Plugin):
 
         Returns:
             Completion text
+
+        Raises:
+            CircuitBreakerOpenError: If the provider's circuit is open
+        """
+        return (await self.complete_with_usage(messages, **kwargs)).text
+
+    async def complete_with_usage(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> CompletionResult:
+        """
+        Complete a prompt and return the text with the usage of this very request.
+
+        `last_usage` only holds the latest request's usage, which another
+        concurrent request may already have replaced; wrappers use this instead.
+
+        Args:
+            messages: List of message dicts
+            **kwargs: Additional parameters
+
+        Returns:
+            CompletionResult
+
+        Raises:
+            CircuitBreakerOpenError: If the provider's circuit is open
         """
         if not self._initialized:
             raise RuntimeError(f"{self.provider_name} provider not initialized")
 
-        # Apply rate limiting if configured
+        prompt_chars = sum(len(m.get("content") or "") for m in messages)
+
+        async def attempt(number: int) -> CompletionResult:
+            with usage_scope(stage="retries" if number > 1 else None):
+                if self.hedger is None:
+                    return await self._request(messages, kwargs)
+                return await self.hedger.run(
+                    lambda: self._request(messages, kwargs),
+                    lambda: self._hedge_request(messages, kwargs),
+                    prompt_chars,
+                )
+
+        return await retry_async(
+            attempt,
+            policy=self.retry_policy,
+            breaker=self.circuit_breaker,
+            stats=self.retry_stats,
+            name=f"{self.provider_name} completion",
+        )
+
+    async def _request(
+        self, messages: list[dict[str, str]], kwargs: dict[str, Any]
+    ) -> CompletionResult:
+        """Send one request: rate limit, concurrency slot, call, usage accounting."""
+        # Every request (retry or hedge included) counts for the rate limiter
         if self.rate_limiter:
             await self.rate_limiter.acquire()
-
-        # Call provider-specific implementation
-        return await self._complete_impl(messages, **kwargs)
+        async with self.concurrency_limiter.slot():
+            start = time.perf_counter()
+            result = await self._complete_impl(messages, **kwargs)
+            latency = time.perf_counter() - start
+
+        text, usage = self._normalize_result(result, messages, latency, **kwargs)
+        self.last_usage = usage
+        self._record_usage(usage, messages)
+        return CompletionResult(text=text, usage=usage)
+
+    async def _hedge_request(
+        self, messages: list[dict[str, str]], kwargs: dict[str, Any]
+    ) -> CompletionResult:
+        """Send the duplicate of a slow request where the hedge policy says."""
+        policy = self.hedger.policy
+        if policy.provider is not None:
+            other_kwargs = {k: v for k, v in kwargs.items() if k != "model"}
+            return await complete_with_usage(policy.provider, messages, **other_kwargs)
+        if policy.model:
+            return await self._request(messages, {**kwargs, "model": policy.model})
+        return await self._request(messages, kwargs)
 
     @abstractmethod
     async def _complete_impl(
         self, messages: list[dict[str, str]], **kwargs
-    ) -> str:
+    ) -> Union[CompletionResult, str]:
         """
         Provider-specific completion implementation.
 
@@ -173,10 +340,47 @@ class BaseProviderPlugin(LLMProvider, Plugin):
             **kwargs: Additional parameters
 
         Returns:
-            Completion text
+            CompletionResult with the text and the usage reported by the API.
+            A plain string is accepted too; its usage is then estimated.
         """
         pass
 
+    def _normalize_result(
+        self,
+        result: Union[CompletionResult, str],
+        messages: list[dict[str, str]],
+        latency: float,
+        **kwargs,
+    ) -> tuple[str, CompletionUsage]:
+        """Split a completion result into text and usage, filling in gaps."""
+        if isinstance(result, CompletionResult):
+            text, usage = result.text, result.usage
+        else:
+            text, usage = result, CompletionUsage(estimated=True)
+        if usage.estimated and not usage.total_tokens:
+            prompt_chars = sum(len(m.get("content") or "") for m in messages)
+            usage.input_tokens = math.ceil(prompt_chars / 4)
+            usage.output_tokens = math.ceil(len(text or "") / 4)
+        if not usage.latency:
+            usage.latency = latency
+        if not usage.model:
+            usage.model = kwargs.get("model") or self.model
+        return text, usage
+
+    def _record_usage(self, usage: CompletionUsage, messages: list[dict[str, str]]) -> None:
+        """Report usage to the process-wide accounting sink."""
+        try:
+            info = self.get_model_info() or {}
+            get_usage_accountant().record(
+                usage,
+                provider=self.provider_name,
+                prompt_chars=sum(len(m.get("content") or "") for m in messages),
+                cost_per_1k_input=info.get("cost_per_1k_input", 0.0),
+                cost_per_1k_output=info.get("cost_per_1k_output", 0.0),
+            )
+        except Exception as e:
+            self.logger.debug(f"Failed to record usage: {e}")
+
     def complete_sync(self, messages: list[dict[str, str]], **kwargs) -> str:
         """
         Synchronous wrapper for completion (use only when async is not possible).
@@ -0,0 +1,524 @@
+"""
+Batch Job Mode
+
+Run many completions as one asynchronous batch job instead of live calls.
+
+The OpenAI Batch API and Anthropic Message Batches take a whole file of
+requests, finish within 24 hours and bill about half the live price. A
+BatchRunner gives every request a stable custom ID, submits the job, polls
+it and returns the results keyed by custom ID, so callers can map answers
+back to the chapter or chunk that asked for them. The job ID and the
+results are kept in a small state file per job: a process restarted
+while a job is running picks the same job up again instead of submitting
+(and paying for) it a second time.
+
+Batch mode covers paragraph transformation and the per-chunk character
+extraction. Everything that depends on those answers still runs live:
+merging and deduplicating the extracted characters, and the extraction of
+chunks whose batch answer was missing or unusable.
+
+Providers without a batch API use LocalBatchBackend, a file-backed stand-in
+that works the job off through the provider's normal `complete()` path.
+It is also what the tests run against.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from src.providers.base import CompletionUsage
+from src.utils.usage_accounting import get_usage_accountant
+
+logger = logging.getLogger(__name__)
+
+BATCH_DISCOUNT = 0.5  # Batch APIs bill about half the live price
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled", "expired"})
+
+
+@dataclass
+class BatchConfig:
+    """Where job state is kept and how jobs are polled."""
+
+    state_dir: str = "books/cache/batches"
+    poll_interval: float = 30.0  # Seconds between status checks
+    timeout: float = 25 * 3600.0  # Give up polling after this (the API window is 24h)
+    backend: Optional[str] = None  # "local" forces the file-backed backend
+
+    @classmethod
+    def from_env(cls, **overrides) -> "BatchConfig":
+        """Build a config from REGENDER_BATCH_* environment variables and overrides."""
+        values = {}
+        if os.getenv("REGENDER_BATCH_DIR"):
+            values["state_dir"] = os.environ["REGENDER_BATCH_DIR"]
+        if os.getenv("REGENDER_BATCH_POLL"):
+            values["poll_interval"] = float(os.environ["REGENDER_BATCH_POLL"])
+        if os.getenv("REGENDER_BATCH_TIMEOUT"):
+            values["timeout"] = float(os.environ["REGENDER_BATCH_TIMEOUT"])
+        if os.getenv("REGENDER_BATCH_BACKEND"):
+            values["backend"] = os.environ["REGENDER_BATCH_BACKEND"]
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+
+@dataclass
+class BatchRequest:
+    """One completion of a batch job."""
+
+    custom_id: str  # [A-Za-z0-9_-], at most 64 characters
+    messages: list[dict[str, str]]
+    params: dict[str, Any] = field(default_factory=dict)  # temperature, response_format, ...
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {"custom_id": self.custom_id, "messages": self.messages, "params": self.params}
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request."""
+
+    custom_id: str
+    text: Optional[str] = None
+    usage: Optional[CompletionUsage] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.text is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "custom_id": self.custom_id,
+            "text": self.text,
+            "usage": self.usage.to_dict() if self.usage else None,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BatchResult":
+        """Create from dictionary representation."""
+        usage = data.get("usage")
+        return cls(
+            custom_id=data["custom_id"],
+            text=data.get("text"),
+            usage=CompletionUsage(**usage) if usage else None,
+            error=data.get("error"),
+        )
+
+
+class BatchBackend(ABC):
+    """
+    Interface of a batch API.
+
+    `status()` returns "in_progress" or one of TERMINAL_STATUSES.
+    """
+
+    name = "batch"
+    records_usage = False  # True if usage is accounted when requests run
+
+    def __init__(self, provider: Any):
+        self.provider = provider
+
+    @abstractmethod
+    async def submit(self, requests: list[BatchRequest], label: str) -> str:
+        """Submit a job and return its ID."""
+        pass
+
+    @abstractmethod
+    async def status(self, job_id: str) -> str:
+        """Current job status."""
+        pass
+
+    @abstractmethod
+    async def results(self, job_id: str) -> list[BatchResult]:
+        """Results of a finished job (failed requests carry an error)."""
+        pass
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-backed stand-in for a batch API.
+
+    A job is a directory with input.jsonl and output.jsonl. Each status check
+    runs the requests that have no output line yet through the provider
+    (concurrency is left to the provider's limiter), so an interrupted job
+    continues where it stopped.
+    """
+
+    name = "local"
+    records_usage = True  # provider.complete() accounts usage itself
+
+    def __init__(self, provider: Any, root: Optional[str] = None):
+        super().__init__(provider)
+        self.root = Path(root or BatchConfig.from_env().state_dir) / "local"
+
+    async def submit(self, requests: list[BatchRequest], label: str) -> str:
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        job_dir = self.root / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        with open(job_dir / "input.jsonl", "w", encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(request.to_dict(), ensure_ascii=False) + "\n")
+        logger.info(f"Submitted local batch {job_id} ({len(requests)} requests) for {label}")
+        return job_id
+
+    def _read_jsonl(self, path: Path) -> list[dict[str, Any]]:
+        if not path.exists():
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    async def status(self, job_id: str) -> str:
+        job_dir = self.root / job_id
+        if not (job_dir / "input.jsonl").exists():
+            return "expired"
+        done = {row["custom_id"] for row in self._read_jsonl(job_dir / "output.jsonl")}
+        pending = [
+            BatchRequest(**row)
+            for row in self._read_jsonl(job_dir / "input.jsonl")
+            if row["custom_id"] not in done
+        ]
+        if pending:
+            with open(job_dir / "output.jsonl", "a", encoding="utf-8") as out:
+
+                async def run(request: BatchRequest) -> None:
+                    try:
+                        text = await self.provider.complete(request.messages, **request.params)
+                        result = BatchResult(request.custom_id, text=text)
+                    except Exception as e:
+                        result = BatchResult(request.custom_id, error=str(e) or type(e).__name__)
+                    # Written as each request finishes, so a restart skips it
+                    out.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+                    out.flush()
+
+                await asyncio.gather(*(run(request) for request in pending))
+        return "completed"
+
+    async def results(self, job_id: str) -> list[BatchResult]:
+        rows = self._read_jsonl(self.root / job_id / "output.jsonl")
+        return [BatchResult.from_dict(row) for row in rows]
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API (/v1/chat/completions, 24h window)."""
+
+    name = "openai"
+
+    async def submit(self, requests: list[BatchRequest], label: str) -> str:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self.provider.build_request(request.messages, **request.params),
+                },
+                ensure_ascii=False,
+            )
+            for request in requests
+        ]
+        client = self.provider.client
+        upload = await client.files.create(
+            file=(f"{label}.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"label": label[:500]},
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} ({len(requests)} requests) for {label}")
+        return batch.id
+
+    async def status(self, job_id: str) -> str:
+        batch = await self.provider.client.batches.retrieve(job_id)
+        # validating / in_progress / finalizing / cancelling all mean "not yet"
+        return batch.status if batch.status in TERMINAL_STATUSES else "in_progress"
+
+    async def results(self, job_id: str) -> list[BatchResult]:
+        client = self.provider.client
+        batch = await client.batches.retrieve(job_id)
+        results = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    results.append(self._parse_line(json.loads(line)))
+        return results
+
+    def _parse_line(self, row: dict[str, Any]) -> BatchResult:
+        custom_id = row.get("custom_id", "")
+        response = row.get("response") or {}
+        body = response.get("body") or {}
+        if row.get("error") or response.get("status_code", 200) >= 400:
+            error = row.get("error") or body.get("error") or {}
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            return BatchResult(custom_id, error=message or "request failed")
+        usage = body.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return BatchResult(
+            custom_id,
+            text=body["choices"][0]["message"]["content"],
+            usage=CompletionUsage(
+                input_tokens=usage.get("prompt_tokens", 0),
+                output_tokens=usage.get("completion_tokens", 0),
+                cached_tokens=details.get("cached_tokens") or 0,
+                model=body.get("model"),
+            ),
+        )
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API (24h window)."""
+
+    name = "anthropic"
+
+    def _batches(self) -> Any:
+        client = self.provider.client
+        messages = getattr(client, "messages", None)
+        batches = getattr(messages, "batches", None)
+        return batches if batches is not None else client.beta.messages.batches
+
+    async def submit(self, requests: list[BatchRequest], label: str) -> str:
+        batch = await self._batches().create(
+            requests=[
+                {
+                    "custom_id": request.custom_id,
+                    "params": self.provider.build_request(request.messages, **request.params),
+                }
+                for request in requests
+            ]
+        )
+        logger.info(f"Submitted Anthropic batch {batch.id} ({len(requests)} requests) for {label}")
+        return batch.id
+
+    async def status(self, job_id: str) -> str:
+        batch = await self._batches().retrieve(job_id)
+        return "completed" if batch.processing_status == "ended" else "in_progress"
+
+    async def results(self, job_id: str) -> list[BatchResult]:
+        results = []
+        async for entry in await self._batches().results(job_id):
+            outcome = entry.result
+            if outcome.type != "succeeded":
+                error = getattr(outcome, "error", None)
+                results.append(BatchResult(entry.custom_id, error=str(error or outcome.type)))
+                continue
+            message = outcome.message
+            usage = message.usage
+            results.append(
+                BatchResult(
+                    entry.custom_id,
+                    text=message.content[0].text,
+                    usage=CompletionUsage(
+                        input_tokens=usage.input_tokens,
+                        output_tokens=usage.output_tokens,
+                        cached_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+                        model=message.model,
+                    ),
+                )
+            )
+        return results
+
+
+def get_batch_backend(provider: Any, config: Optional[BatchConfig] = None) -> BatchBackend:
+    """
+    Pick the batch backend for a provider.
+
+    Args:
+        provider: Provider the requests are meant for
+        config: Batch configuration (backend="local" forces the stand-in)
+
+    Returns:
+        The provider's batch API backend, or LocalBatchBackend
+    """
+    config = config or BatchConfig.from_env()
+    if (config.backend or "").lower() != "local":
+        hook = getattr(provider, "batch_backend", None)
+        backend = hook() if callable(hook) else None
+        if backend is not None:
+            return backend
+    return LocalBatchBackend(provider, config.state_dir)
+
+
+def batch_mode_requested(config: Any = None) -> bool:
+    """
+    Whether a service should send its requests as batch jobs.
+
+    Args:
+        config: Service configuration (its "batch_mode" key), if any
+
+    Returns:
+        True if configured or REGENDER_BATCH_MODE is set
+    """
+    if config is not None and config.get("batch_mode"):
+        return True
+    return os.getenv("REGENDER_BATCH_MODE", "").lower() in ("1", "true", "yes")
+
+
+def create_batch_runner(provider: Any, state_dir: Optional[str] = None) -> "BatchRunner":
+    """
+    Runner for a provider's batch API (or the local stand-in).
+
+    Args:
+        provider: Provider the requests are meant for
+        state_dir: Directory for job state (REGENDER_BATCH_DIR by default)
+
+    Returns:
+        BatchRunner
+    """
+    config = BatchConfig.from_env(state_dir=state_dir)
+    return BatchRunner(get_batch_backend(provider, config), config)
+
+
+class BatchRunner:
+    """
+    Submits a batch job, waits for it and returns results by custom ID.
+
+    Usage:
+        runner = BatchRunner(get_batch_backend(provider))
+        results = await runner.run(requests, label="my-book")
+        text = results["c0-p0"].text
+    """
+
+    def __init__(self, backend: BatchBackend, config: Optional[BatchConfig] = None):
+        """
+        Initialize runner.
+
+        Args:
+            backend: Batch API to use
+            config: State directory and polling settings
+        """
+        self.backend = backend
+        self.config = config or BatchConfig.from_env()
+        self.state_dir = Path(self.config.state_dir)
+
+    def job_key(self, requests: list[BatchRequest]) -> str:
+        """Stable key of a request set (same requests, same job)."""
+        digest = hashlib.sha256(self.backend.name.encode("utf-8"))
+        for request in requests:
+            digest.update(json.dumps(request.to_dict(), sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()[:20]
+
+    def _state_path(self, key: str) -> Path:
+        return self.state_dir / f"{key}.json"
+
+    def _load_state(self, key: str) -> dict[str, Any]:
+        path = self._state_path(key)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable batch state {path}: {e}")
+            return {}
+
+    def _save_state(self, key: str, state: dict[str, Any]) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self._state_path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    async def run(
+        self, requests: list[BatchRequest], label: str = "batch"
+    ) -> dict[str, BatchResult]:
+        """
+        Run requests as one batch job (or resume the job already submitted for them).
+
+        Args:
+            requests: Requests with unique custom IDs
+            label: Name for logs and the job's metadata
+
+        Returns:
+            Map of custom ID to result; requests missing from the output get an error
+
+        Raises:
+            TimeoutError: If the job does not finish within the configured timeout
+        """
+        if not requests:
+            return {}
+        key = self.job_key(requests)
+        state = self._load_state(key)
+
+        if state.get("results") is not None:
+            logger.info(f"Using stored results of batch {state.get('job_id')} for {label}")
+            return {row["custom_id"]: BatchResult.from_dict(row) for row in state["results"]}
+
+        job_id = state.get("job_id")
+        if job_id:
+            logger.info(f"Resuming batch {job_id} for {label}")
+        else:
+            job_id = await self.backend.submit(requests, label)
+            state = {
+                "job_id": job_id,
+                "backend": self.backend.name,
+                "label": label,
+                "requests": len(requests),
+                "submitted_at": time.time(),
+            }
+            self._save_state(key, state)
+
+        status = await self._wait(job_id, state.get("submitted_at", time.time()))
+        results = {r.custom_id: r for r in await self.backend.results(job_id)}
+        for request in requests:
+            if request.custom_id not in results:
+                results[request.custom_id] = BatchResult(
+                    request.custom_id, error=f"missing from batch output (job {status})"
+                )
+        if not self.backend.records_usage:
+            self._record_usage(results.values(), requests)
+
+        failed = sum(1 for r in results.values() if not r.ok)
+        logger.info(f"Batch {job_id} {status}: {len(results) - failed} ok, {failed} failed")
+        state.update(status=status, results=[r.to_dict() for r in results.values()])
+        self._save_state(key, state)
+        return results
+
+    async def _wait(self, job_id: str, submitted_at: float) -> str:
+        """Poll until the job reaches a terminal status."""
+        while True:
+            status = await self.backend.status(job_id)
+            if status in TERMINAL_STATUSES:
+                return status
+            if time.time() - submitted_at > self.config.timeout:
+                raise TimeoutError(
+                    f"Batch {job_id} still {status} after {self.config.timeout:.0f}s"
+                )
+            logger.debug(f"Batch {job_id} {status}, checking again in {self.config.poll_interval}s")
+            await asyncio.sleep(self.config.poll_interval)
+
+    def _record_usage(self, results: Any, requests: list[BatchRequest]) -> None:
+        """Account usage reported by the batch API at the discounted price."""
+        provider = self.backend.provider
+        try:
+            info = provider.get_model_info() or {}
+        except Exception:
+            info = {}
+        prompt_chars = {
+            r.custom_id: sum(len(m.get("content") or "") for m in r.messages) for r in requests
+        }
+        accountant = get_usage_accountant()
+        for result in results:
+            if result.usage is None:
+                continue
+            accountant.record(
+                result.usage,
+                provider=getattr(provider, "provider_name", self.backend.name),
+                prompt_chars=prompt_chars.get(result.custom_id, 0),
+                cost_per_1k_input=info.get("cost_per_1k_input", 0.0) * BATCH_DISCOUNT,
+                cost_per_1k_output=info.get("cost_per_1k_output", 0.0) * BATCH_DISCOUNT,
+            )
@@ -0,0 +1,376 @@
+"""
+Composite Provider Plugin
+
+Load balancing and failover across several configured providers.
+
+Each request goes to one member provider, picked at random in proportion
+to a score: the configured weight, times the share of the member's rate
+budget and concurrency headroom still free, divided by its observed
+latency. Members whose circuit breaker is open are skipped. If the chosen
+member fails (after its own retries), its circuit opens or its quota is
+exhausted, the request fails over to the next best member; other client
+errors are raised, since every member would reject the request alike.
+JSON-mode differences stay inside the composite: members without native
+JSON mode get the JSON instruction in the system message instead of
+`response_format`, so services can keep asking for JSON without knowing
+where a request went.
+"""
+
+import logging
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.providers.base import CompletionResult, complete_with_usage
+from src.providers.base_provider import BaseProviderPlugin
+from src.utils.circuit_breaker import CircuitBreakerOpenError
+from src.utils.retry import ErrorKind, classify_error, is_quota_error
+
+logger = logging.getLogger(__name__)
+
+JSON_INSTRUCTION = (
+    "\n\nIMPORTANT: You must respond with valid JSON only. Do not include any explanatory "
+    "text, markdown formatting, or code blocks. Return only the raw JSON object or array."
+)
+
+# Failures worth trying on another member (besides an exhausted quota, see is_quota_error);
+# other client errors (bad request, context overflow) would fail on every member alike
+FAILOVER_KINDS = frozenset(
+    {
+        ErrorKind.RATE_LIMIT,
+        ErrorKind.OVERLOADED,
+        ErrorKind.SERVER,
+        ErrorKind.TIMEOUT,
+        ErrorKind.CONNECTION,
+        ErrorKind.CIRCUIT_OPEN,
+    }
+)
+
+
+@dataclass
+class _Member:
+    """A wrapped provider with its routing weight and counters."""
+
+    provider: Any
+    weight: float = 1.0
+    requests: int = 0
+    failures: int = 0
+    failovers: int = 0  # Requests this member took over from a failed one
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+
+class CompositeProvider(BaseProviderPlugin):
+    """
+    Provider that spreads requests over several member providers.
+
+    Configuration (config dict keys, with COMPOSITE_* environment fallbacks):
+        providers: Member names or instances        COMPOSITE_PROVIDERS ("openai,anthropic")
+        weights: {name: weight}                     COMPOSITE_WEIGHTS ("openai=2,anthropic=1")
+        seed: Random seed for reproducible routing
+    """
+
+    def __init__(self):
+        """Initialize composite provider."""
+        super().__init__()
+        self.members: list[_Member] = []
+        self.display_model = ""  # "openai:gpt-4o+anthropic:claude-..." for logs and stats
+        self._random = random.Random()
+
+    @property
+    def provider_name(self) -> str:
+        return "composite"
+
+    @property
+    def version(self) -> str:
+        return "1.0.0"
+
+    @property
+    def description(self) -> str:
+        return "Weighted load balancing and failover across several providers"
+
+    @property
+    def default_model(self) -> str:
+        return "auto"
+
+    @property
+    def supports_json(self) -> bool:
+        """JSON requests are always honored (natively or by instruction)."""
+        return True
+
+    @property
+    def max_tokens(self) -> int:
+        return min((m.provider.max_tokens for m in self.members), default=4096)
+
+    @property
+    def rate_limit(self) -> Optional[int]:
+        return None  # Members apply their own limits
+
+    def initialize(self, config: dict[str, Any]) -> None:
+        """
+        Initialize members; no API key of its own is required.
+
+        Members that fail to initialize (e.g. missing API key) are left out.
+
+        Args:
+            config: Configuration dictionary (see class docstring)
+        """
+        names = config.get("providers") or [
+            name.strip()
+            for name in os.getenv("COMPOSITE_PROVIDERS", "openai,anthropic").split(",")
+            if name.strip()
+        ]
+        weights = config.get("weights") or self._parse_weights(os.getenv("COMPOSITE_WEIGHTS"))
+        if config.get("seed") is not None:
+            self._random = random.Random(config["seed"])
+
+        self.members = []
+        for entry in names:
+            try:
+                provider = self._load_member(entry) if isinstance(entry, str) else entry
+            except Exception as e:
+                logger.warning(f"Composite: skipping provider {entry}: {e}")
+                continue
+            self.members.append(_Member(provider, float(weights.get(provider.name, 1.0))))
+
+        if not self.members:
+            raise ValueError("Composite provider has no usable member providers")
+
+        # A neutral model name: store keys, token configs and per-model request tweaks
+        # keyed on it must not match any one member; usage names the member's model
+        self.model = self.default_model
+        self.display_model = "+".join(f"{m.name}:{m.provider.model}" for m in self.members)
+        self._initialize_client()
+        self._initialized = True
+        self.logger.info(
+            "Initialized composite provider over "
+            + ", ".join(f"{m.name}:{m.provider.model} (weight {m.weight:g})" for m in self.members)
+        )
+
+    def _initialize_client(self) -> None:
+        """Members own their clients."""
+
+    @staticmethod
+    def _parse_weights(spec: Optional[str]) -> dict[str, float]:
+        """Parse "openai=2,anthropic=1"."""
+        weights = {}
+        for part in (spec or "").split(","):
+            if "=" in part:
+                name, value = part.split("=", 1)
+                weights[name.strip()] = float(value)
+        return weights
+
+    def _load_member(self, name: str) -> BaseProviderPlugin:
+        """Load and initialize a member provider by name."""
+        from src.plugins.base import PluginManager
+
+        if name == self.provider_name:
+            raise ValueError("Composite provider cannot contain itself")
+
+        manager = PluginManager()
+        manager.load_plugin(f"src.providers.{name}")
+        provider = manager.get(name)
+        if provider is None:
+            raise ValueError(f"Unknown provider: {name}")
+        provider.initialize({})
+        return provider
+
+    async def warm_up(self) -> bool:
+        """Warm up every member."""
+        results = [
+            await m.provider.warm_up() for m in self.members if hasattr(m.provider, "warm_up")
+        ]
+        return any(results)
+
+    # === ROUTING ===
+
+    def _available(self, member: _Member) -> bool:
+        """False while the member's circuit rejects calls."""
+        breaker = getattr(member.provider, "circuit_breaker", None)
+        return breaker is None or breaker.is_available()
+
+    def score(self, member: _Member) -> float:
+        """
+        Routing score: weight x free rate budget x concurrency headroom / latency.
+
+        Args:
+            member: Member to score
+
+        Returns:
+            Non-negative score (higher gets more traffic)
+        """
+        provider = member.provider
+        score = member.weight
+
+        rate_limiter = getattr(provider, "rate_limiter", None)
+        if rate_limiter is not None and hasattr(rate_limiter, "available_fraction"):
+            score *= max(0.05, rate_limiter.available_fraction())
+
+        limiter = getattr(provider, "concurrency_limiter", None)
+        if limiter is not None:
+            free = max(0, limiter.limit - limiter.in_flight) - limiter.queue_depth
+            score *= max(0.05, (free + 1) / (limiter.limit + 1))
+            if limiter.latency_baseline:
+                score /= max(0.05, limiter.latency_baseline)
+        return score
+
+    def _route(self, exclude: set[str]) -> list[_Member]:
+        """
+        Order members for one request: a weighted random pick first, then by score.
+
+        Args:
+            exclude: Member names not to use
+
+        Returns:
+            Members to try, best first
+        """
+        candidates = [m for m in self.members if m.name not in exclude and self._available(m)]
+        if not candidates:
+            # Every circuit is open: let the members fail fast (or probe) themselves
+            candidates = [m for m in self.members if m.name not in exclude]
+        scored = sorted(((self.score(m), m) for m in candidates), key=lambda x: -x[0])
+        total = sum(score for score, _ in scored)
+        if total <= 0 or len(scored) == 1:
+            return [m for _, m in scored]
+
+        pick = self._random.uniform(0, total)
+        first = scored[-1][1]
+        for score, member in scored:
+            pick -= score
+            if pick <= 0:
+                first = member
+                break
+        return [first] + [m for _, m in scored if m is not first]
+
+    @staticmethod
+    def _adapt_request(
+        provider: Any, messages: list[dict[str, str]], kwargs: dict[str, Any]
+    ) -> tuple[list[dict[str, str]], dict[str, Any]]:
+        """Translate a request for one member (JSON mode, model name)."""
+        kwargs = {k: v for k, v in kwargs.items() if k != "model"}
+        if kwargs.get("response_format") == "json_object" and not getattr(
+            provider, "supports_json", False
+        ):
+            kwargs.pop("response_format")
+            messages = [dict(m) for m in messages]
+            system = next((m for m in messages if m.get("role") == "system"), None)
+            if system is None:
+                messages.insert(0, {"role": "system", "content": JSON_INSTRUCTION.strip()})
+            else:
+                system["content"] = (system.get("content") or "") + JSON_INSTRUCTION
+        return messages, kwargs
+
+    async def complete_with_usage(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> CompletionResult:
+        """
+        Complete a prompt on the best available member, failing over on errors.
+
+        Retries, rate limiting, concurrency and usage accounting happen in the
+        members, so they are not repeated here.
+
+        Args:
+            messages: List of message dicts
+            **kwargs: Additional parameters
+
+        Returns:
+            CompletionResult whose usage names the model of the member that served it
+        """
+        if not self._initialized:
+            raise RuntimeError(f"{self.provider_name} provider not initialized")
+        result = await self._complete_impl(messages, **kwargs)
+        self.last_usage = result.usage
+        return result
+
+    async def _complete_impl(self, messages: list[dict[str, str]], **kwargs) -> CompletionResult:
+        """Route one request, trying members in order until one succeeds."""
+        tried: set[str] = set()
+        last_error: Optional[Exception] = None
+
+        while len(tried) < len(self.members):
+            order = self._route(tried)
+            if not order:
+                break
+            member = order[0]
+            tried.add(member.name)
+            member.requests += 1
+            if last_error is not None:
+                member.failovers += 1
+
+            member_messages, member_kwargs = self._adapt_request(member.provider, messages, kwargs)
+            try:
+                result = await complete_with_usage(
+                    member.provider, member_messages, **member_kwargs
+                )
+            except Exception as e:
+                member.failures += 1
+                last_error = e
+                kind = classify_error(e)
+                if kind not in FAILOVER_KINDS and not is_quota_error(e):
+                    raise
+                logger.warning(f"Composite: {member.name} failed ({kind.value}), failing over: {e}")
+                continue
+
+            result.usage.model = result.usage.model or member.provider.model
+            return result
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitBreakerOpenError("No composite member provider is available")
+
+    # === REPORTING ===
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get per-member routing statistics.
+
+        Returns:
+            Map of member name to weight, score, circuit state and counters
+        """
+        stats = {}
+        for m in self.members:
+            breaker = getattr(m.provider, "circuit_breaker", None)
+            stats[m.name] = {
+                "model": m.provider.model,
+                "weight": m.weight,
+                "score": round(self.score(m), 4),
+                "circuit": breaker.get_state().value if breaker else None,
+                "requests": m.requests,
+                "failures": m.failures,
+                "failovers": m.failovers,
+            }
+        return stats
+
+    def get_model_info(self) -> dict[str, Any]:
+        """
+        Get capabilities shared by all members.
+
+        Returns:
+            Dictionary with model capabilities (the most restrictive values)
+        """
+        infos = [m.provider.get_model_info() or {} for m in self.members]
+        return {
+            "context_window": min((i.get("context_window", 8192) for i in infos), default=8192),
+            "max_output": min((i.get("max_output", 4096) for i in infos), default=4096),
+            "supports_vision": all(i.get("supports_vision", False) for i in infos),
+            "supports_json": True,
+            "members": {m.name: info for m, info in zip(self.members, infos)},
+        }
+
+    async def get_rate_limits(self) -> dict:
+        """
+        Get the members' rate limits.
+
+        Returns:
+            Map of member name to its rate limit info
+        """
+        limits = {}
+        for m in self.members:
+            try:
+                limits[m.name] = await m.provider.get_rate_limits()
+            except Exception as e:
+                limits[m.name] = {"error": str(e)}
+        return limits
@@ -0,0 +1,270 @@
+"""
+Adaptive Concurrency Limiter
+
+AIMD (additive increase, multiplicative decrease) limit on in-flight
+requests per provider.
+
+The limit grows by about one slot per window of successful requests while
+it is actually in use, and is cut by a factor on rate limits (429),
+overload (529/503), timeouts and latency spikes (a response much slower
+than the running latency baseline). One limiter per provider name is kept
+in a registry, so every service that calls a provider shares its limit;
+the current limit, in-flight count and queue depth are exposed for metrics.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.utils.retry import ErrorKind, classify_error
+
+logger = logging.getLogger(__name__)
+
+# Failures that mean "send less"
+BACKOFF_KINDS = frozenset({ErrorKind.RATE_LIMIT, ErrorKind.OVERLOADED, ErrorKind.TIMEOUT})
+
+
+@dataclass
+class ConcurrencyConfig:
+    """Bounds and tuning of an adaptive limiter."""
+
+    initial_limit: int = 4
+    min_limit: int = 1
+    max_limit: int = 32
+    decrease_factor: float = 0.5  # Multiplier applied on backoff signals
+    latency_spike_factor: float = 2.5  # Sample / baseline ratio counted as a spike
+    latency_smoothing: float = 0.1  # EWMA weight of a new latency sample
+    min_samples: int = 10  # Samples before latency spikes are acted on
+
+    @classmethod
+    def from_env(cls, **overrides) -> "ConcurrencyConfig":
+        """Build a config from REGENDER_CONCURRENCY_* environment variables and overrides."""
+        values = {k: v for k, v in overrides.items() if v is not None}
+        for field_name in ("initial_limit", "min_limit", "max_limit"):
+            var = f"REGENDER_CONCURRENCY_{field_name.upper()}"
+            if os.getenv(var):
+                values[field_name] = int(os.environ[var])
+        return cls(**values)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limit on simultaneous requests that adapts to the provider's feedback.
+
+    Usage:
+        async with limiter.slot():
+            await call_provider()
+
+    The slot measures the call's latency and inspects its exception (if any)
+    to adjust the limit.
+    """
+
+    def __init__(self, name: str, config: Optional[ConcurrencyConfig] = None):
+        """
+        Initialize limiter.
+
+        Args:
+            name: Name for logging and metrics (usually the provider name)
+            config: Limits and tuning
+        """
+        self.name = name
+        self.config = config or ConcurrencyConfig()
+        self._limit = float(self._clamp(self.config.initial_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latency_baseline: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = 0.0
+        self.successes = 0
+        self.increases = 0
+        self.decreases = 0
+        self.max_queue_depth = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def latency_baseline(self) -> Optional[float]:
+        """Smoothed latency of successful requests (None before the first one)."""
+        return self._latency_baseline
+
+    def set_bounds(self, max_limit: Optional[int] = None, limit: Optional[int] = None) -> None:
+        """
+        Adjust the ceiling and/or the current limit (e.g. after discovery).
+
+        Args:
+            max_limit: New upper bound
+            limit: New current limit (clamped to the bounds)
+        """
+        if max_limit is not None:
+            self.config.max_limit = max(self.config.min_limit, max_limit)
+        self._limit = float(self._clamp(limit if limit is not None else self._limit))
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one in-flight slot for the duration of a request."""
+        await self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self._release()
+            self.on_error(e)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        else:
+            self._release()
+            self.on_success(time.perf_counter() - start)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self._in_flight < self.limit and not self.queue_depth:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot handed to a cancelled waiter is passed on
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Free a slot and hand it to the next waiter."""
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Grant slots to waiters while there is room under the limit."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self, latency: float) -> None:
+        """
+        Feed back a successful request.
+
+        Args:
+            latency: Seconds the request took (excluding the wait for a slot)
+        """
+        self.successes += 1
+        baseline = self._latency_baseline
+        self._samples += 1
+        if baseline is None:
+            self._latency_baseline = latency
+        else:
+            alpha = self.config.latency_smoothing
+            self._latency_baseline = (1 - alpha) * baseline + alpha * latency
+
+        if (
+            baseline
+            and self._samples >= self.config.min_samples
+            and latency > baseline * self.config.latency_spike_factor
+        ):
+            self._decrease(f"latency spike ({latency:.2f}s vs {baseline:.2f}s baseline)")
+            return
+
+        # Grow only while the limit is the bottleneck, by ~1 per limit's worth of successes
+        if self._in_flight + 1 >= self.limit or self.queue_depth:
+            previous = self.limit
+            self._limit = min(float(self.config.max_limit), self._limit + 1 / self._limit)
+            if self.limit > previous:
+                self.increases += 1
+                logger.debug(f"Concurrency '{self.name}': limit raised to {self.limit}")
+                self._wake()
+
+    def on_error(self, error: BaseException) -> None:
+        """
+        Feed back a failed request; backs off on rate limits, overload and timeouts.
+
+        Args:
+            error: Exception raised by the request
+        """
+        kind = classify_error(error)
+        if kind in BACKOFF_KINDS:
+            self._decrease(kind.value)
+
+    def _decrease(self, reason: str) -> None:
+        """Cut the limit, at most once per latency baseline so one burst counts once."""
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency_baseline or 0.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = float(self._clamp(self._limit * self.config.decrease_factor))
+        self.decreases += 1
+        if self.limit < previous:
+            logger.info(
+                f"Concurrency '{self.name}': limit cut from {previous} to {self.limit} ({reason})"
+            )
+
+    def _clamp(self, value: float) -> float:
+        return max(float(self.config.min_limit), min(float(self.config.max_limit), value))
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Current state for monitoring."""
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "min_limit": self.config.min_limit,
+            "max_limit": self.config.max_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "latency_baseline": round(self._latency_baseline or 0.0, 3),
+            "successes": self.successes,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(
+    name: str, config: Optional[ConcurrencyConfig] = None
+) -> AdaptiveConcurrencyLimiter:
+    """
+    Get or create the shared limiter for a provider.
+
+    Args:
+        name: Limiter name (provider name)
+        config: Configuration (only used for new instances)
+
+    Returns:
+        AdaptiveConcurrencyLimiter instance
+    """
+    if name not in _limiters:
+        _limiters[name] = AdaptiveConcurrencyLimiter(name, config)
+    return _limiters[name]
+
+
+def get_all_concurrency_limiters() -> dict[str, AdaptiveConcurrencyLimiter]:
+    """Get all registered limiters."""
+    return dict(_limiters)
@@ -0,0 +1,233 @@
+"""
+Request Hedging
+
+Duplicate a slow request instead of waiting for it to time out.
+
+Latencies of completed requests are kept per size class (prompt length
+rounded to a power of two in kilo-characters), measured from when the
+original request was sent; an original request cancelled because its hedge
+won is counted with the time it had run, a lower bound of its latency. When
+a request is still running after the class's observed p90, a second copy is
+sent, either to the same provider, to another model or to a second
+provider. The first successful answer is used and the other request is
+cancelled. Hedges cost extra input tokens, so they are only sent while the
+estimated extra tokens stay within a cap, both absolute and as a fraction
+of all tokens sent.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+from src.utils.usage_accounting import usage_scope
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_SIZE_CLASS = 6  # 64k+ characters
+
+
+def size_class(prompt_chars: int) -> int:
+    """Bucket a prompt by length: 0 (<1k chars), 1 (<2k), 2 (<4k), ... MAX_SIZE_CLASS."""
+    return min(MAX_SIZE_CLASS, (prompt_chars // 1000).bit_length())
+
+
+@dataclass
+class HedgePolicy:
+    """When to hedge and how much it may cost."""
+
+    percentile: float = 0.9  # Hedge after this latency percentile of the size class
+    min_samples: int = 20  # Completed requests per size class before hedging
+    window: int = 200  # Latencies kept per size class
+    min_delay: float = 0.5  # Never hedge earlier than this (seconds)
+    max_extra_fraction: float = 0.1  # Extra tokens allowed, as a share of all tokens sent
+    max_extra_tokens: Optional[int] = None  # Absolute cap on extra tokens
+    model: Optional[str] = None  # Send the hedge to another model of the same provider
+    provider: Optional[Any] = None  # Or to another provider instance
+
+    @classmethod
+    def from_env(cls, **overrides) -> "HedgePolicy":
+        """Build a policy from REGENDER_HEDGE_* environment variables and overrides."""
+        values = {}
+        if os.getenv("REGENDER_HEDGE_PERCENTILE"):
+            values["percentile"] = float(os.environ["REGENDER_HEDGE_PERCENTILE"])
+        if os.getenv("REGENDER_HEDGE_MAX_EXTRA_FRACTION"):
+            values["max_extra_fraction"] = float(os.environ["REGENDER_HEDGE_MAX_EXTRA_FRACTION"])
+        if os.getenv("REGENDER_HEDGE_MAX_EXTRA_TOKENS"):
+            values["max_extra_tokens"] = int(os.environ["REGENDER_HEDGE_MAX_EXTRA_TOKENS"])
+        if os.getenv("REGENDER_HEDGE_MODEL"):
+            values["model"] = os.environ["REGENDER_HEDGE_MODEL"]
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+
+@dataclass
+class HedgeStats:
+    """Hedging counters."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    primary_wins: int = 0
+    skipped_budget: int = 0
+    tokens: int = 0  # Estimated input tokens of all primary requests
+    extra_tokens: int = 0  # Estimated input tokens of all hedges
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        data = asdict(self)
+        data["hedge_rate"] = round(self.hedged / self.requests, 4) if self.requests else 0.0
+        data["hedge_win_rate"] = round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0
+        data["extra_token_fraction"] = (
+            round(self.extra_tokens / self.tokens, 4) if self.tokens else 0.0
+        )
+        return data
+
+
+class RequestHedger:
+    """Runs requests with a hedge after the size class's tail latency."""
+
+    def __init__(self, policy: Optional[HedgePolicy] = None):
+        """
+        Initialize hedger.
+
+        Args:
+            policy: Hedging policy (defaults from the environment)
+        """
+        self.policy = policy or HedgePolicy.from_env()
+        self.stats = HedgeStats()
+        self._latencies: dict[int, deque[float]] = {}
+
+    def observe(self, prompt_chars: int, latency: float) -> None:
+        """Record the latency of a completed request."""
+        size = size_class(prompt_chars)
+        samples = self._latencies.get(size)
+        if samples is None:
+            samples = self._latencies[size] = deque(maxlen=self.policy.window)
+        samples.append(latency)
+
+    def hedge_delay(self, prompt_chars: int) -> Optional[float]:
+        """
+        Seconds after which a request of this size gets hedged.
+
+        Returns:
+            Delay, or None if the size class has too few samples
+        """
+        return self._class_delay(size_class(prompt_chars))
+
+    def _class_delay(self, size: int) -> Optional[float]:
+        samples = self._latencies.get(size)
+        if not samples or len(samples) < self.policy.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.policy.percentile * len(ordered)) - 1)
+        return max(self.policy.min_delay, ordered[index])
+
+    def _within_budget(self, tokens: int) -> bool:
+        """Whether a hedge of `tokens` input tokens fits under the caps."""
+        spent = self.stats.extra_tokens + tokens
+        if self.policy.max_extra_tokens is not None and spent > self.policy.max_extra_tokens:
+            return False
+        return spent <= self.policy.max_extra_fraction * self.stats.tokens
+
+    async def _timed(
+        self,
+        func: Callable[[], Awaitable[T]],
+        prompt_chars: int,
+        started: float,
+        stage: Optional[str] = None,
+    ) -> T:
+        """Run one leg and record, if it succeeds, the time since the request `started`."""
+        with usage_scope(stage=stage):
+            result = await func()
+        self.observe(prompt_chars, time.perf_counter() - started)
+        return result
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+        prompt_chars: int,
+    ) -> T:
+        """
+        Run `primary()`, hedging with `hedge()` if it is slower than usual.
+
+        Args:
+            primary: Starts the original request
+            hedge: Starts the duplicate request
+            prompt_chars: Prompt length (selects the size class)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The primary's error if both legs fail
+        """
+        estimated_tokens = math.ceil(prompt_chars / 4)
+        self.stats.requests += 1
+        self.stats.tokens += estimated_tokens
+
+        delay = self.hedge_delay(prompt_chars)
+        started = time.perf_counter()
+        if delay is None:
+            return await self._timed(primary, prompt_chars, started)
+
+        primary_task = asyncio.create_task(self._timed(primary, prompt_chars, started))
+        tasks = [primary_task]
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if done:
+                return primary_task.result()
+            if not self._within_budget(estimated_tokens):
+                self.stats.skipped_budget += 1
+                return await primary_task
+
+            self.stats.hedged += 1
+            self.stats.extra_tokens += estimated_tokens
+            logger.debug(f"Hedging request of {prompt_chars} chars after {delay:.2f}s")
+            hedge_task = asyncio.create_task(
+                self._timed(hedge, prompt_chars, started, stage="hedges")
+            )
+            tasks.append(hedge_task)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.stats.hedge_wins += 1
+                            # The straggler is cancelled below; it took at least this long
+                            if not primary_task.done():
+                                self.observe(prompt_chars, time.perf_counter() - started)
+                        else:
+                            self.stats.primary_wins += 1
+                        return task.result()
+            # Both legs failed: report the original request's error
+            hedge_task.exception()
+            raise primary_task.exception()
+        finally:
+            # Cancel the losing (or orphaned) leg; its concurrency slot is released
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Hedging counters plus the current hedge delay per size class."""
+        return {
+            **self.stats.to_dict(),
+            "hedge_delays": {
+                size: round(delay, 3)
+                for size in sorted(self._latencies)
+                if (delay := self._class_delay(size)) is not None
+            },
+        }
@@ -0,0 +1,178 @@
+"""
+HTTP Connection Pool
+
+Shared keep-alive HTTP clients for provider SDKs and TUI helpers.
+
+Every provider instance, the TUI model-list lookups and the Ollama
+connection test go through one httpx.AsyncClient per event loop, so TLS
+sessions and sockets are reused instead of being set up again for every
+client object. The pool is sized to the pipeline's concurrency limit and can
+be warmed up (connections opened ahead of time) while the application is
+still starting or the user is still choosing options.
+
+httpx binds connections to the event loop that opened them, hence one client
+per loop: `asyncio.run()`-based sync wrappers get a fresh client instead of
+one whose sockets belong to a closed loop.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool limits shared by all provider clients."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0  # Per-request timeouts are enforced by the providers
+
+    @classmethod
+    def from_env(cls, **overrides) -> "HTTPPoolConfig":
+        """Build a config from REGENDER_HTTP_* environment variables and overrides."""
+        config = cls(**overrides)
+        if os.getenv("REGENDER_HTTP_MAX_CONNECTIONS"):
+            config.max_connections = int(os.environ["REGENDER_HTTP_MAX_CONNECTIONS"])
+            config.max_keepalive_connections = config.max_connections
+        if os.getenv("REGENDER_HTTP_KEEPALIVE_EXPIRY"):
+            config.keepalive_expiry = float(os.environ["REGENDER_HTTP_KEEPALIVE_EXPIRY"])
+        return config
+
+
+_config = HTTPPoolConfig.from_env()
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def configure_http_pool(max_connections: Optional[int] = None, **kwargs) -> HTTPPoolConfig:
+    """
+    Set pool limits for clients created from now on.
+
+    Args:
+        max_connections: Maximum simultaneous connections (match the concurrency limit)
+        **kwargs: Other HTTPPoolConfig fields
+
+    Returns:
+        The active configuration
+    """
+    global _config
+    overrides = dict(kwargs)
+    if max_connections:
+        overrides.setdefault("max_connections", max_connections)
+        overrides.setdefault("max_keepalive_connections", max_connections)
+    _config = HTTPPoolConfig.from_env(**overrides)
+    return _config
+
+
+def get_http_client():
+    """
+    Get the shared httpx.AsyncClient for the running event loop.
+
+    Returns:
+        httpx.AsyncClient
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=_config.max_connections,
+                    max_keepalive_connections=_config.max_keepalive_connections,
+                    keepalive_expiry=_config.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(_config.read_timeout, connect=_config.connect_timeout),
+                follow_redirects=True,
+            )
+            _clients[loop] = client
+            logger.debug(
+                f"Created shared HTTP client (max {_config.max_connections} connections, "
+                f"keep-alive {_config.keepalive_expiry:.0f}s)"
+            )
+        return client
+
+
+async def warm_up(urls: list[str], timeout: float = 5.0) -> int:
+    """
+    Open pooled connections to the given URLs ahead of the first real request.
+
+    Any HTTP response (even 401/404) counts: the point is the TCP and TLS
+    handshake, which the pool then keeps alive. Failures are ignored.
+
+    Args:
+        urls: URLs to touch (one HEAD request each, concurrently)
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Number of hosts that answered
+    """
+    if not urls:
+        return 0
+    client = get_http_client()
+
+    async def touch(url: str) -> bool:
+        try:
+            await client.head(url, timeout=timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Warm-up of {url} failed: {e}")
+            return False
+
+    results = await asyncio.gather(*(touch(url) for url in dict.fromkeys(urls)))
+    warmed = sum(results)
+    logger.debug(f"Warmed up {warmed}/{len(results)} provider connections")
+    return warmed
+
+
+async def close_http_client() -> None:
+    """Close the shared client of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+class PooledSDKClient:
+    """
+    Lazily built SDK client that uses the shared HTTP client of the current loop.
+
+    Attribute access is forwarded, so `self.client.chat.completions.create(...)`
+    keeps working unchanged in providers.
+    """
+
+    def __init__(self, factory: Callable[[Any], Any]):
+        """
+        Args:
+            factory: Builds an SDK client given an httpx.AsyncClient
+                (e.g. `lambda http: AsyncOpenAI(api_key=key, http_client=http)`)
+        """
+        self._factory = factory
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get(self) -> Any:
+        """SDK client bound to the running loop's shared HTTP client."""
+        loop = asyncio.get_running_loop()
+        http_client = get_http_client()
+        entry = self._clients.get(loop)
+        if entry is None or entry[0] is not http_client:
+            entry = (http_client, self._factory(http_client))
+            self._clients[loop] = entry
+        return entry[1]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
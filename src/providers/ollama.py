@@ -9,14 +9,27 @@ custom base_url — no API key required.
 
 import asyncio
 import os
+import threading
+import time
 from typing import Any, Optional
 
+from src.providers.base import CompletionResult
 from src.providers.base_provider import BaseProviderPlugin
+from src.providers.concurrency import ConcurrencyConfig
+from src.providers.http_pool import PooledSDKClient
+from src.providers.openai import extract_usage
+
+# Parallelism measured per server (base URL), shared by every provider instance
+_parallelism: dict[str, int] = {}
+_discovery_started: set[str] = set()
+_discovery_lock = threading.Lock()
 
 
 class OllamaProvider(BaseProviderPlugin):
     """Local model provider via Ollama."""
 
+    MAX_PROBE_PARALLELISM = 8  # Largest burst tried when discovering server parallelism
+
     @property
     def provider_name(self) -> str:
         return "ollama"
@@ -45,27 +58,138 @@ class OllamaProvider(BaseProviderPlugin):
     def rate_limit(self) -> Optional[int]:
         return None  # Local — no rate limit
 
+    @property
+    def concurrency_config(self) -> ConcurrencyConfig:
+        """
+        Start serial; the ceiling is the server's OLLAMA_NUM_PARALLEL if known.
+
+        Without it, `discover_parallelism()` (run during warm-up) measures it.
+        """
+        num_parallel = os.getenv("OLLAMA_NUM_PARALLEL")
+        if num_parallel:
+            return ConcurrencyConfig.from_env(
+                initial_limit=int(num_parallel), max_limit=int(num_parallel)
+            )
+        return ConcurrencyConfig.from_env(initial_limit=1, max_limit=self.MAX_PROBE_PARALLELISM)
+
     def initialize(self, config: dict[str, Any]) -> None:
         """Override to skip API key requirement — Ollama is local."""
         self.api_key = "ollama"  # Required by SDK, ignored by Ollama
         self.model = config.get("model") or self.default_model
         self.rate_limiter = None
+        self._configure_requests(config)
         self._initialize_client()
         self._initialized = True
         self.logger.info(f"Initialized ollama provider with model {self.model}")
 
+    @property
+    def base_url(self) -> str:
+        """Local Ollama endpoint."""
+        return os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/v1")
+
+    @property
+    def warm_up_url(self) -> str:
+        """Local Ollama endpoint to pre-connect to."""
+        return self.base_url
+
+    async def warm_up(self) -> bool:
+        """
+        Connect to the local server and measure how many requests it serves in parallel.
+
+        The measurement runs once per process and server; later warm-ups (every
+        Application the TUI builds) reuse its result.
+        """
+        if not await super().warm_up():
+            return False
+        if os.getenv("OLLAMA_NUM_PARALLEL"):
+            return True
+        with _discovery_lock:
+            first = self.base_url not in _discovery_started
+            _discovery_started.add(self.base_url)
+        if first:
+            try:
+                await self.discover_parallelism()
+            except Exception as e:
+                with _discovery_lock:
+                    _discovery_started.discard(self.base_url)  # Try again on the next warm-up
+                self.logger.debug(f"Ollama parallelism discovery failed: {e}")
+        elif self.base_url in _parallelism:
+            self._apply_parallelism(_parallelism[self.base_url])
+        return True
+
+    async def discover_parallelism(self) -> int:
+        """
+        Find the server's effective parallelism and use it as the concurrency ceiling.
+
+        Sends bursts of 1, 2, 4, ... one-token requests. While the server runs
+        them in parallel a burst takes about as long as a single request; once
+        it starts queueing them the burst time grows with its size. The result
+        is cached per server, so it is measured at most once per process.
+
+        Returns:
+            Largest burst size served without queueing
+        """
+        if self.base_url in _parallelism:
+            self._apply_parallelism(_parallelism[self.base_url])
+            return _parallelism[self.base_url]
+
+        async def probe() -> None:
+            await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": "ok"}],
+                max_tokens=1,
+                temperature=0,
+            )
+
+        async def burst(size: int) -> float:
+            start = time.perf_counter()
+            await asyncio.wait_for(asyncio.gather(*(probe() for _ in range(size))), 120.0)
+            return time.perf_counter() - start
+
+        await burst(1)  # Load the model; the first request is not representative
+        single = await burst(1)
+        parallelism, size = 1, 2
+        while size <= self.MAX_PROBE_PARALLELISM:
+            if await burst(size) > single * 1.5:
+                break
+            parallelism, size = size, size * 2
+
+        _parallelism[self.base_url] = parallelism
+        self._apply_parallelism(parallelism)
+        self.logger.info(f"Ollama serves {parallelism} request(s) in parallel")
+        return parallelism
+
+    def _apply_parallelism(self, parallelism: int) -> None:
+        """
+        Bound the shared limiter by a measured parallelism.
+
+        A limiter that real requests have already used keeps the limit it
+        learned: the ceiling is only raised to fit it, never dropped below it.
+        """
+        limiter = self.concurrency_limiter
+        if limiter.successes or limiter.in_flight:
+            limiter.set_bounds(max_limit=max(parallelism, limiter.limit))
+        else:
+            limiter.set_bounds(max_limit=parallelism, limit=parallelism)
+
     def _initialize_client(self) -> None:
         """Initialize OpenAI client pointed at local Ollama endpoint."""
         try:
             from openai import AsyncOpenAI
 
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/v1")
-            self.client = AsyncOpenAI(api_key="ollama", base_url=base_url)
+            base_url = self.base_url
+            self.client = PooledSDKClient(
+                lambda http_client: AsyncOpenAI(
+                    api_key="ollama", base_url=base_url, http_client=http_client, max_retries=0
+                )
+            )
             self.logger.debug(f"Ollama client initialized at {base_url}")
         except ImportError as e:
             raise ImportError("openai package not installed. Run: pip install openai") from e
 
-    async def _complete_impl(self, messages: list[dict[str, str]], **kwargs) -> str:
+    async def _complete_impl(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> CompletionResult:
         """Send completion request to local Ollama instance."""
         try:
             request_params = {
@@ -80,7 +204,11 @@ class OllamaProvider(BaseProviderPlugin):
                 self.client.chat.completions.create(**request_params),
                 timeout=120.0,  # Local models can be slower
             )
-            return response.choices[0].message.content
+            # Same response shape as OpenAI; usage is reported by recent Ollama versions
+            return CompletionResult(
+                text=response.choices[0].message.content,
+                usage=extract_usage(response, request_params["model"]),
+            )
 
         except asyncio.TimeoutError as e:
             raise TimeoutError("Ollama request timed out. The model may be loading or your hardware is slow.") from e
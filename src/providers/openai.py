@@ -8,7 +8,35 @@ import asyncio
 import json
 from typing import Any
 
+from src.providers.base import CompletionResult, CompletionUsage
 from src.providers.base_provider import BaseProviderPlugin
+from src.providers.http_pool import PooledSDKClient
+
+
+def extract_usage(response: Any, model: str) -> CompletionUsage:
+    """
+    Read the usage block of a chat completion response.
+
+    Shared with OpenAI-compatible providers (e.g. Ollama).
+
+    Args:
+        response: Chat completion response
+        model: Requested model, used if the response does not name one
+
+    Returns:
+        Reported usage (marked estimated if the response has none)
+    """
+    usage = getattr(response, "usage", None)
+    model = getattr(response, "model", None) or model
+    if usage is None:
+        return CompletionUsage(model=model, estimated=True)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return CompletionUsage(
+        input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+        model=model,
+    )
 
 
 class OpenAIProvider(BaseProviderPlugin):
@@ -50,19 +78,62 @@ class OpenAIProvider(BaseProviderPlugin):
         """OpenAI rate limit (requests per minute)."""
         return 500  # Tier 2 default
 
+    @property
+    def warm_up_url(self) -> str:
+        """API endpoint to pre-connect to."""
+        return "https://api.openai.com/v1/models"
+
     def _initialize_client(self):
         """Initialize OpenAI client."""
         try:
             from openai import AsyncOpenAI
 
-            self.client = AsyncOpenAI(api_key=self.api_key)
+            api_key = self.api_key
+            # max_retries=0: retry_async is the only retry layer (see src.utils.retry)
+            self.client = PooledSDKClient(
+                lambda http_client: AsyncOpenAI(
+                    api_key=api_key, http_client=http_client, max_retries=0
+                )
+            )
             self.logger.debug("OpenAI async client initialized")
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
 
+    def build_request(self, messages: list[dict[str, str]], **kwargs) -> dict[str, Any]:
+        """
+        Build chat completion parameters (shared with the batch backend).
+
+        Args:
+            messages: List of message dicts
+            **kwargs: Additional parameters like temperature, max_tokens
+
+        Returns:
+            Request parameters for chat.completions.create
+        """
+        request_params = {
+            "model": kwargs.get("model", self.model),
+            "messages": messages,
+            "temperature": kwargs.get("temperature", 0.7),
+        }
+
+        # Add optional parameters
+        if "max_tokens" in kwargs:
+            request_params["max_tokens"] = kwargs["max_tokens"]
+
+        # Handle JSON mode
+        if kwargs.get("response_format") == "json_object":
+            request_params["response_format"] = {"type": "json_object"}
+        return request_params
+
+    def batch_backend(self):
+        """OpenAI Batch API backend (about half price, 24h completion window)."""
+        from src.providers.batch import OpenAIBatchBackend
+
+        return OpenAIBatchBackend(self)
+
     async def _complete_impl(
         self, messages: list[dict[str, str]], **kwargs
-    ) -> str:
+    ) -> CompletionResult:
         """
         OpenAI-specific completion implementation.
 
@@ -71,23 +142,10 @@ class OpenAIProvider(BaseProviderPlugin):
             **kwargs: Additional parameters like temperature, max_tokens
 
         Returns:
-            Completion text
+            Completion text with reported usage
         """
         try:
-            # Prepare request parameters
-            request_params = {
-                "model": kwargs.get("model", self.model),
-                "messages": messages,
-                "temperature": kwargs.get("temperature", 0.7),
-            }
-
-            # Add optional parameters
-            if "max_tokens" in kwargs:
-                request_params["max_tokens"] = kwargs["max_tokens"]
-
-            # Handle JSON mode
-            if kwargs.get("response_format") == "json_object":
-                request_params["response_format"] = {"type": "json_object"}
+            request_params = self.build_request(messages, **kwargs)
 
             # Make the API call with await and timeout (60 seconds)
             response = await asyncio.wait_for(
@@ -105,7 +163,9 @@ class OpenAIProvider(BaseProviderPlugin):
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"Invalid JSON response: {e}")
 
-            return content
+            return CompletionResult(
+                text=content, usage=extract_usage(response, request_params["model"])
+            )
 
         except asyncio.TimeoutError:
             self.logger.error("OpenAI API call timed out after 60 seconds")
@@ -113,23 +173,14 @@ class OpenAIProvider(BaseProviderPlugin):
         except Exception as e:
             error_message = str(e)
 
-            # Handle rate limiting specifically
-            if "rate_limit" in error_message.lower() or "429" in error_message:
+            # Rate limits are retried by the provider retry layer (honoring Retry-After)
+            is_rate_limit = "rate_limit" in error_message.lower() or "429" in error_message
+            if is_rate_limit and "insufficient_quota" not in error_message.lower():
                 self.logger.warning(f"Rate limit hit: {e}")
-                # Extract retry-after if available
-                wait_time = 60  # Default to 60 seconds
-                if hasattr(e, 'response') and e.response:
-                    retry_after = e.response.headers.get('retry-after')
-                    if retry_after:
-                        wait_time = int(retry_after)
-
-                self.logger.info(f"Waiting {wait_time} seconds before retry...")
-                await asyncio.sleep(wait_time)
-                # Retry once
-                return await self._complete_impl(messages, **kwargs)
+                raise
 
             # Handle other API errors
-            elif "insufficient_quota" in error_message.lower():
+            if "insufficient_quota" in error_message.lower():
                 self.logger.error("OpenAI API quota exceeded")
                 raise ValueError("OpenAI API quota exceeded. Please check your billing.")
 
@@ -78,6 +78,12 @@ class TokenBucketRateLimiter:
             # Always wait minimum delay to prevent bursts
             await asyncio.sleep(self.min_delay)
 
+    def available_fraction(self) -> float:
+        """Share of the bucket available right now (0.0 empty, 1.0 full)."""
+        elapsed = time.time() - self.last_refill
+        available = min(self.max_tokens, self.available_tokens + (elapsed / 60.0) * self.max_tokens)
+        return max(0.0, available / self.max_tokens)
+
 
 class OpenAIRateLimiter:
     """Specific rate limiter for OpenAI API."""
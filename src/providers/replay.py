@@ -0,0 +1,495 @@
+"""
+Replay Provider Plugin
+
+Record/replay provider for offline load testing and deterministic runs.
+
+In "record" mode every request is forwarded to a real provider and the
+response, latency and token usage are appended to a JSONL cassette. In
+"replay" mode responses are served from the cassette with no network
+access, while still behaving like a remote API: latency can follow the
+recorded timings or a configurable distribution, rate-limit (429),
+overloaded (529) and timeout errors can be injected at fixed rates, and
+throughput can be capped in requests and tokens per minute. This makes it
+possible to exercise retries, rate limiting and concurrency tuning
+without spending API credits.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Optional
+
+from src.providers.base import CompletionResult, CompletionUsage, complete_with_usage
+from src.providers.base_provider import BaseProviderPlugin
+from src.providers.rate_limiter import TokenBucketRateLimiter
+from src.utils.errors import ProviderError, RateLimitError
+
+DEFAULT_CASSETTE = Path("books/cache/cassettes/default.jsonl")
+
+MODE_REPLAY = "replay"
+MODE_RECORD = "record"
+
+LATENCY_DISTRIBUTIONS = ("recorded", "none", "fixed", "uniform", "lognormal")
+
+
+def request_fingerprint(messages: list[dict[str, str]], **kwargs) -> str:
+    """
+    Build the cassette key for a request.
+
+    The model is deliberately left out so a cassette recorded with one model
+    can be replayed under another name; everything that changes the answer
+    (messages, temperature, JSON mode) is included.
+
+    Args:
+        messages: Request messages
+        **kwargs: Completion parameters
+
+    Returns:
+        Hex digest key
+    """
+    payload = {
+        "messages": [
+            {"role": m.get("role", ""), "content": m.get("content", "")} for m in messages
+        ],
+        "temperature": kwargs.get("temperature"),
+        "response_format": kwargs.get("response_format"),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+class ReplayProvider(BaseProviderPlugin):
+    """
+    Provider that records real completions to a cassette and replays them.
+
+    Configuration (config dict keys, with REPLAY_* environment fallbacks):
+        mode: "replay" (default) or "record"                    REPLAY_MODE
+        cassette: JSONL cassette path                           REPLAY_CASSETTE
+        provider: Wrapped provider instance for record mode
+        inner_provider: Wrapped provider name for record mode   REPLAY_INNER_PROVIDER
+        on_miss: "error" (default) or "echo"                    REPLAY_ON_MISS
+        latency: {"distribution": one of LATENCY_DISTRIBUTIONS,
+                  "value", "low", "high", "median", "sigma", "scale"}
+                                                                REPLAY_LATENCY ("lognormal:1.5:0.4")
+        errors: {"rate_limit", "overloaded", "timeout": probability,
+                 "retry_after": seconds, "timeout_after": seconds}
+                                                                REPLAY_ERRORS ("rate_limit=0.05,timeout=0.01")
+        max_requests_per_minute / max_tokens_per_minute: throughput caps
+        max_concurrency: simultaneous in-flight requests
+        seed: Random seed for reproducible latency and error sequences
+        retry: RetryPolicy overrides, e.g. {"max_attempts": 3, "base_delay": 0.1}
+        hedge: True or HedgePolicy overrides to hedge slow requests
+    """
+
+    def __init__(self):
+        """Initialize replay provider."""
+        super().__init__()
+        self.mode = MODE_REPLAY
+        self.cassette_path = DEFAULT_CASSETTE
+        self.inner: Optional[BaseProviderPlugin] = None
+        self.on_miss = "error"
+        self.latency: dict[str, Any] = {"distribution": "recorded"}
+        self.error_rates: dict[str, float] = {}
+        self.retry_after = 1.0
+        self.timeout_after = 0.0
+        self.token_limiter: Optional[TokenBucketRateLimiter] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._max_concurrency: Optional[int] = None
+        self._max_rpm: Optional[int] = None
+        self._records: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[str, int] = {}
+        self._random = random.Random()
+        self._stats = {
+            "requests": 0,
+            "hits": 0,
+            "misses": 0,
+            "recorded": 0,
+            "errors": {"rate_limit": 0, "overloaded": 0, "timeout": 0},
+        }
+
+    @property
+    def provider_name(self) -> str:
+        """Provider name."""
+        return "replay"
+
+    @property
+    def version(self) -> str:
+        """Plugin version."""
+        return "1.0.0"
+
+    @property
+    def description(self) -> str:
+        """Provider description."""
+        return "Record/replay provider for offline load testing"
+
+    @property
+    def default_model(self) -> str:
+        """Default model."""
+        return "replay"
+
+    @property
+    def supports_json(self) -> bool:
+        """JSON mode is passed through to the recorded provider."""
+        return True
+
+    @property
+    def max_tokens(self) -> int:
+        """Max tokens (mirrors the wrapped provider when recording)."""
+        return self.inner.max_tokens if self.inner else 128000
+
+    @property
+    def rate_limit(self) -> Optional[int]:
+        """Requests per minute cap, if configured."""
+        return self._max_rpm
+
+    def initialize(self, config: dict[str, Any]) -> None:
+        """
+        Initialize from configuration; no API key is required.
+
+        Args:
+            config: Configuration dictionary (see class docstring)
+        """
+        self.mode = (config.get("mode") or os.getenv("REPLAY_MODE", MODE_REPLAY)).lower()
+        if self.mode not in (MODE_REPLAY, MODE_RECORD):
+            raise ValueError(f"Unknown replay mode '{self.mode}' (use 'replay' or 'record')")
+
+        self.cassette_path = Path(
+            config.get("cassette") or os.getenv("REPLAY_CASSETTE") or DEFAULT_CASSETTE
+        )
+        self.on_miss = (config.get("on_miss") or os.getenv("REPLAY_ON_MISS", "error")).lower()
+        self.latency = self._parse_latency(config.get("latency") or os.getenv("REPLAY_LATENCY"))
+        self._parse_errors(config.get("errors") or os.getenv("REPLAY_ERRORS"))
+
+        seed = config.get("seed", os.getenv("REPLAY_SEED"))
+        self._random = random.Random(int(seed) if seed is not None else None)
+
+        rpm = config.get("max_requests_per_minute") or os.getenv("REPLAY_MAX_RPM")
+        tpm = config.get("max_tokens_per_minute") or os.getenv("REPLAY_MAX_TPM")
+        self._max_rpm = int(rpm) if rpm else None
+        self.rate_limiter = (
+            TokenBucketRateLimiter(tokens_per_minute=self._max_rpm, tokens_per_request=1)
+            if self._max_rpm
+            else None
+        )
+        self.token_limiter = (
+            TokenBucketRateLimiter(tokens_per_minute=int(tpm), tokens_per_request=1)
+            if tpm
+            else None
+        )
+        concurrency = config.get("max_concurrency") or os.getenv("REPLAY_MAX_CONCURRENCY")
+        self._max_concurrency = int(concurrency) if concurrency else None
+        self._semaphore = None
+        self._configure_requests(config)
+
+        if self.mode == MODE_RECORD:
+            self.inner = config.get("provider") or self._load_inner_provider(
+                config.get("inner_provider") or os.getenv("REPLAY_INNER_PROVIDER", "openai")
+            )
+
+        self.model = config.get("model") or os.getenv(
+            "REPLAY_MODEL", self.inner.model if self.inner else self.default_model
+        )
+        self._initialize_client()
+        self._initialized = True
+        self.logger.info(
+            f"Initialized replay provider ({self.mode}) with cassette {self.cassette_path} "
+            f"({sum(len(r) for r in self._records.values())} recorded responses)"
+        )
+
+    def _initialize_client(self) -> None:
+        """Load the cassette into memory."""
+        self._records = {}
+        self._cursors = {}
+        if not self.cassette_path.exists():
+            if self.mode == MODE_REPLAY:
+                self.logger.warning(f"Cassette {self.cassette_path} does not exist yet")
+            return
+
+        with open(self.cassette_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Skipping corrupt cassette line {line_no}")
+                    continue
+                self._records.setdefault(record["key"], []).append(record)
+
+    async def _complete_impl(self, messages: list[dict[str, str]], **kwargs) -> CompletionResult:
+        """
+        Serve a completion from the cassette (or record one).
+
+        Args:
+            messages: List of message dicts
+            **kwargs: Additional parameters
+
+        Returns:
+            Completion text with the recorded usage
+        """
+        if self._max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        if self._semaphore is None:
+            return await self._serve(messages, **kwargs)
+        async with self._semaphore:
+            return await self._serve(messages, **kwargs)
+
+    async def _serve(self, messages: list[dict[str, str]], **kwargs) -> CompletionResult:
+        """Handle one request after admission control."""
+        self._stats["requests"] += 1
+        key = request_fingerprint(messages, **kwargs)
+        prompt_text = "".join(m.get("content", "") for m in messages)
+
+        if self.token_limiter:
+            await self.token_limiter.acquire(estimate_tokens(prompt_text))
+
+        await self._maybe_inject_error()
+
+        if self.mode == MODE_RECORD:
+            return await self._record(key, messages, prompt_text, **kwargs)
+
+        record = self._next_record(key)
+        if record is None:
+            self._stats["misses"] += 1
+            if self.on_miss == "echo":
+                content = messages[-1].get("content", "") if messages else ""
+                record = {"response": content, "latency": 0.0, "usage": {}}
+            else:
+                raise ProviderError(
+                    f"No recorded response for request {key[:12]} in {self.cassette_path}",
+                    provider=self.provider_name,
+                    error_code="REPLAY_MISS",
+                )
+        else:
+            self._stats["hits"] += 1
+
+        delay = self._sample_latency(record.get("latency", 0.0))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = record["response"]
+        usage = record.get("usage") or {}
+        return CompletionResult(
+            text=response,
+            usage=CompletionUsage(
+                input_tokens=usage.get("input_tokens", estimate_tokens(prompt_text)),
+                output_tokens=usage.get("output_tokens", estimate_tokens(response)),
+                cached_tokens=usage.get("cached_tokens", 0),
+                latency=delay,
+                model=record.get("model") or self.model,
+                estimated="input_tokens" not in usage,
+            ),
+        )
+
+    async def _record(
+        self, key: str, messages: list[dict[str, str]], prompt_text: str, **kwargs
+    ) -> CompletionResult:
+        """Forward to the wrapped provider and append the exchange to the cassette."""
+        start = time.perf_counter()
+        result = await complete_with_usage(self.inner, messages, **kwargs)
+        latency = time.perf_counter() - start
+
+        response, usage = result.text, replace(result.usage)
+        if usage.estimated and not usage.total_tokens:
+            usage.input_tokens = estimate_tokens(prompt_text)
+            usage.output_tokens = estimate_tokens(response or "")
+        usage.latency = latency
+        usage.model = usage.model or getattr(self.inner, "model", None)
+        record = {
+            "key": key,
+            "model": usage.model,
+            "latency": round(latency, 4),
+            "usage": {
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "cached_tokens": usage.cached_tokens,
+            },
+            "response": response,
+        }
+
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cassette_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        self._records.setdefault(key, []).append(record)
+        self._stats["recorded"] += 1
+        return CompletionResult(text=response, usage=usage)
+
+    def _next_record(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the next recorded response for a key, cycling through repeats."""
+        records = self._records.get(key)
+        if not records:
+            return None
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return records[cursor % len(records)]
+
+    async def _maybe_inject_error(self) -> None:
+        """Raise a simulated API error according to the configured rates."""
+        roll = self._random.random()
+        threshold = 0.0
+        for kind in ("rate_limit", "overloaded", "timeout"):
+            threshold += self.error_rates.get(kind, 0.0)
+            if roll >= threshold:
+                continue
+
+            self._stats["errors"][kind] += 1
+            if kind == "rate_limit":
+                raise RateLimitError(
+                    "429 rate_limit_error: simulated rate limit",
+                    retry_after=self.retry_after,
+                    provider=self.provider_name,
+                    details={"status_code": 429},
+                )
+            if kind == "overloaded":
+                raise ProviderError(
+                    "529 overloaded_error: simulated overload",
+                    provider=self.provider_name,
+                    error_code="PROVIDER_OVERLOADED",
+                    details={"status_code": 529},
+                )
+            if self.timeout_after > 0:
+                await asyncio.sleep(self.timeout_after)
+            raise TimeoutError("Replay API call timed out (simulated).")
+
+    def _sample_latency(self, recorded: float) -> float:
+        """Draw a latency in seconds from the configured distribution."""
+        distribution = self.latency.get("distribution", "recorded")
+        scale = float(self.latency.get("scale", 1.0))
+
+        if distribution == "none":
+            return 0.0
+        if distribution == "fixed":
+            value = float(self.latency.get("value", 0.0))
+        elif distribution == "uniform":
+            value = self._random.uniform(
+                float(self.latency.get("low", 0.0)), float(self.latency.get("high", 1.0))
+            )
+        elif distribution == "lognormal":
+            median = float(self.latency.get("median", 1.0))
+            sigma = float(self.latency.get("sigma", 0.5))
+            value = self._random.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            value = float(recorded or 0.0)
+        return max(0.0, value * scale)
+
+    @staticmethod
+    def _parse_latency(spec: Any) -> dict[str, Any]:
+        """Parse a latency spec: a dict or "name[:arg[:arg]]" string."""
+        if not spec:
+            return {"distribution": "recorded"}
+        if isinstance(spec, dict):
+            latency = dict(spec)
+        else:
+            name, *args = str(spec).split(":")
+            latency = {"distribution": name.strip().lower()}
+            params = {
+                "fixed": ("value",),
+                "uniform": ("low", "high"),
+                "lognormal": ("median", "sigma"),
+            }
+            for param, value in zip(params.get(latency["distribution"], ()), args):
+                latency[param] = float(value)
+
+        if latency.get("distribution", "recorded") not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency['distribution']}' "
+                f"(use one of {', '.join(LATENCY_DISTRIBUTIONS)})"
+            )
+        return latency
+
+    def _parse_errors(self, spec: Any) -> None:
+        """Parse error injection rates: a dict or "kind=rate,..." string."""
+        self.error_rates = {}
+        self.retry_after = 1.0
+        self.timeout_after = 0.0
+        if not spec:
+            return
+        if isinstance(spec, str):
+            spec = dict(item.split("=", 1) for item in spec.split(",") if "=" in item)
+
+        for kind, value in spec.items():
+            kind = kind.strip()
+            if kind == "retry_after":
+                self.retry_after = float(value)
+            elif kind == "timeout_after":
+                self.timeout_after = float(value)
+            elif kind in ("rate_limit", "overloaded", "timeout"):
+                self.error_rates[kind] = float(value)
+            else:
+                raise ValueError(f"Unknown injected error type '{kind}'")
+
+        if sum(self.error_rates.values()) > 1.0:
+            raise ValueError("Injected error rates must sum to at most 1.0")
+
+    def _load_inner_provider(self, name: str) -> BaseProviderPlugin:
+        """Load and initialize the provider to record from."""
+        from src.plugins.base import PluginManager
+
+        if name == self.provider_name:
+            raise ValueError("Replay provider cannot record from itself")
+
+        manager = PluginManager()
+        manager.load_plugin(f"src.providers.{name}")
+        provider = manager.get(name)
+        if provider is None:
+            raise ValueError(f"Unknown provider to record from: {name}")
+        provider.initialize({})
+        return provider
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get replay statistics.
+
+        Returns:
+            Dictionary with request, hit/miss, recording and injected-error counts
+        """
+        return {
+            "mode": self.mode,
+            "cassette": str(self.cassette_path),
+            **self._stats,
+            "errors": dict(self._stats["errors"]),
+        }
+
+    def get_model_info(self) -> dict[str, Any]:
+        """
+        Get information about the current model.
+
+        Returns:
+            Dictionary with model capabilities
+        """
+        if self.inner:
+            return self.inner.get_model_info()
+        return {
+            "context_window": self.max_tokens,
+            "max_output": 4096,
+            "supports_vision": False,
+            "supports_json": True,
+        }
+
+    async def get_rate_limits(self) -> dict:
+        """
+        Get the simulated rate limits.
+
+        Returns:
+            Dictionary with rate limit info
+        """
+        return {
+            "requests_per_minute": self.rate_limiter.max_tokens if self.rate_limiter else None,
+            "tokens_per_minute": self.token_limiter.max_tokens if self.token_limiter else None,
+            "max_concurrency": self._max_concurrency,
+            "error_rates": dict(self.error_rates),
+        }
@@ -0,0 +1,356 @@
+"""
+Character Analysis Store
+
+Content-addressed persistence for character analyses and the
+name suggestions derived from them.
+
+Analyses are keyed by the book's content hash plus the provider and model
+that produced them, so renamed files still hit the cache and different books
+with similar file names never collide. A small index file maps keys to
+entries for O(1) lookup, and partial results (extraction finished, merge
+pending) are checkpointed so an interrupted analysis can resume.
+
+Several processes (say the CLI and the TUI) may share one store. Updates to
+the index and the suggestion memo re-read the file under an exclusive lock
+and merge into it, so no writer drops another's entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from src.models.character import CharacterAnalysis
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within one process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path("books/cache/characters")
+STORE_DIR_ENV = "REGENDER_ANALYSIS_STORE"
+
+
+def provider_identity(provider: Any) -> tuple[str, str]:
+    """
+    Get the (provider, model) pair that identifies who produced an analysis.
+
+    Works with plugin providers as well as duck-typed test providers.
+
+    Args:
+        provider: LLM provider instance (may be None)
+
+    Returns:
+        Tuple of (provider name, model name)
+    """
+    if provider is None:
+        return "none", "none"
+    name = getattr(provider, "name", None) or type(provider).__name__
+    model = getattr(provider, "model", None) or getattr(provider, "default_model", None)
+    return str(name), str(model or "default")
+
+
+class AnalysisStore:
+    """
+    Persistent store for character analyses keyed by book hash, provider and model.
+
+    Layout on disk:
+        <root>/index.json             key -> entry metadata
+        <root>/<key>.json             completed CharacterAnalysis
+        <root>/<key>.partial.json     checkpoint of an unfinished analysis
+        <root>/name_suggestions.json  memoized name-alternative suggestions
+        <root>/.<file>.lock           lock held while index.json or the memo is updated
+    """
+
+    INDEX_FILE = "index.json"
+    SUGGESTIONS_FILE = "name_suggestions.json"
+    STATUS_COMPLETE = "complete"
+    STATUS_PARTIAL = "partial"
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory. Defaults to $REGENDER_ANALYSIS_STORE or
+                books/cache/characters.
+        """
+        self.root = Path(root or os.getenv(STORE_DIR_ENV) or DEFAULT_STORE_DIR)
+        # File name -> (stat signature, parsed content) of the shared JSON maps
+        self._maps: dict[str, tuple[Optional[tuple[int, int, int]], dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(book_hash: str, provider: str, model: str) -> str:
+        """
+        Build the store key for a book/provider/model combination.
+
+        Args:
+            book_hash: Book content hash (Book.hash())
+            provider: Provider name
+            model: Model name
+
+        Returns:
+            Filesystem-safe key
+        """
+        raw = f"{book_hash}-{provider}-{model}"
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", raw)
+
+    # === PUBLIC API ===
+
+    def get(self, book_hash: str, provider: str, model: str) -> Optional[CharacterAnalysis]:
+        """
+        Look up a completed analysis.
+
+        Returns:
+            CharacterAnalysis or None if not stored (or unreadable)
+        """
+        key = self.make_key(book_hash, provider, model)
+        entry = self._load_index().get(key)
+        if not entry or not entry.get("complete"):
+            return None
+
+        data = self._read_json(self.root / entry["complete"])
+        if data is None:
+            return None
+        try:
+            return CharacterAnalysis.from_dict(data)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable analysis {key}: {e}")
+            return None
+
+    def put(
+        self,
+        analysis: CharacterAnalysis,
+        provider: str,
+        model: str,
+        book_title: Optional[str] = None,
+    ) -> Path:
+        """
+        Store a completed analysis and drop any partial checkpoint for it.
+
+        Args:
+            analysis: Completed analysis (book_id must be the book hash)
+            provider: Provider name
+            model: Model name
+            book_title: Optional title, recorded in the index for humans
+
+        Returns:
+            Path of the stored analysis file
+        """
+        key = self.make_key(analysis.book_id, provider, model)
+        filename = f"{key}.json"
+        analysis.provider = analysis.provider or provider
+        analysis.model = analysis.model or model
+        self._write_json(self.root / filename, analysis.to_dict())
+
+        with self._updating(self.INDEX_FILE) as index:
+            entry = index.get(key, {})
+            partial = entry.pop("partial", None)
+            entry.update(
+                {
+                    "book_hash": analysis.book_id,
+                    "provider": provider,
+                    "model": model,
+                    "status": self.STATUS_COMPLETE,
+                    "complete": filename,
+                    "updated": datetime.now().isoformat(),
+                }
+            )
+            if book_title:
+                entry["book_title"] = book_title
+            index[key] = entry
+
+        if partial:
+            (self.root / partial).unlink(missing_ok=True)
+        return self.root / filename
+
+    def get_partial(self, book_hash: str, provider: str, model: str) -> Optional[dict[str, Any]]:
+        """
+        Load the checkpoint of an unfinished analysis.
+
+        Returns:
+            Checkpoint dict (with a "stage" key) or None
+        """
+        key = self.make_key(book_hash, provider, model)
+        entry = self._load_index().get(key)
+        if not entry or not entry.get("partial"):
+            return None
+        return self._read_json(self.root / entry["partial"])
+
+    def put_partial(
+        self, book_hash: str, provider: str, model: str, stage: str, data: dict[str, Any]
+    ) -> None:
+        """
+        Checkpoint an unfinished analysis.
+
+        Args:
+            book_hash: Book content hash
+            provider: Provider name
+            model: Model name
+            stage: Last completed stage (e.g. "extracted")
+            data: Stage payload needed to resume
+        """
+        key = self.make_key(book_hash, provider, model)
+        filename = f"{key}.partial.json"
+        self._write_json(self.root / filename, {"stage": stage, **data})
+
+        with self._updating(self.INDEX_FILE) as index:
+            entry = index.setdefault(
+                key, {"book_hash": book_hash, "provider": provider, "model": model}
+            )
+            entry["partial"] = filename
+            if not entry.get("complete"):
+                entry["status"] = self.STATUS_PARTIAL
+            entry["updated"] = datetime.now().isoformat()
+
+    def delete(self, book_hash: str, provider: str, model: str) -> bool:
+        """
+        Remove an entry (complete and partial) from the store.
+
+        Returns:
+            True if an entry was removed
+        """
+        key = self.make_key(book_hash, provider, model)
+        with self._updating(self.INDEX_FILE) as index:
+            entry = index.pop(key, None)
+        if entry is None:
+            return False
+
+        for name in (entry.get("complete"), entry.get("partial")):
+            if name:
+                (self.root / name).unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def suggestion_key(name: str, gender: str, transform_type: str, style_context: str = "") -> str:
+        """
+        Build the memo key for a name suggestion.
+
+        Args:
+            name: Original character name
+            gender: Character's current gender value
+            transform_type: Transform type value
+            style_context: Optional style hint passed to the suggester
+
+        Returns:
+            Hex digest key
+        """
+        raw = json.dumps([name.strip().lower(), gender, transform_type, style_context.strip()])
+        return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+    def get_name_suggestion(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a memoized name suggestion.
+
+        Returns:
+            Entry dict, or None if nothing is stored
+        """
+        return self._load_suggestions().get(key)
+
+    def put_name_suggestions(self, entries: dict[str, dict[str, Any]]) -> None:
+        """
+        Memoize name suggestions.
+
+        Args:
+            entries: Map of suggestion key to entry dict
+        """
+        if not entries:
+            return
+        with self._updating(self.SUGGESTIONS_FILE) as suggestions:
+            suggestions.update(entries)
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Return a copy of the index."""
+        return dict(self._load_index())
+
+    # === INTERNALS ===
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        """Load the index, re-reading it only when the file changed."""
+        return self._load_map(self.INDEX_FILE)
+
+    def _load_suggestions(self) -> dict[str, dict[str, Any]]:
+        """Load the name-suggestion memo, re-reading it only when the file changed."""
+        return self._load_map(self.SUGGESTIONS_FILE)
+
+    def _load_map(self, filename: str, fresh: bool = False) -> dict[str, Any]:
+        """
+        Load a store-wide JSON map, cached until another writer replaces the file.
+
+        Args:
+            filename: File name under the store root
+            fresh: Always read from disk, ignoring the cache
+        """
+        path = self.root / filename
+        signature = self._signature(path)
+        cached = self._maps.get(filename)
+        if fresh or cached is None or cached[0] != signature:
+            data = self._read_json(path) if signature else None
+            cached = (signature, data if isinstance(data, dict) else {})
+            self._maps[filename] = cached
+        return cached[1]
+
+    @contextmanager
+    def _updating(self, filename: str) -> Iterator[dict[str, Any]]:
+        """
+        Read-modify-write a store-wide JSON map.
+
+        The map is re-read from disk while holding the thread lock and an
+        exclusive lock on <root>/.<filename>.lock, so entries written by other
+        processes since our last read are merged rather than overwritten.
+
+        Yields:
+            The current map; changes made to it are written back atomically
+        """
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / f".{filename}.lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)  # Released when the file closes
+                data = self._load_map(filename, fresh=True)
+                try:
+                    yield data
+                    path = self.root / filename
+                    self._write_json(path, data)
+                    self._maps[filename] = (self._signature(path), data)
+                except BaseException:
+                    self._maps.pop(filename, None)  # Don't serve changes that weren't saved
+                    raise
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[tuple[int, int, int]]:
+        """Inode, mtime and size of a file (None if missing); changes on every replace."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_json(self, path: Path) -> Optional[Any]:
+        """Read a JSON file, returning None if it is missing or corrupt."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read {path}: {e}")
+            return None
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Write JSON atomically so a crash never leaves a truncated file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
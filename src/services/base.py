@@ -6,12 +6,13 @@ implementing common patterns for initialization, error handling, and
 async/sync execution.
 """
 
-import asyncio
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from src.utils.retry import RetryPolicy, retry_async
+
 
 @dataclass
 class ServiceConfig:
@@ -156,12 +157,16 @@ class BaseService(ABC):
         self, func: callable, *args, max_retries: Optional[int] = None, **kwargs
     ) -> Any:
         """
-        Retry a function with exponential backoff.
+        Retry a function with jittered exponential backoff.
+
+        Uses the same retry layer as the providers (Retry-After, deadline),
+        but also retries failures it cannot classify. Client errors such as
+        bad requests or exhausted quota are not retried.
 
         Args:
             func: Function to retry
             args: Positional arguments for func
-            max_retries: Maximum number of retries (uses config if not specified)
+            max_retries: Maximum number of attempts (uses config if not specified)
             kwargs: Keyword arguments for func
 
         Returns:
@@ -170,26 +175,12 @@ class BaseService(ABC):
         Raises:
             Last exception if all retries fail
         """
-        max_retries = max_retries or self.config.max_retries
-        last_error = None
-
-        for attempt in range(max_retries):
-            try:
-                return await func(*args, **kwargs)
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    wait_time = 2**attempt  # Exponential backoff
-                    self.logger.warning(
-                        f"Retry {attempt + 1}/{max_retries} after error: {e}. "
-                        f"Waiting {wait_time}s..."
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    self.logger.error(f"All {max_retries} retries failed")
-
-        if last_error:
-            raise last_error
+        policy = RetryPolicy.from_env(
+            max_attempts=max_retries or self.config.max_retries, retry_unclassified=True
+        )
+        return await retry_async(
+            lambda attempt: func(*args, **kwargs), policy=policy, name=self.__class__.__name__
+        )
 
     def get_metrics(self) -> dict[str, Any]:
         """
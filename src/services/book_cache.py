@@ -0,0 +1,308 @@
+"""
+Parsed Book Cache
+
+Content-addressed persistence for parsed books, so repeat runs skip
+Gutenberg cleaning, format detection, hierarchy building and sentence
+splitting entirely.
+
+Entries are keyed by the SHA-256 of the source file's bytes plus the
+parser version (`src.parsers.parser.PARSER_VERSION`), so a renamed file
+still hits, two books sharing a boilerplate header never collide, and a
+parser change invalidates every entry at once. The key also names the
+variant of the book that was stored (e.g. the sentence-split canonical
+book versus the service's one-sentence-per-paragraph book).
+
+Each entry is a single file: a small JSON header (book fields plus an
+index of chapter offsets) followed by one zlib-compressed, compact JSON
+blob per chapter. Chapters can therefore be listed without being
+decoded, and loaded one at a time.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+from src.models.book import Book, Chapter, Paragraph
+from src.parsers.parser import PARSER_VERSION
+from src.utils.json_io import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("books/cache/parsed")
+CACHE_DIR_ENV = "REGENDER_BOOK_CACHE"
+
+MAGIC = b"RGBOOK1\n"
+_HEADER_SIZE = struct.Struct(">Q")
+_HASH_CHUNK = 1 << 20
+
+
+def content_hash(file_path: Union[str, Path]) -> str:
+    """
+    SHA-256 of a file's bytes, read in chunks.
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _encode_chapter(chapter: Chapter) -> bytes:
+    """Compact chapter payload: paragraphs as bare sentence lists."""
+    data = [
+        chapter.number,
+        chapter.title,
+        chapter.metadata,
+        [list(p.iter_sentences()) for p in chapter.paragraphs],
+    ]
+    return zlib.compress(dumps(data, compact=True), 1)
+
+
+def _decode_chapter(blob: bytes) -> Chapter:
+    number, title, metadata, paragraphs = loads(zlib.decompress(blob))
+    return Chapter(
+        number=number,
+        title=title,
+        paragraphs=[Paragraph(sentences=sentences) for sentences in paragraphs],
+        metadata=metadata,
+    )
+
+
+class CachedBook:
+    """
+    Lazily loaded cache entry.
+
+    The book fields and chapter list are read up front; chapter contents
+    are read and decoded only when asked for.
+
+    Usage:
+        with cache.open(digest) as cached:
+            print(cached.title, [c["title"] for c in cached.chapter_index])
+            first = cached.chapter(0)
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open a cache file and read its header.
+
+        Raises:
+            ValueError: If the file is not a cache entry
+        """
+        self.path = path
+        self._file: BinaryIO = open(path, "rb")  # noqa: SIM115 - closed in close()
+        try:
+            if self._file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a parsed-book cache file: {path}")
+            (size,) = _HEADER_SIZE.unpack(self._file.read(_HEADER_SIZE.size))
+            header = json.loads(self._file.read(size))
+        except Exception:
+            self._file.close()
+            raise
+        self._data_start = len(MAGIC) + _HEADER_SIZE.size + size
+
+        self.title: Optional[str] = header["title"]
+        self.author: Optional[str] = header["author"]
+        self.metadata: dict[str, Any] = header["metadata"]
+        self.source_file: Optional[str] = header.get("source_file")
+        # [{"number", "title", "offset", "size"}, ...]
+        self.chapter_index: list[dict[str, Any]] = header["chapters"]
+
+    def __len__(self) -> int:
+        return len(self.chapter_index)
+
+    def chapter(self, index: int) -> Chapter:
+        """
+        Load one chapter.
+
+        Args:
+            index: Position of the chapter in the book
+
+        Returns:
+            Chapter object
+        """
+        entry = self.chapter_index[index]
+        self._file.seek(self._data_start + entry["offset"])
+        return _decode_chapter(self._file.read(entry["size"]))
+
+    def chapters(self) -> Iterator[Chapter]:
+        """Load the chapters one by one, in order."""
+        for i in range(len(self.chapter_index)):
+            yield self.chapter(i)
+
+    def load(self) -> Book:
+        """Load the whole book."""
+        self._file.seek(self._data_start)
+        data = self._file.read()
+        chapters = [
+            _decode_chapter(data[entry["offset"] : entry["offset"] + entry["size"]])
+            for entry in self.chapter_index
+        ]
+        return Book(
+            title=self.title,
+            author=self.author,
+            chapters=chapters,
+            metadata=dict(self.metadata),
+            source_file=self.source_file,
+        )
+
+    def close(self):
+        """Close the cache file."""
+        self._file.close()
+
+    def __enter__(self) -> "CachedBook":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BookCache:
+    """
+    Persistent cache of parsed books keyed by source content hash and parser version.
+
+    Layout on disk:
+        <root>/<sha256[:32]>-p<parser version>-<variant>.book
+    """
+
+    SUFFIX = ".book"
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory. Defaults to $REGENDER_BOOK_CACHE or
+                books/cache/parsed.
+        """
+        self.root = Path(root or os.getenv(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+    @staticmethod
+    def make_key(digest: str, variant: str) -> str:
+        """
+        Build the cache key for a source file and book variant.
+
+        Args:
+            digest: Content hash of the source file (see `content_hash`)
+            variant: Which kind of parsed book is stored
+
+        Returns:
+            Filesystem-safe key
+        """
+        raw = f"{digest[:32]}-p{PARSER_VERSION}-{variant}"
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", raw)
+
+    def path_for(self, digest: str, variant: str = "canonical") -> Path:
+        """Path of the entry for a source file and variant."""
+        return self.root / f"{self.make_key(digest, variant)}{self.SUFFIX}"
+
+    # === PUBLIC API ===
+
+    def open(self, digest: str, variant: str = "canonical") -> Optional[CachedBook]:
+        """
+        Open an entry for lazy, per-chapter loading.
+
+        Returns:
+            CachedBook (caller closes it) or None if not cached (or unreadable)
+        """
+        path = self.path_for(digest, variant)
+        try:
+            return CachedBook(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.warning(f"Discarding unreadable cached book {path.name}: {e}")
+            return None
+
+    def get(self, digest: str, variant: str = "canonical") -> Optional[Book]:
+        """
+        Load a cached book.
+
+        Returns:
+            Book or None if not cached (or unreadable)
+        """
+        cached = self.open(digest, variant)
+        if cached is None:
+            return None
+        try:
+            with cached:
+                return cached.load()
+        except (OSError, ValueError, TypeError, zlib.error) as e:
+            logger.warning(f"Discarding unreadable cached book {cached.path.name}: {e}")
+            return None
+
+    def put(self, digest: str, book: Book, variant: str = "canonical") -> Path:
+        """
+        Store a parsed book.
+
+        Args:
+            digest: Content hash of the source file
+            book: Parsed book
+            variant: Which kind of parsed book this is
+
+        Returns:
+            Path of the cache entry
+        """
+        blobs = [_encode_chapter(chapter) for chapter in book.chapters]
+        index, offset = [], 0
+        for chapter, blob in zip(book.chapters, blobs):
+            index.append(
+                {
+                    "number": chapter.number,
+                    "title": chapter.title,
+                    "offset": offset,
+                    "size": len(blob),
+                }
+            )
+            offset += len(blob)
+
+        header = json.dumps(
+            {
+                "title": book.title,
+                "author": book.author,
+                "metadata": book.metadata,
+                "source_file": book.source_file,
+                "chapters": index,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+
+        path = self.path_for(digest, variant)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so a crash never leaves a truncated entry
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_SIZE.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+        return path
+
+    def delete(self, digest: str, variant: str = "canonical") -> bool:
+        """
+        Remove an entry.
+
+        Returns:
+            True if an entry was removed
+        """
+        path = self.path_for(digest, variant)
+        if not path.exists():
+            return False
+        path.unlink(missing_ok=True)
+        return True
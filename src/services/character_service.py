@@ -22,7 +22,10 @@ from rapidfuzz import fuzz, process
 from src.models.book import Book
 from src.models.character import Character, CharacterAnalysis, Gender
 from src.providers.base import LLMProvider
+from src.providers.batch import BatchRequest, batch_mode_requested, create_batch_runner
+from src.services.analysis_store import AnalysisStore, provider_identity
 from src.services.base import BaseService, ServiceConfig
+from src.services.gender_inference import GenderEstimate, GenderInferenceEngine
 from src.services.prompts import EXTRACTION_PROMPT_TEMPLATE, MERGE_PROMPT_TEMPLATE
 from src.utils.errors import (
     CharacterExtractionError,
@@ -30,6 +33,8 @@ from src.utils.errors import (
     ErrorHandler,
     ValidationError,
 )
+from src.utils.retry import ErrorKind, classify_error
+from src.utils.usage_accounting import usage_scope
 
 
 class UnionFind:
@@ -141,6 +146,19 @@ class CharacterService(BaseService):
             "batch_size": 50,
         }
 
+        # Local pronoun-statistics gender inference: confident estimates override the
+        # extraction's gender and let alias groups merge without the merge prompt
+        self.gender_inference_config = {
+            "enabled": char_config.get("local_gender_inference", True),
+            "confidence_threshold": char_config.get("gender_confidence_threshold", 0.8),
+        }
+        self.gender_inference = GenderInferenceEngine()
+
+        # Persistent analysis store (resume + reuse across CLI/TUI runs)
+        self.analysis_store: Optional[AnalysisStore] = None
+        if self.config.cache_enabled:
+            self.analysis_store = AnalysisStore(self.config.get("analysis_store_dir"))
+
     def _initialize(self):
         """Initialize service resources (required by BaseService)."""
         # No additional initialization needed for refactored service
@@ -204,28 +222,84 @@ class CharacterService(BaseService):
                 details={"service": "CharacterService"}
             )
 
+        book_hash = book.hash()
+        provider_name, model_name = provider_identity(self.provider)
+
+        if self.analysis_store:
+            cached = self.analysis_store.get(book_hash, provider_name, model_name)
+            if cached:
+                self.logger.info(f"Using stored character analysis for {book_hash}")
+                return cached
+
         try:
             self.logger.info(f"Starting character analysis for book: {book.title or 'Unknown'}")
 
-            # Phase 1: Extract all character mentions
-            raw_characters = await self._extract_all_characters(book_text)
-            self.logger.info(f"Extracted {len(raw_characters)} raw character mentions")
+            # Phase 1: Extract all character mentions (or resume from checkpoint)
+            checkpoint = None
+            if self.analysis_store:
+                checkpoint = self.analysis_store.get_partial(book_hash, provider_name, model_name)
+
+            if checkpoint and checkpoint.get("stage") == "extracted":
+                raw_characters = checkpoint.get("raw_characters", [])
+                self.logger.info(
+                    f"Resuming from checkpoint with {len(raw_characters)} extracted characters"
+                )
+            else:
+                with usage_scope(stage="extraction", book=book.title or book_hash):
+                    if batch_mode_requested(self.config):
+                        raw_characters = await self._extract_all_characters_batch(
+                            book_text, book.title or book_hash
+                        )
+                    else:
+                        raw_characters = await self._extract_all_characters(book_text)
+                self.logger.info(f"Extracted {len(raw_characters)} raw character mentions")
+                if self.analysis_store and raw_characters:
+                    self.analysis_store.put_partial(
+                        book_hash,
+                        provider_name,
+                        model_name,
+                        stage="extracted",
+                        data={"raw_characters": raw_characters},
+                    )
 
             # Phase 2: Group similar characters efficiently
             character_groups = self._group_similar_characters(raw_characters)
             self.logger.info(f"Created {len(character_groups)} character groups")
 
-            # Phase 3: Merge groups using LLM
-            final_characters = await self._merge_character_groups(character_groups)
+            # Phase 3: Infer genders locally from pronoun statistics
+            gender_estimates = {}
+            if self.gender_inference_config["enabled"]:
+                gender_estimates = await asyncio.to_thread(
+                    self._infer_genders_locally, book, character_groups
+                )
+
+            # Phase 4: Merge groups (LLM only where local evidence is not enough)
+            merge_stats = {"local_gender": 0, "llm_merges_skipped": 0}
+            with usage_scope(stage="merge", book=book.title or book_hash):
+                final_characters = await self._merge_character_groups(
+                    character_groups, gender_estimates, merge_stats
+                )
             self.logger.info(f"Final character count: {len(final_characters)}")
 
+            metadata = self._calculate_metadata(final_characters)
+            if self.gender_inference_config["enabled"]:
+                metadata["gender_inference"] = merge_stats
+
             # Create analysis result
-            return CharacterAnalysis(
-                book_id=book.hash(),  # Use book hash as ID
+            analysis = CharacterAnalysis(
+                book_id=book_hash,  # Use book hash as ID
                 characters=final_characters,
-                metadata=self._calculate_metadata(final_characters),
+                metadata=metadata,
+                provider=provider_name,
+                model=model_name,
             )
 
+            # Only persist useful results; an empty cast usually means extraction failed
+            if self.analysis_store and final_characters:
+                self.analysis_store.put(analysis, provider_name, model_name, book_title=book.title)
+
+            return analysis
+
         except (ValidationError, CharacterExtractionError, ConfigurationError):
             # Re-raise our custom errors
             raise
@@ -258,9 +332,10 @@ class CharacterService(BaseService):
         seen_names = set()
         unique_characters = []
 
-        # Process chunks with limited concurrency to avoid overwhelming the API
-        # Use batch size of 1 for OpenAI to avoid rate limiting
-        max_concurrent = 1 if 'openai' in str(type(self.provider)).lower() else 3
+        # Process chunks with limited concurrency to avoid overwhelming the API.
+        # Providers adapt their own request parallelism (shared across
+        # services), so only the fan-out is capped here
+        max_concurrent = self.config.max_concurrent
 
         async def process_chunk_batch(batch_chunks: list[tuple[int, str]]):
             """Process a batch of chunks concurrently."""
@@ -324,10 +399,6 @@ class CharacterService(BaseService):
             if progress_bar:
                 progress_bar.update(batch_end - batch_start)
 
-            # Add a small delay between batches to avoid rate limiting
-            if batch_end < len(chunks):
-                await asyncio.sleep(1)
-
         if progress_bar:
             progress_bar.close()
 
@@ -426,41 +497,108 @@ class CharacterService(BaseService):
 
         for attempt in range(self.extraction_config["max_retries"]):
             try:
-                response = await self._complete_with_retry(
-                    prompt, temperature=self.extraction_config["temperature"]
-                )
+                # Re-asks for unusable responses are accounted as retries
+                with usage_scope(stage="retries" if attempt else None):
+                    response = await self._complete(
+                        prompt, temperature=self.extraction_config["temperature"]
+                    )
 
-                characters = self._parse_json_response(response)
-
-                # Handle different response formats
-                if isinstance(characters, dict):
-                    # Expected format: {"characters": [...]}
-                    characters = characters.get("characters", [])
-                elif not isinstance(characters, list):
-                    # Unexpected format
-                    self.logger.warning(f"Unexpected response type: {type(characters)}")
-                    characters = []
-
-                # Validate and add metadata
-                valid_chars = []
-                for char in characters:
-                    if isinstance(char, dict) and char.get("name"):
-                        # Ensure required fields
-                        char.setdefault("gender", "unknown")
-                        char.setdefault("pronouns", "")
-                        char.setdefault("description", "")
-                        char.setdefault("aliases", [])
-                        char.setdefault("titles", [])
-                        char["chunk_index"] = chunk_index
-                        valid_chars.append(char)
-
-                return valid_chars
+                return self._characters_from_response(response, chunk_index)
 
             except Exception as e:
-                if attempt == self.extraction_config["max_retries"] - 1:
+                # Provider failures were already retried (or are not retryable);
+                # only an unusable response is worth asking again
+                last_attempt = attempt == self.extraction_config["max_retries"] - 1
+                if last_attempt or classify_error(e) is not ErrorKind.UNKNOWN:
                     self.logger.error(f"Failed to extract from chunk {chunk_index}: {e}")
                     return []
-                await asyncio.sleep(2**attempt)  # Exponential backoff
+                self.logger.warning(f"Retrying chunk {chunk_index} after bad response: {e}")
+
+    def _characters_from_response(self, response: str, chunk_index: int) -> list[dict]:
+        """
+        Parse and validate an extraction response.
+
+        Args:
+            response: Completion text
+            chunk_index: Index of the chunk it answers
+
+        Returns:
+            List of character dictionaries with required fields filled in
+        """
+        characters = self._parse_json_response(response)
+
+        # Handle different response formats
+        if isinstance(characters, dict):
+            # Expected format: {"characters": [...]}
+            characters = characters.get("characters", [])
+        elif not isinstance(characters, list):
+            # Unexpected format
+            self.logger.warning(f"Unexpected response type: {type(characters)}")
+            characters = []
+
+        # Validate and add metadata
+        valid_chars = []
+        for char in characters:
+            if isinstance(char, dict) and char.get("name"):
+                # Ensure required fields
+                char.setdefault("gender", "unknown")
+                char.setdefault("pronouns", "")
+                char.setdefault("description", "")
+                char.setdefault("aliases", [])
+                char.setdefault("titles", [])
+                char["chunk_index"] = chunk_index
+                valid_chars.append(char)
+
+        return valid_chars
+
+    async def _extract_all_characters_batch(self, text: str, label: str) -> list[dict[str, Any]]:
+        """
+        Extract raw character mentions with one batch job over all chunks.
+
+        Chunks whose batch answer is missing or unusable are extracted live.
+
+        Args:
+            text: Book text
+            label: Job label (book title or hash)
+
+        Returns:
+            List of raw character dictionaries
+        """
+        chunks = await asyncio.to_thread(self._create_chunks, text)
+        requests = []
+        for i, chunk in enumerate(chunks):
+            messages, kwargs = self._completion_request(
+                EXTRACTION_PROMPT_TEMPLATE.format(text=chunk),
+                temperature=self.extraction_config["temperature"],
+            )
+            requests.append(BatchRequest(f"chunk-{i}", messages, kwargs))
+
+        self.logger.info(f"Submitting {len(requests)} extraction chunks as one batch job")
+        runner = create_batch_runner(self.provider, self.config.get("batch_dir"))
+        results = await runner.run(requests, label=f"{label}-extraction")
+
+        seen_names = set()
+        unique_characters = []
+        for i, chunk in enumerate(chunks):
+            result = results.get(f"chunk-{i}")
+            characters = None
+            if result is not None and result.ok:
+                try:
+                    characters = self._characters_from_response(result.text, i)
+                except Exception as e:
+                    self.logger.warning(f"Unusable batch answer for chunk {i}: {e}")
+            if characters is None:
+                characters = await self._extract_from_chunk(chunk, i)
+
+            # Same early deduplication and cap as _extract_all_characters
+            for char in characters:
+                char_name = char.get("name", "").lower().strip()
+                if char_name and char_name not in seen_names and len(unique_characters) < 1000:
+                    seen_names.add(char_name)
+                    unique_characters.append(char)
+
+        self.logger.info(f"Extracted {len(unique_characters)} unique characters from batch job")
+        return unique_characters
 
     # === GROUPING METHODS ===
 
@@ -637,29 +775,148 @@ class CharacterService(BaseService):
 
     # === MERGING METHODS ===
 
-    async def _merge_character_groups(self, groups: list[list[dict]]) -> list[Character]:
+    async def _merge_character_groups(
+        self,
+        groups: list[list[dict]],
+        gender_estimates: Optional[dict[str, GenderEstimate]] = None,
+        stats: Optional[dict[str, int]] = None,
+    ) -> list[Character]:
         """
         Use LLM to intelligently merge character groups.
 
+        Groups whose members are clearly the same person and whose gender is
+        settled by local pronoun statistics are merged without an LLM call.
+        Extraction still returns a gender for every character (names are not
+        known before it runs); a confident local estimate overrides it.
+
         Args:
             groups: List of character groups
+            gender_estimates: Optional local gender estimates keyed by raw name
+            stats: Optional counters updated with local-inference usage
 
         Returns:
             List of final Character objects
         """
+        gender_estimates = gender_estimates or {}
+        stats = stats if stats is not None else {}
+        threshold = self.gender_inference_config["confidence_threshold"]
         final_characters = []
 
         for group in groups:
+            member_estimates = [
+                gender_estimates[c.get("name")] for c in group if c.get("name") in gender_estimates
+            ]
+            estimate = (
+                GenderEstimate.combine(group[0].get("name", ""), member_estimates)
+                if member_estimates
+                else None
+            )
+
             if len(group) == 1:
                 # Single character, no merging needed
-                final_characters.append(self._dict_to_character(group[0]))
+                character = self._dict_to_character(group[0])
+            elif self._can_merge_locally(group, member_estimates, threshold):
+                character = self._merge_group_locally(group)
+                stats["llm_merges_skipped"] = stats.get("llm_merges_skipped", 0) + 1
             else:
                 # Need LLM to determine if these are the same character
-                merged = await self._merge_group_with_llm(group)
-                final_characters.append(merged)
+                character = await self._merge_group_with_llm(group)
+
+            if estimate and estimate.is_confident(threshold):
+                self._apply_gender_estimate(character, estimate)
+                stats["local_gender"] = stats.get("local_gender", 0) + 1
+
+            final_characters.append(character)
 
         return final_characters
 
+    def _infer_genders_locally(
+        self, book: Book, groups: list[list[dict]]
+    ) -> dict[str, GenderEstimate]:
+        """
+        Run local gender inference for every extracted character.
+
+        Args:
+            book: Book being analyzed
+            groups: Character groups from the grouping phase
+
+        Returns:
+            Gender estimates keyed by raw character name
+        """
+        names = {}
+        for group in groups:
+            for char in group:
+                name = char.get("name")
+                if name:
+                    names[name] = [name] + [a for a in char.get("aliases", []) if a]
+        return self.gender_inference.infer(book, names)
+
+    def _can_merge_locally(
+        self, group: list[dict], estimates: list[GenderEstimate], threshold: float
+    ) -> bool:
+        """
+        Check whether a group can be merged without asking the LLM.
+
+        Requires every member name to be a subset of the most complete name
+        (e.g. "Elizabeth" and "Miss Elizabeth Bennet") and all members with
+        evidence to agree on a confidently inferred gender.
+        """
+        if not self.gender_inference_config["enabled"] or not estimates:
+            return False
+
+        canonical = max(group, key=lambda c: len(c.get("name", "")))
+        canonical_tokens = self._tokenize_name(canonical.get("name", ""))
+        for char in group:
+            tokens = self._tokenize_name(char.get("name", ""))
+            if not tokens or not tokens <= canonical_tokens:
+                return False
+
+        pooled = GenderEstimate.combine(canonical.get("name", ""), estimates)
+        if not pooled.is_confident(threshold):
+            return False
+        return all(e.gender in (pooled.gender, Gender.UNKNOWN) for e in estimates)
+
+    def _merge_group_locally(self, group: list[dict]) -> Character:
+        """
+        Merge a group of aliases of one character without the LLM.
+
+        Args:
+            group: List of character dictionaries
+
+        Returns:
+            Merged Character object
+        """
+        canonical = max(group, key=lambda c: len(c.get("name", "")))
+        aliases = []
+        for char in group:
+            for name in [char.get("name", "")] + list(char.get("aliases", [])):
+                if name and name != canonical.get("name") and name not in aliases:
+                    aliases.append(name)
+
+        character = self._dict_to_character(canonical)
+        character.aliases = aliases
+        character.description = next(
+            (c.get("description") for c in group if c.get("description")), ""
+        )
+        return character
+
+    def _apply_gender_estimate(self, character: Character, estimate: GenderEstimate) -> None:
+        """
+        Apply a confident local gender estimate to a character.
+
+        Args:
+            character: Character to update
+            estimate: Confident local estimate
+        """
+        if character.gender != estimate.gender:
+            self.logger.debug(
+                f"Local inference sets {character.name} to {estimate.gender.value} "
+                f"(was {character.gender.value}, confidence {estimate.confidence:.2f})"
+            )
+            character.gender = estimate.gender
+            character.pronouns = "he/him/his" if estimate.gender == Gender.MALE else "she/her/hers"
+        character.confidence = round(estimate.confidence, 3)
+
     async def _merge_group_with_llm(self, group: list[dict]) -> Character:
         """
         Use LLM to merge a group of potentially similar characters.
@@ -676,7 +933,7 @@ class CharacterService(BaseService):
         prompt = MERGE_PROMPT_TEMPLATE.format(characters=group_desc)
 
         try:
-            response = await self._complete_with_retry(
+            response = await self._complete(
                 prompt, temperature=self.merging_config["temperature"]
             )
 
@@ -718,9 +975,11 @@ class CharacterService(BaseService):
 
     # === UTILITY METHODS ===
 
-    async def _complete_with_retry(self, prompt: str, temperature: float = 0.7) -> str:
+    async def _complete(self, prompt: str, temperature: float = 0.7) -> str:
         """
-        Complete prompt with exponential backoff retry.
+        Complete a prompt with the analysis system message.
+
+        Transient provider failures are retried by the provider's retry layer.
 
         Args:
             prompt: Prompt to complete
@@ -729,39 +988,45 @@ class CharacterService(BaseService):
         Returns:
             Completion text
         """
+        messages, kwargs = self._completion_request(prompt, temperature)
+        return await self.provider.complete(messages, **kwargs)
+
+    def _completion_request(
+        self, prompt: str, temperature: float = 0.7
+    ) -> tuple[list[dict[str, str]], dict[str, Any]]:
+        """
+        Messages and parameters for an analysis prompt (live or batch).
+
+        Args:
+            prompt: Prompt to complete
+            temperature: Temperature for completion
+
+        Returns:
+            Tuple of (messages, completion kwargs)
+        """
         messages = [
             {"role": "system", "content": "You are a literary analysis expert."},
             {"role": "user", "content": prompt},
         ]
 
-        for attempt in range(self.extraction_config["max_retries"]):
-            try:
-                # Only use JSON mode if provider supports it
-                # Our new prompts already explicitly request JSON
-                kwargs = {}
-
-                # Some models like gpt-5-mini only support temperature=1.0
-                # Check if the model has this limitation
-                model_name = getattr(self.provider, 'model', '')
-                if 'gpt-5-mini' in model_name or 'gpt-5-nano' in model_name:
-                    # These models only support temperature=1.0
-                    kwargs["temperature"] = 1.0
-                else:
-                    kwargs["temperature"] = temperature
+        # Only use JSON mode if provider supports it
+        # Our new prompts already explicitly request JSON
+        kwargs = {}
 
-                if hasattr(self.provider, "supports_json") and self.provider.supports_json:
-                    # For providers that support JSON mode, use it
-                    kwargs["response_format"] = "json_object"
+        # Some models like gpt-5-mini only support temperature=1.0
+        # Check if the model has this limitation
+        model_name = getattr(self.provider, 'model', '')
+        if 'gpt-5-mini' in model_name or 'gpt-5-nano' in model_name:
+            # These models only support temperature=1.0
+            kwargs["temperature"] = 1.0
+        else:
+            kwargs["temperature"] = temperature
 
-                response = await self.provider.complete(messages, **kwargs)
-                return response
+        if hasattr(self.provider, "supports_json") and self.provider.supports_json:
+            # For providers that support JSON mode, use it
+            kwargs["response_format"] = "json_object"
 
-            except Exception as e:
-                if attempt == self.extraction_config["max_retries"] - 1:
-                    raise
-                wait_time = 2**attempt
-                self.logger.warning(f"Retry {attempt + 1} after {wait_time}s: {e}")
-                await asyncio.sleep(wait_time)
+        return messages, kwargs
 
     def _parse_json_response(self, response: str) -> Any:
         """
@@ -971,6 +1236,8 @@ class CharacterService(BaseService):
 
         Returns list of dicts: [{"original": ..., "suggested": ..., "character_id": ...}]
         Only returns characters whose gender actually changes for this transform type.
+        Suggestions are memoized on disk per (name, gender, transform type, style
+        context), so only characters without a stored answer reach the LLM.
         """
         from src.models.transformation import TransformType
 
@@ -1004,6 +1271,56 @@ class CharacterService(BaseService):
         if not chars_needing_changes:
             return []
 
+        # Serve what we can from the on-disk memo; only ask the LLM for the rest
+        store = self.analysis_store
+        keys = {}
+        cached = {}
+        for char in chars_needing_changes:
+            gender_val = char.gender.value if hasattr(char.gender, "value") else str(char.gender)
+            keys[char.name] = AnalysisStore.suggestion_key(
+                char.name, gender_val, transform_type.value, style_context
+            )
+            entry = store.get_name_suggestion(keys[char.name]) if store else None
+            if entry is not None and entry.get("suggested"):
+                cached[char.name] = entry
+
+        misses = [char for char in chars_needing_changes if char.name not in cached]
+        fresh = []
+        if misses:
+            fresh = await self._request_name_suggestions(misses, transform_type, style_context)
+            if fresh is None:
+                fresh = []
+            elif store:
+                # Only answers are memoized: a character the LLM left out is asked again
+                by_original = {item["original"].lower(): item for item in fresh}
+                store.put_name_suggestions(
+                    {
+                        keys[char.name]: by_original[char.name.lower()]
+                        for char in misses
+                        if char.name.lower() in by_original
+                    }
+                )
+
+        # In cast order, wherever each answer came from; answers naming no one asked go last
+        fresh_by_name = {}
+        for item in fresh:
+            fresh_by_name.setdefault(item["original"].lower(), item)
+        result = []
+        for char in chars_needing_changes:
+            if char.name in cached:
+                result.append(dict(cached[char.name]))
+            elif char.name.lower() in fresh_by_name:
+                result.append(fresh_by_name[char.name.lower()])
+        placed = {id(item) for item in result}
+        return result + [item for item in fresh if id(item) not in placed]
+
+    async def _request_name_suggestions(
+        self, chars_needing_changes: list[Character], transform_type: Any, style_context: str
+    ) -> Optional[list[dict[str, str]]]:
+        """Ask the LLM for name suggestions.
+
+        Returns the validated suggestions, or None if the request or parsing failed.
+        """
         # Build character list for prompt
         char_lines = []
         for char in chars_needing_changes:
@@ -1032,7 +1349,8 @@ Rules:
 Return ONLY the JSON array."""
 
         try:
-            response = await self._complete_with_retry(prompt, temperature=0.5)
+            with usage_scope(stage="suggestions"):
+                response = await self._complete(prompt, temperature=0.5)
             parsed = self._parse_json_response(response)
 
             # Handle both list and dict responses
@@ -1042,10 +1360,10 @@ Return ONLY the JSON array."""
                         parsed = parsed[key]
                         break
                 else:
-                    return []
+                    return None
 
             if not isinstance(parsed, list):
-                return []
+                return None
 
             # Validate and clean each entry
             result = []
@@ -1063,4 +1381,4 @@ Return ONLY the JSON array."""
             return result
 
         except Exception:
-            return []
+            return None
@@ -0,0 +1,433 @@
+"""
+Corpus Ingestion
+
+Parses whole directories of plain-text books (e.g. a Gutenberg mirror)
+into canonical books, spreading the work over a process pool.
+
+Each file is hashed in the parent process. Files whose content hash was
+already ingested to every requested output (canonical JSON, the cache)
+according to the manifest are skipped, and so are duplicates within the
+run. The remaining files are parsed by worker
+processes, which write their results directly to canonical JSON and/or
+the parsed-book cache. Only a small manifest record per file comes back
+to the parent.
+
+The manifest is an append-only JSONL file with one record per attempt:
+format, confidence, chapter/paragraph/sentence counts, per-stage timings
+and the error for failures. Records are flushed as files finish, so an
+interrupted run resumes where it stopped. Files whose path, size and
+mtime match an earlier successful record that wrote the requested
+outputs are skipped without rehashing.
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from src.services.book_cache import BookCache, content_hash
+from src.utils.json_io import dump
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# Files at least this large are parsed through the streaming parser
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class IngestSummary:
+    """Outcome of one corpus ingestion run."""
+
+    manifest_path: Path
+    ingested: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.ingested + self.skipped + self.failed
+
+
+def find_sources(paths: Iterable[Union[str, Path]], pattern: str = "*.txt") -> list[Path]:
+    """
+    Expand files and directories into a sorted list of source files.
+
+    Args:
+        paths: Files, or directories searched recursively
+        pattern: Glob for files inside directories
+
+    Returns:
+        Source files, without duplicates
+    """
+    found = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.update(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            found.add(path)
+        else:
+            logger.warning(f"Skipping missing path: {path}")
+    return sorted(found)
+
+
+def load_manifest(manifest_path: Union[str, Path]) -> dict[str, dict[str, Any]]:
+    """
+    Read a manifest, keeping the latest record per source path.
+
+    Args:
+        manifest_path: JSONL manifest
+
+    Returns:
+        Map of source path to its latest record
+    """
+    records: dict[str, dict[str, Any]] = {}
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write can leave a truncated last line
+                    continue
+                if isinstance(record, dict) and "path" in record:
+                    records[record["path"]] = record
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def ingest_file(
+    path: str,
+    digest: str,
+    json_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    compact: bool = False,
+) -> dict[str, Any]:
+    """
+    Parse one file to a canonical book and write it out (runs in a worker).
+
+    Args:
+        path: Source text file
+        digest: Content hash of the file
+        json_path: Where to write canonical JSON (None to skip)
+        cache_dir: BookCache directory to store the book in (None to skip)
+        compact: Write the JSON without indentation
+
+    Returns:
+        Manifest record for the file
+    """
+    from src.parsers.book_converter import BookConverter
+    from src.parsers.parser import IntegratedParser
+    from src.parsers.streaming import StreamingParser
+
+    record: dict[str, Any] = {"path": path, "hash": digest}
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        source = Path(path)
+        stat = source.stat()
+        record.update({"size": stat.st_size, "mtime": stat.st_mtime})
+
+        t = time.perf_counter()
+        if stat.st_size >= STREAMING_THRESHOLD:
+            with StreamingParser().parse_file(source, errors="ignore") as streamed:
+                parsed = streamed.to_parsed_book()
+        else:
+            with open(source, encoding="utf-8", errors="ignore") as f:
+                parsed = IntegratedParser().parse(f.read())
+        timings["parse"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        book = BookConverter().convert(parsed)
+        book.source_file = path
+        timings["convert"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        if json_path:
+            output = Path(json_path)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                dump(book.to_dict(lazy=True), f, compact=compact)
+            os.replace(tmp_path, output)
+            record["output"] = json_path
+        if cache_dir:
+            record["cache"] = str(BookCache(cache_dir).put(digest, book))
+        timings["write"] = time.perf_counter() - t
+
+        record.update(
+            {
+                "status": STATUS_OK,
+                "title": book.title,
+                "author": book.author,
+                "format": parsed.format.value,
+                "format_confidence": parsed.format_confidence,
+                "chapters": len(book.chapters),
+                "paragraphs": sum(len(c.paragraphs) for c in book.chapters),
+                "sentences": sum(p.sentence_count() for c in book.chapters for p in c.paragraphs),
+            }
+        )
+    except Exception as e:
+        record.update({"status": STATUS_FAILED, "error": f"{type(e).__name__}: {e}"})
+
+    timings["total"] = time.perf_counter() - started
+    record["timings"] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    return record
+
+
+class CorpusIngestor:
+    """
+    Parses a corpus of text files in parallel, restartably.
+
+    Usage:
+        ingestor = CorpusIngestor(json_dir="books/json/corpus", workers=8)
+        summary = ingestor.run(["mirror/"])
+    """
+
+    def __init__(
+        self,
+        json_dir: Optional[Union[str, Path]] = None,
+        cache: Optional[BookCache] = None,
+        manifest_path: Optional[Union[str, Path]] = None,
+        workers: Optional[int] = None,
+        retry_failed: bool = True,
+        compact_json: bool = False,
+    ):
+        """
+        Initialize the ingestor.
+
+        Args:
+            json_dir: Directory for canonical JSON (mirrors the source layout)
+            cache: Parsed-book cache to store books in
+            manifest_path: Manifest file. Defaults to manifest.jsonl in json_dir,
+                or in the cache directory.
+            workers: Worker processes (default: CPU count)
+            retry_failed: Re-attempt files whose last record is a failure
+            compact_json: Write canonical JSON without indentation
+
+        Raises:
+            ValueError: If neither json_dir nor cache is given
+        """
+        if json_dir is None and cache is None:
+            raise ValueError("Corpus ingestion needs json_dir, cache, or both")
+        self.json_dir = Path(json_dir) if json_dir is not None else None
+        self.cache = cache
+        default_dir = self.json_dir if self.json_dir is not None else cache.root
+        self.manifest_path = Path(manifest_path or default_dir / MANIFEST_FILE)
+        self.workers = workers or os.cpu_count() or 1
+        self.retry_failed = retry_failed
+        self.compact_json = compact_json
+
+    def run(
+        self,
+        paths: Iterable[Union[str, Path]],
+        pattern: str = "*.txt",
+        on_record: Optional[Callable[[dict[str, Any]], None]] = None,
+    ) -> IngestSummary:
+        """
+        Ingest every source file under the given paths.
+
+        Args:
+            paths: Files and/or directories
+            pattern: Glob for files inside directories
+            on_record: Called with each new manifest record (e.g. for progress)
+
+        Returns:
+            IngestSummary for this run
+        """
+        started = time.perf_counter()
+        summary = IngestSummary(manifest_path=self.manifest_path)
+        paths = [Path(p) for p in paths]
+        sources = find_sources(paths, pattern)
+        roots = [p for p in paths if p.is_dir()]
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "a", encoding="utf-8") as manifest:
+
+            def record(result: dict[str, Any]):
+                result.setdefault("ingested_at", datetime.now().isoformat())
+                manifest.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                manifest.flush()
+                if result["status"] == STATUS_OK:
+                    summary.ingested += 1
+                else:
+                    summary.failed += 1
+                    summary.failures.append(result["path"])
+                if on_record:
+                    on_record(result)
+
+            jobs = self._pending_jobs(sources, roots, summary)
+            self._run_pool(jobs, record)
+
+        summary.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Corpus ingestion: {summary.ingested} ingested, {summary.skipped} skipped, "
+            f"{summary.failed} failed in {summary.elapsed:.1f}s"
+        )
+        return summary
+
+    def _pending_jobs(
+        self, sources: list[Path], roots: list[Path], summary: IngestSummary
+    ) -> Iterator[tuple[str, str, Optional[str], Optional[str]]]:
+        """Hash sources lazily and yield the ones still to ingest."""
+        previous = load_manifest(self.manifest_path)
+        requested = self._requested_outputs()
+        # Outputs of this run's kinds already written per content hash
+        written: dict[str, set[str]] = {}
+        for r in previous.values():
+            if r.get("status") == STATUS_OK:
+                written.setdefault(r["hash"], set()).update(self._written_outputs(r))
+        given_up = set()
+        if not self.retry_failed:
+            given_up = {r["hash"] for r in previous.values() if r.get("hash")}
+
+        for source in sources:
+            key = str(source)
+            stat = source.stat()
+            earlier = previous.get(key)
+            if (
+                earlier
+                and earlier.get("status") == STATUS_OK
+                and earlier.get("size") == stat.st_size
+                and earlier.get("mtime") == stat.st_mtime
+                and requested <= self._written_outputs(earlier)
+            ):
+                # Unchanged since it was ingested to every requested output: skip without rehashing
+                summary.skipped += 1
+                continue
+
+            digest = content_hash(source)
+            if requested <= written.get(digest, set()) or digest in given_up:
+                summary.skipped += 1
+                continue
+            # Later copies of the same content in this run are skipped too
+            written.setdefault(digest, set()).update(requested)
+
+            yield (
+                key,
+                digest,
+                str(self._json_path(source, roots, digest)) if self.json_dir is not None else None,
+                str(self.cache.root) if self.cache is not None else None,
+            )
+
+    def _requested_outputs(self) -> set[str]:
+        """Output kinds this run writes: "json" and/or "cache"."""
+        outputs = set()
+        if self.json_dir is not None:
+            outputs.add("json")
+        if self.cache is not None:
+            outputs.add("cache")
+        return outputs
+
+    def _written_outputs(self, record: dict[str, Any]) -> set[str]:
+        """Output kinds a manifest record wrote to this run's JSON directory and cache."""
+        outputs = set()
+        output = record.get("output")
+        if self.json_dir is not None and output and Path(output).is_relative_to(self.json_dir):
+            outputs.add("json")
+        if self.cache is not None and record.get("cache") == str(
+            self.cache.path_for(record["hash"])
+        ):
+            outputs.add("cache")
+        return outputs
+
+    def _json_path(self, source: Path, roots: list[Path], digest: str) -> Path:
+        """Output path mirroring the source's location under its corpus root."""
+        for root in roots:
+            try:
+                return (self.json_dir / source.relative_to(root)).with_suffix(".json")
+            except ValueError:
+                continue
+        # Files given outside any directory share one folder; the hash keeps equal stems apart
+        return self.json_dir / f"{source.stem}-{digest[:8]}.json"
+
+    def _run_pool(
+        self,
+        jobs: Iterator[tuple[str, str, Optional[str], Optional[str]]],
+        record: Callable[[dict[str, Any]], None],
+    ) -> None:
+        """Keep the pool busy with a bounded number of files in flight."""
+        max_in_flight = self.workers * 2
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        in_flight: dict[Future, tuple[str, str]] = {}
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(ingest_file, *job, compact=self.compact_json)] = job[
+                        :2
+                    ]
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    path, digest = in_flight.pop(future)
+                    try:
+                        record(future.result())
+                    except BrokenProcessPool as e:
+                        # A worker died (e.g. out of memory); the file is marked failed
+                        broken = True
+                        record(
+                            {"path": path, "hash": digest, "status": STATUS_FAILED, "error": str(e)}
+                        )
+                if broken:
+                    for path, digest in in_flight.values():
+                        record(
+                            {
+                                "path": path,
+                                "hash": digest,
+                                "status": STATUS_FAILED,
+                                "error": "worker pool crashed",
+                            }
+                        )
+                    in_flight.clear()
+                    executor.shutdown(cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=self.workers)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def ingest_corpus(
+    paths: Iterable[Union[str, Path]],
+    json_dir: Optional[Union[str, Path]] = None,
+    cache: Optional[BookCache] = None,
+    workers: Optional[int] = None,
+    manifest_path: Optional[Union[str, Path]] = None,
+    pattern: str = "*.txt",
+) -> IngestSummary:
+    """
+    Convenience function to ingest a corpus.
+
+    Args:
+        paths: Files and/or directories of text books
+        json_dir: Directory for canonical JSON
+        cache: Parsed-book cache to store books in
+        workers: Worker processes (default: CPU count)
+        manifest_path: Manifest file (see CorpusIngestor)
+        pattern: Glob for files inside directories
+
+    Returns:
+        IngestSummary for this run
+    """
+    ingestor = CorpusIngestor(json_dir, cache, manifest_path, workers)
+    return ingestor.run(paths, pattern)
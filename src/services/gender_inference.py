@@ -0,0 +1,382 @@
+"""
+Local Gender Inference
+
+Deterministic, LLM-free gender inference from pronoun statistics.
+
+Given a parsed book and the extracted character names, each mention is
+attributed evidence from gendered titles ("Mr.", "Lady"), appositive nouns
+("Jane, the eldest daughter"), nearby third-person pronouns in a small
+sentence window, and speaker tags ("she said") in dialogue paragraphs.
+Quoted speech is masked out first so pronouns inside dialogue, which
+usually refer to someone else, are not credited to the speaker.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from src.models.book import Book
+from src.models.character import Gender
+
+logger = logging.getLogger(__name__)
+
+# Evidence weights
+TITLE_WEIGHT = 3.0
+APPOSITIVE_WEIGHT = 1.5
+SPEAKER_TAG_WEIGHT = 2.0
+SUBJECT_PRONOUN_WEIGHT = 1.0
+POSSESSIVE_PRONOUN_WEIGHT = 0.5
+WINDOW_DECAY = 0.7
+
+MALE_TITLES = {
+    "mr",
+    "sir",
+    "lord",
+    "master",
+    "king",
+    "prince",
+    "duke",
+    "earl",
+    "count",
+    "baron",
+    "monsieur",
+    "herr",
+    "signor",
+    "señor",
+    "don",
+    "father",
+    "uncle",
+    "brother",
+}
+FEMALE_TITLES = {
+    "mrs",
+    "miss",
+    "ms",
+    "lady",
+    "madam",
+    "madame",
+    "mistress",
+    "dame",
+    "queen",
+    "princess",
+    "duchess",
+    "countess",
+    "baroness",
+    "mademoiselle",
+    "frau",
+    "signora",
+    "señora",
+    "doña",
+    "mother",
+    "aunt",
+    "sister",
+}
+MALE_NOUNS = {
+    "man",
+    "boy",
+    "gentleman",
+    "husband",
+    "son",
+    "father",
+    "brother",
+    "uncle",
+    "nephew",
+    "king",
+    "prince",
+    "lord",
+    "fellow",
+    "lad",
+    "widower",
+    "grandfather",
+    "bachelor",
+}
+FEMALE_NOUNS = {
+    "woman",
+    "girl",
+    "lady",
+    "wife",
+    "daughter",
+    "mother",
+    "sister",
+    "aunt",
+    "niece",
+    "queen",
+    "princess",
+    "maid",
+    "lass",
+    "widow",
+    "grandmother",
+    "spinster",
+    "mistress",
+}
+SPEECH_VERBS = (
+    "said|says|replied|cried|asked|answered|exclaimed|whispered|continued|added|"
+    "returned|observed|remarked|muttered|called|shouted|began|rejoined"
+)
+
+_QUOTE_RE = re.compile(r"“[^”]*”|\"[^\"]*\"")
+# Sentence/clause boundary that does not split after "Mr.", "Mrs.", initials etc.
+_SENTENCE_RE = re.compile(
+    r"(?<=[.!?;])(?<!\bMr\.)(?<!\bMrs\.)(?<!\bMs\.)(?<!\bDr\.)(?<!\bSt\.)(?<!\b[A-Z]\.)\s+"
+)
+_PRONOUN_RE = re.compile(r"\b(he|she|him|his|her|hers|himself|herself)\b", re.IGNORECASE)
+_LEADING_PRONOUN_RE = re.compile(r"^\W*(he|she)\b", re.IGNORECASE)
+_LEADING_SUBJECT_RE = re.compile(r"\b(?:he|she)\b", re.IGNORECASE)
+_SPEAKER_TAG_RE = re.compile(
+    rf"\x00\s*,?\s*(?:{SPEECH_VERBS})\s+(he|she)\b|\b(he|she)\s+(?:{SPEECH_VERBS})\b",
+    re.IGNORECASE,
+)
+_APPOSITIVE_RE = re.compile(
+    r"^\s*,\s+(?:the|a|an|his|her|their|my|our|your)?\s*(?:[a-z]+\s+)?([a-z]+)\b"
+)
+
+# "him" after a named subject nearly always refers to someone else, so it is
+# ignored; "her" is object-or-possessive and gets the lower weight.
+_PRONOUN_EVIDENCE = {
+    "he": ("male", SUBJECT_PRONOUN_WEIGHT),
+    "himself": ("male", SUBJECT_PRONOUN_WEIGHT),
+    "his": ("male", POSSESSIVE_PRONOUN_WEIGHT),
+    "him": ("male", 0.0),
+    "she": ("female", SUBJECT_PRONOUN_WEIGHT),
+    "herself": ("female", SUBJECT_PRONOUN_WEIGHT),
+    "her": ("female", POSSESSIVE_PRONOUN_WEIGHT),
+    "hers": ("female", POSSESSIVE_PRONOUN_WEIGHT),
+}
+
+
+@dataclass
+class GenderEstimate:
+    """Locally inferred gender for one character."""
+
+    name: str
+    male: float = 0.0
+    female: float = 0.0
+    mentions: int = 0
+    smoothing: float = 2.0
+
+    @property
+    def evidence(self) -> float:
+        """Total weighted evidence."""
+        return self.male + self.female
+
+    @property
+    def distribution(self) -> dict[str, float]:
+        """Smoothed probability of each gender."""
+        total = self.evidence + self.smoothing
+        return {
+            "male": (self.male + self.smoothing / 2) / total,
+            "female": (self.female + self.smoothing / 2) / total,
+        }
+
+    @property
+    def confidence(self) -> float:
+        """Confidence in the leading gender (0-1), penalizing thin evidence."""
+        return abs(self.male - self.female) / (self.evidence + self.smoothing)
+
+    @property
+    def gender(self) -> Gender:
+        """Leading gender, or UNKNOWN without any evidence."""
+        if self.male > self.female:
+            return Gender.MALE
+        if self.female > self.male:
+            return Gender.FEMALE
+        return Gender.UNKNOWN
+
+    def is_confident(self, threshold: float) -> bool:
+        """Whether this estimate is strong enough to skip the LLM."""
+        return self.gender != Gender.UNKNOWN and self.confidence >= threshold
+
+    @classmethod
+    def combine(cls, name: str, estimates: list["GenderEstimate"]) -> "GenderEstimate":
+        """Pool the evidence of several estimates (e.g. a group of aliases)."""
+        combined = cls(name=name)
+        for estimate in estimates:
+            combined.male += estimate.male
+            combined.female += estimate.female
+            combined.mentions += estimate.mentions
+        return combined
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "name": self.name,
+            "gender": self.gender.value,
+            "distribution": self.distribution,
+            "confidence": round(self.confidence, 3),
+            "mentions": self.mentions,
+        }
+
+
+@dataclass
+class _Mention:
+    """A character mention in masked narration text."""
+
+    key: str
+    start: int
+    end: int
+    title: Optional[str] = None
+
+
+@dataclass
+class GenderInferenceEngine:
+    """
+    Infer character genders from pronoun and title statistics.
+
+    Pronouns are only attributed when a sentence mentions exactly one
+    character; the following `window` sentences without any mention credit
+    a leading subject pronoun ("She turned...") to that character with decay.
+    """
+
+    window: int = 2
+    smoothing: float = 2.0
+    _titles: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self._titles = dict.fromkeys(MALE_TITLES, "male")
+        self._titles.update(dict.fromkeys(FEMALE_TITLES, "female"))
+
+    def infer(self, book: Book, names: dict[str, list[str]]) -> dict[str, GenderEstimate]:
+        """
+        Infer a gender estimate per character.
+
+        Args:
+            book: Parsed book
+            names: Map of character key to the surface forms it appears as
+                (name plus aliases). Surface forms shared by several
+                characters are ambiguous and ignored.
+
+        Returns:
+            Map of character key to GenderEstimate
+        """
+        estimates = {key: GenderEstimate(name=key, smoothing=self.smoothing) for key in names}
+        matcher, surfaces = self._build_matcher(names)
+        if matcher is None:
+            return estimates
+
+        for chapter in book.chapters:
+            for paragraph in chapter.paragraphs:
+                self._scan_paragraph(paragraph.get_text(), matcher, surfaces, estimates)
+
+        return estimates
+
+    # === INTERNALS ===
+
+    def _build_matcher(
+        self, names: dict[str, list[str]]
+    ) -> tuple[Optional[re.Pattern], dict[str, str]]:
+        """
+        Compile one alternation over all unambiguous surface forms.
+
+        The title prefix is lazy so a surface that itself starts with a title
+        ("Mrs. Bennet") wins over a shorter one ("Bennet") plus a title.
+        """
+        owners: dict[str, set[str]] = {}
+        for key, forms in names.items():
+            for form in forms:
+                form = (form or "").strip()
+                if len(form) < 2:
+                    continue
+                owners.setdefault(form.lower(), set()).add(key)
+
+        surfaces = {form: next(iter(keys)) for form, keys in owners.items() if len(keys) == 1}
+        if not surfaces:
+            return None, {}
+
+        alternation = "|".join(re.escape(s) for s in sorted(surfaces, key=len, reverse=True))
+        titles = "|".join(re.escape(t) for t in sorted(self._titles, key=len, reverse=True))
+        pattern = re.compile(
+            rf"(?:\b(?P<title>{titles})\.?\s+)??\b(?P<name>{alternation})\b", re.IGNORECASE
+        )
+        return pattern, surfaces
+
+    def _find_mentions(self, text: str, matcher: re.Pattern, surfaces: dict[str, str]):
+        """Find character mentions in a sentence."""
+        mentions = []
+        for match in matcher.finditer(text):
+            surface = match.group("name").lower()
+            key = surfaces.get(surface)
+            if key is None:
+                continue
+            title = (match.group("title") or "").lower() or None
+            if title is None:
+                # Titles can be part of the name itself ("Mrs. Bennet")
+                first = surface.split()[0].rstrip(".")
+                title = first if first in self._titles and " " in surface else None
+            mentions.append(_Mention(key, match.start("name"), match.end("name"), title))
+        return mentions
+
+    def _scan_paragraph(
+        self,
+        text: str,
+        matcher: re.Pattern,
+        surfaces: dict[str, str],
+        estimates: dict[str, GenderEstimate],
+    ) -> None:
+        """Collect evidence from one paragraph."""
+        narration = _QUOTE_RE.sub(" \x00 ", text)
+        sentences = _SENTENCE_RE.split(narration)
+
+        paragraph_keys = set()
+        focus: Optional[str] = None
+        distance = 0
+
+        for sentence in sentences:
+            mentions = self._find_mentions(sentence, matcher, surfaces)
+            keys = {m.key for m in mentions}
+            paragraph_keys |= keys
+
+            for mention in mentions:
+                estimate = estimates[mention.key]
+                estimate.mentions += 1
+                if mention.title:
+                    self._add(estimate, self._titles[mention.title], TITLE_WEIGHT)
+                appositive = _APPOSITIVE_RE.match(sentence[mention.end :])
+                if appositive:
+                    noun = appositive.group(1).lower()
+                    if noun in MALE_NOUNS:
+                        self._add(estimate, "male", APPOSITIVE_WEIGHT)
+                    elif noun in FEMALE_NOUNS:
+                        self._add(estimate, "female", APPOSITIVE_WEIGHT)
+
+            if len(keys) == 1:
+                # Sole named character in the sentence. If a subject pronoun
+                # precedes the first mention, someone else is the subject.
+                first = mentions[0].start
+                if _LEADING_SUBJECT_RE.search(sentence[:first]):
+                    focus = None
+                    continue
+                focus = mentions[0].key
+                distance = 0
+                for match in _PRONOUN_RE.finditer(sentence, mentions[0].end):
+                    gender, weight = _PRONOUN_EVIDENCE[match.group(1).lower()]
+                    self._add(estimates[focus], gender, weight)
+            elif keys:
+                focus = None
+            elif focus is not None:
+                distance += 1
+                if distance > self.window:
+                    focus = None
+                    continue
+                leading = _LEADING_PRONOUN_RE.match(sentence)
+                if leading:
+                    gender, weight = _PRONOUN_EVIDENCE[leading.group(1).lower()]
+                    self._add(estimates[focus], gender, weight * WINDOW_DECAY**distance)
+
+        # Speaker attribution: a pronoun speech tag in a dialogue paragraph
+        # that names a single character refers to that character
+        if len(paragraph_keys) == 1 and "\x00" in narration:
+            speaker = next(iter(paragraph_keys))
+            for match in _SPEAKER_TAG_RE.finditer(narration):
+                pronoun = (match.group(1) or match.group(2)).lower()
+                gender, _ = _PRONOUN_EVIDENCE[pronoun]
+                self._add(estimates[speaker], gender, SPEAKER_TAG_WEIGHT)
+
+    @staticmethod
+    def _add(estimate: GenderEstimate, gender: str, weight: float) -> None:
+        if not weight:
+            return
+        if gender == "male":
+            estimate.male += weight
+        else:
+            estimate.female += weight
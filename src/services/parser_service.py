@@ -6,16 +6,19 @@ the structured Book domain model.
 """
 
 import asyncio
-import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any, Optional, Union
 
 import aiofiles
 
 from src.models.book import Book, Chapter, Paragraph
+from src.parsers.streaming import StreamingParser
 from src.services.base import BaseService, ServiceConfig
+from src.services.book_cache import BookCache, content_hash
 from src.strategies.integrated_parsing import IntegratedParsingStrategy
 from src.strategies.parsing import ParsingStrategy
+from src.utils.json_io import loads, write_json
 
 
 class ParserService(BaseService):
@@ -27,8 +30,15 @@ class ParserService(BaseService):
     - Parses text into structured format
     - Validates the result
     - Converts to domain model
+
+    Text files of at least `streaming_threshold` bytes (config key, default
+    8MB) are parsed from a memory-mapped file instead of being read whole.
+    With `cache_enabled`, parsed books are kept in a BookCache keyed by the
+    file's content hash, so unchanged files are never parsed twice.
     """
 
+    STREAMING_THRESHOLD = 8 * 1024 * 1024
+
     def __init__(
         self, strategy: Optional[ParsingStrategy] = None, config: Optional[ServiceConfig] = None
     ):
@@ -45,7 +55,10 @@ class ParserService(BaseService):
     def _initialize(self):
         """Initialize parser resources."""
         self.validators = []
-        self.format_cache = {}
+        self.book_cache = (
+            BookCache(self.config.get("book_cache_dir")) if self.config.cache_enabled else None
+        )
+        self.cache_hits = 0
 
         # Set up logging
         self.logger.info(f"Initialized {self.__class__.__name__}")
@@ -81,31 +94,99 @@ class ParserService(BaseService):
                 self.logger.info(f"Loading existing JSON file: {input_path}")
                 return await self.parse_json(input_path)
 
-            # Otherwise, parse the text file
-            # Read file
-            raw_data = await self._read_file(input_path)
-
-            # Detect format
-            format_type = await self._detect_format(raw_data)
-            self.logger.info(f"Detected format: {format_type}")
-
-            # Parse using strategy
-            parsed_data = await self.strategy.parse_async(raw_data, format_type)
-
-            # Convert to domain model
-            book = self._create_book_model(parsed_data)
-            book.source_file = str(input_path)
+            # Skip parsing entirely if this exact file was parsed before
+            digest = content_hash(input_path) if self.book_cache else None
+            if digest:
+                book = self.book_cache.get(digest, self._cache_variant())
+                if book is not None:
+                    self.cache_hits += 1
+                    self.logger.info(f"Loaded parsed book from cache: {input_path}")
+                    book.source_file = str(input_path)
+                    return book
+
+            # Large text files are streamed rather than read into memory
+            if self._should_stream(input_path):
+                self.logger.info(f"Streaming large file: {input_path}")
+                loop = asyncio.get_running_loop()
+                book = await loop.run_in_executor(None, self._parse_streaming, input_path)
+            else:
+                book = await self._parse_text_file(input_path)
 
             # Validate result
             errors = self._validate_book(book)
             if errors:
                 self.logger.warning(f"Validation warnings: {errors}")
 
+            if digest:
+                self.book_cache.put(digest, book, self._cache_variant())
+
             return book
 
         except Exception as e:
             self.handle_error(e, {"input_path": str(input_path)})
 
+    async def _parse_text_file(self, input_path: Path) -> Book:
+        """Read a text file into memory and parse it with the strategy."""
+        # Read file
+        raw_data = await self._read_file(input_path)
+
+        # Detect format
+        format_type = await self._detect_format(raw_data)
+        self.logger.info(f"Detected format: {format_type}")
+
+        # Parse using strategy
+        parsed_data = await self.strategy.parse_async(raw_data, format_type)
+
+        # Convert to domain model
+        book = self._create_book_model(parsed_data)
+        book.source_file = str(input_path)
+        return book
+
+    def _cache_variant(self) -> str:
+        """BookCache variant for books produced by this service's strategy."""
+        return f"service-{type(self.strategy).__name__}"
+
+    def _should_stream(self, input_path: Path) -> bool:
+        """Whether a text file is large enough to parse through the streaming path."""
+        if not isinstance(self.strategy, IntegratedParsingStrategy):
+            # Custom strategies only accept the whole text
+            return False
+        threshold = self.config.get("streaming_threshold", self.STREAMING_THRESHOLD)
+        return input_path.stat().st_size >= threshold
+
+    def stream_chapters(self, input_path: Union[str, Path]) -> Iterator[Chapter]:
+        """
+        Parse a text file lazily, yielding chapters as they are parsed.
+
+        Peak memory stays proportional to the largest chapter; see
+        `src.parsers.streaming`.
+
+        Args:
+            input_path: Path to the text file
+
+        Yields:
+            Chapter objects in reading order
+        """
+        with StreamingParser(self.strategy.parser).parse_file(input_path) as streamed:
+            for i, chapter_data in enumerate(streamed.chapters):
+                yield self._create_chapter(chapter_data, i)
+
+    def _parse_streaming(self, input_path: Path) -> Book:
+        """Parse a text file through the streaming parser."""
+        with StreamingParser(self.strategy.parser).parse_file(input_path) as streamed:
+            chapters = [self._create_chapter(data, i) for i, data in enumerate(streamed.chapters)]
+            self.logger.info(f"Detected format: {streamed.format.value}")
+            book = Book(
+                title=streamed.title,
+                author=streamed.author,
+                chapters=chapters,
+                metadata={
+                    k: v for k, v in streamed.metadata.items() if k not in ["title", "author"]
+                },
+            )
+        book.source_file = str(input_path)
+        return book
+
     async def parse_json(self, json_path: Union[str, Path]) -> Book:
         """
         Load a book from JSON file.
@@ -118,11 +199,10 @@ class ParserService(BaseService):
         """
         json_path = Path(json_path)
 
-        async with asyncio.Lock(), aiofiles.open(json_path, encoding="utf-8") as f:
+        async with aiofiles.open(json_path, "rb") as f:
             content = await f.read()
-            data = json.loads(content)
 
-        return Book.from_dict(data)
+        return Book.from_dict(loads(content))
 
     def validate_input(self, input_path: Path) -> bool:
         """
@@ -173,18 +253,7 @@ class ParserService(BaseService):
         Returns:
             Format identifier
         """
-        # Check cache
-        text_hash = hash(text[:1000])  # Hash first 1000 chars
-        if text_hash in self.format_cache:
-            return self.format_cache[text_hash]
-
-        # Detect format
-        format_type = await self.strategy.detect_format_async(text)
-
-        # Cache result
-        self.format_cache[text_hash] = format_type
-
-        return format_type
+        return await self.strategy.detect_format_async(text)
 
     def _create_book_model(self, data: dict) -> Book:
         """
@@ -196,30 +265,10 @@ class ParserService(BaseService):
         Returns:
             Book object
         """
-        chapters = []
-
-        for i, chapter_data in enumerate(data.get("chapters", [])):
-            # Create paragraphs
-            paragraphs = []
-            for para_data in chapter_data.get("paragraphs", []):
-                if isinstance(para_data, dict):
-                    sentences = para_data.get("sentences", [])
-                elif isinstance(para_data, str):
-                    sentences = [para_data]
-                else:
-                    sentences = []
-
-                if sentences:
-                    paragraphs.append(Paragraph(sentences=sentences))
-
-            # Create chapter
-            chapter = Chapter(
-                number=chapter_data.get("number", i + 1),
-                title=chapter_data.get("title"),
-                paragraphs=paragraphs,
-                metadata=chapter_data.get("metadata", {}),
-            )
-            chapters.append(chapter)
+        chapters = [
+            self._create_chapter(chapter_data, i)
+            for i, chapter_data in enumerate(data.get("chapters", []))
+        ]
 
         # Extract metadata
         metadata = data.get("metadata", {})
@@ -235,6 +284,37 @@ class ParserService(BaseService):
             metadata={k: v for k, v in metadata.items() if k not in ["title", "author"]},
         )
 
+    def _create_chapter(self, chapter_data: dict, index: int) -> Chapter:
+        """
+        Convert one parsed chapter to a Chapter model.
+
+        Args:
+            chapter_data: Parsed chapter data
+            index: Position of the chapter in the book
+
+        Returns:
+            Chapter object
+        """
+        # Create paragraphs
+        paragraphs = []
+        for para_data in chapter_data.get("paragraphs", []):
+            if isinstance(para_data, dict):
+                sentences = para_data.get("sentences", [])
+            elif isinstance(para_data, str):
+                sentences = [para_data]
+            else:
+                sentences = []
+
+            if sentences:
+                paragraphs.append(Paragraph(sentences=sentences))
+
+        return Chapter(
+            number=chapter_data.get("number", index + 1),
+            title=chapter_data.get("title"),
+            paragraphs=paragraphs,
+            metadata=chapter_data.get("metadata", {}),
+        )
+
     def _validate_book(self, book: Book) -> list[str]:
         """
         Validate book structure.
@@ -256,22 +336,19 @@ class ParserService(BaseService):
 
         return errors
 
-    async def save_as_json(self, book: Book, output_path: Union[str, Path]) -> None:
+    async def save_as_json(
+        self, book: Book, output_path: Union[str, Path], compact: bool = False
+    ) -> None:
         """
-        Save book as JSON.
+        Save book as JSON, writing one chapter at a time.
 
         Args:
             book: Book to save
             output_path: Output file path
+            compact: Write without indentation or spaces
         """
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        data = book.to_dict()
-        json_content = json.dumps(data, indent=2, ensure_ascii=False)
-
-        async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
-            await f.write(json_content)
+        await asyncio.to_thread(write_json, output_path, book.to_dict(lazy=True), compact=compact)
 
         self.logger.info(f"Saved book to {output_path}")
 
@@ -281,7 +358,8 @@ class ParserService(BaseService):
         metrics.update(
             {
                 "strategy": self.strategy.__class__.__name__,
-                "format_cache_size": len(self.format_cache),
+                "book_cache": str(self.book_cache.root) if self.book_cache else None,
+                "book_cache_hits": self.cache_hits,
             }
         )
         return metrics
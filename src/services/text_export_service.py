@@ -267,14 +267,11 @@ class TextExportService(BaseService):
         Returns:
             Path to created text file
         """
-        import json
-
-        from src.models.book import Book
+        from src.utils.json_io import read_json
 
         # Load JSON
         json_path_obj = Path(json_path)
-        with open(json_path_obj, encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(json_path_obj)
 
         # Create Book object from JSON
         book = Book.from_dict(data)
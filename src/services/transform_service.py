@@ -18,6 +18,12 @@ from src.models.transformation import (
     TransformType,
 )
 from src.providers.base import LLMProvider
+from src.providers.batch import (
+    BatchRequest,
+    BatchResult,
+    batch_mode_requested,
+    create_batch_runner,
+)
 from src.services.base import BaseService, ServiceConfig
 from src.services.prompts import TRANSFORM_BATCH_PROMPT_TEMPLATE, TRANSFORM_SIMPLE_PROMPT_TEMPLATE
 from src.strategies.transform import SmartTransformStrategy, TransformStrategy
@@ -28,6 +34,7 @@ from src.utils.errors import (
     ValidationError,
 )
 from src.utils.token_manager import TokenManager
+from src.utils.usage_accounting import UsageTally, get_usage_accountant, usage_scope
 
 from .character_service import CharacterService
 
@@ -82,6 +89,9 @@ class TransformService(BaseService):
                 self.token_manager = TokenManager()  # Default to GPT-4
 
         self.logger.info(f"Using TokenManager for {self.token_manager.config.name}")
+
+        # Feed the token manager with the usage our provider actually reports
+        get_usage_accountant().add_listener(self._on_provider_usage)
         self.logger.info(f"Initialized {self.__class__.__name__}")
 
     def _get_default_strategy(self) -> TransformStrategy:
@@ -176,6 +186,173 @@ class TransformService(BaseService):
             ValidationError: If input is invalid
             TransformationError: If transformation fails
         """
+        self._validate_transform_request(book, transform_type, selected_characters)
+
+        start_time = time.time()
+
+        # Use the token ratio measured on earlier calls (e.g. character analysis)
+        self.token_manager.recalibrate(getattr(self.provider, "model", None))
+
+        tally = UsageTally()
+        try:
+            with usage_scope(tally=tally):
+                characters, context, name_map = await self._prepare_transform(
+                    book, transform_type, characters, selected_characters, name_map
+                )
+
+            # Transform chapters
+            self.logger.info(f"Transforming {len(book.chapters)} chapters...")
+            book_label = book.title or book.hash()
+            with usage_scope(stage="transform", book=book_label, tally=tally):
+                if batch_mode_requested(self.config):
+                    transformed_chapters, all_changes = await self._transform_chapters_batch(
+                        book.chapters,
+                        context,
+                        name_map=name_map,
+                        on_chapter_complete=on_chapter_complete,
+                        label=book_label,
+                    )
+                else:
+                    transformed_chapters, all_changes = await self._transform_chapters(
+                        book.chapters,
+                        context,
+                        name_map=name_map,
+                        on_chapter_complete=on_chapter_complete,
+                    )
+
+            transformation = self._build_transformation(
+                book, transformed_chapters, all_changes, transform_type, characters,
+                start_time, tally,
+            )
+
+            self.logger.info(
+                f"Transformation complete: {len(all_changes)} changes in "
+                f"{time.time() - start_time:.1f}s"
+            )
+
+            return transformation
+
+        except (ValidationError, TransformationError, ConfigurationError):
+            # Re-raise our custom errors
+            raise
+        except Exception as e:
+            # Convert unexpected errors
+            error = self.error_handler.handle_error(e)
+            self.error_handler.log_error(error)
+            raise TransformationError(
+                f"Transformation failed: {str(e)}",
+                transform_type=transform_type.value,
+                details={
+                    "book_title": book.title or "Unknown",
+                    "processing_time": time.time() - start_time
+                }
+            ) from e
+
+    async def transform_books_batch(
+        self,
+        books: list[Book],
+        transform_type: TransformType,
+        characters: Optional[dict[str, CharacterAnalysis]] = None,
+        name_maps: Optional[dict[str, dict[str, str]]] = None,
+    ) -> list[Transformation]:
+        """
+        Transform several books with a single batch job.
+
+        Every paragraph batch of every book goes into one job file, so a
+        corpus is paid for at the batch price and waits for one job instead
+        of one per book. Only the transformation is batched across books:
+        books without pre-analyzed characters are analyzed first, one at a
+        time, and their character merging runs live (with batch mode on, each
+        book's chunk extraction is a batch job of its own).
+
+        Args:
+            books: Books to transform
+            transform_type: Type of transformation
+            characters: Pre-analyzed characters by book hash (optional)
+            name_maps: Name mappings by book hash (optional)
+
+        Returns:
+            One Transformation per book, in input order
+
+        Raises:
+            ValidationError: If input is invalid
+            TransformationError: If transformation fails
+        """
+        for book in books:
+            self._validate_transform_request(book, transform_type)
+
+        start_time = time.time()
+        self.token_manager.recalibrate(getattr(self.provider, "model", None))
+        characters = characters or {}
+        name_maps = name_maps or {}
+
+        try:
+            prepared = []
+            requests = []
+            for k, book in enumerate(books):
+                book_hash = book.hash()
+                tally = UsageTally()
+                with usage_scope(tally=tally):
+                    book_characters, context, name_map = await self._prepare_transform(
+                        book,
+                        transform_type,
+                        characters.get(book_hash),
+                        None,
+                        name_maps.get(book_hash),
+                    )
+                book_requests, plan = self._plan_batch_requests(
+                    book.chapters, context, prefix=f"b{k}-"
+                )
+                requests.extend(book_requests)
+                prepared.append((book, book_characters, context, name_map, plan, tally))
+
+            self.logger.info(
+                f"Submitting {len(requests)} paragraph batches from {len(books)} books as one batch job"
+            )
+            label = f"{len(books)}-books-{transform_type.value}"
+            with usage_scope(stage="transform"):
+                runner = create_batch_runner(self.provider, self.config.get("batch_dir"))
+                results = await runner.run(requests, label=label)
+
+            transformations = []
+            for book, book_characters, context, name_map, plan, tally in prepared:
+                book_label = book.title or book.hash()
+                with usage_scope(stage="transform", book=book_label, tally=tally):
+                    chapters, changes = await self._assemble_batch_chapters(
+                        book.chapters, plan, results, context, name_map=name_map
+                    )
+                transformations.append(
+                    self._build_transformation(
+                        book, chapters, changes, transform_type, book_characters,
+                        start_time, tally,
+                    )
+                )
+            return transformations
+
+        except (ValidationError, TransformationError, ConfigurationError):
+            raise
+        except Exception as e:
+            error = self.error_handler.handle_error(e)
+            self.error_handler.log_error(error)
+            raise TransformationError(
+                f"Batch transformation failed: {str(e)}",
+                transform_type=transform_type.value,
+                details={"books": len(books), "processing_time": time.time() - start_time},
+            ) from e
+
+    def _validate_transform_request(
+        self,
+        book: Book,
+        transform_type: TransformType,
+        selected_characters: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Validate the input of a book transformation.
+
+        Raises:
+            ValidationError: If input is invalid
+            ConfigurationError: If no provider is configured
+        """
         # Input validation
         if not book:
             raise ValidationError("Book cannot be None")
@@ -222,73 +399,68 @@ class TransformService(BaseService):
                     field="selected_characters"
                 )
 
-        start_time = time.time()
-
-        try:
-            # Get character analysis if not provided
-            if not characters:
-                if not self.character_service:
-                    raise ConfigurationError(
-                        "Character service required when characters not provided",
-                        config_key="character_service"
-                    )
+    async def _prepare_transform(
+        self,
+        book: Book,
+        transform_type: TransformType,
+        characters: Optional[CharacterAnalysis],
+        selected_characters: Optional[list[str]],
+        name_map: Optional[dict[str, str]],
+    ) -> tuple[CharacterAnalysis, dict[str, Any], Optional[dict[str, str]]]:
+        """
+        Analyze characters if needed and build the transformation context.
 
-                self.logger.info("Analyzing characters...")
-                characters = await self.character_service.process(book)
+        Returns:
+            Tuple of (characters, context, name_map expanded with aliases)
+        """
+        # Get character analysis if not provided
+        if not characters:
+            if not self.character_service:
+                raise ConfigurationError(
+                    "Character service required when characters not provided",
+                    config_key="character_service"
+                )
 
-            # Create transformation context
-            context = self._create_context(characters, transform_type, selected_characters)
+            self.logger.info("Analyzing characters...")
+            characters = await self.character_service.process(book)
 
-            # Auto-expand name_map with character aliases so nicknames are caught.
-            # Best-effort: depends on the character service detecting aliases consistently.
-            if name_map and characters:
-                expanded = self._expand_name_map_with_aliases(name_map, characters)
-                if len(expanded) > len(name_map):
-                    self.logger.info(f"Expanded name_map with {len(expanded) - len(name_map)} character aliases")
-                name_map = expanded
+        # Create transformation context
+        context = self._create_context(characters, transform_type, selected_characters)
 
-            # Transform chapters
-            self.logger.info(f"Transforming {len(book.chapters)} chapters...")
-            transformed_chapters, all_changes = await self._transform_chapters(
-                book.chapters, context, name_map=name_map, on_chapter_complete=on_chapter_complete
-            )
+        # Auto-expand name_map with character aliases so nicknames are caught.
+        # Best-effort: depends on the character service detecting aliases consistently.
+        if name_map and characters:
+            expanded = self._expand_name_map_with_aliases(name_map, characters)
+            if len(expanded) > len(name_map):
+                self.logger.info(f"Expanded name_map with {len(expanded) - len(name_map)} character aliases")
+            name_map = expanded
 
-            # Create transformation result
-            transformation = Transformation(
-                original_book=book,
-                transformed_chapters=transformed_chapters,
-                transform_type=transform_type,
-                characters_used=characters,
-                changes=all_changes,
-                metadata={
-                    "provider": self.provider.name if self.provider else "mock",
-                    "strategy": self.strategy.__class__.__name__,
-                    "processing_time": time.time() - start_time,
-                },
-            )
+        return characters, context, name_map
 
-            self.logger.info(
-                f"Transformation complete: {len(all_changes)} changes in "
-                f"{time.time() - start_time:.1f}s"
-            )
-
-            return transformation
-
-        except (ValidationError, TransformationError, ConfigurationError):
-            # Re-raise our custom errors
-            raise
-        except Exception as e:
-            # Convert unexpected errors
-            error = self.error_handler.handle_error(e)
-            self.error_handler.log_error(error)
-            raise TransformationError(
-                f"Transformation failed: {str(e)}",
-                transform_type=transform_type.value,
-                details={
-                    "book_title": book.title or "Unknown",
-                    "processing_time": time.time() - start_time
-                }
-            ) from e
+    def _build_transformation(
+        self,
+        book: Book,
+        transformed_chapters: list[Chapter],
+        changes: list[TransformationChange],
+        transform_type: TransformType,
+        characters: CharacterAnalysis,
+        start_time: float,
+        usage: UsageTally,
+    ) -> Transformation:
+        """Create the transformation result with provider, timing and this run's usage."""
+        return Transformation(
+            original_book=book,
+            transformed_chapters=transformed_chapters,
+            transform_type=transform_type,
+            characters_used=characters,
+            changes=changes,
+            metadata={
+                "provider": self.provider.name if self.provider else "mock",
+                "strategy": self.strategy.__class__.__name__,
+                "processing_time": time.time() - start_time,
+                "usage": usage.to_dict(),
+            },
+        )
 
     def _create_context(
         self,
@@ -407,14 +579,14 @@ class TransformService(BaseService):
         if to_transform:
             lines.append("Characters to transform:")
             for name in to_transform:
-                char = next((c for c in characters.characters if c.name == name), None)
+                char = characters.get_character(name)
                 if char:
                     lines.append(f"  - {name}: {char.gender.value} -> swap gender")
 
         if to_preserve:
             lines.append("\nCharacters to preserve (DO NOT change):")
             for name in to_preserve:
-                char = next((c for c in characters.characters if c.name == name), None)
+                char = characters.get_character(name)
                 if char:
                     lines.append(f"  - {name}: keep as {char.gender.value}")
 
@@ -592,12 +764,6 @@ class TransformService(BaseService):
                 estimated_tokens = min(self.token_manager.estimate_tokens(chapter_text), 4500)
                 await rate_limiter.acquire(estimated_tokens)
 
-                # Track token usage
-                self.token_manager.track_usage(
-                    input_tokens=estimated_tokens,
-                    provider=self.provider.name if self.provider else "unknown",
-                )
-
             self.logger.debug(f"Transforming chapter {i + 1}/{total}")
 
             transformed_chapter, changes = await self._transform_single_chapter(
@@ -623,14 +789,6 @@ class TransformService(BaseService):
         on_chapter_complete: Optional[Any] = None,
     ) -> tuple[list[Chapter], list[TransformationChange]]:
         """Transform chapters in parallel with rate limiting."""
-
-        # For OpenAI, force sequential processing due to rate limits
-        if self.provider and "openai" in self.provider.name.lower():
-            self.logger.info("OpenAI detected - using sequential processing for rate limiting")
-            return await self._transform_chapters_sequential(
-                chapters, context, name_map=name_map, on_chapter_complete=on_chapter_complete
-            )
-
         total = len(chapters)
         completed = 0
 
@@ -642,6 +800,8 @@ class TransformService(BaseService):
                 on_chapter_complete(completed, total, chapter.title or f"Chapter {i + 1}")
             return result
 
+        # Caps chapters in progress; actual request parallelism is set by the
+        # provider's shared adaptive limiter
         semaphore = asyncio.Semaphore(self.config.max_concurrent)
 
         async def limited_task(chapter, i):
@@ -658,6 +818,105 @@ class TransformService(BaseService):
 
         return transformed_chapters, all_changes
 
+    # === BATCH JOB MODE ===
+
+    def _plan_batch_requests(
+        self, chapters: list[Chapter], context: dict[str, Any], prefix: str = ""
+    ) -> tuple[list[BatchRequest], list[list[tuple[str, list, int]]]]:
+        """
+        Build one batch request per token-optimized paragraph batch.
+
+        Args:
+            chapters: Chapters to transform
+            context: Transformation context
+            prefix: Custom ID prefix (tells books apart in a multi-book job)
+
+        Returns:
+            Tuple of (requests, per-chapter list of (custom_id, paragraphs, batch_start))
+        """
+        requests = []
+        plan = []
+        for chapter_index, chapter in enumerate(chapters):
+            chapter_plan = []
+            batch_start = 0
+            for batch_paragraphs in self._create_token_optimized_batches(chapter.paragraphs, context):
+                custom_id = f"{prefix}c{chapter_index}-p{batch_start}"
+                requests.append(
+                    BatchRequest(
+                        custom_id,
+                        self._batch_messages(batch_paragraphs, context),
+                        {"temperature": self.config.llm_temperature},
+                    )
+                )
+                chapter_plan.append((custom_id, batch_paragraphs, batch_start))
+                batch_start += len(batch_paragraphs)
+            plan.append(chapter_plan)
+        return requests, plan
+
+    async def _assemble_batch_chapters(
+        self,
+        chapters: list[Chapter],
+        plan: list[list[tuple[str, list, int]]],
+        results: dict[str, BatchResult],
+        context: dict[str, Any],
+        name_map: Optional[dict[str, str]] = None,
+        on_chapter_complete: Optional[Any] = None,
+    ) -> tuple[list[Chapter], list[TransformationChange]]:
+        """
+        Map batch results back to chapters by custom ID.
+
+        Batches the job could not answer are retried live at sentence level.
+        """
+        transform_type = context.get("transform_type", TransformType.GENDER_SWAP)
+        transformed_chapters = []
+        all_changes = []
+        total = len(chapters)
+        for chapter_index, (chapter, chapter_plan) in enumerate(zip(chapters, plan)):
+            paragraphs = []
+            for custom_id, batch_paragraphs, batch_start in chapter_plan:
+                result = results.get(custom_id)
+                if result is not None and result.ok:
+                    batch_result, batch_changes = self._apply_batch_response(
+                        batch_paragraphs, result.text, chapter_index, batch_start,
+                        name_map, transform_type,
+                    )
+                    paragraphs.extend(batch_result)
+                    all_changes.extend(batch_changes)
+                else:
+                    error = result.error if result is not None else "no result"
+                    self.logger.warning(
+                        f"Batch request {custom_id} failed ({error}), retrying at sentence level..."
+                    )
+                    paragraphs.extend(
+                        await self._retry_at_sentence_level(
+                            batch_paragraphs, context, name_map, transform_type
+                        )
+                    )
+            transformed_chapters.append(self._finalize_chapter(chapter, paragraphs, transform_type))
+            if on_chapter_complete:
+                on_chapter_complete(
+                    chapter_index + 1, total, chapter.title or f"Chapter {chapter_index + 1}"
+                )
+        return transformed_chapters, all_changes
+
+    async def _transform_chapters_batch(
+        self,
+        chapters: list[Chapter],
+        context: dict[str, Any],
+        name_map: Optional[dict[str, str]] = None,
+        on_chapter_complete: Optional[Any] = None,
+        label: str = "book",
+    ) -> tuple[list[Chapter], list[TransformationChange]]:
+        """Transform chapters as one batch job; a restarted run resumes the same job."""
+        requests, plan = self._plan_batch_requests(chapters, context)
+        self.logger.info(f"Submitting {len(requests)} paragraph batches as one batch job")
+        runner = create_batch_runner(self.provider, self.config.get("batch_dir"))
+        results = await runner.run(requests, label=label)
+        return await self._assemble_batch_chapters(
+            chapters, plan, results, context, name_map=name_map,
+            on_chapter_complete=on_chapter_complete,
+        )
+
     async def _transform_single_chapter(
         self,
         chapter: Chapter,
@@ -677,9 +936,6 @@ class TransformService(BaseService):
         Returns:
             Tuple of (transformed chapter, list of changes)
         """
-        from src.models.book import Chapter, Paragraph
-        from src.models.transformation import TransformationChange
-
         # Require LLM provider for transformation
         if not self.provider:
             raise ValueError("LLM provider is required for transformation. Please configure an LLM provider (OpenAI or Anthropic).")
@@ -699,12 +955,6 @@ class TransformService(BaseService):
             estimated_tokens = min(self.token_manager.estimate_tokens(chapter_text), 4500)
             await rate_limiter.acquire(estimated_tokens)
 
-            # Track token usage
-            self.token_manager.track_usage(
-                input_tokens=estimated_tokens,
-                provider=self.provider.name if self.provider else "unknown",
-            )
-
         # Transform paragraphs in token-optimized batches
         from src.utils.config import config as app_config
 
@@ -739,56 +989,18 @@ class TransformService(BaseService):
             else:
                 progress_bar.set_postfix({"paragraphs": f"{batch_start+1}-{batch_end}"})
 
-            # Create batch prompt with the actual paragraph objects
-            prompt = self._create_batch_transform_prompt(batch_paragraphs, context, len(batch_paragraphs))
-
             try:
                 # Call LLM for batch
-                messages = [
-                    {"role": "system", "content": prompt["system"]},
-                    {"role": "user", "content": prompt["user"]},
-                ]
-
                 response = await self.provider.complete(
-                    messages=messages,
+                    messages=self._batch_messages(batch_paragraphs, context),
                     temperature=self.config.llm_temperature,
                 )
 
-                # Split response by paragraph markers
-                transformed_texts = self._parse_batch_response(response, len(batch_paragraphs))
-
-                # Process each paragraph in the batch
-                for i, (paragraph, transformed_text) in enumerate(zip(batch_paragraphs, transformed_texts)):
-                    para_idx = batch_start + i
-                    original_text = paragraph.get_text()
-
-                    # Debug logging for first paragraph
-                    if para_idx == 0:
-                        self.logger.debug(f"Original text: {repr(original_text[:100])}")
-                        self.logger.debug(f"Transformed text: {repr(transformed_text[:100])}")
-
-                    # Apply name substitutions after LLM transform
-                    if name_map:
-                        transformed_text = self._apply_name_map(transformed_text, name_map)
-
-                    # Apply deterministic term substitutions (safety net for LLM misses)
-                    transformed_text = self._apply_term_map(transformed_text, transform_type)
-
-                    # Track changes
-                    if transformed_text != original_text:
-                        changes.append(
-                            TransformationChange(
-                                chapter_index=chapter_index,
-                                paragraph_index=para_idx,
-                                sentence_index=0,
-                                original=original_text,
-                                transformed=transformed_text,
-                                change_type="gender_swap",
-                            )
-                        )
-
-                    # Create transformed paragraph
-                    transformed_paragraphs.append(Paragraph(sentences=[transformed_text]))
+                batch_result, batch_changes = self._apply_batch_response(
+                    batch_paragraphs, response, chapter_index, batch_start, name_map, transform_type
+                )
+                transformed_paragraphs.extend(batch_result)
+                changes.extend(batch_changes)
 
                 # Update batch_start for next iteration
                 batch_start = batch_end
@@ -811,21 +1023,110 @@ class TransformService(BaseService):
         if progress_bar:
             progress_bar.close()
 
+        return self._finalize_chapter(chapter, transformed_paragraphs, transform_type), changes
+
+    def _batch_messages(self, batch_paragraphs: list, context: dict[str, Any]) -> list[dict[str, str]]:
+        """Chat messages that ask for one batch of paragraphs."""
+        # Create batch prompt with the actual paragraph objects
+        prompt = self._create_batch_transform_prompt(batch_paragraphs, context, len(batch_paragraphs))
+        return [
+            {"role": "system", "content": prompt["system"]},
+            {"role": "user", "content": prompt["user"]},
+        ]
+
+    def _apply_batch_response(
+        self,
+        batch_paragraphs: list,
+        response: str,
+        chapter_index: int,
+        batch_start: int,
+        name_map: Optional[dict[str, str]],
+        transform_type: TransformType,
+    ) -> tuple[list, list[TransformationChange]]:
+        """
+        Turn the LLM's answer for one batch into paragraphs and tracked changes.
+
+        Args:
+            batch_paragraphs: Paragraphs that were sent
+            response: Completion text
+            chapter_index: Index of the chapter
+            batch_start: Index of the batch's first paragraph in the chapter
+            name_map: Optional mapping of original names to replacement names
+            transform_type: Type of transformation
+
+        Returns:
+            Tuple of (transformed paragraphs, list of changes)
+        """
+        from src.models.book import Paragraph
+
+        paragraphs = []
+        changes = []
+
+        # Split response by paragraph markers
+        transformed_texts = self._parse_batch_response(response, len(batch_paragraphs))
+
+        # Process each paragraph in the batch
+        for i, (paragraph, transformed_text) in enumerate(zip(batch_paragraphs, transformed_texts)):
+            para_idx = batch_start + i
+            original_text = paragraph.get_text()
+
+            # Debug logging for first paragraph
+            if para_idx == 0:
+                self.logger.debug(f"Original text: {repr(original_text[:100])}")
+                self.logger.debug(f"Transformed text: {repr(transformed_text[:100])}")
+
+            # Apply name substitutions after LLM transform
+            if name_map:
+                transformed_text = self._apply_name_map(transformed_text, name_map)
+
+            # Apply deterministic term substitutions (safety net for LLM misses)
+            transformed_text = self._apply_term_map(transformed_text, transform_type)
+
+            # Track changes
+            if transformed_text != original_text:
+                changes.append(
+                    TransformationChange(
+                        chapter_index=chapter_index,
+                        paragraph_index=para_idx,
+                        sentence_index=0,
+                        original=original_text,
+                        transformed=transformed_text,
+                        change_type="gender_swap",
+                    )
+                )
+
+            # Create transformed paragraph
+            paragraphs.append(Paragraph(sentences=[transformed_text]))
+
+        return paragraphs, changes
+
+    def _finalize_chapter(self, chapter: Chapter, paragraphs: list, transform_type: TransformType) -> Chapter:
+        """Build the transformed chapter after a final term_map pass."""
+        from src.models.book import Paragraph
+
         # Final term_map pass over all paragraphs — catches any that couldn't be LLM-transformed
         # (e.g. batches that failed retry). Idempotent on already-transformed paragraphs.
-        for i, para in enumerate(transformed_paragraphs):
+        for i, para in enumerate(paragraphs):
             current_text = para.get_text()
             fixed_text = self._apply_term_map(current_text, transform_type)
             if fixed_text != current_text:
-                transformed_paragraphs[i] = Paragraph(sentences=[fixed_text])
-
-        # Create transformed chapter
-        transformed_chapter = Chapter(
-            number=chapter.number, title=chapter.title, paragraphs=transformed_paragraphs
+                paragraphs[i] = Paragraph(sentences=[fixed_text])
+
+        return Chapter(number=chapter.number, title=chapter.title, paragraphs=paragraphs)
+
+    def _on_provider_usage(self, usage, provider: str, stage: str, book, cost: float) -> None:
+        """Track reported usage from this service's provider in the token manager."""
+        if self.provider is None or provider != getattr(self.provider, "name", None):
+            return
+        self.token_manager.track_usage(
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            model=usage.model,
+            provider=provider,
+            stage=stage,
+            cost=cost,
         )
 
-        return transformed_chapter, changes
-
     def _apply_name_map(self, text: str, name_map: dict[str, str]) -> str:
         """Apply case-aware name substitutions to a paragraph of text."""
         for original, replacement in name_map.items():
@@ -1252,30 +1553,35 @@ class TransformService(BaseService):
         from src.models.book import Paragraph
 
         results = []
-        for para in batch_paragraphs:
-            try:
-                transformed_text = await self._transform_single_paragraph(
-                    para, context, name_map, transform_type
-                )
-                results.append(Paragraph(sentences=[transformed_text]))
-            except Exception as e:
-                self.logger.warning(f"Single-paragraph retry failed ({e}), splitting by sentences...")
-                sentences = para.sentences if para.sentences else [para.get_text()]
-                # Process in groups of 10 sentences to stay well within timeout
-                group_size = 10
-                groups = [sentences[i : i + group_size] for i in range(0, len(sentences), group_size)]
-                merged_parts = []
-                for group in groups:
-                    group_para = Paragraph(sentences=group)
-                    try:
-                        part_text = await self._transform_single_paragraph(
-                            group_para, context, name_map, transform_type
-                        )
-                        merged_parts.append(part_text)
-                    except Exception:
-                        # True last resort: keep original sentence group text
-                        merged_parts.append(group_para.get_text())
-                results.append(Paragraph(sentences=[" ".join(merged_parts)]))
+        with usage_scope(stage="retries"):
+            for para in batch_paragraphs:
+                try:
+                    transformed_text = await self._transform_single_paragraph(
+                        para, context, name_map, transform_type
+                    )
+                    results.append(Paragraph(sentences=[transformed_text]))
+                except Exception as e:
+                    self.logger.warning(
+                        f"Single-paragraph retry failed ({e}), splitting by sentences..."
+                    )
+                    sentences = list(para.iter_sentences()) or [para.get_text()]
+                    # Process in groups of 10 sentences to stay well within timeout
+                    group_size = 10
+                    groups = [
+                        sentences[i : i + group_size] for i in range(0, len(sentences), group_size)
+                    ]
+                    merged_parts = []
+                    for group in groups:
+                        group_para = Paragraph(sentences=group)
+                        try:
+                            part_text = await self._transform_single_paragraph(
+                                group_para, context, name_map, transform_type
+                            )
+                            merged_parts.append(part_text)
+                        except Exception:
+                            # True last resort: keep original sentence group text
+                            merged_parts.append(group_para.get_text())
+                    results.append(Paragraph(sentences=[" ".join(merged_parts)]))
         return results
 
     def _expand_name_map_with_aliases(
@@ -1289,13 +1595,23 @@ class TransformService(BaseService):
         → 'Lizzy' and 'Eliza' are added pointing to the same target.
         """
         expanded = dict(name_map)
-        for char in characters.characters:
+
+        # Resolve mapped names through the alias index instead of scanning the cast
+        mapped_chars = {}
+        for name, target in name_map.items():
+            char = characters.get_character(name)
+            if char is not None:
+                mapped_chars.setdefault(id(char), (char, target))
+
+        for char, fallback_target in mapped_chars.values():
             all_names = [char.name] + list(char.aliases)
-            matched_target = next((name_map[n] for n in all_names if n in name_map), None)
-            if matched_target:
-                for name in all_names:
-                    if name not in expanded:
-                        expanded[name] = matched_target
+            # Prefer the target of the character's own spelling, as before
+            matched_target = next(
+                (name_map[n] for n in all_names if n in name_map), fallback_target
+            )
+            for name in all_names:
+                if name not in expanded:
+                    expanded[name] = matched_target
         return expanded
 
     def _parse_batch_response(self, response: str, expected_count: int) -> list[str]:
@@ -1351,10 +1667,10 @@ class TransformService(BaseService):
         current_batch = []
         current_tokens = 0
 
-        for para in paragraphs:
-            para_text = para.get_text()
-            para_tokens = self.token_manager.estimate_tokens(para_text)
+        # Count all paragraphs in one tokenizer call
+        para_token_counts = self.token_manager.estimate_batch([p.get_text() for p in paragraphs])
 
+        for para, para_tokens in zip(paragraphs, para_token_counts):
             # Start new batch if adding this paragraph would exceed limit
             if current_tokens + para_tokens > available_tokens and current_batch:
                 batches.append(current_batch)
@@ -1386,10 +1702,10 @@ class TransformService(BaseService):
         if not self.token_manager:
             return len(batch_paragraphs) * 200  # Rough estimate
 
-        total_tokens = 0
-        # Add paragraph text tokens
-        for para in batch_paragraphs:
-            total_tokens += self.token_manager.estimate_tokens(para.get_text())
+        # Add paragraph text tokens (memoized from batch planning)
+        total_tokens = sum(
+            self.token_manager.estimate_batch([para.get_text() for para in batch_paragraphs])
+        )
 
         # Add prompt overhead
         total_tokens += 1500  # System prompt
@@ -1494,6 +1810,7 @@ TRANSFORMED TEXT:"""
         # Add token usage metrics
         if self.token_manager:
             metrics["token_usage"] = self.token_manager.get_usage_stats()
+            metrics["usage"] = get_usage_accountant().summary()
             metrics["model_info"] = self.token_manager.get_model_info()
 
         return metrics
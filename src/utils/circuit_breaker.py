@@ -49,7 +49,7 @@ class CircuitBreakerConfig:
 
     # Monitoring windows
     monitoring_window: float = 60.0  # Time window for tracking failures
-    half_open_max_calls: int = 3  # Max calls allowed in half-open state
+    half_open_max_calls: int = 3  # Max trial calls in flight in half-open state
 
     # Error handling
     expected_exceptions: tuple = (Exception,)  # Which exceptions count as failures
@@ -129,6 +129,7 @@ class CircuitBreaker:
                 self.metrics.failure_count = 0
 
             elif self.metrics.state == CircuitState.HALF_OPEN:
+                self._release_slot()
                 self.metrics.success_count += 1
 
                 # Close circuit if enough successes in half-open
@@ -146,6 +147,7 @@ class CircuitBreaker:
             logger.debug(
                 f"Circuit breaker '{self.name}': Ignoring exception {type(exception).__name__}"
             )
+            self._release_slot()
             return
 
         # Check if this is an expected failure type
@@ -154,6 +156,7 @@ class CircuitBreaker:
                 f"Circuit breaker '{self.name}': Unexpected exception type "
                 f"{type(exception).__name__}"
             )
+            self._release_slot()
             return
 
         current_time = time.time()
@@ -225,6 +228,12 @@ class CircuitBreaker:
                     f"Previous state: {previous_state}"
                 )
 
+    def _release_slot(self) -> None:
+        """Give back a half-open trial slot once its call has finished."""
+        with self._lock:
+            if self.metrics.state == CircuitState.HALF_OPEN and self.metrics.half_open_calls > 0:
+                self.metrics.half_open_calls -= 1
+
     def _can_execute(self) -> bool:
         """Check if a call can be executed based on current state."""
         with self._lock:
@@ -234,6 +243,7 @@ class CircuitBreaker:
             elif self.metrics.state == CircuitState.OPEN:
                 if self._should_attempt_reset():
                     self._half_open_circuit()
+                    self.metrics.half_open_calls = 1
                     return True
                 else:
                     return False
@@ -247,6 +257,40 @@ class CircuitBreaker:
 
             return False
 
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through, for callers that manage the call themselves.
+
+        Counts as a half-open trial call when the circuit is half-open.
+        """
+        return self._can_execute()
+
+    def is_available(self) -> bool:
+        """Whether a call would be let through now (without claiming a half-open slot)."""
+        with self._lock:
+            if self.metrics.state == CircuitState.OPEN:
+                return self._should_attempt_reset()
+            if self.metrics.state == CircuitState.HALF_OPEN:
+                return self.metrics.half_open_calls < self.config.half_open_max_calls
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call made after allow_request()."""
+        self._record_success()
+
+    def record_failure(self, exception: Exception) -> None:
+        """Record a failed call made after allow_request()."""
+        self._record_failure(exception)
+
+    def release(self) -> None:
+        """
+        Settle a call made after allow_request() that says nothing about health.
+
+        Gives back its half-open trial slot without counting a success or a
+        failure (e.g. a rate limit, a bad request or a cancelled call).
+        """
+        self._release_slot()
+
     def call(self, func: Callable[..., T], *args, **kwargs) -> T:
         """
         Execute a function with circuit breaker protection.
@@ -65,10 +65,11 @@ class ProviderError(RegenderError):
     def __init__(self, message: str, provider: Optional[str] = None, **kwargs):
         """Initialize ProviderError with provider information."""
         details = kwargs.pop("details", {})
+        error_code = kwargs.pop("error_code", "PROVIDER_ERROR")
         if provider:
             details["provider"] = provider
         super().__init__(
-            message=message, error_code="PROVIDER_ERROR", details=details, **kwargs
+            message=message, error_code=error_code, details=details, **kwargs
         )
 
 
@@ -129,7 +130,8 @@ class RateLimitError(ProviderError):
         if retry_after:
             details["retry_after_seconds"] = retry_after
         kwargs["error_code"] = "RATE_LIMIT_ERROR"
-        super().__init__(message=message, **kwargs)
+        super().__init__(message=message, details=details, **kwargs)
+        self.retry_after = retry_after
 
 
 class TimeoutError(RegenderError):
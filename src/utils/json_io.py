@@ -0,0 +1,188 @@
+"""
+JSON Serialization
+
+Fast reading and writing of book, character and transformation JSON.
+
+orjson is used when it is installed, otherwise the standard library
+(set $REGENDER_JSON_BACKEND=json to force it). Both backends write the same
+text: UTF-8 without escaping, indented by 2 spaces, or with no whitespace at
+all in compact mode. Enums are written as their value, dataclasses as an
+object of their fields, NaN and infinities as null (as orjson does; the
+standard library's NaN is not valid JSON), and any other value that is not
+a JSON type as `str()`.
+
+`dump` streams lists passed as iterators (such as generators) item by item,
+so `write_json(path, book.to_dict(lazy=True))` encodes and writes one chapter
+at a time instead of building the whole book's dict tree and text first.
+"""
+
+import dataclasses
+import json
+import logging
+import math
+import os
+from collections.abc import Iterator
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKEND_ENV = "REGENDER_JSON_BACKEND"
+BACKENDS = ("orjson", "json") if orjson else ("json",)
+
+
+def _default_backend() -> str:
+    """The backend named in $REGENDER_JSON_BACKEND, if usable, else the fastest one."""
+    requested = os.getenv(JSON_BACKEND_ENV)
+    if requested and requested not in BACKENDS:
+        logger.warning(f"JSON backend {requested!r} unavailable, using {BACKENDS[0]}")
+    return requested if requested in BACKENDS else BACKENDS[0]
+
+
+BACKEND = _default_backend()
+
+
+def dumps(obj: Any, *, compact: bool = False, backend: Optional[str] = None) -> bytes:
+    """
+    Encode a JSON value.
+
+    Args:
+        obj: Value to encode (iterators are not expanded; see `dump`)
+        compact: Omit all whitespace instead of indenting by 2 spaces
+        backend: "orjson" or "json" (default: `BACKEND`)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return _encode(obj, 0, compact, backend or BACKEND)
+
+
+def dump(obj: Any, fp: IO[bytes], *, compact: bool = False, backend: Optional[str] = None) -> None:
+    """
+    Write a JSON value to a binary file, streaming lists given as iterators.
+
+    Any iterator found as the value itself, as a dict value or as an item of
+    another streamed list is written one item at a time, so only one item is
+    ever encoded in memory. The output is identical to `dumps` of the same
+    value with its iterators turned into lists.
+
+    Args:
+        obj: Value to write
+        fp: File opened in binary mode
+        compact: Omit all whitespace instead of indenting by 2 spaces
+        backend: "orjson" or "json" (default: `BACKEND`)
+    """
+    _write(obj, fp.write, 0, compact, backend or BACKEND)
+
+
+def write_json(
+    path: Union[str, Path], obj: Any, *, compact: bool = False, backend: Optional[str] = None
+) -> None:
+    """Write a JSON value to a file with `dump`, creating its directory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        dump(obj, f, compact=compact, backend=backend)
+
+
+def loads(data: Union[bytes, str], *, backend: Optional[str] = None) -> Any:
+    """Decode JSON from bytes or text."""
+    if (backend or BACKEND) == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Union[str, Path], *, backend: Optional[str] = None) -> Any:
+    """Read and decode a JSON file (UTF-8)."""
+    if (backend or BACKEND) == "orjson":
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _default(obj: Any) -> Any:
+    """Encode a value that is not a JSON type the same way on both backends."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def _finite(obj: Any) -> Any:
+    """Copy a value with NaN and infinities replaced by None, as orjson writes them."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if isinstance(obj, Enum) or dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _finite(_default(obj))
+    return obj
+
+
+def _encode(obj: Any, depth: int, compact: bool, backend: str) -> bytes:
+    """Encode a value as it appears `depth` levels deep in an indented document."""
+    if backend == "orjson":
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(obj, default=_default, option=option)
+    else:
+        kwargs = {
+            "ensure_ascii": False,
+            "allow_nan": False,
+            "default": _default,
+            "indent": None if compact else 2,
+            "separators": (",", ":") if compact else None,
+        }
+        try:
+            data = json.dumps(obj, **kwargs).encode()
+        except ValueError as e:
+            if "Out of range float" not in str(e):
+                raise
+            # Non-finite floats are rare, so only then copy the value to replace them
+            data = json.dumps(_finite(obj), **kwargs).encode()
+    if depth and not compact:
+        # Strings never contain a raw newline, so every one starts a new line
+        data = data.replace(b"\n", b"\n" + b"  " * depth)
+    return data
+
+
+def _write(obj: Any, write, depth: int, compact: bool, backend: str) -> None:
+    """Write `obj` at `depth`, expanding iterators and the containers holding them."""
+    if isinstance(obj, Iterator):
+        _write_items(((None, item) for item in obj), b"[", b"]", write, depth, compact, backend)
+    elif isinstance(obj, dict) and any(isinstance(v, Iterator) for v in obj.values()):
+        _write_items(iter(obj.items()), b"{", b"}", write, depth, compact, backend)
+    else:
+        write(_encode(obj, depth, compact, backend))
+
+
+def _write_items(items, open_: bytes, close: bytes, write, depth, compact, backend) -> None:
+    """Write an array (keys None) or object from (key, value) pairs, as the encoders lay it out."""
+    indent = b"" if compact else b"\n" + b"  " * (depth + 1)
+    colon = b":" if compact else b": "
+    write(open_)
+    first = True
+    for key, value in items:
+        write(indent if first else b"," + indent)
+        first = False
+        if key is not None:
+            write(_encode(str(key), 0, True, backend) + colon)
+        _write(value, write, depth + 1, compact, backend)
+    if not first and not compact:
+        write(b"\n" + b"  " * depth)
+    write(close)
@@ -0,0 +1,365 @@
+"""
+Retry Middleware
+
+One retry policy for every provider call instead of ad-hoc loops per service.
+
+Failures are classified first: rate limits, overload (429/529/503), other
+server errors, timeouts and connection errors are retried; client errors
+(bad request, auth, quota/billing) and an open circuit are not. Waits use
+decorrelated jitter (each delay is drawn between the base delay and three
+times the previous one, capped), a server-sent Retry-After takes precedence,
+and no wait is started that would run past the total deadline. A circuit
+breaker can be attached so a provider that keeps failing is skipped fast
+instead of being retried by every caller.
+"""
+
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import time
+from collections.abc import Awaitable
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, Callable, Optional, TypeVar
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from src.utils.errors import RateLimitError, TimeoutError as RegenderTimeoutError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ErrorKind(Enum):
+    """Failure classes that decide whether a call is retried."""
+
+    RATE_LIMIT = "rate_limit"
+    OVERLOADED = "overloaded"
+    SERVER = "server"
+    TIMEOUT = "timeout"
+    CONNECTION = "connection"
+    CLIENT = "client"
+    CIRCUIT_OPEN = "circuit_open"
+    UNKNOWN = "unknown"
+
+
+RETRYABLE_KINDS = frozenset(
+    {
+        ErrorKind.RATE_LIMIT,
+        ErrorKind.OVERLOADED,
+        ErrorKind.SERVER,
+        ErrorKind.TIMEOUT,
+        ErrorKind.CONNECTION,
+    }
+)
+
+# Kinds that say something about the provider's health (a 429 only says we are too fast)
+BREAKER_KINDS = frozenset(
+    {ErrorKind.OVERLOADED, ErrorKind.SERVER, ErrorKind.TIMEOUT, ErrorKind.CONNECTION}
+)
+
+_FATAL_MARKERS = ("insufficient_quota", "quota exceeded", "billing", "credit")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of an SDK or ProviderError exception, if it carries one."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    if status is None:
+        details = getattr(exc, "details", None)
+        if isinstance(details, dict):
+            status = details.get("status_code")
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException) -> ErrorKind:
+    """
+    Classify a provider failure.
+
+    Works on the SDK exceptions (status_code / response attributes), on
+    ProviderError (details["status_code"]) and, as a last resort, on the
+    error message.
+
+    Args:
+        exc: Exception raised by a provider call
+
+    Returns:
+        ErrorKind
+    """
+    if isinstance(exc, CircuitBreakerOpenError):
+        return ErrorKind.CIRCUIT_OPEN
+    if is_quota_error(exc):
+        return ErrorKind.CLIENT
+    message = str(exc).lower()
+    if isinstance(exc, RateLimitError):
+        return ErrorKind.RATE_LIMIT
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, RegenderTimeoutError)):
+        return ErrorKind.TIMEOUT
+
+    status = _status_code(exc)
+    if status is not None:
+        if status in (408,):
+            return ErrorKind.TIMEOUT
+        if status == 429:
+            return ErrorKind.RATE_LIMIT
+        if status in (503, 529):
+            return ErrorKind.OVERLOADED
+        if status >= 500:
+            return ErrorKind.SERVER
+        if status >= 400:
+            return ErrorKind.CLIENT
+
+    type_name = type(exc).__name__
+    if "Timeout" in type_name:
+        return ErrorKind.TIMEOUT
+    if isinstance(exc, ConnectionError) or "Connect" in type_name or "Transport" in type_name:
+        return ErrorKind.CONNECTION
+    if "429" in message or "rate limit" in message or "rate_limit" in message:
+        return ErrorKind.RATE_LIMIT
+    if "529" in message or "overloaded" in message:
+        return ErrorKind.OVERLOADED
+    if "timed out" in message:
+        return ErrorKind.TIMEOUT
+    return ErrorKind.UNKNOWN
+
+
+def is_quota_error(exc: BaseException) -> bool:
+    """Whether a failure is an exhausted quota or billing problem (a CLIENT error)."""
+    message = str(exc).lower()
+    return any(marker in message for marker in _FATAL_MARKERS)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a failure is worth retrying."""
+    return classify_error(exc) in RETRYABLE_KINDS
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Server-requested wait before the next attempt.
+
+    Reads RateLimitError.retry_after, then the `retry-after-ms` and
+    `retry-after` response headers (seconds or an HTTP date).
+
+    Args:
+        exc: Exception raised by a provider call
+
+    Returns:
+        Seconds to wait, or None if the server did not say
+    """
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return float(value) / 1000
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to retry."""
+
+    max_attempts: int = 5
+    base_delay: float = 1.0  # Lower bound of every jittered wait
+    max_delay: float = 60.0  # Cap for jittered waits (Retry-After may exceed it)
+    deadline: float = 600.0  # Total seconds for all attempts and waits
+    timeout_attempts: int = 2  # Timeouts repeat on identical input; retry them less
+    retry_unclassified: bool = False  # Also retry ErrorKind.UNKNOWN failures
+
+    @classmethod
+    def from_env(cls, **overrides) -> "RetryPolicy":
+        """Build a policy from REGENDER_RETRY_* environment variables and overrides."""
+        env = {
+            "max_attempts": ("REGENDER_RETRY_MAX_ATTEMPTS", int),
+            "base_delay": ("REGENDER_RETRY_BASE_DELAY", float),
+            "max_delay": ("REGENDER_RETRY_MAX_DELAY", float),
+            "deadline": ("REGENDER_RETRY_DEADLINE", float),
+        }
+        values = {}
+        for field_name, (var, cast) in env.items():
+            if os.getenv(var):
+                values[field_name] = cast(os.environ[var])
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+    def next_delay(self, previous: float, rng: Optional[random.Random] = None) -> float:
+        """
+        Decorrelated-jitter backoff: uniform(base, 3 * previous), capped.
+
+        Args:
+            previous: The previous delay (use base_delay before the first retry)
+            rng: Random source (module random by default)
+
+        Returns:
+            Seconds to wait
+        """
+        rng = rng or random
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, rng.uniform(self.base_delay, upper))
+
+
+@dataclass
+class RetryStats:
+    """Counters for one retried call site (e.g. one provider)."""
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    successes: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    deadline_exceeded: int = 0
+    waited: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        data = asdict(self)
+        data["waited"] = round(self.waited, 3)
+        return data
+
+
+async def _attempt(
+    func: Callable[[int], Awaitable[T]],
+    attempt: int,
+    timeout: float,
+    breaker: Optional[CircuitBreaker],
+) -> T:
+    """
+    Run one attempt, settling the breaker call it was allowed however it ends.
+
+    Successes and BREAKER_KINDS failures are recorded; anything else (a rate
+    limit, a client error, cancellation of a losing hedge) only releases the
+    half-open slot, so such calls can never leave the breaker stuck half-open.
+    """
+    settled = False
+    try:
+        result = await asyncio.wait_for(func(attempt), timeout=timeout)
+        if breaker is not None:
+            breaker.record_success()
+            settled = True
+        return result
+    except Exception as e:
+        if breaker is not None and classify_error(e) in BREAKER_KINDS:
+            breaker.record_failure(e)
+            settled = True
+        raise
+    finally:
+        if breaker is not None and not settled:
+            breaker.release()
+
+
+async def retry_async(
+    func: Callable[[int], Awaitable[T]],
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    stats: Optional[RetryStats] = None,
+    name: str = "call",
+) -> T:
+    """
+    Run `func(attempt)` until it succeeds or the policy gives up.
+
+    Args:
+        func: Coroutine function taking the 1-based attempt number
+        policy: Retry policy (defaults from the environment)
+        breaker: Circuit breaker to consult before and update after each attempt
+        stats: Counters to update
+        name: Label for log messages
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        CircuitBreakerOpenError: If the breaker rejects the call
+        Exception: The last failure once retries are exhausted or not allowed
+    """
+    policy = policy or RetryPolicy.from_env()
+    stats = stats if stats is not None else RetryStats()
+    stats.calls += 1
+    started = time.monotonic()
+    delay = policy.base_delay
+    timeouts = 0
+    attempt = 0
+    last_error: Optional[Exception] = None
+
+    while True:
+        attempt += 1
+        if breaker is not None and not breaker.allow_request():
+            stats.short_circuited += 1
+            raise CircuitBreakerOpenError(
+                f"Circuit breaker '{breaker.name}' is open; not calling {name}"
+            ) from last_error
+
+        remaining = policy.deadline - (time.monotonic() - started)
+        stats.attempts += 1
+        try:
+            result = await _attempt(func, attempt, max(remaining, 0.001), breaker)
+        except Exception as e:
+            last_error = e
+            kind = classify_error(e)
+
+            retryable = kind in RETRYABLE_KINDS or (
+                policy.retry_unclassified and kind is ErrorKind.UNKNOWN
+            )
+            if kind is ErrorKind.TIMEOUT:
+                timeouts += 1
+                retryable = retryable and timeouts < policy.timeout_attempts
+            if not retryable or attempt >= policy.max_attempts:
+                stats.failures += 1
+                if retryable:
+                    logger.warning(f"{name}: giving up after {attempt} attempts: {e}")
+                raise
+
+            server_wait = retry_after_seconds(e)
+            if server_wait is not None:
+                wait = server_wait + random.uniform(0, policy.base_delay)
+            else:
+                delay = policy.next_delay(delay)
+                wait = delay
+
+            remaining = policy.deadline - (time.monotonic() - started)
+            if wait >= remaining:
+                stats.failures += 1
+                stats.deadline_exceeded += 1
+                logger.warning(
+                    f"{name}: not retrying {kind.value} error, a {wait:.1f}s wait would pass "
+                    f"the {policy.deadline:.0f}s deadline: {e}"
+                )
+                raise
+
+            stats.retries += 1
+            stats.waited += wait
+            logger.warning(
+                f"{name}: {kind.value} error on attempt {attempt}/{policy.max_attempts}, "
+                f"retrying in {wait:.1f}s: {e}"
+            )
+            await asyncio.sleep(wait)
+            continue
+
+        stats.successes += 1
+        return result
@@ -4,11 +4,22 @@ Token Management System
 Provides centralized token estimation, chunking, and tracking for different LLM providers.
 """
 
+import contextlib
+import hashlib
+import json
 import logging
+import os
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Any, Optional
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from src.utils.tokenizer import Tokenizer, load_tokenizer
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +34,8 @@ class TokenUsage:
     estimated_cost: float = 0.0
     model: Optional[str] = None
     provider: Optional[str] = None
+    stage: Optional[str] = None
+    timestamp: float = 0.0
 
     def __post_init__(self):
         """Calculate total if not provided."""
@@ -40,6 +53,17 @@ class TokenUsage:
             provider=self.provider or other.provider,
         )
 
+    def accumulate(self, other: "TokenUsage") -> None:
+        """Add another usage into this one in place."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.total_tokens += other.total_tokens
+        self.estimated_cost += other.estimated_cost
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        return asdict(self)
+
 
 @dataclass
 class ModelConfig:
@@ -52,6 +76,7 @@ class ModelConfig:
     output_cost_per_1k: float = 0.0
     preferred_chunk_size: int = 4000
     overlap_tokens: int = 200
+    tokenizer: Optional[str] = None  # Local vocabulary name, see src.utils.tokenizer
 
 
 @dataclass
@@ -240,16 +265,46 @@ class ParagraphSplitter(TextSplitter):
 
 
 class TokenEstimator:
-    """Estimates tokens for different models."""
+    """
+    Estimates tokens for different models.
 
-    def __init__(self, model_config: ModelConfig):
+    Uses an exact local tokenizer when the model's vocabulary is available
+    (see src.utils.tokenizer), otherwise a chars-per-token heuristic that
+    recalibrates itself from the usage providers report. Counts are memoized
+    per text in a bounded LRU keyed by content hash, so re-estimating the same
+    paragraphs while planning batches is free.
+    """
+
+    CACHE_SIZE = 8192
+    CALIBRATION_INTERVAL = 200  # Heuristic estimates between calibration checks
+    HEURISTIC_BUFFER = 1.05  # Safety margin on heuristic estimates
+
+    def __init__(
+        self,
+        model_config: ModelConfig,
+        tokenizer: Optional[Tokenizer] = None,
+        cache_size: Optional[int] = None,
+    ):
         """
         Initialize token estimator.
 
         Args:
             model_config: Configuration for the model
+            tokenizer: Exact tokenizer (defaults to the model's local vocabulary, if any)
+            cache_size: Maximum memoized counts
         """
         self.config = model_config
+        self.tokenizer = tokenizer or load_tokenizer(model_config.tokenizer)
+        self.chars_per_token = model_config.chars_per_token
+        self.calibration_model: Optional[str] = None
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._cache_size = cache_size or self.CACHE_SIZE
+        self._since_calibration = 0
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self.tokenizer is not None
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -263,12 +318,96 @@ class TokenEstimator:
         """
         if not text:
             return 0
+        return self.estimate_batch([text])[0]
+
+    def estimate_batch(self, texts: list[str]) -> list[int]:
+        """
+        Estimate tokens for several texts, tokenizing all cache misses in one call.
+
+        Args:
+            texts: Texts to estimate
+
+        Returns:
+            Token counts in the same order
+        """
+        counts: list[Optional[int]] = [None] * len(texts)
+        missing: dict[bytes, list[int]] = {}
+        for i, text in enumerate(texts):
+            if not text:
+                counts[i] = 0
+                continue
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                counts[i] = cached
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            keys = list(missing)
+            fresh = self._count([texts[missing[key][0]] for key in keys])
+            for key, count in zip(keys, fresh):
+                self._remember(key, count)
+                for i in missing[key]:
+                    counts[i] = count
+
+        return counts
+
+    def calibrate(self, model: Optional[str] = None, min_calls: int = 5) -> Optional[float]:
+        """
+        Adopt the chars-per-token ratio observed in reported provider usage.
+
+        Only affects the heuristic; exact tokenizers need no calibration.
+
+        Args:
+            model: Model name as reported by the provider (remembered for later checks)
+            min_calls: Minimum measured calls before the observation is trusted
+
+        Returns:
+            The new ratio, or None if there was not enough data
+        """
+        from src.utils.usage_accounting import get_usage_accountant
 
-        # Basic estimation based on character count
-        estimated = len(text) / self.config.chars_per_token
+        if model:
+            self.calibration_model = model
+        self._since_calibration = 0
+        observed = get_usage_accountant().observed_chars_per_token(
+            self.calibration_model or self.config.name, min_calls=min_calls
+        )
+        if observed is None or abs(observed - self.chars_per_token) < 0.01:
+            return None
 
-        # Add small buffer for safety (5%)
-        return int(estimated * 1.05)
+        logger.info(
+            f"Recalibrated {self.config.name} chars_per_token: "
+            f"{self.chars_per_token:.2f} -> {observed:.2f}"
+        )
+        self.chars_per_token = observed
+        if not self.exact:
+            self._cache.clear()  # Memoized counts used the old ratio
+        return observed
+
+    def _count(self, texts: list[str]) -> list[int]:
+        """Count tokens for uncached texts."""
+        if self.tokenizer is not None:
+            try:
+                return self.tokenizer.count_batch(texts)
+            except Exception as e:
+                logger.warning(f"Tokenizer {self.tokenizer.name} failed, using heuristic: {e}")
+                self.tokenizer = None
+
+        self._since_calibration += len(texts)
+        if self._since_calibration >= self.CALIBRATION_INTERVAL:
+            self.calibrate()
+
+        ratio = self.chars_per_token
+        return [int(len(text) / ratio * self.HEURISTIC_BUFFER) for text in texts]
+
+    def _remember(self, key: bytes, count: int) -> None:
+        """Add a count to the LRU cache."""
+        self._cache[key] = count
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
 
     def estimate_cost(self, input_tokens: int, output_tokens: int = 0) -> float:
         """
@@ -300,6 +439,25 @@ class TokenEstimator:
         return tokens + reserve_tokens <= self.config.max_context_tokens
 
 
+@dataclass
+class _UsageCounter:
+    """Running totals for one usage bucket."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    estimated_cost: float = 0.0
+
+    def add(self, usage: TokenUsage) -> None:
+        self.calls += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.estimated_cost += usage.estimated_cost
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
 class TokenManager:
     """
     Centralized token management system.
@@ -318,6 +476,7 @@ class TokenManager:
             output_cost_per_1k=0.06,
             preferred_chunk_size=4000,
             overlap_tokens=200,
+            tokenizer="cl100k_base",
         ),
         "gpt-4-turbo": ModelConfig(
             name="gpt-4-turbo",
@@ -327,6 +486,7 @@ class TokenManager:
             output_cost_per_1k=0.03,
             preferred_chunk_size=6000,
             overlap_tokens=300,
+            tokenizer="cl100k_base",
         ),
         "gpt-3.5-turbo": ModelConfig(
             name="gpt-3.5-turbo",
@@ -336,6 +496,7 @@ class TokenManager:
             output_cost_per_1k=0.002,
             preferred_chunk_size=4000,
             overlap_tokens=200,
+            tokenizer="cl100k_base",
         ),
         "claude-3-sonnet": ModelConfig(
             name="claude-3-sonnet",
@@ -366,11 +527,16 @@ class TokenManager:
         ),
     }
 
+    HISTORY_SIZE = 100
+    SPILL_PATH_ENV = "REGENDER_USAGE_SPILL"
+
     def __init__(
         self,
         model_name: str = "gpt-4",
         custom_config: Optional[ModelConfig] = None,
         splitter: Optional[TextSplitter] = None,
+        history_size: Optional[int] = None,
+        spill_path: Optional[Union[str, Path]] = None,
     ):
         """
         Initialize token manager.
@@ -379,6 +545,9 @@ class TokenManager:
             model_name: Name of the model to use
             custom_config: Custom model configuration
             splitter: Text splitter strategy
+            history_size: Number of recent calls kept in memory
+            spill_path: Optional NDJSON file receiving every tracked call
+                (defaults to $REGENDER_USAGE_SPILL)
         """
         if custom_config:
             self.config = custom_config
@@ -390,7 +559,15 @@ class TokenManager:
 
         self.estimator = TokenEstimator(self.config)
         self.splitter = splitter or ParagraphSplitter()
-        self.usage_history: list[TokenUsage] = []
+
+        # Usage is kept as running aggregates plus a bounded window of recent calls
+        self.usage_history: deque[TokenUsage] = deque(maxlen=history_size or self.HISTORY_SIZE)
+        spill_path = spill_path or os.getenv(self.SPILL_PATH_ENV)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._usage_lock = threading.Lock()
+        self._spill_lock = threading.Lock()  # Spill writes stay off the aggregation lock
+        self._spill_file = None
+        self._reset_usage()
 
         logger.info(f"Initialized TokenManager for {self.config.name}")
 
@@ -430,6 +607,18 @@ class TokenManager:
         """
         return self.estimator.estimate_tokens(text)
 
+    def estimate_batch(self, texts: list[str]) -> list[int]:
+        """
+        Estimate tokens for several texts in one tokenizer call.
+
+        Args:
+            texts: Texts to estimate
+
+        Returns:
+            Token counts in the same order
+        """
+        return self.estimator.estimate_batch(texts)
+
     def chunk_text(
         self,
         text: str,
@@ -512,7 +701,7 @@ class TokenManager:
 
     def _simple_chunk(self, text: str, max_tokens: int) -> list[str]:
         """Simple character-based chunking as fallback."""
-        max_chars = int(max_tokens * self.config.chars_per_token)
+        max_chars = int(max_tokens * self.estimator.chars_per_token)
         chunks = []
 
         for i in range(0, len(text), max_chars):
@@ -523,7 +712,7 @@ class TokenManager:
 
     def _get_overlap_text(self, text: str, overlap_tokens: int, from_end: bool = True) -> str:
         """Extract overlap text from beginning or end of a chunk."""
-        overlap_chars = int(overlap_tokens * self.config.chars_per_token)
+        overlap_chars = int(overlap_tokens * self.estimator.chars_per_token)
 
         if from_end:
             # Get text from the end
@@ -552,31 +741,58 @@ class TokenManager:
         output_tokens: int = 0,
         model: Optional[str] = None,
         provider: Optional[str] = None,
+        stage: Optional[str] = None,
+        cost: Optional[float] = None,
     ) -> TokenUsage:
         """
         Track token usage for monitoring and cost calculation.
 
+        Aggregates are updated in place, so this and the stats reads are O(1)
+        no matter how many calls have been tracked.
+
         Args:
             input_tokens: Number of input tokens used
             output_tokens: Number of output tokens generated
             model: Model name (uses config default if None)
             provider: Provider name
+            stage: Pipeline stage (defaults to the active usage scope)
+            cost: Known cost (estimated from the model config if None)
 
         Returns:
             TokenUsage object with cost calculation
         """
-        model = model or self.config.name
-        estimated_cost = self.estimator.estimate_cost(input_tokens, output_tokens)
+        from src.utils.usage_accounting import current_scope
 
         usage = TokenUsage(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            estimated_cost=estimated_cost,
-            model=model,
+            estimated_cost=(
+                cost
+                if cost is not None
+                else self.estimator.estimate_cost(input_tokens, output_tokens)
+            ),
+            model=model or self.config.name,
             provider=provider,
+            stage=stage or current_scope()[0],
+            timestamp=time.time(),
         )
 
-        self.usage_history.append(usage)
+        with self._usage_lock:
+            self._call_count += 1
+            self._total.accumulate(usage)
+            for buckets, key in (
+                (self._by_provider, usage.provider or "unknown"),
+                (self._by_model, usage.model),
+                (self._by_stage, usage.stage or "other"),
+            ):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = _UsageCounter()
+                bucket.add(usage)
+            self.usage_history.append(usage)
+
+        if self.spill_path:
+            self._spill(usage)
         return usage
 
     def get_total_usage(self) -> TokenUsage:
@@ -584,16 +800,17 @@ class TokenManager:
         Get total token usage across all tracked calls.
 
         Returns:
-            Aggregated TokenUsage
+            Aggregated TokenUsage (a copy)
         """
-        if not self.usage_history:
-            return TokenUsage()
-
-        total = self.usage_history[0]
-        for usage in self.usage_history[1:]:
-            total = total.add(usage)
-
-        return total
+        with self._usage_lock:
+            total = self._total
+            return TokenUsage(
+                input_tokens=total.input_tokens,
+                output_tokens=total.output_tokens,
+                total_tokens=total.total_tokens,
+                estimated_cost=total.estimated_cost,
+                model=self.config.name,
+            )
 
     def get_usage_stats(self) -> dict[str, Any]:
         """
@@ -602,20 +819,65 @@ class TokenManager:
         Returns:
             Dictionary with usage statistics
         """
-        total_usage = self.get_total_usage()
+        with self._usage_lock:
+            total = self._total
+            calls = self._call_count
+            recent_start = max(0, len(self.usage_history) - 5)
+            return {
+                "total_calls": calls,
+                "total_input_tokens": total.input_tokens,
+                "total_output_tokens": total.output_tokens,
+                "total_tokens": total.total_tokens,
+                "estimated_total_cost": total.estimated_cost,
+                "average_tokens_per_call": total.total_tokens / calls if calls else 0,
+                "model": self.config.name,
+                "by_provider": {k: v.to_dict() for k, v in self._by_provider.items()},
+                "by_model": {k: v.to_dict() for k, v in self._by_model.items()},
+                "by_stage": {k: v.to_dict() for k, v in self._by_stage.items()},
+                "recent_calls": list(islice(self.usage_history, recent_start, None)),
+            }
+
+    def _reset_usage(self) -> None:
+        """Reset running aggregates and the recent-call window."""
+        self._call_count = 0
+        self._total = TokenUsage()
+        self._by_provider: dict[str, _UsageCounter] = {}
+        self._by_model: dict[str, _UsageCounter] = {}
+        self._by_stage: dict[str, _UsageCounter] = {}
+        self.usage_history.clear()
 
-        return {
-            "total_calls": len(self.usage_history),
-            "total_input_tokens": total_usage.input_tokens,
-            "total_output_tokens": total_usage.output_tokens,
-            "total_tokens": total_usage.total_tokens,
-            "estimated_total_cost": total_usage.estimated_cost,
-            "average_tokens_per_call": (
-                total_usage.total_tokens / len(self.usage_history) if self.usage_history else 0
-            ),
-            "model": self.config.name,
-            "recent_calls": self.usage_history[-5:] if self.usage_history else [],
-        }
+    def _spill(self, usage: TokenUsage) -> None:
+        """Append one call record to the NDJSON spill file, through one open handle."""
+        line = json.dumps(usage.to_dict()) + "\n"
+        with self._spill_lock:
+            path = self.spill_path
+            if path is None:
+                return
+            try:
+                if self._spill_file is None or self._spill_file.name != str(path):
+                    self._close_spill()
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    # Line buffered, so every record reaches the file as it is written
+                    self._spill_file = open(  # noqa: SIM115 - closed in close()
+                        path, "a", encoding="utf-8", buffering=1
+                    )
+                self._spill_file.write(line)
+            except OSError as e:
+                logger.warning(f"Disabling usage spill to {path}: {e}")
+                self.spill_path = None
+                self._close_spill()
+
+    def _close_spill(self) -> None:
+        """Close the spill handle, if open (caller holds the spill lock)."""
+        if self._spill_file is not None:
+            with contextlib.suppress(OSError):
+                self._spill_file.close()
+            self._spill_file = None
+
+    def close(self) -> None:
+        """Close the usage spill file; it is reopened by the next tracked call."""
+        with self._spill_lock:
+            self._close_spill()
 
     def fits_in_context(self, text: str, reserve_tokens: int = 500) -> bool:
         """
@@ -639,7 +901,8 @@ class TokenManager:
         """
         return {
             "name": self.config.name,
-            "chars_per_token": self.config.chars_per_token,
+            "chars_per_token": self.estimator.chars_per_token,
+            "exact_tokenizer": self.estimator.tokenizer.name if self.estimator.exact else None,
             "max_context_tokens": self.config.max_context_tokens,
             "preferred_chunk_size": self.config.preferred_chunk_size,
             "overlap_tokens": self.config.overlap_tokens,
@@ -647,7 +910,21 @@ class TokenManager:
             "output_cost_per_1k": self.config.output_cost_per_1k,
         }
 
+    def recalibrate(self, model: Optional[str] = None, min_calls: int = 5) -> Optional[float]:
+        """
+        Adopt the chars-per-token ratio observed in reported provider usage.
+
+        Args:
+            model: Model name as reported by the provider (defaults to config name)
+            min_calls: Minimum measured calls before the observation is trusted
+
+        Returns:
+            The new chars_per_token, or None if there was not enough data
+        """
+        return self.estimator.calibrate(model, min_calls=min_calls)
+
     def clear_usage_history(self) -> None:
-        """Clear usage tracking history."""
-        self.usage_history.clear()
+        """Clear usage aggregates and history (the spill file is kept)."""
+        with self._usage_lock:
+            self._reset_usage()
         logger.info("Cleared token usage history")
@@ -0,0 +1,125 @@
+"""
+Local Tokenizers
+
+Optional exact token counting from vocabulary files on disk.
+
+Two vocabulary formats are supported, each through its optional package:
+
+    <name>.json       Hugging Face tokenizer file (requires `tokenizers`)
+    <name>.tiktoken   tiktoken BPE ranks file     (requires `tiktoken`)
+
+Files are looked up in $REGENDER_TOKENIZER_DIR (default: models/tokenizers).
+Nothing is ever downloaded: if the file or the package is missing,
+`load_tokenizer` returns None and callers fall back to the heuristic.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKENIZER_DIR = Path("models/tokenizers")
+TOKENIZER_DIR_ENV = "REGENDER_TOKENIZER_DIR"
+
+# Pre-tokenization patterns for the tiktoken encodings we know how to load
+TIKTOKEN_PATTERNS = {
+    "cl100k_base": (
+        r"(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}|"
+        r" ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"
+    ),
+}
+
+
+class Tokenizer(Protocol):
+    """Minimal interface used by TokenEstimator."""
+
+    name: str
+
+    def count_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts in one call."""
+        ...
+
+
+class HFTokenizer:
+    """Tokenizer backed by a Hugging Face tokenizer.json file."""
+
+    def __init__(self, name: str, path: Path):
+        from tokenizers import Tokenizer as _Tokenizer
+
+        self.name = name
+        self._tokenizer = _Tokenizer.from_file(str(path))
+
+    def count_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts in one call."""
+        encodings = self._tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+
+class TiktokenTokenizer:
+    """Tokenizer backed by a local .tiktoken BPE ranks file."""
+
+    def __init__(self, name: str, path: Path):
+        import tiktoken
+        from tiktoken.load import load_tiktoken_bpe
+
+        self.name = name
+        self._encoding = tiktoken.Encoding(
+            name=name,
+            pat_str=TIKTOKEN_PATTERNS[name],
+            mergeable_ranks=load_tiktoken_bpe(str(path)),
+            special_tokens={},
+        )
+
+    def count_batch(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts in one call."""
+        return [len(tokens) for tokens in self._encoding.encode_ordinary_batch(texts)]
+
+
+_cache: dict[str, Optional[Tokenizer]] = {}
+
+
+def load_tokenizer(name: Optional[str], directory: Optional[Path] = None) -> Optional[Tokenizer]:
+    """
+    Load a tokenizer by vocabulary name from the local tokenizer directory.
+
+    Results (including failures) are cached per name for the process.
+
+    Args:
+        name: Vocabulary name, e.g. "cl100k_base" (None disables)
+        directory: Override for the tokenizer directory
+
+    Returns:
+        Tokenizer, or None if no usable local vocabulary exists
+    """
+    if not name:
+        return None
+
+    root = Path(directory or os.getenv(TOKENIZER_DIR_ENV) or DEFAULT_TOKENIZER_DIR)
+    cache_key = f"{root}/{name}"
+    if cache_key in _cache:
+        return _cache[cache_key]
+
+    tokenizer: Optional[Tokenizer] = None
+    candidates = [
+        (root / f"{name}.json", HFTokenizer),
+        (root / f"{name}.tiktoken", TiktokenTokenizer),
+    ]
+    for path, backend in candidates:
+        if not path.exists():
+            continue
+        if backend is TiktokenTokenizer and name not in TIKTOKEN_PATTERNS:
+            logger.warning(f"No pre-tokenization pattern known for {name}, skipping {path}")
+            continue
+        try:
+            tokenizer = backend(name, path)
+            logger.info(f"Loaded tokenizer {name} from {path}")
+            break
+        except ImportError as e:
+            logger.debug(f"Tokenizer backend for {path} unavailable: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to load tokenizer {path}: {e}")
+
+    _cache[cache_key] = tokenizer
+    return tokenizer
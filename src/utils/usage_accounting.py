@@ -0,0 +1,338 @@
+"""
+Usage Accounting
+
+Process-wide sink for the token usage that providers actually report.
+
+Every completion made through a provider plugin is recorded here with the
+stage ("extraction", "merge", "transform", "retries", ...) and book it was
+made for. Stage and book are carried in context variables, so code only has
+to wrap its work in `usage_scope(...)`; concurrent tasks keep their own
+scope. A scope can also carry a `UsageTally`, which collects just the
+completions made inside it (e.g. one transformation), unlike the per-book
+totals that add up every run on a title. The sink also compares the character-count token estimate with the
+reported input tokens, so `chars_per_token` can be recalibrated per model.
+"""
+
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from src.providers.base import CompletionUsage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+_current_stage: ContextVar[Optional[str]] = ContextVar("usage_stage", default=None)
+_current_book: ContextVar[Optional[str]] = ContextVar("usage_book", default=None)
+_current_tallies: ContextVar[tuple["UsageTally", ...]] = ContextVar("usage_tallies", default=())
+
+
+@contextmanager
+def usage_scope(
+    stage: Optional[str] = None,
+    book: Optional[str] = None,
+    tally: Optional["UsageTally"] = None,
+):
+    """
+    Attribute completions made inside the block to a stage and/or book.
+
+    Arguments left as None inherit the enclosing scope.
+
+    Args:
+        stage: Pipeline stage name
+        book: Book label (title or hash)
+        tally: Also count the block's completions here (enclosing tallies still count them)
+    """
+    stage_token = _current_stage.set(stage) if stage is not None else None
+    book_token = _current_book.set(book) if book is not None else None
+    tally_token = (
+        _current_tallies.set((*_current_tallies.get(), tally)) if tally is not None else None
+    )
+    try:
+        yield
+    finally:
+        if stage_token is not None:
+            _current_stage.reset(stage_token)
+        if book_token is not None:
+            _current_book.reset(book_token)
+        if tally_token is not None:
+            _current_tallies.reset(tally_token)
+
+
+def current_scope() -> tuple[Optional[str], Optional[str]]:
+    """Return the active (stage, book) pair."""
+    return _current_stage.get(), _current_book.get()
+
+
+@dataclass
+class UsageTotals:
+    """Aggregated usage for one bucket (stage, book, provider...)."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency: float = 0.0
+    cost: float = 0.0
+    estimated_calls: int = 0
+
+    def add(self, usage: CompletionUsage, cost: float) -> None:
+        """Add one completion."""
+        self.calls += 1
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.latency += usage.latency
+        self.cost += cost
+        if usage.estimated:
+            self.estimated_calls += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation."""
+        data = asdict(self)
+        data["total_tokens"] = self.input_tokens + self.output_tokens
+        data["avg_latency"] = self.latency / self.calls if self.calls else 0.0
+        data["cost"] = round(self.cost, 6)
+        return data
+
+
+class UsageTally:
+    """Usage of the completions made inside the `usage_scope` blocks it was passed to."""
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self._lock = threading.Lock()
+        self._total = UsageTotals()
+        self._by_stage: dict[str, UsageTotals] = {}
+
+    def add(self, usage: CompletionUsage, stage: str, cost: float) -> None:
+        """Add one completion."""
+        with self._lock:
+            self._total.add(usage, cost)
+            self._by_stage.setdefault(stage, UsageTotals()).add(usage, cost)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Totals with a per-stage breakdown (same shape as a `by_book()` entry)."""
+        with self._lock:
+            return {
+                **self._total.to_dict(),
+                "stages": {stage: t.to_dict() for stage, t in self._by_stage.items()},
+            }
+
+
+@dataclass
+class _EstimatorStats:
+    """Estimated vs reported input tokens for one model."""
+
+    configured_chars_per_token: float
+    calls: int = 0
+    prompt_chars: int = 0
+    actual_tokens: int = 0
+    estimated_tokens: float = 0.0
+    abs_error: float = 0.0
+
+    def add(self, prompt_chars: int, actual_tokens: int) -> None:
+        estimate = prompt_chars / self.configured_chars_per_token
+        self.calls += 1
+        self.prompt_chars += prompt_chars
+        self.actual_tokens += actual_tokens
+        self.estimated_tokens += estimate
+        self.abs_error += abs(estimate - actual_tokens)
+
+    def to_dict(self) -> dict[str, Any]:
+        actual = self.actual_tokens or 1
+        return {
+            "calls": self.calls,
+            "configured_chars_per_token": self.configured_chars_per_token,
+            "observed_chars_per_token": round(self.prompt_chars / actual, 3),
+            "mean_abs_error_pct": round(100 * self.abs_error / actual, 2),
+            "bias_pct": round(100 * (self.estimated_tokens - self.actual_tokens) / actual, 2),
+        }
+
+
+class UsageAccountant:
+    """Thread-safe aggregator of reported completion usage."""
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], Optional[Callable]]] = []
+        self.reset()
+
+    def add_listener(self, callback: Callable) -> None:
+        """
+        Call `callback(usage, provider, stage, book, cost)` for every recorded completion.
+
+        Bound methods are held weakly, so a listening service does not stay
+        alive just because it subscribed.
+
+        Args:
+            callback: Function or bound method
+        """
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+
+            def ref(callback=callback):
+                return callback
+
+        with self._lock:
+            self._listeners.append(ref)
+
+    def reset(self) -> None:
+        """Drop all recorded usage."""
+        with self._lock:
+            self._total = UsageTotals()
+            self._by_stage: dict[str, UsageTotals] = {}
+            self._by_book: dict[str, UsageTotals] = {}
+            self._by_book_stage: dict[str, dict[str, UsageTotals]] = {}
+            self._by_provider: dict[str, UsageTotals] = {}
+            self._estimator: dict[str, _EstimatorStats] = {}
+
+    def record(
+        self,
+        usage: CompletionUsage,
+        provider: str,
+        prompt_chars: int = 0,
+        cost_per_1k_input: float = 0.0,
+        cost_per_1k_output: float = 0.0,
+    ) -> None:
+        """
+        Record one completion under the active stage and book.
+
+        Args:
+            usage: Usage reported by the provider
+            provider: Provider name
+            prompt_chars: Characters sent in the prompt (for estimator calibration)
+            cost_per_1k_input: Input price for the model
+            cost_per_1k_output: Output price for the model
+        """
+        stage, book = current_scope()
+        stage = stage or "other"
+        model = usage.model or "unknown"
+        cost = (
+            usage.input_tokens / 1000 * cost_per_1k_input
+            + usage.output_tokens / 1000 * cost_per_1k_output
+        )
+
+        with self._lock:
+            self._total.add(usage, cost)
+            self._by_stage.setdefault(stage, UsageTotals()).add(usage, cost)
+            self._by_provider.setdefault(f"{provider}/{model}", UsageTotals()).add(usage, cost)
+            if book:
+                self._by_book.setdefault(book, UsageTotals()).add(usage, cost)
+                self._by_book_stage.setdefault(book, {}).setdefault(stage, UsageTotals()).add(
+                    usage, cost
+                )
+            if prompt_chars and usage.input_tokens and not usage.estimated:
+                stats = self._estimator.get(model)
+                if stats is None:
+                    stats = _EstimatorStats(configured_chars_per_token(model))
+                    self._estimator[model] = stats
+                stats.add(prompt_chars, usage.input_tokens)
+            listeners = [ref() for ref in self._listeners]
+            self._listeners = [ref for ref, cb in zip(self._listeners, listeners) if cb]
+
+        for tally in _current_tallies.get():
+            tally.add(usage, stage, cost)
+
+        for callback in listeners:
+            if callback is None:
+                continue
+            try:
+                callback(usage, provider, stage, book, cost)
+            except Exception as e:
+                logger.debug(f"Usage listener failed: {e}")
+
+    def totals(self) -> UsageTotals:
+        """Overall totals (a copy)."""
+        with self._lock:
+            return UsageTotals(**asdict(self._total))
+
+    def by_stage(self) -> dict[str, dict[str, Any]]:
+        """Usage per pipeline stage."""
+        with self._lock:
+            return {stage: t.to_dict() for stage, t in self._by_stage.items()}
+
+    def by_book(self) -> dict[str, dict[str, Any]]:
+        """Usage per book, with a per-stage breakdown."""
+        with self._lock:
+            return {
+                book: {
+                    **t.to_dict(),
+                    "stages": {s: st.to_dict() for s, st in self._by_book_stage[book].items()},
+                }
+                for book, t in self._by_book.items()
+            }
+
+    def by_provider(self) -> dict[str, dict[str, Any]]:
+        """Usage per provider/model."""
+        with self._lock:
+            return {key: t.to_dict() for key, t in self._by_provider.items()}
+
+    def estimator_report(self) -> dict[str, dict[str, Any]]:
+        """
+        Compare character-based token estimates with reported input tokens.
+
+        Returns:
+            Map of model to calls, configured and observed chars_per_token,
+            mean absolute error and bias (positive = overestimate) in percent
+        """
+        with self._lock:
+            return {model: s.to_dict() for model, s in self._estimator.items()}
+
+    def observed_chars_per_token(self, model: str, min_calls: int = 5) -> Optional[float]:
+        """
+        Observed chars-per-token ratio for a model.
+
+        Args:
+            model: Model name
+            min_calls: Minimum number of measured calls before trusting the ratio
+
+        Returns:
+            Ratio, or None if there is not enough data
+        """
+        with self._lock:
+            stats = self._estimator.get(model)
+            if not stats or stats.calls < min_calls or not stats.actual_tokens:
+                return None
+            return stats.prompt_chars / stats.actual_tokens
+
+    def summary(self) -> dict[str, Any]:
+        """Full usage report."""
+        return {
+            "total": self.totals().to_dict(),
+            "stages": self.by_stage(),
+            "books": self.by_book(),
+            "providers": self.by_provider(),
+            "estimator": self.estimator_report(),
+        }
+
+
+def configured_chars_per_token(model: str) -> float:
+    """
+    The chars_per_token the TokenManager would use for a model.
+
+    Model names are matched on the longest known config name they start with
+    (e.g. "gpt-4o-mini" uses "gpt-4").
+    """
+    from src.utils.token_manager import TokenManager
+
+    best = None
+    for name, config in TokenManager.MODEL_CONFIGS.items():
+        if model.startswith(name) and (best is None or len(name) > len(best[0])):
+            best = (name, config)
+    return best[1].chars_per_token if best else DEFAULT_CHARS_PER_TOKEN
+
+
+_accountant = UsageAccountant()
+
+
+def get_usage_accountant() -> UsageAccountant:
+    """Get the process-wide usage accountant."""
+    return _accountant
@@ -55,6 +55,13 @@ class MockLLMProvider:
         return loop.run_until_complete(self.complete_async(messages, **kwargs))
 
 
+@pytest.fixture(autouse=True)
+def isolated_analysis_store(tmp_path, monkeypatch):
+    """Keep persisted character analyses and parsed books out of the working tree."""
+    monkeypatch.setenv("REGENDER_ANALYSIS_STORE", str(tmp_path / "analysis_store"))
+    monkeypatch.setenv("REGENDER_BOOK_CACHE", str(tmp_path / "book_cache"))
+
+
 @pytest.fixture
 def mock_llm():
     """Provide a mock LLM instance."""
@@ -100,3 +100,243 @@ def test_pipeline_handles_bad_input(app_with_mock, tmp_path):
     # Should handle gracefully (might fail or succeed with empty output)
     assert "success" in result  # Should at least return a result dict
     # Don't care if it succeeded or failed, just that it didn't crash
+
+
+def test_analysis_store_roundtrip_and_checkpoint(tmp_path):
+    """Stored analyses are found by content hash, provider and model."""
+    from src.models.character import Character, CharacterAnalysis, Gender
+    from src.services.analysis_store import AnalysisStore
+
+    store = AnalysisStore(tmp_path / "store")
+    store.put_partial("abc123", "mock", "mock-model", stage="extracted",
+                      data={"raw_characters": [{"name": "Jane"}]})
+    assert store.get("abc123", "mock", "mock-model") is None
+    assert store.get_partial("abc123", "mock", "mock-model")["raw_characters"] == [{"name": "Jane"}]
+
+    analysis = CharacterAnalysis(
+        book_id="abc123",
+        characters=[Character(name="Jane", gender=Gender.FEMALE, pronouns="she/her")],
+    )
+    store.put(analysis, "mock", "mock-model", book_title="Test")
+
+    # A fresh store instance reads the index from disk
+    reopened = AnalysisStore(tmp_path / "store")
+    loaded = reopened.get("abc123", "mock", "mock-model")
+    assert loaded is not None
+    assert loaded.characters[0].name == "Jane"
+    assert reopened.get_partial("abc123", "mock", "mock-model") is None
+    assert reopened.get("abc123", "mock", "other-model") is None
+
+
+def test_analysis_stores_sharing_a_directory_merge_their_writes(tmp_path):
+    """Two store instances (say CLI and TUI) never erase each other's entries."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.models.character import CharacterAnalysis
+    from src.services.analysis_store import AnalysisStore
+
+    cli = AnalysisStore(tmp_path / "store")
+    tui = AnalysisStore(tmp_path / "store")
+    assert cli.get("book-a", "mock", "m") is None and tui.get("book-b", "mock", "m") is None
+
+    cli.put(CharacterAnalysis(book_id="book-a", characters=[]), "mock", "m")
+    tui.put(CharacterAnalysis(book_id="book-b", characters=[]), "mock", "m")
+    cli.put_name_suggestions({"k1": {"suggested": "John"}})
+    tui.put_name_suggestions({"k2": {"suggested": "Andrew"}})
+
+    for store in (cli, tui, AnalysisStore(tmp_path / "store")):
+        assert store.get("book-a", "mock", "m") is not None
+        assert store.get("book-b", "mock", "m") is not None
+        assert store.get_name_suggestion("k1") and store.get_name_suggestion("k2")
+
+    # Concurrent writers in one process neither collide on temp files nor lose updates
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(
+            lambda i: (cli if i % 2 else tui).put_name_suggestions({f"t{i}": {"n": i}}),
+            range(40),
+        ))
+    reopened = AnalysisStore(tmp_path / "store")
+    assert all(reopened.get_name_suggestion(f"t{i}") == {"n": i} for i in range(40))
+    assert not list((tmp_path / "store").glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_name_suggestions_memoize_answers_but_not_omissions():
+    """A character the LLM leaves out is asked about again; results keep the cast order."""
+    from src.models.character import Character, CharacterAnalysis, Gender
+    from src.services.base import ServiceConfig
+    from src.services.character_service import CharacterService
+
+    class SuggestingProvider:
+        name = "mock"
+        model = "mock-model"
+        supports_json = True
+
+        def __init__(self):
+            self.prompts = []
+
+        async def complete(self, messages, **kwargs):
+            prompt = messages[-1]["content"]
+            self.prompts.append(prompt)
+            answers = []
+            # Only has an idea for Ann the second time round
+            if '"Ann"' in prompt and len(self.prompts) > 1:
+                answers.append({"original": "Ann", "suggested": "Andrew"})
+            if '"Jane"' in prompt:
+                answers.append({"original": "Jane", "suggested": "John"})
+            return json.dumps(answers)
+
+    provider = SuggestingProvider()
+    service = CharacterService(provider=provider, config=ServiceConfig(cache_enabled=True))
+    characters = CharacterAnalysis(
+        book_id="abc123",
+        characters=[
+            Character(name="Ann", gender=Gender.FEMALE, pronouns="she/her"),
+            Character(name="Jane", gender=Gender.FEMALE, pronouns="she/her"),
+        ],
+    )
+
+    first = await service.suggest_name_alternatives(characters, "all_male")
+    assert [s["suggested"] for s in first] == ["John"]
+
+    # Jane comes from the memo and Ann from the LLM, yet Ann stays first
+    second = await service.suggest_name_alternatives(characters, "all_male")
+    assert [s["suggested"] for s in second] == ["Andrew", "John"]
+    assert len(provider.prompts) == 2
+    assert '"Ann"' in provider.prompts[1] and '"Jane"' not in provider.prompts[1]
+
+    third = await service.suggest_name_alternatives(characters, "all_male")
+    assert third == second
+    assert len(provider.prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_confident_local_gender_merges_aliases_without_the_llm():
+    """Subset-name aliases agreeing on a confident gender skip the merge prompt."""
+    from src.models.character import Gender
+    from src.services.character_service import CharacterService
+    from src.services.gender_inference import GenderEstimate
+
+    class MergingProvider:
+        name = "mock"
+        model = "mock-model"
+        supports_json = True
+
+        def __init__(self):
+            self.prompts = []
+
+        async def complete(self, messages, **kwargs):
+            self.prompts.append(messages[-1]["content"])
+            return json.dumps(
+                {
+                    "is_same_person": True,
+                    "canonical_name": "Jane Smith",
+                    "gender": "male",
+                    "pronouns": "he/him",
+                    "description": "",
+                    "aliases": ["Jane Doe"],
+                }
+            )
+
+    provider = MergingProvider()
+    service = CharacterService(provider=provider)
+    threshold = service.gender_inference_config["confidence_threshold"]
+    estimates = {
+        "Elizabeth": GenderEstimate("Elizabeth", female=12.0),
+        "Miss Elizabeth Bennet": GenderEstimate("Miss Elizabeth Bennet", female=9.0, male=1.0),
+        "Jane Smith": GenderEstimate("Jane Smith", female=1.0),
+        "Jane Doe": GenderEstimate("Jane Doe", female=1.0),
+    }
+    aliases = [
+        {"name": "Elizabeth", "gender": "unknown", "aliases": ["Lizzy"]},
+        {"name": "Miss Elizabeth Bennet", "gender": "male", "description": "second daughter"},
+    ]
+    # Different surnames are never merged locally, whatever the evidence
+    namesakes = [{"name": "Jane Smith", "gender": "female"}, {"name": "Jane Doe"}]
+    conflicting = [aliases[0], {"name": "Elizabeth Bennet", "gender": "male"}]
+    conflicting_estimates = [
+        estimates["Elizabeth"], GenderEstimate("Elizabeth Bennet", male=30.0)
+    ]
+
+    assert service._can_merge_locally(aliases, [estimates[c["name"]] for c in aliases], threshold)
+    assert not service._can_merge_locally(aliases, [], threshold)
+    assert not service._can_merge_locally(
+        namesakes, [estimates[c["name"]] for c in namesakes], threshold
+    )
+    assert not service._can_merge_locally(conflicting, conflicting_estimates, threshold)
+
+    stats = {}
+    merged = await service._merge_character_groups([aliases, namesakes], estimates, stats)
+
+    assert len(provider.prompts) == 1  # Only the namesakes went to the LLM
+    assert stats == {"llm_merges_skipped": 1, "local_gender": 1}
+    elizabeth = merged[0]
+    assert elizabeth.name == "Miss Elizabeth Bennet"
+    assert elizabeth.aliases == ["Elizabeth", "Lizzy"]
+    assert elizabeth.description == "second daughter"
+    # The confident local estimate overrides the extraction's gender
+    assert elizabeth.gender == Gender.FEMALE
+    assert elizabeth.pronouns == "she/her/hers"
+    pooled = GenderEstimate.combine("", [estimates[c["name"]] for c in aliases])
+    assert elizabeth.confidence == round(pooled.confidence, 3)
+    # Weak evidence leaves the LLM's answer alone
+    assert merged[1].gender == Gender.MALE
+
+    character = service._dict_to_character({"name": "Pat", "gender": "male", "pronouns": "he"})
+    service._apply_gender_estimate(character, GenderEstimate("Pat", male=20.0))
+    assert (character.gender, character.pronouns) == (Gender.MALE, "he")
+    assert character.confidence == round(20.0 / 22.0, 3)
+
+
+@pytest.mark.asyncio
+async def test_provider_warm_up_runs_once_per_provider_per_event_loop(monkeypatch):
+    """Later applications on a loop skip the warm-up unless it failed; new loops warm up."""
+    import asyncio
+    import weakref
+
+    import src.app
+    from src.app import Application
+    from src.container import ApplicationContext
+    from src.providers.http_pool import close_http_client
+
+    monkeypatch.setattr(src.app, "_warmed_up", weakref.WeakKeyDictionary())
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)  # No real provider to warm up
+
+    class WarmProvider:
+        name = "mock"
+        supports_json = True
+        warm_ups = 0
+
+        def __init__(self, model="mock-model", answers=True):
+            self.model = model
+            self.answers = answers
+
+        async def warm_up(self):
+            WarmProvider.warm_ups += 1
+            return self.answers
+
+    async def start(provider):
+        context = ApplicationContext()
+        context.initialize()
+        context.register_instance("llm_provider", provider)
+        app = Application(context=context)
+        app._provider = provider
+        app._start_warm_up()
+        if app._warm_up_task is not None:
+            await app._warm_up_task
+        await asyncio.sleep(0)  # Let the done callback run
+        return app._warm_up_task is not None
+
+    assert await start(WarmProvider(answers=False))
+    assert await start(WarmProvider())  # The failed warm-up is retried
+    assert not await start(WarmProvider())
+    assert await start(WarmProvider(model="other-model"))
+    assert WarmProvider.warm_ups == 3
+
+    # A second event loop (another asyncio.run, say the TUI after the CLI) has its own pool
+    assert await asyncio.to_thread(asyncio.run, start(WarmProvider()))
+    # So does this loop once its pooled client was closed and replaced
+    await close_http_client()
+    assert await start(WarmProvider())
+    assert not await start(WarmProvider())
+    assert WarmProvider.warm_ups == 5
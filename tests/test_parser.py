@@ -93,3 +93,425 @@ def test_parser_preserves_paragraph_structure():
 
 # Play format detection is complex and not critical
 # Skipping this test for pragmatic approach
+
+
+def test_section_matcher_keeps_pattern_order_and_groups():
+    """The single-scan matcher picks the first pattern in order, with its own groups."""
+    from src.parsers.hierarchy import HierarchyBuilder, SectionType
+
+    builder = HierarchyBuilder()
+
+    assert builder._match_section("VOLUME III") == (SectionType.VOLUME, "3", None)
+    assert builder._match_section("CHAPTER 12. The Ball") == (SectionType.CHAPTER, "12", "The Ball")
+    # A bare numeral is a chapter, not a poem: chapter patterns come first
+    assert builder._match_section("XIV.") == (SectionType.CHAPTER, "14", None)
+    assert builder._match_section("It was a dark and stormy night.") is None
+    assert builder._detect_hierarchy(["VOLUME I", "CHAPTER I.", "text"]) == [
+        SectionType.VOLUME,
+        SectionType.CHAPTER,
+    ]
+
+
+def test_streaming_parser_matches_in_memory_parse(tmp_path):
+    """Streamed chapters are the ones parse() gives for the whole text, CRLF or not."""
+    from src.parsers.streaming import StreamingParser
+
+    body = "\n\n".join(
+        f"VOLUME {v}\n\n"
+        + "\n\n".join(
+            f"CHAPTER {v}{c}\n\n" + "\n\n".join(f"Line {p} of\nchapter {c}." for p in range(c))
+            for c in range(1, 5)
+        )
+        for v in ("I", "II")
+    )
+    text = (
+        "*** START OF THE PROJECT GUTENBERG EBOOK TEST ***\n\n"
+        f"{body}\n\n*** END OF THE PROJECT GUTENBERG EBOOK TEST ***\n"
+    )
+    path = tmp_path / "book.txt"
+    path.write_bytes(text.replace("\n", "\r\n").encode("utf-8"))
+
+    expected = IntegratedParser().parse(text)
+    with StreamingParser().parse_file(path) as streamed:
+        chapters = list(streamed.chapters)
+
+    assert chapters == expected.chapters
+    assert streamed.format == expected.format
+    assert streamed.cleaned_text_length == expected.cleaned_text_length
+
+
+def test_book_cache_round_trip_and_lazy_chapters(tmp_path):
+    """Cached books load back unchanged, chapter by chapter, keyed by content hash."""
+    from src.models.book import Book, Chapter, Paragraph
+    from src.services.book_cache import BookCache, content_hash
+
+    source = tmp_path / "book.txt"
+    source.write_text("CHAPTER 1\n\nSome text.\n")
+    book = Book(
+        title="T",
+        author="A",
+        chapters=[
+            Chapter(number=i, title=f"Chapter {i}", paragraphs=[Paragraph(["One.", "Two."])])
+            for i in (1, 2)
+        ],
+        metadata={"language": "en"},
+    )
+
+    cache = BookCache(tmp_path / "cache")
+    digest = content_hash(source)
+    assert cache.get(digest) is None
+    cache.put(digest, book)
+
+    assert cache.get(digest).to_dict() == book.to_dict()
+    assert cache.get(digest, variant="other") is None
+    with cache.open(digest) as cached:
+        assert [c["title"] for c in cached.chapter_index] == ["Chapter 1", "Chapter 2"]
+        assert cached.chapter(1).to_dict() == book.chapters[1].to_dict()
+
+    source.write_text("CHAPTER 1\n\nOther text.\n")
+    assert cache.get(content_hash(source)) is None
+
+
+def test_corpus_ingestion_skips_ingested_hashes_on_rerun(tmp_path):
+    """Parallel ingestion writes JSON plus a manifest, and a rerun skips done files."""
+    from pathlib import Path
+
+    from src.services.book_cache import BookCache
+    from src.services.corpus import CorpusIngestor, load_manifest
+
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    text = "CHAPTER 1\n\nOne. Two.\n\nThree.\n\nFour.\n"
+    (corpus / "a.txt").write_text(text)
+    (corpus / "sub" / "b.txt").write_text(text.replace("One", "Uno"))
+    (corpus / "sub" / "copy.txt").write_text(text)  # same content as a.txt
+
+    ingestor = CorpusIngestor(json_dir=tmp_path / "json", workers=2)
+    summary = ingestor.run([corpus])
+
+    assert (summary.ingested, summary.skipped, summary.failed) == (2, 1, 0)
+    assert (tmp_path / "json" / "sub" / "b.json").exists()
+    records = load_manifest(summary.manifest_path)
+    assert records[str(corpus / "a.txt")]["chapters"] == 1
+    assert set(records[str(corpus / "a.txt")]["timings"]) >= {"parse", "convert", "write"}
+
+    rerun = ingestor.run([corpus])
+    assert (rerun.ingested, rerun.skipped) == (0, 3)
+
+    # Asking for the cache as well re-ingests what was only written as JSON
+    cache = BookCache(tmp_path / "cache")
+    cached = CorpusIngestor(json_dir=tmp_path / "json", cache=cache, workers=2)
+    assert (cached.run([corpus]).ingested, cached.run([corpus]).skipped) == (2, 3)
+    assert cache.get(records[str(corpus / "a.txt")]["hash"]) is not None
+
+    # Explicit files outside a directory root with the same name get their own JSON
+    explicit = []
+    for folder, word in (("x", "Eins"), ("y", "Une")):
+        (tmp_path / folder).mkdir()
+        explicit.append(tmp_path / folder / "c.txt")
+        explicit[-1].write_text(text.replace("One", word))
+    assert ingestor.run(explicit).ingested == 2
+    records = load_manifest(summary.manifest_path)
+    outputs = {records[str(path)]["output"] for path in explicit}
+    assert len(outputs) == 2
+    assert all(Path(output).exists() for output in outputs)
+
+
+def test_split_sentences_skips_abbreviations_and_handles_quotes():
+    """Abbreviations never end a sentence; quoted endings and ?/! do."""
+    from src.parsers.book_converter import BookConverter
+
+    converter = BookConverter()
+    text = 'Mr. Smith met Dr.  Jones at 5 p.m. Today.\n"Stop!" Then he left? Yes. U.S. Navy'
+    assert converter.split_sentences(text) == [
+        'Mr. Smith met Dr. Jones at 5 p.m. Today. "Stop!"',
+        "Then he left?",
+        "Yes.",
+        "U.S. Navy",
+    ]
+    assert converter.split_sentences("no capital. after this") == ["no capital. after this"]
+    assert converter.split_sentences("  \n ") == []
+
+    converter.abbreviations.add("Capt.")
+    assert converter.split_sentences("Capt. Hook sailed.") == ["Capt. Hook sailed."]
+
+
+def test_synthetic_books_are_detected_as_their_kind():
+    """Each benchmark generator exercises the parser path it is named for."""
+    from benchmarks.synthetic import GENERATORS
+
+    expected = {
+        "novel": "standard",
+        "play": "play",
+        "multi_volume": "multi_part",
+        "epistolary": "epistolary",
+        "poetry": "poetry",
+    }
+    parser = IntegratedParser()
+    for kind, generate in GENERATORS.items():
+        text = generate(60_000, seed=1)
+        assert text == generate(60_000, seed=1)
+        book = parser.parse(text)
+        assert book.format.value == expected[kind], kind
+        assert len(book.chapters) > 3, kind
+
+
+def test_play_parser_builds_acts_scenes_and_speeches():
+    """Every scene is kept, speeches run to the next cue, and side sections are collected."""
+    from src.parsers.play import PlayElementType, PlayParser
+
+    text = """Dramatis Personae
+HAMLET, prince of Denmark
+HORATIO, his friend
+
+
+PROLOGUE
+Two households, both alike.
+
+ACT I.
+SCENE I. Elsinore. A platform.
+[Enter Horatio]
+HORATIO: Ho!
+Who's there?
+HAMLET:
+Long live the king!
+SCENE II. A room of state.
+HAMLET.
+A little more than kin.
+ACT 2
+SCENE I. A room.
+HORATIO.
+My lord.
+EPILOGUE
+All is well."""
+
+    play = PlayParser().parse(text.split("\n"))
+
+    assert play.dramatis_personae == ["HAMLET, prince of Denmark", "HORATIO, his friend"]
+    assert play.prologue == ["Two households, both alike."]
+    assert play.epilogue == ["All is well."]
+    assert [[scene.number for scene in act.scenes] for act in play.acts] == [["I", "II"], ["I"]]
+    assert [act.number for act in play.acts] == ["I", "2"]
+    first = play.acts[0].scenes[0]
+    assert first.location == "Elsinore. A platform."
+    assert [(e.type, e.metadata.get("character"), e.content) for e in first.elements] == [
+        (PlayElementType.STAGE_DIRECTION, None, "Enter Horatio"),
+        (PlayElementType.DIALOGUE, "HORATIO", "Ho! Who's there?"),
+        (PlayElementType.DIALOGUE, "HAMLET", "Long live the king!"),
+    ]
+
+
+def test_paragraph_text_buffer_matches_sentences_and_tracks_mutation():
+    """Compact paragraphs keep the sentence API, dict format and digests."""
+    import copy
+    import pickle
+
+    from src.models.book import Chapter, Paragraph
+
+    paragraph = Paragraph(sentences=["It was late.", "He left."])
+    chapter = Chapter(number=1, title="One", paragraphs=[paragraph])
+    assert paragraph.get_text() == "It was late. He left."
+    assert paragraph.sentence_count() == 2
+    assert paragraph.to_dict() == {"sentences": ["It was late.", "He left."]}
+    assert Paragraph(sentences=[]).get_text() == ""
+    assert Chapter.from_dict(chapter.to_dict()) == chapter
+    assert pickle.loads(pickle.dumps(chapter)).hash() == chapter.hash()
+
+    before = chapter.hash()
+    clone = copy.deepcopy(chapter)
+    paragraph.sentences.append("Rain fell.")
+    assert paragraph.get_text() == "It was late. He left. Rain fell."
+    assert chapter.hash() != before
+    assert clone.hash() == before
+    paragraph.sentences = ["It was late.", "He left."]
+    assert chapter.hash() == before
+
+
+
+def test_book_hash_follows_in_place_edits_but_not_source_file():
+    """Book.hash sees sentence and paragraph edits below cached digests, never the path."""
+    from src.models.book import Book, Chapter, Paragraph
+
+    def make_book(source_file=None):
+        return Book(
+            title="Tale",
+            author="Anon",
+            chapters=[
+                Chapter(1, "One", [Paragraph(["It was late.", "He left."])]),
+                Chapter(2, "Two", [Paragraph(["Morning came."])]),
+            ],
+            source_file=source_file,
+        )
+
+    book = make_book("books/texts/tale.txt")
+    original = book.hash()
+    assert make_book().hash() == original
+    assert make_book("elsewhere/tale-copy.txt").hash() == original
+    book.source_file = "moved/tale.txt"
+    assert book.hash() == original
+    assert Book.from_dict(book.to_dict()).hash() == original
+
+    paragraph = book.chapters[0].paragraphs[0]
+    paragraph.sentences[1] = "She left."
+    edited = book.hash()
+    assert edited != original
+    paragraph.sentences[1] = "He left."
+    assert book.hash() == original
+
+    second = book.chapters[1]
+    second.paragraphs.append(Paragraph(["Rain fell."]))
+    assert book.hash() not in (original, edited)
+    second.paragraphs.pop()
+    assert book.hash() == original
+    second.paragraphs[0] = Paragraph(["Evening came."])
+    assert book.hash() != original
+    second.paragraphs[0].sentences = ["Morning came."]
+    assert book.hash() == original
+    book.chapters.reverse()
+    assert book.hash() != original
+
+
+def test_character_index_and_mentions_track_their_own_analysis():
+    """Lookups and mentions share one lenient index, rebuilt only for the changed analysis."""
+    import copy
+
+    from src.models.character import Character, CharacterAnalysis, Gender
+
+    darcy = Character(name="Mr. Darcy", gender=Gender.MALE, pronouns={}, aliases=["Fitzwilliam"])
+    jane = Character(name="Jane Bennet", gender=Gender.FEMALE, pronouns={}, aliases=["Jane"])
+    analysis = CharacterAnalysis(book_id="pp", characters=[darcy, jane])
+    other = CharacterAnalysis(book_id="other", characters=[jane])
+
+    assert analysis.get_character("MR DARCY") is darcy
+    text = "mr darcy bowed. MR.  DARCY left; Jane Bennet and jane stayed, Mr. Darcyson too."
+    mentions = analysis.find_mentions(text)
+    assert [(text[s:e], c) for s, e, c in mentions] == [
+        ("mr darcy", darcy),
+        ("MR.  DARCY", darcy),
+        ("Jane Bennet", jane),
+        ("jane", jane),
+    ]
+    assert all(analysis.get_character(text[s:e]) is c for s, e, c in mentions)
+
+    # In-place alias edits reach the analyses listing the character, and only those
+    other.get_character("Jane")
+    other_version = other._index_version
+    darcy.aliases.append("Will")
+    assert analysis.get_character("will") is darcy
+    assert analysis.mentioned_characters("Will came.") == [darcy]
+    assert other._index_version == other_version
+    jane.name = "Jane Bingley"
+    assert other.get_character("jane bingley") is jane
+    assert analysis.get_character("Jane Bingley") is jane
+
+    clone = copy.deepcopy(analysis)
+    clone.characters[0].aliases.append("Darce")
+    assert clone.get_character("darce") is clone.characters[0]
+    assert analysis.get_character("darce") is None
+    analysis.characters.remove(darcy)
+    assert analysis.get_character("Mr. Darcy") is None
+    assert analysis.find_mentions("Mr. Darcy") == []
+
+
+def test_json_streaming_matches_json_dump():
+    """Streamed, lazily built book JSON is byte-identical to json.dump on every backend."""
+    import io
+    import json
+
+    from src.models.book import Book, Chapter, Paragraph
+    from src.utils import json_io
+
+    book = Book(
+        title="Émile",
+        author=None,
+        chapters=[
+            Chapter(1, "One", [Paragraph(["“Hi,” she said.", "Tab\there."])]),
+            Chapter(2, None, [], metadata={"empty": {}}),
+        ],
+        metadata={"tags": []},
+    )
+    pretty = json.dumps(book.to_dict(), indent=2, ensure_ascii=False).encode()
+    compact = json.dumps(book.to_dict(), ensure_ascii=False, separators=(",", ":")).encode()
+    for backend in json_io.BACKENDS:
+        for is_compact, expected in ((False, pretty), (True, compact)):
+            buffer = io.BytesIO()
+            json_io.dump(book.to_dict(lazy=True), buffer, compact=is_compact, backend=backend)
+            assert buffer.getvalue() == expected
+        assert Book.from_dict(json_io.loads(pretty, backend=backend)) == book
+
+
+
+def test_json_backends_agree_on_enums_dataclasses_and_non_finite_floats():
+    """Values outside JSON's types encode the same on every backend, and as valid JSON."""
+    import io
+    import json
+    from datetime import datetime
+
+    from src.models.character import Character, Gender
+    from src.utils import json_io
+
+    character = Character(name="Ann", gender=Gender.FEMALE, pronouns={}, confidence=float("nan"))
+    character.aliases.append("Annie")  # Non-field attributes are not written
+    value = {
+        "gender": Gender.MALE,
+        "character": character,
+        "scores": [1.5, float("inf"), -float("inf")],
+        "when": datetime(2024, 5, 1, 12, 30),
+        "tags": {"x"},
+        3: None,
+    }
+    expected = {
+        "gender": "male",
+        "character": {**character.to_dict(), "confidence": None},
+        "scores": [1.5, None, None],
+        "when": "2024-05-01 12:30:00",
+        "tags": "{'x'}",
+        "3": None,
+    }
+    outputs = set()
+    for backend in json_io.BACKENDS:
+        for is_compact in (False, True):
+            data = json_io.dumps(value, compact=is_compact, backend=backend)
+            assert json.loads(data) == expected  # A written NaN would load as nan, not None
+            buffer = io.BytesIO()
+            json_io.dump({"items": iter([value])}, buffer, compact=is_compact, backend=backend)
+            assert json.loads(buffer.getvalue()) == {"items": [expected]}
+            outputs.add((is_compact, data))
+    assert len(outputs) == 2  # One text per layout, whichever the backend
+
+
+def test_gutenberg_scan_locates_content_metadata_and_toc():
+    """One scan gives the content range, metadata and TOC that clean/get_toc return."""
+    from src.parsers.gutenberg import GutenbergParser
+
+    text = "\n".join(
+        [
+            "The Project Gutenberg EBook of Test Book, by Someone",
+            "Title: Test Book",
+            "Author: Someone",
+            *[""] * 9,
+            "*** START OF THIS PROJECT GUTENBERG EBOOK TEST BOOK ***",
+            "",
+            "CONTENTS",
+            "I. The Beginning ..... 1",
+            "",
+            "CHAPTER I.",
+            "It began.",
+            "17",
+            "[Illustration: A house",
+            "by the sea]",
+            "It ended.",
+            "*** END OF THIS PROJECT GUTENBERG EBOOK TEST BOOK ***",
+            "License text",
+        ]
+    )
+    cleaner = GutenbergParser()
+    layout = cleaner.scan(text)
+
+    assert (layout.content_start, layout.content_end) == (14, 23)
+    assert (layout.toc_start, layout.toc_end) == (14, 17)
+    assert layout.toc == cleaner.get_toc(text) == "CONTENTS\nI. The Beginning ..... 1\n"
+    lines, metadata = cleaner.clean_layout(layout)
+    assert (metadata.title, metadata.author) == ("Test Book", "Someone")
+    assert lines[-3:] == ["CHAPTER I.", "It began.", "It ended."]
+    assert cleaner.clean(text) == ("\n".join(lines), metadata)
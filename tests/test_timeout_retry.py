@@ -5,7 +5,9 @@ Simulates the Darcy's letter scenario: a very long paragraph that causes an API
 timeout on the first batch attempt. The retry logic should split the paragraph
 into sentence groups and successfully transform it without re-running the whole book.
 """
+import json
 import re
+import time
 
 import pytest
 
@@ -162,3 +164,652 @@ async def test_retry_falls_back_to_term_map_on_total_failure():
     assert re.search(r"\buncle\b", output_text), f"'uncle' not in output: {output_text}"
     assert re.search(r"\bwidower\b", output_text), f"'widower' not in output: {output_text}"
     assert re.search(r"\bking\b", output_text), f"'king' not in output: {output_text}"
+
+
+@pytest.mark.asyncio
+async def test_replay_provider_records_replays_and_injects_errors(tmp_path):
+    """A recorded cassette replays offline; injected 429s carry retry_after."""
+    import asyncio
+
+    from src.providers.base import CompletionResult, CompletionUsage
+    from src.providers.replay import ReplayProvider
+    from src.utils.errors import RateLimitError
+
+    class EchoProvider:
+        model = "echo-model"
+
+        async def complete(self, messages, **kwargs):
+            return messages[-1]["content"].upper()
+
+    cassette = tmp_path / "cassette.jsonl"
+    messages = [{"role": "user", "content": "she said hello"}]
+
+    recorder = ReplayProvider()
+    recorder.initialize({"mode": "record", "cassette": cassette, "provider": EchoProvider()})
+    assert await recorder.complete(messages, temperature=0) == "SHE SAID HELLO"
+
+    player = ReplayProvider()
+    player.initialize({"cassette": cassette, "latency": "fixed:0.01"})
+    assert await player.complete(messages, temperature=0) == "SHE SAID HELLO"
+    assert player.last_usage.model == "echo-model"
+    assert player.get_stats()["hits"] == 1
+
+    flaky = ReplayProvider()
+    flaky.initialize(
+        {
+            "cassette": cassette,
+            "errors": {"rate_limit": 1.0, "retry_after": 2},
+            "retry": {"max_attempts": 1},
+            "max_requests_per_minute": 600,
+        }
+    )
+    assert flaky.rate_limit == 600
+    with pytest.raises(RateLimitError) as exc_info:
+        await flaky.complete(messages, temperature=0)
+    assert exc_info.value.retry_after == 2
+
+    # Concurrent recordings each store the usage of their own request
+    class SlowFirstProvider(EchoProvider):
+        async def complete_with_usage(self, messages, **kwargs):
+            text = messages[-1]["content"]
+            await asyncio.sleep(0.05 if text == "first" else 0.0)
+            usage = CompletionUsage(input_tokens=len(text), model=self.model)
+            return CompletionResult(text=text, usage=usage)
+
+    concurrent = tmp_path / "concurrent.jsonl"
+    recorder = ReplayProvider()
+    recorder.initialize({"mode": "record", "cassette": concurrent, "provider": SlowFirstProvider()})
+    await asyncio.gather(
+        *(recorder.complete([{"role": "user", "content": c}]) for c in ("first", "second!"))
+    )
+    records = [json.loads(line) for line in concurrent.read_text().splitlines()]
+    assert {r["response"]: r["usage"]["input_tokens"] for r in records} == {
+        "first": 5,
+        "second!": 7,
+    }
+
+
+@pytest.mark.asyncio
+async def test_provider_retries_transient_errors_and_opens_circuit(tmp_path):
+    """Overloaded errors are retried with backoff, then the provider's circuit opens."""
+    from src.providers.replay import ReplayProvider
+    from src.utils.circuit_breaker import CircuitBreakerOpenError
+    from src.utils.circuit_breaker_monitor import CircuitBreakerMonitor
+    from src.utils.errors import ProviderError
+    from src.utils.retry import ErrorKind, classify_error
+
+    cassette = tmp_path / "cassette.jsonl"
+    provider = ReplayProvider()
+    provider.initialize(
+        {
+            "cassette": cassette,
+            "on_miss": "echo",
+            "errors": {"overloaded": 1.0},
+            "retry": {"max_attempts": 3, "base_delay": 0.001, "max_delay": 0.01},
+        }
+    )
+    provider.circuit_breaker.reset()
+    messages = [{"role": "user", "content": "hello"}]
+
+    with pytest.raises(ProviderError) as exc_info:
+        await provider.complete(messages)
+    assert classify_error(exc_info.value) is ErrorKind.OVERLOADED
+    assert provider.retry_stats.attempts == 3
+    assert provider.retry_stats.retries == 2
+
+    # The fifth failure opens the circuit, so the next retry is refused without a call
+    with pytest.raises(CircuitBreakerOpenError):
+        await provider.complete(messages)
+    assert provider.retry_stats.attempts == 5
+    assert provider.retry_stats.short_circuited == 1
+
+    health = CircuitBreakerMonitor().get_health_summary()
+    assert health["circuit_breakers"]["provider:replay"]["status"] == "failed"
+    provider.circuit_breaker.reset()
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_and_cancellations_in_half_open_release_the_trial_slot():
+    """A 429 or a cancelled call in half-open neither reopens nor wedges the circuit."""
+    import asyncio
+
+    from src.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+    from src.utils.errors import ProviderError, RateLimitError
+    from src.utils.retry import RetryPolicy, retry_async
+
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=1, timeout_duration=0.0), name="half-open-test"
+    )
+    policy = RetryPolicy(max_attempts=1)
+
+    def raising(exc):
+        async def call(attempt):
+            raise exc
+
+        return call
+
+    async def ok(attempt):
+        return "ok"
+
+    with pytest.raises(ProviderError):
+        server_error = ProviderError("boom", details={"status_code": 500})
+        await retry_async(raising(server_error), policy, breaker)
+    assert breaker.get_state() is CircuitState.OPEN
+
+    # More 429s than half-open slots: each one gives its slot back
+    for _ in range(breaker.config.half_open_max_calls + 2):
+        with pytest.raises(RateLimitError):
+            await retry_async(raising(RateLimitError("slow down")), policy, breaker)
+    assert breaker.get_state() is CircuitState.HALF_OPEN
+    assert breaker.metrics.half_open_calls == 0
+
+    # A losing hedge leg is cancelled mid-call
+    started = asyncio.Event()
+
+    async def hang(attempt):
+        started.set()
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(retry_async(hang, policy, breaker))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.metrics.half_open_calls == 0
+
+    for _ in range(breaker.config.success_threshold):
+        assert await retry_async(ok, policy, breaker) == "ok"
+    assert breaker.get_state() is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_grows_on_success_and_halves_on_429():
+    """The AIMD limiter queues excess requests, grows while saturated and backs off on 429."""
+    import asyncio
+
+    from src.providers.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyConfig
+    from src.utils.errors import RateLimitError
+
+    config = ConcurrencyConfig(initial_limit=2, max_limit=8, latency_spike_factor=1000)
+    limiter = AdaptiveConcurrencyLimiter("test", config)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(*(request() for _ in range(40)))
+    assert limiter.max_queue_depth > 0
+    assert limiter.limit > 2
+    assert peak <= limiter.config.max_limit
+
+    before = limiter.limit
+    with pytest.raises(RateLimitError):
+        async with limiter.slot():
+            raise RateLimitError("429 Too Many Requests")
+    assert limiter.limit == max(1, before // 2)
+    assert limiter.get_metrics()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ollama_parallelism_is_discovered_once_and_keeps_a_learned_limit(monkeypatch):
+    """Discovery probes a server once per process and never shrinks a limiter in use."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from src.providers import ollama
+    from src.providers.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyConfig
+
+    monkeypatch.setattr(ollama, "_parallelism", {})
+    monkeypatch.setattr(ollama, "_discovery_started", set())
+    server = asyncio.Semaphore(2)
+    probes = 0
+
+    async def create(**kwargs):
+        nonlocal probes
+        probes += 1
+        async with server:
+            await asyncio.sleep(0.05)
+
+    limiter = AdaptiveConcurrencyLimiter("ollama-test", ConcurrencyConfig(initial_limit=1))
+    providers = []
+    for _ in range(2):
+        provider = ollama.OllamaProvider()
+        provider.model = "llama3"
+        completions = SimpleNamespace(create=create)
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        provider._concurrency_limiter = limiter
+        providers.append(provider)
+
+    assert await providers[0].discover_parallelism() == 2
+    assert limiter.limit == limiter.config.max_limit == 2
+    sent = probes
+
+    # Real traffic taught the limiter more than the probe saw; a later discovery keeps it
+    limiter.successes = 10
+    limiter.set_bounds(max_limit=6, limit=6)
+    assert await providers[1].discover_parallelism() == 2
+    assert probes == sent
+    assert limiter.limit == 6
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_and_cancels_straggler():
+    """A request slower than its size class's p90 is duplicated; the loser is cancelled."""
+    import asyncio
+
+    from src.providers.hedging import HedgePolicy, RequestHedger, size_class
+
+    hedger = RequestHedger(HedgePolicy(min_samples=3, min_delay=0.01, max_extra_fraction=1.0))
+    for _ in range(3):
+        hedger.observe(400, 0.02)
+    cancelled = False
+
+    async def straggler():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return "slow"
+
+    async def duplicate():
+        return "fast"
+
+    assert await hedger.run(straggler, duplicate, prompt_chars=400) == "fast"
+    assert cancelled
+    stats = hedger.get_metrics()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    # The winner counts from when the original was sent, the straggler as censored;
+    # neither pulls the hedge delay below the latency that triggered the hedge
+    samples = list(hedger._latencies[size_class(400)])
+    assert len(samples) == 5
+    assert min(samples[3:]) >= 0.02
+
+    # Without budget left, the request just waits for the original
+    hedger.policy.max_extra_tokens = 0
+
+    async def slowish():
+        await asyncio.sleep(0.05)
+        return "original"
+
+    assert await hedger.run(slowish, duplicate, prompt_chars=400) == "original"
+    assert hedger.stats.skipped_budget == 1
+
+
+@pytest.mark.asyncio
+async def test_composite_provider_fails_over_and_adapts_json_mode():
+    """A failing member hands the request to the next one, which gets JSON by instruction."""
+    from src.providers.composite import CompositeProvider
+    from src.utils.errors import ProviderError
+
+    class Member:
+        def __init__(self, name, supports_json, error=None):
+            self.name = name
+            self.model = f"{name}-model"
+            self.max_tokens = 8192
+            self.supports_json = supports_json
+            self.error = error
+            self.seen = []
+
+        async def complete(self, messages, **kwargs):
+            self.seen.append((messages, kwargs))
+            if self.error:
+                raise self.error
+            return '{"ok": true}'
+
+        def get_model_info(self):
+            return {"context_window": 8192}
+
+    down = Member("vendor_a", True, ProviderError("overloaded", details={"status_code": 529}))
+    local = Member("vendor_b", supports_json=False)
+    composite = CompositeProvider()
+    composite.initialize(
+        {"providers": [down, local], "weights": {"vendor_a": 1000, "vendor_b": 1}, "seed": 1}
+    )
+
+    messages = [{"role": "user", "content": "Extract characters"}]
+    assert await composite.complete(messages, response_format="json_object") == '{"ok": true}'
+
+    sent_messages, sent_kwargs = local.seen[0]
+    assert "response_format" not in sent_kwargs
+    assert "valid JSON only" in sent_messages[0]["content"]
+    stats = composite.get_stats()
+    assert stats["vendor_a"]["failures"] == 1
+    assert stats["vendor_b"]["failovers"] == 1
+
+    # Model-keyed lookups see a neutral name; usage names the member that answered
+    assert composite.model == "auto"
+    assert composite.display_model == "vendor_a:vendor_a-model+vendor_b:vendor_b-model"
+    result = await composite.complete_with_usage(messages)
+    assert result.usage.model == "vendor_b-model"
+
+    # An exhausted quota fails over; a bad request would fail on every member
+    down.error = ValueError("OpenAI API quota exceeded. Please check your billing.")
+    assert await composite.complete(messages) == '{"ok": true}'
+    down.error = ProviderError("maximum context length exceeded", details={"status_code": 400})
+    served = len(local.seen)
+    with pytest.raises(ProviderError):
+        await composite.complete(messages)
+    assert len(local.seen) == served
+
+
+@pytest.mark.asyncio
+async def test_batch_job_maps_results_by_custom_id_and_resumes(tmp_path):
+    """Batch mode answers chapters from one job; a restarted runner resumes that job."""
+    from src.models.book import Chapter, Paragraph
+    from src.models.character import CharacterAnalysis
+    from src.models.transformation import TransformType
+    from src.providers.batch import BatchConfig, BatchRequest, BatchRunner, LocalBatchBackend
+    from src.services.base import ServiceConfig
+    from src.services.transform_service import TransformService
+
+    class EchoProvider:
+        name = "mock"
+        model = "mock-model"
+        calls = 0
+
+        async def complete(self, messages, **kwargs):
+            self.calls += 1
+            paragraphs = _extract_paragraphs_from_prompt(messages[-1]["content"])
+            return "\n\n".join(_make_transformed(f" {p} ").strip() for p in paragraphs)
+
+    provider = EchoProvider()
+    service = TransformService(
+        provider=provider,
+        config=ServiceConfig(config={"batch_mode": True, "batch_dir": str(tmp_path)}),
+    )
+    chapters = [
+        Chapter(number=1, title="One", paragraphs=[Paragraph(sentences=["Then she left."])]),
+        Chapter(number=2, title="Two", paragraphs=[Paragraph(sentences=["I saw her sister."])]),
+    ]
+    context = {
+        "transform_type": TransformType.ALL_MALE,
+        "characters": CharacterAnalysis(book_id="test", characters=[]),
+    }
+
+    transformed, changes = await service._transform_chapters_batch(chapters, context, label="t")
+    assert [c.paragraphs[0].get_text() for c in transformed] == [
+        "Then he left.",
+        "I saw him brother.",
+    ]
+    assert {c.chapter_index for c in changes} == {0, 1}
+
+    # Stored results are reused: no new job, no new calls
+    calls = provider.calls
+    await service._transform_chapters_batch(chapters, context, label="t")
+    assert provider.calls == calls
+
+    # A job submitted before a restart is polled again instead of resubmitted
+    config = BatchConfig(state_dir=str(tmp_path / "resume"))
+    requests = [BatchRequest("x-1", [{"role": "user", "content": "Go:\n\nshe ran"}])]
+    before = BatchRunner(LocalBatchBackend(provider, config.state_dir), config)
+    job_id = await before.backend.submit(requests, "resume")
+    before._save_state(before.job_key(requests), {"job_id": job_id, "submitted_at": time.time()})
+
+    after = BatchRunner(LocalBatchBackend(provider, config.state_dir), config)
+    results = await after.run(requests, label="resume")
+    assert results["x-1"].text == "he ran"
+    assert len(list((tmp_path / "resume" / "local").iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_reported_usage_is_accounted_per_stage_and_book(tmp_path):
+    """Usage reported by a provider lands in the accounting sink under its scope."""
+    from src.providers.replay import ReplayProvider, request_fingerprint
+    from src.utils.usage_accounting import get_usage_accountant, usage_scope
+
+    cassette = tmp_path / "cassette.jsonl"
+    messages = [{"role": "user", "content": "x" * 400}]
+    record = {
+        "key": request_fingerprint(messages),
+        "model": "gpt-4o",
+        "latency": 0.0,
+        "usage": {"input_tokens": 80, "output_tokens": 5},
+        "response": "ok",
+    }
+    cassette.write_text(json.dumps(record) + "\n")
+
+    provider = ReplayProvider()
+    provider.initialize({"cassette": cassette, "latency": "none"})
+    accountant = get_usage_accountant()
+    accountant.reset()
+
+    with usage_scope(stage="extraction", book="Emma"):
+        await provider.complete(messages)
+    await provider.complete(messages)
+
+    assert accountant.by_stage()["extraction"]["input_tokens"] == 80
+    assert accountant.by_stage()["other"]["calls"] == 1
+    assert accountant.by_book()["Emma"]["stages"]["extraction"]["output_tokens"] == 5
+    # 400 chars / 80 tokens = 5 chars per token, against the configured 3.5
+    assert accountant.estimator_report()["gpt-4o"]["observed_chars_per_token"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_transformation_usage_counts_only_its_own_completions():
+    """Transforming the same title twice reports one run's usage, not the running total."""
+    import asyncio
+
+    from src.models.book import Book, Chapter, Paragraph
+    from src.models.character import Character, CharacterAnalysis, Gender
+    from src.models.transformation import TransformType
+    from src.providers.base import CompletionUsage
+    from src.services.base import ServiceConfig
+    from src.services.transform_service import TransformService
+    from src.utils.usage_accounting import get_usage_accountant, usage_scope
+
+    class UsageReportingProvider:
+        name = "mock"
+        model = "mock-model"
+
+        async def complete(self, messages, **kwargs):
+            get_usage_accountant().record(
+                CompletionUsage(input_tokens=10, output_tokens=2), provider="mock"
+            )
+            await asyncio.sleep(0)
+            paragraphs = _extract_paragraphs_from_prompt(messages[-1]["content"])
+            return "\n\n".join(_make_transformed(p) for p in paragraphs)
+
+    async def unrelated_call_on_the_same_title():
+        with usage_scope(stage="transform", book="Emma"):
+            get_usage_accountant().record(CompletionUsage(input_tokens=500), provider="other")
+
+    service = TransformService(provider=UsageReportingProvider(), config=ServiceConfig())
+    book = Book(
+        title="Emma",
+        author="Jane Austen",
+        chapters=[Chapter(number=1, title="One", paragraphs=[Paragraph(["She smiled."])])],
+    )
+    characters = CharacterAnalysis(
+        book_id=book.hash(),
+        characters=[Character(name="Emma", gender=Gender.FEMALE, pronouns="she/her")],
+    )
+    get_usage_accountant().reset()
+
+    first, _ = await asyncio.gather(
+        service.transform_book(book, TransformType.ALL_MALE, characters),
+        unrelated_call_on_the_same_title(),
+    )
+    second = await service.transform_book(book, TransformType.ALL_MALE, characters)
+
+    usage = first.metadata["usage"]
+    assert usage["calls"] >= 1
+    assert usage["input_tokens"] == 10 * usage["calls"]
+    assert usage["stages"]["transform"]["calls"] == usage["calls"]
+    assert second.metadata["usage"] == usage
+    assert get_usage_accountant().by_book()["Emma"]["calls"] == 2 * usage["calls"] + 1
+
+
+def test_token_estimator_memoizes_in_lru_and_calibrates_from_usage():
+    """Counts are memoized per text with LRU eviction; the heuristic follows reported usage."""
+    from src.providers.base import CompletionUsage
+    from src.utils.token_manager import ModelConfig, TokenEstimator
+    from src.utils.usage_accounting import get_usage_accountant
+
+    class WordTokenizer:
+        name = "words"
+
+        def __init__(self):
+            self.batches = []
+
+        def count_batch(self, texts):
+            self.batches.append(list(texts))
+            return [len(text.split()) for text in texts]
+
+    tokenizer = WordTokenizer()
+    config = ModelConfig(name="test-model", chars_per_token=3.0, max_context_tokens=8000)
+    estimator = TokenEstimator(config, tokenizer=tokenizer, cache_size=2)
+
+    assert estimator.estimate_batch(["a b", "c", "a b", ""]) == [2, 1, 2, 0]
+    assert tokenizer.batches == [["a b", "c"]]  # Duplicates and empty texts are not counted
+    assert estimator.estimate_tokens("c") == 1  # Memo hit, and now the most recent entry
+    assert estimator.estimate_batch(["d e f"]) == [3]  # Evicts "a b", the least recent
+    assert estimator.estimate_batch(["c", "a b"]) == [1, 2]
+    assert tokenizer.batches[1:] == [["d e f"], ["a b"]]
+
+    # Reported usage of 4 chars per token replaces the configured ratio of 3
+    accountant = get_usage_accountant()
+    accountant.reset()
+    heuristic = TokenEstimator(config, tokenizer=None)
+    text = "x" * 300
+    assert not heuristic.exact
+    assert heuristic.estimate_tokens(text) == int(300 / 3.0 * TokenEstimator.HEURISTIC_BUFFER)
+    for _ in range(4):
+        accountant.record(CompletionUsage(input_tokens=100, model="cal-model"), "p", 400)
+    assert heuristic.calibrate(model="cal-model") is None  # Too few calls to trust
+    accountant.record(CompletionUsage(input_tokens=100, model="cal-model"), "p", 400)
+    accountant.record(CompletionUsage(input_tokens=100, model="cal-model", estimated=True), "p", 9)
+    assert heuristic.calibrate() == 4.0  # Remembers the model; estimated usage is ignored
+    assert heuristic.estimate_tokens(text) == int(300 / 4.0 * TokenEstimator.HEURISTIC_BUFFER)
+    accountant.reset()
+
+
+def test_tokenizer_failures_fall_back_to_the_heuristic(tmp_path, monkeypatch):
+    """A vocabulary that fails to load, or a tokenizer that raises, leaves the heuristic."""
+    from src.utils import tokenizer as tokenizer_module
+    from src.utils.token_manager import ModelConfig, TokenEstimator
+
+    attempts = []
+
+    class BrokenBackend:
+        def __init__(self, name, path):
+            attempts.append(path)
+            raise RuntimeError("corrupt vocabulary")
+
+    monkeypatch.setattr(tokenizer_module, "_cache", {})
+    monkeypatch.setattr(tokenizer_module, "HFTokenizer", BrokenBackend)
+    monkeypatch.setenv(tokenizer_module.TOKENIZER_DIR_ENV, str(tmp_path))
+    (tmp_path / "vocab.json").write_text("{}")
+    (tmp_path / "vocab.tiktoken").write_text("")  # No known pattern for "vocab": skipped
+
+    config = ModelConfig(
+        name="test-model", chars_per_token=4.0, max_context_tokens=8000, tokenizer="vocab"
+    )
+    assert tokenizer_module.load_tokenizer("vocab") is None
+    estimator = TokenEstimator(config)
+    assert not estimator.exact
+    assert estimator.estimate_tokens("x" * 40) == int(10 * TokenEstimator.HEURISTIC_BUFFER)
+    assert attempts == [tmp_path / "vocab.json"]  # The failure is cached per name
+
+    class RaisingTokenizer:
+        name = "raising"
+
+        def count_batch(self, texts):
+            raise ValueError("tokenizer crashed")
+
+    estimator = TokenEstimator(config, tokenizer=RaisingTokenizer())
+    assert estimator.exact
+    assert estimator.estimate_batch(["x" * 40, ""]) == [int(10 * TokenEstimator.HEURISTIC_BUFFER), 0]
+    assert not estimator.exact
+
+
+def test_token_manager_keeps_bounded_history_running_aggregates_and_spill(tmp_path):
+    """Aggregates cover every call while only recent ones stay in memory; all are spilled."""
+    from src.utils.token_manager import TokenManager
+    from src.utils.usage_accounting import usage_scope
+
+    spill = tmp_path / "usage" / "calls.ndjson"
+    manager = TokenManager("gpt-4", history_size=3, spill_path=spill)
+
+    with usage_scope(stage="extraction"):
+        manager.track_usage(100, 10, provider="openai", cost=0.5)
+        manager.track_usage(200, 20, provider="openai", model="gpt-4o", cost=0.25)
+    spill_file = manager._spill_file
+    manager.track_usage(300, 30, provider="anthropic", stage="merge", cost=1.0)
+    manager.track_usage(400, 40, cost=2.0)
+    assert manager._spill_file is spill_file  # One append handle for every call
+
+    stats = manager.get_usage_stats()
+    assert stats["total_calls"] == 4
+    assert (stats["total_input_tokens"], stats["total_output_tokens"]) == (1000, 100)
+    assert stats["estimated_total_cost"] == 3.75
+    assert stats["average_tokens_per_call"] == 275
+    assert [u.input_tokens for u in stats["recent_calls"]] == [200, 300, 400]
+    assert len(manager.usage_history) == 3
+    assert stats["by_provider"] == {
+        "openai": {"calls": 2, "input_tokens": 300, "output_tokens": 30, "estimated_cost": 0.75},
+        "anthropic": {"calls": 1, "input_tokens": 300, "output_tokens": 30, "estimated_cost": 1.0},
+        "unknown": {"calls": 1, "input_tokens": 400, "output_tokens": 40, "estimated_cost": 2.0},
+    }
+    assert {k: v["calls"] for k, v in stats["by_model"].items()} == {"gpt-4": 3, "gpt-4o": 1}
+    assert {k: v["input_tokens"] for k, v in stats["by_stage"].items()} == {
+        "extraction": 300,
+        "merge": 300,
+        "other": 400,
+    }
+
+    lines = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [r["input_tokens"] for r in lines] == [100, 200, 300, 400]
+    assert lines[1]["model"] == "gpt-4o" and lines[2]["stage"] == "merge"
+
+    # Clearing keeps the spill; closing reopens it for appending on the next call
+    manager.clear_usage_history()
+    manager.close()
+    manager.track_usage(5)
+    assert manager.get_usage_stats()["total_calls"] == 1
+    assert len(spill.read_text().splitlines()) == 5
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_sdk_clients_do_not_retry_beneath_the_retry_layer(monkeypatch):
+    """A 429 costs exactly one HTTP call per retry_async attempt, for every SDK provider."""
+    import asyncio
+
+    import httpx
+
+    from src.providers import http_pool
+    from src.providers.anthropic import AnthropicProvider
+    from src.providers.openai import OpenAIProvider
+    from src.utils.retry import ErrorKind, classify_error
+
+    calls = []
+
+    def rate_limited(request):
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"retry-after-ms": "1"}, json={"error": {}})
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setitem(
+        http_pool._clients, loop, httpx.AsyncClient(transport=httpx.MockTransport(rate_limited))
+    )
+    for provider_class in (OpenAIProvider, AnthropicProvider):
+        calls.clear()
+        provider = provider_class()
+        provider.initialize(
+            {"api_key": "test", "retry": {"max_attempts": 3, "base_delay": 0.001}}
+        )
+        provider.rate_limiter = None  # Its minimum spacing would only slow the test down
+        provider.circuit_breaker.reset()
+
+        with pytest.raises(Exception) as exc_info:
+            await provider.complete([{"role": "user", "content": "hi"}])
+
+        assert classify_error(exc_info.value) is ErrorKind.RATE_LIMIT
+        assert provider.retry_stats.attempts == 3
+        assert len(calls) == 3
+        provider.circuit_breaker.reset()